@@ -0,0 +1 @@
+"""성능 벤치마크 (python -m benchmarks.run)"""
@@ -0,0 +1,622 @@
+"""봇 부하 테스트
+
+로컬에 가짜 Telegram Bot API / Yahoo 차트 / CNN Fear & Greed 서버를 띄우고,
+N개 채팅방이 실제 Application 명령어 핸들러로 명령어를 보내는 상황을 흉내 냅니다.
+명령어별 처리 시간(p50/p95/p99)과 처리량을 출력해, 동시 /report 사용자가
+몇 명일 때 응답이 밀리기 시작하는지 확인합니다.
+
+구성:
+    - 가짜 서버는 별도 스레드의 이벤트 루프에서 실행 (봇 이벤트 루프와 작업을 나누지 않음)
+    - 가짜 서버마다 응답 지연(±50% 흔들림)과 오류율 설정
+      (Telegram 오류는 429 Retry-After, Yahoo/CNN 오류는 500)
+    - 채팅방마다 종목 풀에서 무작위로 관심 종목을 골라 임시 watchlist에 저장
+    - 각 채팅방은 명령어를 보내고, 처리가 끝나면(생각 시간 후) 다음 명령어를 보냄
+    - 업데이트는 polling/웹훅과 같은 update_processor를 거치므로 --concurrency가
+      실제 동시 처리 한도와 같게 동작
+
+yfinance는 쿠키/crumb 확인 등 내부 요청을 직접 처리하므로 주소만 바꿔서는 가짜 서버로
+보낼 수 없습니다. 대신 같은 형식의 차트 API(/v8/finance/chart/SYMBOL)를 HTTP로 받아
+DataFrame을 만드는 조회 함수로 fetch_stock_data를 바꿔서 실행합니다.
+
+사용법:
+    uv run python -m benchmarks.loadtest --chats 50 --commands 5
+    uv run python -m benchmarks.loadtest --chats 200 --concurrency 16 --yahoo-latency 0.3
+    uv run python -m benchmarks.loadtest --max-p95 5   # p95가 5초를 넘으면 exit 1
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs
+
+import numpy as np
+import pandas as pd
+import requests
+from telegram import Update
+
+from src import metrics, pipeline, watchlist
+from src.config import Config
+from src.http_server import HttpServer, Request, Response
+from src.indicators import fear_greed
+from src.notifiers import telegram
+
+TOKEN = "123456:LOADTEST"
+
+# 가짜 Bot API가 응답하는 메서드 (나머지는 404)
+TELEGRAM_METHODS = (
+    "getMe",
+    "setMyCommands",
+    "sendMessage",
+    "editMessageText",
+    "deleteMessage",
+    "sendChatAction",
+)
+
+# 시작할 때 한 번 호출하는 메서드 (지연/오류를 넣지 않음)
+SETUP_METHODS = ("getMe", "setMyCommands")
+
+# yfinance range 값별 거래일 수
+RANGE_DAYS = {
+    "1d": 1,
+    "5d": 5,
+    "1mo": 21,
+    "3mo": 63,
+    "6mo": 126,
+    "1y": 252,
+    "2y": 504,
+    "5y": 1260,
+}
+
+# 명령어 비율 (이름:가중치)
+DEFAULT_MIX = "report:6,status:2,list:1,help:1"
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """정렬된 값의 백분위수 (nearest-rank, 값이 없으면 0)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))
+    return sorted_values[index]
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    """명령어 비율 파싱 ("report:6,status:2" → {"report": 6.0, "status": 2.0})"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.strip().partition(":")
+        if name:
+            mix[name.lstrip("/")] = float(weight or 1)
+    return mix
+
+
+class _FakeUpstream:
+    """가짜 서버 공통: 응답 지연과 오류 주입, 요청 수 집계"""
+
+    def __init__(self, latency: float, error_rate: float, seed: int):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self.server = HttpServer("127.0.0.1", 0)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.port}"
+
+    async def _delay_and_fail(self) -> bool:
+        """지연 후 이번 요청을 실패시킬지 반환"""
+        self.requests += 1
+        if self.latency > 0:
+            await asyncio.sleep(self.latency * self._rng.uniform(0.5, 1.5))
+        if self._rng.random() < self.error_rate:
+            self.errors += 1
+            return True
+        return False
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "errors": self.errors}
+
+
+class FakeTelegramServer(_FakeUpstream):
+    """Bot API 흉내 (POST /bot{token}/{method})"""
+
+    def __init__(self, latency: float = 0.05, error_rate: float = 0.0, seed: int = 1):
+        super().__init__(latency, error_rate, seed)
+        self.sent = 0
+        self._message_id = 0
+        for method in TELEGRAM_METHODS:
+            self.server.route("POST", f"/bot{TOKEN}/{method}", self._handler(method))
+
+    @property
+    def base_url(self) -> str:
+        """Application.builder().base_url()에 넘길 주소"""
+        return f"{self.url}/bot"
+
+    def _message(self, params: dict) -> dict:
+        self._message_id += 1
+        return {
+            "message_id": int(params.get("message_id", self._message_id)),
+            "date": int(time.time()),
+            "chat": {"id": int(params.get("chat_id", 0)), "type": "private"},
+            "text": params.get("text", ""),
+        }
+
+    def _handler(self, method: str):
+        async def handle(request: Request) -> Response:
+            if method not in SETUP_METHODS and await self._delay_and_fail():
+                return Response.json(
+                    {
+                        "ok": False,
+                        "error_code": 429,
+                        "description": "Too Many Requests: retry after 1",
+                        "parameters": {"retry_after": 1},
+                    },
+                    status=429,
+                )
+
+            params = {
+                key: values[0]
+                for key, values in parse_qs(request.body.decode("utf-8")).items()
+            }
+            if method == "getMe":
+                result = {
+                    "id": 123456,
+                    "is_bot": True,
+                    "first_name": "LoadTest",
+                    "username": "loadtest_bot",
+                }
+            elif method in ("sendMessage", "editMessageText"):
+                self.sent += method == "sendMessage"
+                result = self._message(params)
+            else:
+                result = True
+            return Response.json({"ok": True, "result": result})
+
+        return handle
+
+    def stats(self) -> dict:
+        return {**super().stats(), "sent_messages": self.sent}
+
+
+class FakeMarketServer(_FakeUpstream):
+    """Yahoo 차트 API(GET /v8/finance/chart/SYMBOL)와 CNN Fear & Greed 흉내"""
+
+    CNN_PATH = "/index/fearandgreed/graphdata"
+
+    def __init__(
+        self,
+        symbols: list[str],
+        history_days: int = 2520,
+        latency: float = 0.2,
+        error_rate: float = 0.0,
+        seed: int = 2,
+    ):
+        super().__init__(latency, error_rate, seed)
+        rng = np.random.default_rng(seed)
+        index = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=history_days)
+        self._timestamps = [int(ts.timestamp()) for ts in index]
+        self._closes = {
+            symbol: (
+                100.0 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, history_days)))
+            ).round(4)
+            for symbol in symbols
+        }
+        # 같은 응답을 매번 직렬화하지 않도록 (종목, range)별로 보관
+        self._bodies: dict[tuple[str, str], bytes] = {}
+        for symbol in symbols:
+            self.server.route(
+                "GET", f"/v8/finance/chart/{symbol}", self._chart_handler(symbol)
+            )
+        self.server.route("GET", self.CNN_PATH, self._handle_fear_greed)
+
+    @property
+    def cnn_url(self) -> str:
+        return f"{self.url}{self.CNN_PATH}"
+
+    def _chart_body(self, symbol: str, range_: str) -> bytes:
+        key = (symbol, range_)
+        if key not in self._bodies:
+            days = RANGE_DAYS.get(range_, len(self._timestamps))
+            closes = self._closes[symbol][-days:]
+            chart = {
+                "chart": {
+                    "result": [
+                        {
+                            "meta": {"symbol": symbol, "currency": "USD"},
+                            "timestamp": self._timestamps[-days:],
+                            "indicators": {"quote": [{"close": closes.tolist()}]},
+                        }
+                    ],
+                    "error": None,
+                }
+            }
+            self._bodies[key] = json.dumps(chart).encode("utf-8")
+        return self._bodies[key]
+
+    def _chart_handler(self, symbol: str):
+        async def handle(request: Request) -> Response:
+            if await self._delay_and_fail():
+                return Response(500, "Internal Server Error")
+            range_ = request.query.get("range", ["1y"])[0]
+            return Response(
+                200, self._chart_body(symbol, range_), content_type="application/json"
+            )
+
+        return handle
+
+    async def _handle_fear_greed(self, request: Request) -> Response:
+        if await self._delay_and_fail():
+            return Response(500, "Internal Server Error")
+        return Response.json(
+            {
+                "fear_and_greed": {
+                    "score": 42.0,
+                    "rating": "fear",
+                    "previous_close": 40.0,
+                    "previous_1_week": 35.0,
+                }
+            }
+        )
+
+
+class ServerThread:
+    """가짜 서버들을 별도 스레드의 이벤트 루프에서 실행"""
+
+    def __init__(self, servers: list[_FakeUpstream]):
+        self.servers = servers
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="loadtest-servers", daemon=True
+        )
+
+    def _call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def start(self):
+        self._thread.start()
+        for fake in self.servers:
+            self._call(fake.server.start())
+
+    def stop(self):
+        for fake in self.servers:
+            self._call(fake.server.stop())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+def make_chart_fetcher(base_url: str):
+    """가짜 Yahoo 차트 API를 조회하는 fetch_stock_data 대체 함수
+
+    fetch_stock_data와 같이 실패하면 빈 DataFrame을 반환합니다.
+    스레드마다 Session을 따로 두어 연결을 재사용합니다.
+    """
+    local = threading.local()
+
+    def fetch(symbol: str, period: str = "1y", timeout: float = 10) -> pd.DataFrame:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        try:
+            with metrics.STOCK_FETCH_SECONDS.time():
+                response = session.get(
+                    f"{base_url}/v8/finance/chart/{symbol}",
+                    params={"range": period, "interval": "1d"},
+                    timeout=timeout,
+                )
+            if response.status_code != 200:
+                metrics.UPSTREAM_ERRORS.labels("yfinance").inc()
+                return pd.DataFrame()
+            result = response.json()["chart"]["result"][0]
+        except (requests.exceptions.RequestException, KeyError, ValueError):
+            metrics.UPSTREAM_ERRORS.labels("yfinance").inc()
+            return pd.DataFrame()
+
+        index = pd.to_datetime(result["timestamp"], unit="s", utc=True)
+        closes = result["indicators"]["quote"][0]["close"]
+        return pd.DataFrame({"Close": closes}, index=index)
+
+    return fetch
+
+
+def make_update(bot, update_id: int, chat_id: int, command: str) -> Update:
+    """채팅방에서 보낸 명령어 메시지 업데이트"""
+    text = f"/{command}"
+    return Update.de_json(
+        {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "from": {"id": chat_id, "is_bot": False, "first_name": "Load"},
+                "text": text,
+                "entities": [{"type": "bot_command", "offset": 0, "length": len(text)}],
+            },
+        },
+        bot,
+    )
+
+
+def _write_watchlists(
+    chat_ids: list[int], universe: list[str], per_chat: int, rng: random.Random
+):
+    """채팅방마다 종목 풀에서 무작위로 고른 관심 종목 저장 (첫 종목은 200일선 분석)"""
+    chats = {}
+    for chat_id in chat_ids:
+        symbols = rng.sample(universe, min(per_chat, len(universe)))
+        chats[str(chat_id)] = {
+            "symbols": symbols,
+            "ma_enabled": symbols[:1],
+            "period": "1y",
+            "alert_time": "09:00",
+        }
+    watchlist.save({"chats": chats})
+
+
+async def _simulate_chat(
+    application,
+    chat_id: int,
+    commands: list[str],
+    think_time: float,
+    rng: random.Random,
+    update_ids,
+    latencies: list[tuple[str, float]],
+):
+    """채팅방 1개: 명령어를 보내고 처리가 끝나면 다음 명령어 (closed loop)"""
+    for command in commands:
+        update = make_update(application.bot, next(update_ids), chat_id, command)
+        start = time.perf_counter()
+        # polling/웹훅과 같은 경로 (동시 처리 한도 적용)
+        await application.update_processor.process_update(
+            update, application.process_update(update)
+        )
+        latencies.append((command, time.perf_counter() - start))
+        if think_time > 0:
+            await asyncio.sleep(rng.expovariate(1 / think_time))
+
+
+def summarize(latencies: list[tuple[str, float]], duration: float) -> dict:
+    """명령어별/전체 지연 백분위수와 처리량"""
+
+    def stats(values: list[float]) -> dict:
+        values = sorted(values)
+        return {
+            "count": len(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+            "max": values[-1] if values else 0.0,
+        }
+
+    by_command: dict[str, list[float]] = {}
+    for command, seconds in latencies:
+        by_command.setdefault(command, []).append(seconds)
+
+    return {
+        "duration": duration,
+        "throughput": len(latencies) / duration if duration > 0 else 0.0,
+        "latency": stats([seconds for _, seconds in latencies]),
+        "commands": {
+            name: stats(values) for name, values in sorted(by_command.items())
+        },
+    }
+
+
+async def run_load_test(
+    chats: int = 20,
+    commands_per_chat: int = 5,
+    mix: dict[str, float] | None = None,
+    symbols_per_chat: int = 5,
+    universe_size: int = 50,
+    concurrency: int = 1,
+    think_time: float = 0.0,
+    telegram_latency: float = 0.05,
+    telegram_error_rate: float = 0.0,
+    yahoo_latency: float = 0.2,
+    yahoo_error_rate: float = 0.0,
+    seed: int = 42,
+) -> dict:
+    """가짜 서버를 띄우고 부하를 흘려 결과 요약 반환
+
+    Args:
+        chats: 동시에 명령어를 보내는 채팅방 수
+        commands_per_chat: 채팅방마다 보낼 명령어 수
+        mix: 명령어 비율 {"report": 6, ...} (없으면 DEFAULT_MIX)
+        symbols_per_chat: 채팅방별 관심 종목 수
+        universe_size: 전체 종목 풀 크기 (작을수록 채팅방끼리 캐시를 공유)
+        concurrency: 동시에 처리할 업데이트 수 (polling=1, 웹훅=WEBHOOK_CONCURRENCY)
+        think_time: 명령어 사이 평균 대기 시간 (초, 지수분포)
+        telegram_latency, telegram_error_rate: 가짜 Bot API 지연(초)/오류율(0~1)
+        yahoo_latency, yahoo_error_rate: 가짜 Yahoo/CNN 지연(초)/오류율(0~1)
+        seed: 난수 시드
+
+    Returns:
+        summarize() 결과 + 가짜 서버별 요청/오류 수, 리포트 캐시 적중률, 핸들러 예외 수
+    """
+    rng = random.Random(seed)
+    mix = mix or parse_mix(DEFAULT_MIX)
+    universe = [f"SYM{i:04d}" for i in range(universe_size)]
+    chat_ids = [100_000 + i for i in range(chats)]
+    names, weights = list(mix), list(mix.values())
+    plans = {
+        chat_id: rng.choices(names, weights, k=commands_per_chat)
+        for chat_id in chat_ids
+    }
+
+    fake_telegram = FakeTelegramServer(telegram_latency, telegram_error_rate, seed)
+    fake_market = FakeMarketServer(
+        universe, latency=yahoo_latency, error_rate=yahoo_error_rate, seed=seed
+    )
+
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(ServerThread([fake_telegram, fake_market]))
+        data_dir = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+        for target, name, value in (
+            (Config, "TELEGRAM_BOT_TOKEN", TOKEN),
+            (Config, "TELEGRAM_CHAT_ID", str(chat_ids[0])),
+            (Config, "ALLOWED_CHAT_IDS", ",".join(map(str, chat_ids))),
+            (Config, "SCHEDULER_ENABLED", False),
+            (Config, "METRICS_PORT", 0),
+            (watchlist, "DATA_DIR", data_dir),
+            (watchlist, "WATCHLIST_FILE", data_dir / "watchlist.json"),
+            (fear_greed, "API_URL", fake_market.cnn_url),
+            (pipeline, "fetch_stock_data", make_chart_fetcher(fake_market.url)),
+        ):
+            stack.enter_context(mock.patch.object(target, name, value))
+
+        _write_watchlists(chat_ids, universe, symbols_per_chat, rng)
+
+        application = telegram.build_application(
+            concurrent_updates=concurrency if concurrency > 1 else False,
+            base_url=fake_telegram.base_url,
+        )
+        # 핸들러에서 처리하지 못한 예외 (예: reply_text의 429)는 로그 대신 개수만 집계
+        handler_errors = []
+
+        async def count_error(update, context):
+            handler_errors.append(type(context.error).__name__)
+
+        application.add_error_handler(count_error)
+        await application.initialize()
+        try:
+            await application.post_init(application)
+            latencies: list[tuple[str, float]] = []
+            update_ids = iter(range(1, 1 << 31))
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(
+                    _simulate_chat(
+                        application,
+                        chat_id,
+                        plans[chat_id],
+                        think_time,
+                        random.Random(seed + chat_id),
+                        update_ids,
+                        latencies,
+                    )
+                    for chat_id in chat_ids
+                )
+            )
+            duration = time.perf_counter() - start
+            cache_stats = application.bot_data["report_cache"].stats()
+        finally:
+            await application.post_stop(application)
+            await application.shutdown()
+
+    result = summarize(latencies, duration)
+    result["telegram"] = fake_telegram.stats()
+    result["market"] = fake_market.stats()
+    result["report_cache_hit_ratio"] = cache_stats["hit_ratio"]
+    result["handler_errors"] = len(handler_errors)
+    return result
+
+
+def print_summary(result: dict):
+    """결과 표 출력"""
+    print(
+        f"\n처리량: {result['throughput']:.1f} 명령어/초 "
+        f"({result['latency']['count']}건, {result['duration']:.1f}초)"
+    )
+    print(f"\n  {'명령어':<12}{'건수':>6}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    rows = [*result["commands"].items(), ("(전체)", result["latency"])]
+    for name, stats in rows:
+        print(
+            f"  {name:<12}{stats['count']:>6}"
+            f"{stats['p50']:>9.2f}s{stats['p95']:>9.2f}s"
+            f"{stats['p99']:>9.2f}s{stats['max']:>9.2f}s"
+        )
+    telegram_stats, market = result["telegram"], result["market"]
+    print(
+        f"\n  Bot API 요청 {telegram_stats['requests']}건"
+        f" (429 {telegram_stats['errors']}건, 전송 메시지 {telegram_stats['sent_messages']}건)"
+    )
+    print(f"  Yahoo/CNN 요청 {market['requests']}건 (오류 {market['errors']}건)")
+    print(f"  핸들러 예외 {result['handler_errors']}건")
+    print(f"  리포트 캐시 적중률 {result['report_cache_hit_ratio']:.0%}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Stock Alert Bot 부하 테스트")
+    parser.add_argument("--chats", type=int, default=20, help="동시 채팅방 수")
+    parser.add_argument("--commands", type=int, default=5, help="채팅방별 명령어 수")
+    parser.add_argument(
+        "--mix", default=DEFAULT_MIX, help=f"명령어 비율 (기본: {DEFAULT_MIX})"
+    )
+    parser.add_argument("--symbols", type=int, default=5, help="채팅방별 관심 종목 수")
+    parser.add_argument("--universe", type=int, default=50, help="전체 종목 풀 크기")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="동시 처리 업데이트 수 (polling=1, 웹훅은 WEBHOOK_CONCURRENCY)",
+    )
+    parser.add_argument(
+        "--think", type=float, default=0.0, help="명령어 사이 평균 대기 (초)"
+    )
+    parser.add_argument("--telegram-latency", type=float, default=0.05)
+    parser.add_argument("--telegram-error-rate", type=float, default=0.0)
+    parser.add_argument("--yahoo-latency", type=float, default=0.2)
+    parser.add_argument("--yahoo-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="결과 JSON 저장 경로")
+    parser.add_argument(
+        "--max-p95", type=float, help="전체 p95 지연(초)이 이 값을 넘으면 exit 1"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    print(
+        f"부하 테스트: 채팅방 {args.chats}개 x 명령어 {args.commands}개, "
+        f"동시 처리 {args.concurrency}"
+    )
+    result = asyncio.run(
+        run_load_test(
+            chats=args.chats,
+            commands_per_chat=args.commands,
+            mix=parse_mix(args.mix),
+            symbols_per_chat=args.symbols,
+            universe_size=args.universe,
+            concurrency=args.concurrency,
+            think_time=args.think,
+            telegram_latency=args.telegram_latency,
+            telegram_error_rate=args.telegram_error_rate,
+            yahoo_latency=args.yahoo_latency,
+            yahoo_error_rate=args.yahoo_error_rate,
+            seed=args.seed,
+        )
+    )
+    print_summary(result)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"\n결과 저장: {args.output}")
+
+    if args.max_p95 is not None and result["latency"]["p95"] > args.max_p95:
+        print(f"\n❌ p95 {result['latency']['p95']:.2f}초 > 기준 {args.max_p95:.2f}초")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""분석/렌더링/리포트 수집 벤치마크
+
+랜덤 워크로 만든 가상 주가로 종목 수(10 ~ 10,000)와 기간(1y, max)별 소요 시간을 측정하고,
+저장된 기준값(benchmarks/baseline.json)과 비교해 느려진 항목이 있으면 실패(exit 1)합니다.
+
+측정 항목:
+    - calculate_mdd, calculate_drawdown_from_peak, calculate_ma: 종목 수만큼 호출
+    - render_daily_report: 종목 수만큼의 결과로 리포트 렌더링 (기간과 무관해 1y만)
+    - collect_report_data: 가짜 조회 함수로 바꾼 pipeline.collect_report_data (네트워크 없음)
+    - loop_lag: collect_report_data 동안 이벤트 루프가 가장 오래 멈춘 시간
+      (길수록 수집 중 다른 명령어 응답이 늦어짐)
+
+사용법:
+    uv run python -m benchmarks.run                     # 전체 측정 후 기준값과 비교
+    uv run python -m benchmarks.run --quick             # 10, 100 종목만
+    uv run python -m benchmarks.run --update-baseline   # 측정 결과를 새 기준값으로 저장
+
+기준값은 측정한 머신에 따라 다르므로, 다른 환경에서는 먼저 --update-baseline으로 만듭니다.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src import pipeline
+from src.notifiers.report_format import render_daily_report
+from src.stock.ma import calculate_ma, calculate_ma_analysis
+from src.stock.mdd import calculate_drawdown_from_peak, calculate_mdd, get_buy_signal
+
+BENCH_DIR = Path(__file__).parent
+BASELINE_FILE = BENCH_DIR / "baseline.json"
+RESULTS_FILE = BENCH_DIR / "results" / "latest.json"
+
+SIZES = (10, 100, 1_000, 10_000)
+QUICK_SIZES = (10, 100)
+
+# 기간별 거래일 수 (max는 약 40년)
+HISTORY_LENGTHS = {"1y": 252, "max": 10_000}
+
+# 종목마다 새 배열을 만들면 10,000종목 x max에서 메모리가 너무 커지므로 돌려 씀
+SERIES_POOL_SIZE = 64
+
+# 기준값보다 이 비율 넘게 느리고, 차이가 MIN_REGRESSION_SECONDS 이상이면 실패
+DEFAULT_TOLERANCE = 0.5
+MIN_REGRESSION_SECONDS = 0.005
+
+# 루프 멈춤 측정 간격 (초)
+LOOP_TICK = 0.001
+
+FEAR_GREED = {"score": 42.0, "rating": "fear", "previous_close": 40.0}
+
+
+def random_walk_pool(length: int, seed: int = 42) -> list[pd.Series]:
+    """일별 로그 수익률 N(0.0003, 0.02) 랜덤 워크 종가"""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end="2025-01-10", periods=length)
+    pool = []
+    for _ in range(SERIES_POOL_SIZE):
+        returns = rng.normal(0.0003, 0.02, length)
+        prices = 100.0 * np.exp(np.cumsum(returns))
+        pool.append(pd.Series(prices, index=index, name="Close"))
+    return pool
+
+
+def make_results(pool: list[pd.Series], count: int) -> list[dict]:
+    """리포트 렌더링용 종목 결과"""
+    results = []
+    for i in range(count):
+        prices = pool[i % len(pool)]
+        drawdown = calculate_drawdown_from_peak(prices)
+        item = {
+            "symbol": f"S{i:05d}",
+            "peak_price": drawdown["peak_price"],
+            "current_price": drawdown["current_price"],
+            "drawdown_pct": drawdown["drawdown_pct"],
+            "buy_signal": get_buy_signal(drawdown["drawdown_pct"]),
+        }
+        if i % 3 == 0:
+            ma_200 = calculate_ma(prices, window=200)
+            item["ma_200"] = calculate_ma_analysis(item["current_price"], ma_200)
+        results.append(item)
+    return results
+
+
+def measure(func, repeats: int) -> float:
+    """repeats번 실행 중 가장 빠른 시간 (초, 다른 프로세스 영향 최소화)"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_collect(
+    pool: list[pd.Series], period: str, count: int, repeats: int
+) -> tuple[float, float]:
+    """가짜 조회 함수로 pipeline.collect_report_data 측정 (스레드 전환/계산/정렬 비용)
+
+    Returns:
+        (소요 시간, 이벤트 루프가 가장 오래 멈춘 시간). 둘 다 repeats번 중 가장 작은 값
+    """
+    frames = [prices.to_frame() for prices in pool]
+    symbols = [f"S{i:05d}" for i in range(count)]
+    frame_of = {symbol: frames[i % len(frames)] for i, symbol in enumerate(symbols)}
+    ma_symbols = symbols[::3]
+
+    def fake_fetch(
+        symbol: str, period: str = "1y", timeout: float = 10
+    ) -> pd.DataFrame:
+        return frame_of[symbol]
+
+    async def collect() -> float:
+        # 수집하는 동안 1ms마다 깨어나는 작업으로 루프 멈춤 시간 측정
+        loop = asyncio.get_running_loop()
+        max_lag = 0.0
+
+        async def ticker():
+            nonlocal max_lag
+            while True:
+                start = loop.time()
+                await asyncio.sleep(LOOP_TICK)
+                max_lag = max(max_lag, loop.time() - start - LOOP_TICK)
+
+        task = asyncio.create_task(ticker())
+        await pipeline.collect_report_data(period, symbols, ma_symbols)
+        task.cancel()
+        return max_lag
+
+    lags = []
+
+    def run():
+        lags.append(asyncio.run(collect()))
+
+    with (
+        mock.patch.object(pipeline, "fetch_stock_data", fake_fetch),
+        mock.patch.object(pipeline, "get_fear_greed_index", lambda: FEAR_GREED),
+    ):
+        seconds = measure(run, repeats)
+    return seconds, min(lags)
+
+
+def run_benchmarks(sizes: tuple[int, ...], repeats: int) -> dict[str, float]:
+    """모든 항목 측정. {"항목[종목수x기간]": 초}"""
+    results = {}
+    for period, length in HISTORY_LENGTHS.items():
+        pool = random_walk_pool(length)
+        for count in sizes:
+            series = [pool[i % len(pool)] for i in range(count)]
+            # 루프 변수는 기본 인자로 고정 (측정 시점의 값 사용)
+            cases = {
+                "calculate_mdd": lambda series=series: [
+                    calculate_mdd(p) for p in series
+                ],
+                "calculate_drawdown_from_peak": lambda series=series: [
+                    calculate_drawdown_from_peak(p) for p in series
+                ],
+                "calculate_ma": lambda series=series: [
+                    calculate_ma(p, 200) for p in series
+                ],
+            }
+            if period == "1y":
+                stock_results = make_results(pool, count)
+                cases["render_daily_report"] = (
+                    lambda stock_results=stock_results, period=period: (
+                        render_daily_report(FEAR_GREED, stock_results, period, "auto")
+                    )
+                )
+
+            for name, func in cases.items():
+                key = f"{name}[{count}x{period}]"
+                results[key] = measure(func, repeats)
+                print(f"  {key:<48}{results[key] * 1000:>10.2f} ms")
+
+            seconds, lag = bench_collect(pool, period, count, repeats)
+            for name, value in (("collect_report_data", seconds), ("loop_lag", lag)):
+                key = f"{name}[{count}x{period}]"
+                results[key] = value
+                print(f"  {key:<48}{value * 1000:>10.2f} ms")
+    return results
+
+
+def compare(
+    results: dict[str, float], baseline: dict[str, float], tolerance: float
+) -> list[str]:
+    """기준값보다 느려진 항목 설명 목록"""
+    regressions = []
+    for key, seconds in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if seconds > base * (1 + tolerance) and seconds - base > MIN_REGRESSION_SECONDS:
+            regressions.append(
+                f"{key}: {base * 1000:.2f} ms → {seconds * 1000:.2f} ms "
+                f"({(seconds / base - 1) * 100:+.0f}%)"
+            )
+    return regressions
+
+
+def _write_json(path: Path, results: dict[str, float]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Stock Alert Bot 벤치마크")
+    parser.add_argument("--quick", action="store_true", help="10, 100 종목만 측정")
+    parser.add_argument(
+        "--sizes",
+        type=lambda text: tuple(int(s) for s in text.split(",")),
+        default=None,
+        help="측정할 종목 수 (쉼표 구분, 예: 10,1000)",
+    )
+    parser.add_argument("--repeats", type=int, default=3, help="항목별 반복 횟수")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="허용 느려짐 비율 (0.5 = 50%%)",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=RESULTS_FILE, help="결과 JSON 경로"
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="결과를 benchmarks/baseline.json에 저장 (비교하지 않음)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+
+    print(f"벤치마크: 종목 수 {sizes}, 기간 {list(HISTORY_LENGTHS)}")
+    results = run_benchmarks(sizes, args.repeats)
+    _write_json(args.output, results)
+    print(f"\n결과 저장: {args.output}")
+
+    if args.update_baseline:
+        _write_json(BASELINE_FILE, results)
+        print(f"기준값 저장: {BASELINE_FILE}")
+        return 0
+
+    if not BASELINE_FILE.exists():
+        print("기준값 없음: --update-baseline으로 먼저 만드세요.")
+        return 0
+
+    baseline = json.loads(BASELINE_FILE.read_text(encoding="utf-8"))["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ 성능 저하 {len(regressions)}건 (허용 {args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+
+    print(f"\n✅ 기준값 대비 성능 저하 없음 (허용 {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
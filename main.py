@@ -2,17 +2,38 @@
 
 실행 모드:
     1. 봇 모드 (권장): 스케줄러 + 명령어 대기를 동시에 처리
-    2. 단일 실행: 한 번 실행 후 종료 (외부 스케줄러 사용 시)
+    2. 웹훅 모드: 봇 모드와 같지만 텔레그램이 업데이트를 HTTP로 바로 전달
+    3. 데몬 모드: 명령어 수신 없이 내장 스케줄러로 리포트만 전송
+    4. 장중 감시 모드: 정규장 동안 현재가를 감시해 매수 단계 변화를 바로 알림
+    5. 단일 실행: 한 번 실행 후 종료 (외부 스케줄러 사용 시)
+    6. 스크리닝: 유니버스 파일의 종목 중 고점 대비 하락률 기준 이하 종목 출력
 
 사용법:
     # 봇 모드 (권장) - 스케줄러 내장 + 명령어 대기
     uv run python main.py --bot
 
+    # 웹훅 모드 - WEBHOOK_URL, WEBHOOK_SECRET 필요
+    uv run python main.py --webhook
+
+    # 데몬 모드 - 스케줄 리포트만 전송 (미국 휴장일 반영)
+    uv run python main.py --daemon
+
+    # 장중 감시 모드 - 매수 단계 기준선을 넘으면 바로 알림
+    uv run python main.py --watch
+
+    # 스크리닝 - data/universe.txt (또는 지정 파일)에서 -20% 이하 종목
+    uv run python main.py --screen
+    uv run python main.py --screen sp500.txt --threshold -30
+
     # 단일 실행 (환경변수 ANALYSIS_PERIOD 사용, 기본값 1y)
     uv run python main.py
 
     # 단일 실행 - 기간 지정
     uv run python main.py --period 6mo
+
+    # 단계별 소요 시간 출력 (다른 모드와 함께 사용 가능)
+    uv run python main.py --profile
+    uv run python main.py --profile-output report.prof --profile-memory
 """
 
 import argparse
@@ -20,81 +41,35 @@ import asyncio
 import sys
 from datetime import datetime
 
+from telegram.error import TelegramError
+
+from src import (
+    analytics,
+    history,
+    pipeline,
+    price_alerts,
+    profiling,
+    screener,
+    signal_state,
+    watchlist,
+)
 from src.config import Config
-from src import watchlist
-from src.indicators.fear_greed import get_fear_greed_index
+from src.notifiers.report_format import (
+    COMPACT_TABLE_HEADER,
+    render_change_alerts,
+    render_daily_report,
+    render_price_alerts,
+)
 from src.notifiers.telegram import TelegramNotifier
-from src.stock.fetcher import fetch_stock_data
-from src.stock.ma import calculate_ma, calculate_ma_analysis
-from src.stock.mdd import calculate_drawdown_from_peak, get_buy_signal
-
-
-def collect_stock_data(symbols: list[str], period: str) -> list[dict]:
-    """
-    각 종목의 고점 대비 하락률과 매수 신호를 수집합니다.
-
-    Args:
-        symbols: 종목 심볼 리스트 (예: ["TSLA", "SCHD", "SCHG"])
-        period: 분석 기간 (예: "1y", "6mo", "3mo")
-
-    Returns:
-        [
-            {
-                "symbol": "TSLA",
-                "peak_price": 500.0,
-                "current_price": 400.0,
-                "drawdown_pct": -20.0,
-                "buy_signal": "2차 매수 (비중 확대)",
-            },
-            ...
-        ]
-    """
-    results = []
-
-    for symbol in symbols:
-        print(f"  - {symbol} 데이터 수집 중...")
-
-        data = fetch_stock_data(symbol, period=period)
-
-        if data.empty:
-            print(f"    ⚠️ {symbol}: 데이터 없음")
-            continue
-
-        drawdown_data = calculate_drawdown_from_peak(data["Close"])
-        buy_signal = get_buy_signal(drawdown_data["drawdown_pct"])
-
-        result = {
-            "symbol": symbol,
-            "peak_price": drawdown_data["peak_price"],
-            "current_price": drawdown_data["current_price"],
-            "drawdown_pct": drawdown_data["drawdown_pct"],
-            "buy_signal": buy_signal,
-        }
-
-        # 200일 이동평균선 분석 (활성화된 종목만)
-        if watchlist.is_ma_enabled(symbol):
-            close_prices = data["Close"]
-            # 200일선 계산용 데이터 결정 (부족하면 1년 데이터 사용)
-            ma_prices = close_prices
-            if len(close_prices) < 200:
-                data_1y = fetch_stock_data(symbol, period="1y")
-                if not data_1y.empty:
-                    ma_prices = data_1y["Close"]
-
-            if len(ma_prices) >= 200:
-                ma_200 = calculate_ma(ma_prices, window=200)
-                result["ma_200"] = calculate_ma_analysis(
-                    result["current_price"], ma_200
-                )
 
-        results.append(result)
 
-        signal_text = f" → {buy_signal}" if buy_signal else " → 관망"
-        print(
-            f"    ✓ {symbol}: {drawdown_data['drawdown_pct']:.1f}% from peak (${drawdown_data['current_price']:.2f}){signal_text}"
-        )
-
-    return results
+async def _print_result(result: dict):
+    """수집이 끝난 종목을 완료 순서대로 출력"""
+    signal_text = f" → {result['buy_signal']}" if result["buy_signal"] else " → 관망"
+    print(
+        f"    ✓ {result['symbol']}: {result['drawdown_pct']:.1f}% from peak "
+        f"(${result['current_price']:.2f}){signal_text}"
+    )
 
 
 async def send_report(notifier: TelegramNotifier, period: str) -> bool:
@@ -115,25 +90,71 @@ async def send_report(notifier: TelegramNotifier, period: str) -> bool:
     print(f"📅 분석 기간: {period_display}")
     print("=" * 50)
 
-    # 1. Fear & Greed Index 수집
-    print("\n[1/3] Fear & Greed Index 수집 중...")
-    fear_greed = get_fear_greed_index()
+    # 1. Fear & Greed Index + 고점 대비 하락률 동시 수집 (봇과 같은 파이프라인)
+    symbols = watchlist.get_all()
+    print(
+        f"\n[1/2] Fear & Greed Index, {period_display} 고점 대비 하락률 수집 중... "
+        f"(종목: {symbols})"
+    )
+    with profiling.span("collect"):
+        fear_greed, stock_results, timed_out = await pipeline.collect_report_data(
+            period, symbols, watchlist.get_ma_symbols(), on_result=_print_result
+        )
+
+    collected = {item["symbol"] for item in stock_results}
+    for symbol in symbols:
+        if symbol in timed_out:
+            stale = " (이전 값 사용)" if symbol in collected else ""
+            print(f"    ⏱️ {symbol}: 시간 초과/오류{stale}")
+        elif symbol not in collected:
+            print(f"    ⚠️ {symbol}: 데이터 없음")
+
+    # 이번 실행 값 기록 (/history, 시간 초과로 이전 값을 쓴 종목 제외)
+    await asyncio.to_thread(history.record, period, stock_results, fear_greed, "cli")
 
     if fear_greed.get("score") is not None:
         print(
-            f"  ✓ Score: {fear_greed.get('score'):.1f} ({fear_greed.get('rating', 'unknown')})"
+            f"  ✓ Fear & Greed: {fear_greed.get('score'):.1f} ({fear_greed.get('rating', 'unknown')})"
         )
     else:
-        print(f"  ⚠️ Error: {fear_greed.get('error', 'Unknown')}")
+        print(f"  ⚠️ Fear & Greed Error: {fear_greed.get('error', 'Unknown')}")
+
+    # 2. 텔레그램 전송 (ALERT_MODE: report / changes / both)
+    print("\n[2/2] 텔레그램 전송 중...")
+    # 신호 변화/목표가는 이번에 새로 수집한 값으로만 판단
+    fresh = pipeline.fresh_results(stock_results)
+    chat_id = str(Config.TELEGRAM_CHAT_ID)
+    changes = signal_state.update(period, fresh, [chat_id])[chat_id]
+    messages = []
+    with profiling.span("render"):
+        if Config.ALERT_MODE in ("report", "both"):
+            messages.extend(
+                render_daily_report(
+                    fear_greed,
+                    stock_results,
+                    period,
+                    Config.REPORT_LAYOUT,
+                    timed_out=timed_out,
+                )
+            )
+        if Config.ALERT_MODE in ("changes", "both"):
+            print(f"  신호 변화: {len(changes)}건")
+            messages.extend(render_change_alerts(changes, period))
+
+    # 목표가 도달 알림 (알림 방식과 관계없이 항상 전송)
+    fired = price_alerts.evaluate(
+        {item["symbol"]: item["current_price"] for item in fresh}, [chat_id]
+    )
+    if fired:
+        print(f"  목표가 도달: {len(fired)}건")
+        messages.extend(render_price_alerts(fired))
 
-    # 2. 고점 대비 하락률 수집
-    symbols = watchlist.get_all()
-    print(f"\n[2/3] {period_display} 고점 대비 하락률 수집 중... (종목: {symbols})")
-    stock_results = collect_stock_data(symbols, period)
+    if not messages:
+        print("  ✓ 신호 변화 없음, 전송 생략")
+        return True
 
-    # 3. 텔레그램 전송
-    print("\n[3/3] 텔레그램 전송 중...")
-    result = await notifier.send_daily_report(fear_greed, stock_results, period)
+    with profiling.span("send"):
+        result = await notifier.send_messages(messages)
 
     if result.get("ok"):
         print(f"  ✓ 전송 완료! (message_id: {result.get('message_id', 'N/A')})")
@@ -143,6 +164,19 @@ async def send_report(notifier: TelegramNotifier, period: str) -> bool:
         return False
 
 
+async def _run_once_async(period: str) -> bool:
+    """notifier 하나를 열어 리포트를 전송하고 HTTP 연결을 정리합니다."""
+    try:
+        async with TelegramNotifier(
+            token=Config.TELEGRAM_BOT_TOKEN,
+            chat_id=Config.TELEGRAM_CHAT_ID,
+        ) as notifier:
+            return await send_report(notifier, period)
+    except TelegramError as e:
+        print(f"  ❌ 텔레그램 연결 실패: {e}")
+        return False
+
+
 def run_once(period: str) -> int:
     """단일 실행 모드 - crontab용"""
     print(f"\n🚀 Stock Alert Bot 시작 - {datetime.now()}")
@@ -154,12 +188,10 @@ def run_once(period: str) -> int:
     print(f"📊 관심 종목: {', '.join(watchlist.get_all())}")
     print(f"📅 분석 기간: {Config.get_period_display(period)}")
 
-    notifier = TelegramNotifier(
-        token=Config.TELEGRAM_BOT_TOKEN,
-        chat_id=Config.TELEGRAM_CHAT_ID,
-    )
-
-    success = asyncio.run(send_report(notifier, period))
+    try:
+        success = asyncio.run(_run_once_async(period))
+    finally:
+        analytics.shutdown()
 
     print("\n" + "=" * 50)
     if success:
@@ -170,27 +202,119 @@ def run_once(period: str) -> int:
         return 1
 
 
-def run_bot():
-    """봇 모드 - 스케줄러 + 명령어 대기"""
-    from src.notifiers.telegram import run_telegram_bot
+def run_bot(webhook: bool = False):
+    """봇 모드 - 스케줄러 + 명령어 대기
 
-    print(f"\n🤖 Stock Alert Bot (Bot Mode) 시작 - {datetime.now()}")
+    Args:
+        webhook: True면 polling 대신 웹훅으로 업데이트 수신
+    """
+    from src.notifiers.telegram import run_telegram_bot, run_telegram_webhook
 
-    if not Config.validate():
+    mode = "Webhook Mode" if webhook else "Bot Mode"
+    print(f"\n🤖 Stock Alert Bot ({mode}) 시작 - {datetime.now()}")
+
+    if not Config.validate() or (webhook and not Config.validate_webhook()):
         print("❌ 설정 오류! .env 파일을 확인하세요.")
         return 1
 
-    print(f"📊 관심 종목: {', '.join(watchlist.get_all())}")
+    print(
+        f"📊 관심 종목: {', '.join(watchlist.get_union_symbols())} "
+        f"(채팅방 {len(watchlist.get_chat_ids())}개)"
+    )
     print("📡 텔레그램 명령어 대기 중... (Ctrl+C로 종료)")
 
     try:
-        run_telegram_bot()
+        if webhook:
+            run_telegram_webhook()
+        else:
+            run_telegram_bot()
         return 0
     except KeyboardInterrupt:
         print("\n👋 봇 종료")
         return 0
 
 
+def run_daemon():
+    """데몬 모드 - 내장 스케줄러로 리포트만 전송 (텔레그램 명령어 수신 없음)"""
+    from src.notifiers.telegram import run_report_daemon
+
+    print(f"\n⏰ Stock Alert Bot (Daemon Mode) 시작 - {datetime.now()}")
+
+    if not Config.validate():
+        print("❌ 설정 오류! .env 파일을 확인하세요.")
+        return 1
+
+    try:
+        run_report_daemon()
+        return 0
+    except KeyboardInterrupt:
+        print("\n👋 데몬 종료")
+        return 0
+
+
+def run_watch():
+    """장중 감시 모드 - 정규장 동안 현재가를 감시해 매수 단계 변화 알림
+
+    고점 기간은 --period가 아니라 채팅방별 분석 기간(/period)을 사용합니다.
+    """
+    from src.watch import run_price_watch
+
+    print(f"\n👀 Stock Alert Bot (Watch Mode) 시작 - {datetime.now()}")
+
+    if not Config.validate():
+        print("❌ 설정 오류! .env 파일을 확인하세요.")
+        return 1
+
+    print(f"📊 감시 종목: {', '.join(watchlist.get_union_symbols())}")
+    for period, chat_ids in watchlist.get_chats_by_period().items():
+        print(
+            f"📅 분석 기간: {Config.get_period_display(period)} (채팅방 {len(chat_ids)}개)"
+        )
+
+    try:
+        run_price_watch()
+        return 0
+    except KeyboardInterrupt:
+        print("\n👋 감시 종료")
+        return 0
+
+
+def run_screen(period: str, path: str | None, threshold: float) -> int:
+    """스크리닝 모드 - 유니버스에서 하락률 기준 이하 종목을 순위대로 출력"""
+    print(f"\n🔎 Stock Alert Bot (Screen) 시작 - {datetime.now()}")
+    try:
+        symbols = screener.load_universe(path)
+    except FileNotFoundError:
+        print(f"❌ 유니버스 파일이 없습니다: {path or screener.universe_file()}")
+        return 1
+
+    print(f"📊 유니버스: {len(symbols)}개 종목")
+    print(f"📅 분석 기간: {Config.get_period_display(period)}")
+    print(f"📉 기준: 고점 대비 {threshold:.1f}% 이하")
+
+    async def on_progress(done: int, total: int, results: list[dict]):
+        matches = screener.rank(results, threshold)
+        print(f"  [{done}/{total}] 조회 {len(results)}개, 조건 충족 {len(matches)}개")
+
+    screen = asyncio.run(screener.screen(symbols, period, on_progress))
+    matches = screener.rank(screen["results"], threshold)
+
+    print(f"\n{len(matches)}개 종목 (하락률 순)")
+    print(COMPACT_TABLE_HEADER)
+    for item in matches:
+        ma = item.get("ma_200")
+        ma_text = f"{ma['diff_pct']:+.1f}%" if ma else "-"
+        print(
+            f"{item['symbol']:<9}{item['drawdown_pct']:>7.1f}%"
+            f"{item['current_price']:>10.2f}{item['peak_price']:>10.2f}{ma_text:>8}"
+        )
+    if screen["missing"]:
+        print(
+            f"\n⚠️ 데이터 없음 {len(screen['missing'])}개: {', '.join(screen['missing'])}"
+        )
+    return 0
+
+
 def parse_args():
     """CLI 인자 파싱"""
     parser = argparse.ArgumentParser(
@@ -202,6 +326,11 @@ def parse_args():
   python main.py --period 6mo     # 6개월 기간으로 분석
   python main.py --period 3mo     # 3개월 기간으로 분석
   python main.py --bot            # 텔레그램 봇 모드
+  python main.py --webhook        # 텔레그램 봇 모드 (웹훅 수신)
+  python main.py --daemon         # 스케줄 리포트만 전송 (명령어 수신 없음)
+  python main.py --watch          # 장중 감시 (매수 단계 변화 즉시 알림)
+  python main.py --screen         # 유니버스 스크리닝 (data/universe.txt)
+  python main.py --profile        # 단계별 소요 시간 출력
 
 유효한 기간: 1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, max
         """,
@@ -222,18 +351,75 @@ def parse_args():
         help="텔레그램 봇 모드로 실행 (명령어 수신 대기)",
     )
 
-    return parser.parse_args()
+    parser.add_argument(
+        "--webhook",
+        "-w",
+        action="store_true",
+        help="텔레그램 봇 모드를 웹훅으로 실행 (WEBHOOK_URL, WEBHOOK_SECRET 필요)",
+    )
 
+    parser.add_argument(
+        "--daemon",
+        "-d",
+        action="store_true",
+        help="스케줄 리포트만 전송하는 데몬으로 실행 (명령어 수신 없음)",
+    )
 
-def main():
-    """메인 함수"""
-    args = parse_args()
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="정규장 동안 현재가를 감시해 매수 단계 기준선을 넘으면 바로 알림",
+    )
 
+    parser.add_argument(
+        "--screen",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="FILE",
+        help="유니버스 파일의 종목 중 하락률 기준 이하 종목 출력 (기본: data/universe.txt)",
+    )
+
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=None,
+        help="스크리닝 기준 하락률 (%%, 예: -20). 미지정시 SCREEN_THRESHOLD",
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="단계별/종목별 소요 시간을 측정해 종료 시 출력",
+    )
+
+    parser.add_argument(
+        "--profile-output",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="cProfile 통계를 파일로 저장 (--profile 포함)",
+    )
+
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="tracemalloc으로 메모리 할당 상위 위치 출력 (--profile 포함)",
+    )
+
+    return parser.parse_args()
+
+
+def run_mode(args) -> int:
+    """CLI 인자에 맞는 실행 모드 실행"""
     # 봇 모드
-    if args.bot:
-        return run_bot()
+    if args.bot or args.webhook:
+        return run_bot(webhook=args.webhook)
+
+    # 데몬 모드
+    if args.daemon:
+        return run_daemon()
 
-    # 단일 실행 모드
     # 우선순위: CLI 인자 > 환경변수 > 기본값(1y)
     period = args.period or Config.ANALYSIS_PERIOD
 
@@ -243,9 +429,67 @@ def main():
         print(f"   유효한 기간: {', '.join(Config.VALID_PERIODS)}")
         return 1
 
+    # 장중 감시 모드
+    if args.watch:
+        return run_watch()
+
+    # 스크리닝 모드
+    if args.screen is not None:
+        threshold = args.threshold
+        if threshold is None:
+            threshold = Config.SCREEN_THRESHOLD
+        return run_screen(period, args.screen or None, -abs(threshold))
+
+    # 단일 실행 모드
     return run_once(period)
 
 
+def run_profiled(args) -> int:
+    """--profile: 단계별 소요 시간을 기록하며 실행하고 종료 시 요약 출력
+
+    --profile-output을 주면 cProfile 통계를 파일로 저장하고
+    (snakeviz, python -m pstats 등으로 확인), --profile-memory를 주면
+    메모리를 가장 많이 할당한 위치를 출력합니다.
+    """
+    import cProfile
+    import tracemalloc
+
+    profiling.enable()
+    profiler = cProfile.Profile() if args.profile_output else None
+    if args.profile_memory:
+        tracemalloc.start()
+    if profiler is not None:
+        profiler.enable()
+
+    try:
+        return run_mode(args)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile_output)
+            print(f"\n📁 cProfile 결과 저장: {args.profile_output}")
+
+        print("\n" + profiling.format_summary())
+
+        if args.profile_memory:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(
+                f"🧠 메모리: 현재 {current / 1024**2:.1f}MB, 최대 {peak / 1024**2:.1f}MB"
+            )
+            for stat in snapshot.statistics("lineno")[:10]:
+                print(f"  {stat}")
+
+
+def main():
+    """메인 함수"""
+    args = parse_args()
+    if args.profile or args.profile_output or args.profile_memory:
+        return run_profiled(args)
+    return run_mode(args)
+
+
 if __name__ == "__main__":
     exit_code = main()
     sys.exit(exit_code)
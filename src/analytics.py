@@ -0,0 +1,308 @@
+"""분석 계산 작업자 풀
+
+종목 데이터를 받은 뒤의 계산(고점 대비 하락률, 200일선)을 이벤트 루프 밖에서 실행합니다.
+max 기간처럼 긴 데이터나 종목이 많을 때 계산이 루프를 붙잡아 다른 명령어 응답이 늦어지지 않도록,
+이벤트 루프는 I/O와 메시지 만들기만 담당합니다.
+
+동작 방식:
+    - 종목별 요청을 짧은 시간(ANALYTICS_BATCH_DELAY) 동안 모아 한 번에 작업자에게 보냄
+    - ANALYTICS_WORKERS가 0(기본값)이면 프로세스 없이 스레드에서 계산
+      (버퍼로 모으지 않고 받은 배열을 복사 없이 그대로 계산)
+    - 작업자 프로세스를 쓰면 배치마다 종가 배열을 공유 메모리 하나에 한 번 복사해 넣고,
+      작업자는 그 버퍼를 복사 없이 읽음 (pickle로 배열을 주고받지 않음)
+    - 작업자는 종목마다 (최고가, 현재가, 하락률, 200일선) 튜플만 돌려줌
+    - 작업자 프로세스가 죽으면(OOM 등) 풀을 버리고 그 배치는 스레드에서 계산,
+      다음 배치에서 풀을 새로 만듦
+
+사용 예:
+    record = await analytics.analyze(closes, ma_closes)
+    record["drawdown_pct"], record["ma_200"]
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from src.config import Config
+from src.stock.ma import calculate_ma
+from src.stock.mdd import calculate_drawdown_from_peak
+
+# 200일선 계산 기간
+MA_WINDOW = 200
+
+# ANALYTICS_WORKERS 자동(-1)일 때 최대 작업자 수
+MAX_AUTO_WORKERS = 4
+
+# 배열 위치: (종가 시작, 종가 길이, 200일선용 시작, 200일선용 길이). 200일선 없으면 길이 0
+Slot = tuple[int, int, int, int]
+
+# 작업자가 돌려주는 종목별 결과: (최고가, 현재가, 하락률, 200일선 또는 None)
+Record = tuple[float, float, float, float | None]
+
+
+def analyze_arrays(closes: np.ndarray, ma_closes: np.ndarray | None = None) -> Record:
+    """종가 배열로 하락률/200일선 계산
+
+    배열을 복사하지 않고 그대로 읽으므로 공유 메모리나 memmap(price_archive)도 그대로 넘길 수 있습니다.
+    """
+    drawdown = calculate_drawdown_from_peak(pd.Series(closes, copy=False))
+    ma_200 = None
+    if ma_closes is not None:
+        ma_200 = calculate_ma(pd.Series(ma_closes, copy=False), MA_WINDOW)
+    return (
+        drawdown["peak_price"],
+        drawdown["current_price"],
+        drawdown["drawdown_pct"],
+        ma_200,
+    )
+
+
+def _analyze_slot(buffer: np.ndarray, slot: Slot) -> Record:
+    """버퍼의 한 종목 구간으로 하락률/200일선 계산 (배열은 복사하지 않음)"""
+    start, length, ma_start, ma_length = slot
+    ma_closes = buffer[ma_start : ma_start + ma_length] if ma_length else None
+    return analyze_arrays(buffer[start : start + length], ma_closes)
+
+
+def analyze_buffer(buffer: np.ndarray, slots: list[Slot]) -> list[Record]:
+    """버퍼 하나에 담긴 여러 종목 계산"""
+    return [_analyze_slot(buffer, slot) for slot in slots]
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """작업자에서 공유 메모리 열기 (정리는 만든 쪽에서 하므로 추적하지 않음)"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python 3.12에는 track 인자가 없음
+        return shared_memory.SharedMemory(name=name)
+
+
+def _analyze_shared(name: str, size: int, slots: list[Slot]) -> list[Record]:
+    """작업자 프로세스 진입점: 공유 메모리의 배치를 계산"""
+    shm = _attach(name)
+    try:
+        buffer = np.ndarray((size,), dtype=np.float64, buffer=shm.buf)
+        records = analyze_buffer(buffer, slots)
+        # 버퍼를 참조하는 배열이 남아 있으면 close할 수 없음
+        del buffer
+        return records
+    finally:
+        shm.close()
+
+
+def _pack(
+    items: list[tuple[np.ndarray, np.ndarray | None]],
+) -> tuple[int, list[Slot]]:
+    """(종가, 200일선용 종가) 목록을 이어 붙일 때의 전체 길이와 종목별 위치"""
+    slots = []
+    offset = 0
+    for closes, ma_closes in items:
+        start, length = offset, len(closes)
+        offset += length
+        if ma_closes is None:
+            ma_start, ma_length = 0, 0
+        elif ma_closes is closes:
+            # 같은 배열이면 한 번만 복사
+            ma_start, ma_length = start, length
+        else:
+            ma_start, ma_length = offset, len(ma_closes)
+            offset += ma_length
+        slots.append((start, length, ma_start, ma_length))
+    return offset, slots
+
+
+def _fill(
+    buffer: np.ndarray,
+    items: list[tuple[np.ndarray, np.ndarray | None]],
+    slots: list[Slot],
+):
+    """위치 목록대로 배열 값을 버퍼에 복사"""
+    for (closes, ma_closes), (start, length, ma_start, ma_length) in zip(items, slots):
+        buffer[start : start + length] = closes
+        if ma_length and ma_start != start:
+            buffer[ma_start : ma_start + ma_length] = ma_closes
+
+
+class AnalyticsPool:
+    """종목별 계산 요청을 배치로 모아 작업자 프로세스에서 실행하는 풀"""
+
+    def __init__(
+        self, workers: int = 0, batch_size: int = 32, batch_delay: float = 0.001
+    ):
+        """
+        Args:
+            workers: 작업자 프로세스 수 (0이면 프로세스 없이 스레드에서 계산)
+            batch_size: 이 수만큼 모이면 기다리지 않고 바로 보냄
+            batch_delay: 첫 요청 후 다른 요청을 기다리는 시간 (초)
+        """
+        self.workers = workers
+        self.batch_size = max(1, batch_size)
+        self.batch_delay = batch_delay
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending: list[tuple[np.ndarray, np.ndarray | None, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.batches = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # 스레드가 있는 프로세스를 fork하면 잠금 상태가 복사될 수 있어 spawn 사용
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def analyze(
+        self, closes: np.ndarray, ma_closes: np.ndarray | None = None
+    ) -> dict:
+        """종목 1개 계산 (같은 시기의 다른 요청과 묶어서 실행)
+
+        Args:
+            closes: 하락률 계산용 종가 배열
+            ma_closes: 200일선 계산용 종가 배열 (없으면 200일선 생략)
+
+        Returns:
+            {"peak_price", "current_price", "drawdown_pct", "ma_200"}
+            ma_200은 데이터가 부족하거나 요청하지 않았으면 None
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((closes, ma_closes, future))
+
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_delay, self._flush)
+
+        peak_price, current_price, drawdown_pct, ma_200 = await future
+        return {
+            "peak_price": peak_price,
+            "current_price": current_price,
+            "drawdown_pct": drawdown_pct,
+            "ma_200": ma_200,
+        }
+
+    def _flush(self):
+        """모인 요청을 배치 하나로 실행"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(
+        self, batch: list[tuple[np.ndarray, np.ndarray | None, asyncio.Future]]
+    ):
+        items = [(closes, ma_closes) for closes, ma_closes, _ in batch]
+        self.batches += 1
+        try:
+            if self.workers > 0:
+                try:
+                    records = await self._run_in_process(items)
+                except BrokenProcessPool:
+                    print("⚠️ 분석 작업자 프로세스 종료: 이번 배치는 스레드에서 계산")
+                    records = await asyncio.to_thread(self._run_in_thread, items)
+            else:
+                records = await asyncio.to_thread(self._run_in_thread, items)
+        except Exception as e:  # noqa: BLE001 - 배치의 호출한 쪽 future로 그대로 전달
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), record in zip(batch, records):
+            if not future.done():
+                future.set_result(record)
+
+    @staticmethod
+    def _run_in_thread(
+        items: list[tuple[np.ndarray, np.ndarray | None]],
+    ) -> list[Record]:
+        # 같은 프로세스이므로 버퍼로 모으지 않고 원래 배열(memmap 포함)을 그대로 계산
+        return [analyze_arrays(closes, ma_closes) for closes, ma_closes in items]
+
+    async def _run_in_process(
+        self, items: list[tuple[np.ndarray, np.ndarray | None]]
+    ) -> list[Record]:
+        size, slots = _pack(items)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, size * 8))
+        try:
+            buffer = np.ndarray((size,), dtype=np.float64, buffer=shm.buf)
+            _fill(buffer, items, slots)
+            del buffer
+            executor = self._get_executor()
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(
+                    executor, _analyze_shared, shm.name, size, slots
+                )
+            except BrokenProcessPool:
+                # 망가진 풀은 다시 쓸 수 없으므로 버리고 다음 배치에서 새로 만듦
+                # (동시에 실패한 다른 배치가 이미 새 풀을 만들었으면 그대로 둠)
+                if self._executor is executor:
+                    self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def shutdown(self):
+        """작업자 프로세스 종료"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+# CLI/봇이 함께 쓰는 기본 풀 (처음 쓸 때 생성)
+_pool: AnalyticsPool | None = None
+
+
+def resolve_workers(workers: int) -> int:
+    """작업자 수 결정 (음수면 이벤트 루프용 코어 1개를 남기고 CPU 수에 맞춤)
+
+    프로세스 풀은 배치마다 공유 메모리 복사와 spawn 비용이 있어 기본값은 0(스레드)이고,
+    ANALYTICS_WORKERS로 직접 켤 때만 사용
+
+    코어가 1개뿐이면 프로세스를 나눠도 빨라지지 않고 전환 비용만 늘어서 0(스레드)
+    """
+    if workers >= 0:
+        return workers
+    return min(MAX_AUTO_WORKERS, max(0, (os.cpu_count() or 1) - 1))
+
+
+def get_pool() -> AnalyticsPool:
+    """설정값으로 만든 기본 풀 반환"""
+    global _pool
+    if _pool is None:
+        _pool = AnalyticsPool(
+            workers=resolve_workers(Config.ANALYTICS_WORKERS),
+            batch_size=Config.ANALYTICS_BATCH_SIZE,
+            batch_delay=Config.ANALYTICS_BATCH_DELAY,
+        )
+    return _pool
+
+
+async def analyze(closes: np.ndarray, ma_closes: np.ndarray | None = None) -> dict:
+    """기본 풀로 종목 1개 계산 (AnalyticsPool.analyze 참고)"""
+    return await get_pool().analyze(closes, ma_closes)
+
+
+def shutdown():
+    """기본 풀의 작업자 프로세스 종료 (봇/CLI 종료 시)"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
@@ -0,0 +1,261 @@
+"""캐시 모듈
+
+리포트 요청이 몰릴 때 같은 데이터를 다시 수집/포맷팅하지 않도록 완성된 메시지를 저장합니다.
+
+캐시 키:
+    (분석 기간, watchlist 버전, 데이터 기준 시점)
+
+데이터 기준 시점(as-of):
+    - 장 마감 후/주말/휴장일/장 시작 전: 마지막 정규장 마감일 → 다음 정규장 마감까지 같은 값
+    - 정규장 중: REPORT_CACHE_TTL 초 단위 구간 → 실시간 가격 변화를 주기적으로 반영
+    거래소별 캘린더(market_calendar)로 계산합니다. 앞부분은 항상 NYSE이고,
+    종목에 다른 거래소가 있으면 ";KRX=close:2025-01-13"처럼 거래소별 값을 덧붙입니다.
+    (종목별 결과는 자기 거래소 값이 같으면 다시 조회하지 않음)
+
+watchlist가 바뀌면 버전이, 새 일봉이 생기면 기준 시점이 바뀌므로
+이전 키는 더 이상 조회되지 않고 자연스럽게 무효화됩니다.
+
+PrewarmCache는 스케줄 리포트 직전에 미리 수집한 종목 데이터를 알림 시각까지 보관합니다.
+"""
+
+import asyncio
+import datetime
+from collections import OrderedDict
+
+from src import market_calendar
+from src.config import Config
+from src.market_calendar import MARKET_TZ, NYSE, Exchange
+
+
+def exchange_as_of(
+    exchange: Exchange,
+    now: datetime.datetime | None = None,
+    intraday_ttl: int | None = None,
+) -> str:
+    """거래소 하나의 데이터 기준 시점
+
+    Returns:
+        "close:2025-01-10" (마지막 마감일) 또는 "intraday:1736521200" (장중 구간 시작 timestamp)
+    """
+    if now is None:
+        now = datetime.datetime.now(tz=MARKET_TZ)
+
+    if market_calendar.is_open(now, exchange):
+        ttl = max(1, intraday_ttl or Config.REPORT_CACHE_TTL)
+        bucket = int(now.timestamp()) // ttl * ttl
+        return f"intraday:{bucket}"
+
+    return f"close:{market_calendar.last_close(now, exchange).isoformat()}"
+
+
+def data_as_of(
+    now: datetime.datetime | None = None,
+    intraday_ttl: int | None = None,
+    symbols: list[str] | None = None,
+) -> str:
+    """현재 시점에 받을 수 있는 주가 데이터의 기준 시점
+
+    휴장일/조기 폐장은 market_calendar 기준으로 판단합니다.
+
+    Args:
+        now: 기준 시각 (없으면 현재 시각, timezone 포함)
+        intraday_ttl: 정규장 중 캐시 유지 시간 (초, 없으면 REPORT_CACHE_TTL)
+        symbols: 대상 종목 (NYSE 외 거래소 종목이 있으면 그 거래소 값을 덧붙임)
+
+    Returns:
+        "close:2025-01-10", "intraday:1736521200" 또는
+        "close:2025-01-10;KRX=intraday:1736725800" (KRX 종목 포함)
+    """
+    as_of = exchange_as_of(NYSE, now, intraday_ttl)
+    exchanges = {market_calendar.exchange_for(symbol) for symbol in symbols or []}
+    for exchange in sorted(exchanges - {NYSE}, key=lambda e: e.name):
+        as_of += f";{exchange.name}={exchange_as_of(exchange, now, intraday_ttl)}"
+    return as_of
+
+
+def split_as_of(as_of: str) -> dict[str, str]:
+    """data_as_of 값을 거래소별로 나눔 ("close:A;KRX=close:B" → {"NYSE": ..., "KRX": ...})"""
+    first, *rest = as_of.split(";")
+    parts = {NYSE.name: first}
+    for part in rest:
+        name, _, value = part.partition("=")
+        parts[name] = value
+    return parts
+
+
+def same_session(a: str, b: str) -> bool:
+    """두 기준 시점의 데이터가 같은 장 구간인지
+
+    거래소별로 값이 같거나, 둘 다 같은 정규장 중(장중 TTL 구간만 다름)이면 True.
+    사이에 장이 열리거나 닫혔으면(마감 ↔ 장중, 마감일 변경) False.
+    """
+    a_parts, b_parts = split_as_of(a), split_as_of(b)
+    if a_parts.keys() != b_parts.keys():
+        return False
+    for name, value in a_parts.items():
+        other = b_parts[name]
+        if value == other:
+            continue
+        if not (value.startswith("intraday:") and other.startswith("intraday:")):
+            return False
+    return True
+
+
+def symbol_as_of(as_of: str, symbol: str) -> str | None:
+    """data_as_of 값에서 종목 거래소의 기준 시점 (그 거래소 값이 없으면 None)"""
+    return split_as_of(as_of).get(market_calendar.exchange_for(symbol).name)
+
+
+def is_current(as_of: str, now: datetime.datetime | None = None) -> bool:
+    """예전에 계산한 기준 시점이 지금도 같은지 (거래소별로 다시 계산해 비교)"""
+    for name, value in split_as_of(as_of).items():
+        exchange = market_calendar.EXCHANGES.get(name)
+        if exchange is None or exchange_as_of(exchange, now) != value:
+            return False
+    return True
+
+
+def _superseded(old: str, new: str) -> bool:
+    """두 기준 시점에 함께 있는 거래소 중 값이 바뀐 곳이 있는지"""
+    old_parts, new_parts = split_as_of(old), split_as_of(new)
+    return any(
+        old_parts[name] != new_parts[name] for name in old_parts.keys() & new_parts
+    )
+
+
+class ReportCache:
+    """완성된 리포트 메시지(페이지 리스트) 캐시 (LRU)"""
+
+    def __init__(self, max_entries: int = 64):
+        """
+        Args:
+            max_entries: 최대 저장 개수 (넘으면 가장 오래 안 쓴 항목부터 삭제)
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, list[str]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        period: str, watchlist_version: str, as_of: str, layout: str = "full"
+    ) -> tuple:
+        """캐시 키 생성 (기준 시점은 항상 마지막 요소)"""
+        return (period, layout, watchlist_version, as_of)
+
+    def get(self, key: tuple) -> list[str] | None:
+        """캐시된 메시지 페이지 반환 (없으면 None)"""
+        message = self._entries.get(key)
+        if message is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return message
+
+    def put(self, key: tuple, message: list[str]):
+        """메시지 저장 (기준 시점이 지난 항목은 함께 정리)
+
+        거래소 구성이 다른 리포트(KRX 종목 유무)는 함께 있는 거래소 값이 같으면 남겨 둡니다.
+        """
+        as_of = key[-1]
+        for old_key in [k for k in self._entries if _superseded(k[-1], as_of)]:
+            del self._entries[old_key]
+
+        self._entries[key] = message
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """전체 삭제"""
+        self._entries.clear()
+
+    def items(self) -> list[tuple[tuple, list[str]]]:
+        """저장된 (키, 메시지) 목록 (오래 안 쓴 것부터, snapshot 저장용)"""
+        return list(self._entries.items())
+
+    def stats(self) -> dict:
+        """캐시 통계 (entries, hits, misses, hit_ratio)"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+
+class PrewarmCache:
+    """스케줄 리포트용으로 미리 수집한 데이터 (알림 시각 + 분석 기간별)
+
+    알림 시각보다 PREWARM_LEAD_SECONDS 먼저 수집/분석해 두고,
+    알림 시각에는 꺼내서 렌더링/전송만 합니다. 꺼낸 데이터는 삭제됩니다.
+    """
+
+    def __init__(self):
+        self._entries: dict[tuple[str, str], dict] = {}
+        self._pending: dict[str, asyncio.Event] = {}
+
+    def begin(self, alert_time: str):
+        """사전 수집 시작 표시"""
+        self._pending[alert_time] = asyncio.Event()
+
+    def finish(self, alert_time: str):
+        """사전 수집 종료 표시 (기다리던 전송 작업을 깨움)"""
+        event = self._pending.pop(alert_time, None)
+        if event is not None:
+            event.set()
+
+    async def wait(self, alert_time: str):
+        """진행 중인 사전 수집이 있으면 끝날 때까지 대기 (같은 데이터를 두 번 수집하지 않도록)"""
+        event = self._pending.get(alert_time)
+        if event is not None:
+            await event.wait()
+
+    def put(
+        self,
+        alert_time: str,
+        period: str,
+        as_of: str,
+        symbols: list[str],
+        ma_symbols: list[str],
+        fear_greed: dict,
+        stock_results: list[dict],
+    ):
+        """미리 수집한 데이터 저장 (as_of는 알림 시각 기준)"""
+        self._entries[(alert_time, period)] = {
+            "as_of": as_of,
+            "symbols": set(symbols),
+            "ma_symbols": set(ma_symbols),
+            "fear_greed": fear_greed,
+            "stock_results": stock_results,
+        }
+
+    def take(
+        self,
+        alert_time: str,
+        period: str,
+        as_of: str,
+        symbols: list[str],
+        ma_symbols: list[str],
+    ) -> tuple[dict, list[dict]] | None:
+        """저장된 데이터를 꺼냄
+
+        기준 시점이 같고, 현재 필요한 종목/MA 종목을 모두 포함할 때만 반환합니다.
+        (사전 수집 이후 /add 등으로 종목이 늘었으면 None → 다시 수집)
+
+        Returns:
+            (Fear & Greed, 종목 결과 리스트) 또는 None
+        """
+        entry = self._entries.pop((alert_time, period), None)
+        if entry is None or entry["as_of"] != as_of:
+            return None
+        if not set(symbols) <= entry["symbols"]:
+            return None
+        if not set(ma_symbols) <= entry["ma_symbols"]:
+            return None
+        return entry["fear_greed"], entry["stock_results"]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -13,6 +13,9 @@ class Config:
     # 텔레그램 설정
     TELEGRAM_BOT_TOKEN: str = os.getenv("TELEGRAM_BOT_TOKEN", "")
     TELEGRAM_CHAT_ID: str = os.getenv("TELEGRAM_CHAT_ID", "")
+    # 봇을 사용할 수 있는 채팅방 ID (쉼표 구분, TELEGRAM_CHAT_ID는 항상 포함)
+    # 그 외 채팅방의 명령어는 무시하고 watchlist에도 등록하지 않음
+    ALLOWED_CHAT_IDS: str = os.getenv("ALLOWED_CHAT_IDS", "")
 
     # 관심 종목 (초기화용 기본값, 실제 종목은 watchlist.py에서 관리)
     DEFAULT_SYMBOLS: str = os.getenv("DEFAULT_SYMBOLS", "TSLA,SCHD,SCHG")
@@ -24,8 +27,113 @@ class Config:
     # 분석 기간 (yfinance 형식: 1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, max)
     ANALYSIS_PERIOD: str = os.getenv("ANALYSIS_PERIOD", "1y")
 
+    # 종목 데이터 동시 조회 수 (CLI/봇 공통, 0이면 제한 없음)
+    FETCH_CONCURRENCY: int = int(os.getenv("FETCH_CONCURRENCY", "8"))
+    # 긴 기간(5y, max) 동시 조회 수 (데이터가 커서 메모리를 덜 쓰도록 더 작게, 0이면 FETCH_CONCURRENCY)
+    LONG_PERIOD_CONCURRENCY: int = int(os.getenv("LONG_PERIOD_CONCURRENCY", "2"))
+    # 종목별 전체 종가를 data/archive에 보관하고 최근 일봉만 받아 추가 (numpy.memmap)
+    PRICE_ARCHIVE: bool = os.getenv("PRICE_ARCHIVE", "false").lower() == "true"
+    # 리포트 1회 수집 제한 시간 (초, 넘으면 끝난 종목만으로 리포트, 0이면 제한 없음)
+    COLLECT_DEADLINE: float = float(os.getenv("COLLECT_DEADLINE", "60"))
+    # 종목 1개 조회 제한 시간 (초, yfinance 요청 timeout으로도 사용, 0이면 제한 없음)
+    SYMBOL_TIMEOUT: float = float(os.getenv("SYMBOL_TIMEOUT", "20"))
+    # 시간 초과 종목을 마지막으로 수집한 값으로 채울지 (리포트에 ⏱️ 표시)
+    STALE_FALLBACK: bool = os.getenv("STALE_FALLBACK", "true").lower() == "true"
+
+    # 하락률/200일선 계산 작업자 프로세스 수
+    # (0이면 프로세스 없이 스레드에서 계산, -1이면 CPU 수에 맞춤: 코어가 1개면 스레드)
+    ANALYTICS_WORKERS: int = int(os.getenv("ANALYTICS_WORKERS", "0"))
+    # 계산 요청을 묶는 최대 종목 수와 묶기 위해 기다리는 시간 (초)
+    ANALYTICS_BATCH_SIZE: int = int(os.getenv("ANALYTICS_BATCH_SIZE", "32"))
+    ANALYTICS_BATCH_DELAY: float = float(os.getenv("ANALYTICS_BATCH_DELAY", "0.001"))
+
+    # 유니버스 스크리너 (/screen, --screen)
+    # 유니버스 파일 경로 (비어 있으면 data/universe.txt)
+    SCREEN_UNIVERSE: str = os.getenv("SCREEN_UNIVERSE", "")
+    # 기본 기준 하락률 (%), 메시지에 표시할 최대 종목 수
+    SCREEN_THRESHOLD: float = float(os.getenv("SCREEN_THRESHOLD", "-20"))
+    SCREEN_TOP: int = int(os.getenv("SCREEN_TOP", "50"))
+    # 한 번에 요청할 종목 수, 동시에 보낼 묶음 요청 수, 초당 시작할 묶음 요청 수
+    SCREEN_CHUNK_SIZE: int = int(os.getenv("SCREEN_CHUNK_SIZE", "50"))
+    SCREEN_CONCURRENCY: int = int(os.getenv("SCREEN_CONCURRENCY", "2"))
+    SCREEN_RATE: float = float(os.getenv("SCREEN_RATE", "1"))
+
+    # 리포트 캐시: 정규장 중 같은 리포트를 재사용하는 시간 (초)
+    REPORT_CACHE_TTL: int = int(os.getenv("REPORT_CACHE_TTL", "300"))
+
+    # 알림 방식: report(매번 전체 리포트), changes(매수 단계/200일선 위치가 바뀔 때만 짧은 알림), both
+    ALERT_MODE: str = os.getenv("ALERT_MODE", "report")
+    # 상태 변화 판단 여유 폭: 기준선 근처에서 알림이 오락가락하지 않도록
+    SIGNAL_HYSTERESIS_PCT: float = float(os.getenv("SIGNAL_HYSTERESIS_PCT", "1.0"))
+    MA_HYSTERESIS_PCT: float = float(os.getenv("MA_HYSTERESIS_PCT", "0.5"))
+
+    # 리포트 기록 저장 (/history): 리포트마다 계산 값을 SQLite에 추가
+    HISTORY_ENABLED: bool = os.getenv("HISTORY_ENABLED", "true").lower() == "true"
+    # 저장소 파일 경로 (비어 있으면 data/history.db)
+    HISTORY_DB: str = os.getenv("HISTORY_DB", "")
+
+    # 캐시 snapshot: 종료 시와 SNAPSHOT_INTERVAL초마다 저장하고, 재시작 시 유효한 것만 복원
+    SNAPSHOT_ENABLED: bool = os.getenv("SNAPSHOT_ENABLED", "true").lower() == "true"
+    SNAPSHOT_INTERVAL: float = float(os.getenv("SNAPSHOT_INTERVAL", "300"))
+    # 저장한 지 이 시간(초)이 지난 snapshot은 복원하지 않음
+    SNAPSHOT_MAX_AGE: float = float(os.getenv("SNAPSHOT_MAX_AGE", "86400"))
+
+    # 스케줄 리포트 사전 수집: 알림 시간보다 몇 초 먼저 데이터를 수집할지 (0이면 끔)
+    PREWARM_LEAD_SECONDS: int = int(os.getenv("PREWARM_LEAD_SECONDS", "120"))
+
+    # 장중 감시 (--watch): 현재가 조회 간격 범위 (초, 변동성에 따라 자동 조절)
+    WATCH_MIN_INTERVAL: float = float(os.getenv("WATCH_MIN_INTERVAL", "5"))
+    WATCH_MAX_INTERVAL: float = float(os.getenv("WATCH_MAX_INTERVAL", "60"))
+
+    # 리포트 레이아웃: full(종목별 상세), compact(한 줄 표), auto(종목 수에 따라 선택)
+    REPORT_LAYOUT: str = os.getenv("REPORT_LAYOUT", "auto")
+    # auto 레이아웃에서 compact로 바꾸는 종목 수 기준
+    REPORT_COMPACT_THRESHOLD: int = int(os.getenv("REPORT_COMPACT_THRESHOLD", "30"))
+
+    # /report 진행 상황 표시: 완료된 종목부터 임시 메시지에 표시
+    REPORT_STREAMING: bool = os.getenv("REPORT_STREAMING", "true").lower() == "true"
+    # 임시 메시지 최소 수정 간격 (초, 텔레그램 수정 한도 고려)
+    REPORT_PROGRESS_INTERVAL: float = float(
+        os.getenv("REPORT_PROGRESS_INTERVAL", "1.5")
+    )
+
+    # 텔레그램 전송 속도 제한 (Bot API 한도보다 약간 낮게)
+    SEND_GLOBAL_RATE: float = float(os.getenv("SEND_GLOBAL_RATE", "25"))
+    SEND_CHAT_RATE: float = float(os.getenv("SEND_CHAT_RATE", "1"))
+    SEND_GROUP_RATE_PER_MIN: float = float(os.getenv("SEND_GROUP_RATE_PER_MIN", "20"))
+    SEND_MAX_RETRIES: int = int(os.getenv("SEND_MAX_RETRIES", "3"))
+
+    # 웹훅 모드 (--webhook): 텔레그램이 업데이트를 이 서버로 바로 보냄
+    # WEBHOOK_URL은 외부에서 접근 가능한 HTTPS 주소 (로드밸런서 주소 + WEBHOOK_PATH)
+    WEBHOOK_URL: str = os.getenv("WEBHOOK_URL", "")
+    WEBHOOK_LISTEN: str = os.getenv("WEBHOOK_LISTEN", "0.0.0.0")
+    WEBHOOK_PORT: int = int(os.getenv("WEBHOOK_PORT", "8443"))
+    WEBHOOK_PATH: str = os.getenv("WEBHOOK_PATH", "/telegram")
+    # 텔레그램이 X-Telegram-Bot-Api-Secret-Token 헤더로 보내는 비밀 토큰
+    WEBHOOK_SECRET: str = os.getenv("WEBHOOK_SECRET", "")
+    # 동시에 처리할 업데이트 수
+    WEBHOOK_CONCURRENCY: int = int(os.getenv("WEBHOOK_CONCURRENCY", "16"))
+
+    # Prometheus 메트릭 (GET /metrics, 0이면 끔). 외부에 노출하지 않도록 기본은 localhost
+    METRICS_PORT: int = int(os.getenv("METRICS_PORT", "0"))
+    METRICS_LISTEN: str = os.getenv("METRICS_LISTEN", "127.0.0.1")
+
+    # 스케줄 리포트 실행 여부 (여러 프로세스를 띄울 때는 한 곳에서만 true)
+    SCHEDULER_ENABLED: bool = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+    # 새 주가 데이터가 없는 날(미국 주말/휴장일 다음 날)은 스케줄 리포트 건너뛰기
+    SCHEDULE_SKIP_UNCHANGED: bool = (
+        os.getenv("SCHEDULE_SKIP_UNCHANGED", "true").lower() == "true"
+    )
+    # 예정 시각보다 이 시간(초) 넘게 늦으면 그 회차는 건너뜀 (절전 복귀 등)
+    SCHEDULE_MISFIRE_GRACE: int = int(os.getenv("SCHEDULE_MISFIRE_GRACE", "300"))
+    # 정규장 기준 추가 리포트 (분 단위, 쉼표 구분, 예: "open-30,close+15")
+    SESSION_REPORTS: str = os.getenv("SESSION_REPORTS", "")
+
+    # 유효한 알림 방식
+    ALERT_MODES: tuple[str, ...] = ("report", "changes", "both")
+
     # 유효한 분석 기간 목록
-    VALID_PERIODS: list[str] = [
+    VALID_PERIODS: tuple[str, ...] = (
         "1d",
         "5d",
         "1mo",
@@ -35,7 +143,7 @@ class Config:
         "2y",
         "5y",
         "max",
-    ]
+    )
 
     @classmethod
     def get_period_display(cls, period: str) -> str:
@@ -53,6 +161,14 @@ class Config:
         }
         return period_names.get(period, period)
 
+    @classmethod
+    def get_allowed_chat_ids(cls) -> set[str]:
+        """봇을 사용할 수 있는 채팅방 ID (ALLOWED_CHAT_IDS + TELEGRAM_CHAT_ID)"""
+        chat_ids = {s.strip() for s in cls.ALLOWED_CHAT_IDS.split(",") if s.strip()}
+        if cls.TELEGRAM_CHAT_ID:
+            chat_ids.add(str(cls.TELEGRAM_CHAT_ID))
+        return chat_ids
+
     @classmethod
     def is_valid_period(cls, period: str) -> bool:
         """유효한 분석 기간인지 확인"""
@@ -67,4 +183,20 @@ class Config:
         if not cls.TELEGRAM_CHAT_ID:
             print("Error: TELEGRAM_CHAT_ID가 설정되지 않았습니다.")
             return False
+        if cls.ALERT_MODE not in cls.ALERT_MODES:
+            print(
+                f"Error: ALERT_MODE는 {', '.join(cls.ALERT_MODES)} 중 하나여야 합니다."
+            )
+            return False
+        return True
+
+    @classmethod
+    def validate_webhook(cls) -> bool:
+        """웹훅 모드 설정값 검증"""
+        if not cls.WEBHOOK_URL.startswith("https://"):
+            print("Error: WEBHOOK_URL은 https:// 주소여야 합니다.")
+            return False
+        if not cls.WEBHOOK_SECRET:
+            print("Error: WEBHOOK_SECRET이 설정되지 않았습니다.")
+            return False
         return True
@@ -0,0 +1,210 @@
+"""리포트 기록 저장소
+
+리포트마다 계산한 값(하락률, 고점, 현재가, 200일선 차이, Fear & Greed)을
+SQLite 파일에 쌓아 둡니다. 보낸 뒤 버리던 값을 남겨 두어
+/history 명령어를 외부 조회 없이 바로 답하고, 실제로 받은 신호의 기록으로도 씁니다.
+
+파일 위치: data/history.db (HISTORY_DB로 변경)
+구조:
+    runs     리포트 1회 (실행 시각, 분석 기간, 실행 경로, Fear & Greed)
+    results  종목별 값 (run_id, 종목, 날짜, 하락률, 고점, 현재가, 200일선, 매수 신호)
+             (종목, 날짜) 인덱스와 날짜 인덱스
+
+사용 예:
+    history.record("1y", stock_results, fear_greed, "scheduled")
+    rows = history.query("TSLA", days=30, period="1y")
+"""
+
+import datetime
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+from src import watchlist
+from src.config import Config
+
+# /history 기본 조회 기간 (일)
+DEFAULT_DAYS = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_at TEXT NOT NULL,
+    period TEXT NOT NULL,
+    source TEXT NOT NULL,
+    fear_greed REAL,
+    fear_greed_rating TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    symbol TEXT NOT NULL,
+    date TEXT NOT NULL,
+    period TEXT NOT NULL,
+    peak_price REAL,
+    current_price REAL,
+    drawdown_pct REAL,
+    ma_200 REAL,
+    ma_diff_pct REAL,
+    buy_signal TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_results_symbol_date ON results(symbol, date);
+CREATE INDEX IF NOT EXISTS idx_results_date ON results(date);
+"""
+
+
+def _db_file() -> Path:
+    """저장소 파일 경로 (기본: watchlist와 같은 data 디렉토리)"""
+    if Config.HISTORY_DB:
+        return Path(Config.HISTORY_DB)
+    return watchlist.DATA_DIR / "history.db"
+
+
+def connect() -> sqlite3.Connection:
+    """저장소 열기 (없으면 테이블/인덱스 생성)"""
+    path = _db_file()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    # 봇이 쓰는 중에도 /history 조회가 막히지 않도록
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _result_row(run_id: int, date: str, period: str, item: dict) -> tuple:
+    """종목 결과 1개를 results 테이블 행으로"""
+    ma_200 = item.get("ma_200") or {}
+    return (
+        run_id,
+        item["symbol"],
+        date,
+        period,
+        item.get("peak_price"),
+        item.get("current_price"),
+        item.get("drawdown_pct"),
+        ma_200.get("ma_200"),
+        ma_200.get("diff_pct"),
+        item.get("buy_signal") or "",
+    )
+
+
+def record(
+    period: str,
+    stock_results: list[dict],
+    fear_greed: dict,
+    source: str,
+    now: datetime.datetime | None = None,
+) -> int | None:
+    """리포트 1회의 결과를 저장소에 추가합니다.
+
+    시간 초과로 이전 값을 쓴 종목(stale)은 이번 값이 아니므로, 같은 기준 시점이라
+    재사용한 종목(reused)은 이미 저장한 값이므로 저장하지 않습니다.
+    새로 저장할 종목이 없으면 실행(run) 기록도 남기지 않습니다.
+    sqlite에 쓰므로 이벤트 루프에서는 asyncio.to_thread로 호출합니다.
+
+    Args:
+        period: 분석 기간
+        stock_results: 종목별 분석 결과
+        fear_greed: Fear & Greed 결과
+        source: 실행 경로 (cli, command, scheduled)
+        now: 실행 시각 (없으면 현재 시각)
+
+    Returns:
+        저장한 run id (HISTORY_ENABLED가 꺼져 있거나 새 결과가 없거나 저장 실패 시 None)
+    """
+    if not Config.HISTORY_ENABLED:
+        return None
+    fresh = [
+        item
+        for item in stock_results
+        if not item.get("stale") and not item.get("reused")
+    ]
+    if not fresh:
+        return None
+    if now is None:
+        now = datetime.datetime.now()
+    date = now.date().isoformat()
+
+    try:
+        with closing(connect()) as conn, conn:
+            cursor = conn.execute(
+                "INSERT INTO runs (run_at, period, source, fear_greed, fear_greed_rating)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (
+                    now.isoformat(timespec="seconds"),
+                    period,
+                    source,
+                    fear_greed.get("score"),
+                    fear_greed.get("rating"),
+                ),
+            )
+            run_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [_result_row(run_id, date, period, item) for item in fresh],
+            )
+        return run_id
+    except sqlite3.Error as e:
+        print(f"리포트 기록 저장 실패: {e}")
+        return None
+
+
+def query(
+    symbol: str,
+    days: int = DEFAULT_DAYS,
+    period: str | None = None,
+    now: datetime.datetime | None = None,
+) -> list[dict]:
+    """종목의 최근 기록을 날짜별로 조회합니다. (하루에 여러 번 실행했으면 마지막 값)
+
+    Args:
+        symbol: 종목 코드
+        days: 오늘 포함 최근 며칠
+        period: 분석 기간 (없으면 모든 기간)
+        now: 기준 시각 (없으면 현재 시각)
+
+    Returns:
+        날짜 오름차순 리스트
+        [
+            {
+                "date": "2025-01-10",
+                "run_at": "2025-01-10T09:00:00",
+                "period": "1y",
+                "peak_price": 488.54,
+                "current_price": 394.94,
+                "drawdown_pct": -19.2,
+                "ma_200": 250.1,          # 200일선 (없으면 None)
+                "ma_diff_pct": 57.9,      # 200일선 대비 (%, 없으면 None)
+                "buy_signal": "1차 매수",
+                "fear_greed": 35.0,
+                "fear_greed_rating": "fear",
+            }
+        ]
+    """
+    if now is None:
+        now = datetime.datetime.now()
+    since = (now.date() - datetime.timedelta(days=max(1, days) - 1)).isoformat()
+
+    sql = (
+        "SELECT r.date, runs.run_at, r.period, r.peak_price, r.current_price,"
+        " r.drawdown_pct, r.ma_200, r.ma_diff_pct, r.buy_signal,"
+        " runs.fear_greed, runs.fear_greed_rating"
+        " FROM results r JOIN runs ON runs.id = r.run_id"
+        " WHERE r.symbol = ? AND r.date >= ?"
+    )
+    params: list = [symbol.upper(), since]
+    if period:
+        sql += " AND r.period = ?"
+        params.append(period)
+    sql += " ORDER BY r.date, runs.run_at, r.run_id"
+
+    try:
+        with closing(connect()) as conn:
+            rows = conn.execute(sql, params).fetchall()
+    except sqlite3.Error as e:
+        print(f"리포트 기록 조회 실패: {e}")
+        return []
+
+    # 날짜별 마지막 실행 값만 남김 (정렬 순서상 뒤에 오는 값이 최신)
+    by_date = {row["date"]: dict(row) for row in rows}
+    return list(by_date.values())
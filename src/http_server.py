@@ -0,0 +1,243 @@
+"""내장 비동기 HTTP 서버 모듈
+
+외부 웹 프레임워크 없이 asyncio 스트림만으로 동작하는 작은 HTTP/1.1 서버입니다.
+웹훅 수신처럼 요청 처리가 단순한 엔드포인트용입니다.
+
+특징:
+    - 연결마다 별도 태스크로 처리 (동시 요청 처리)
+    - Keep-Alive 지원 (텔레그램은 연결을 재사용함)
+    - 요청 1건 읽기 제한 시간, 헤더 개수/크기 제한 (느린 클라이언트가 연결을 붙잡지 않도록)
+    - 경로 + 메서드 단위 라우팅
+
+사용 예:
+    server = HttpServer("0.0.0.0", 8443)
+    server.route("POST", "/telegram", handle_update)
+    await server.start()
+    ...
+    await server.stop()
+"""
+
+import asyncio
+import json
+from collections.abc import Awaitable, Callable
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+# 요청 본문 최대 크기 (텔레그램 업데이트는 보통 수 KB)
+MAX_BODY_SIZE = 1024 * 1024
+
+# Keep-Alive 연결 유휴 시간 (초, 요청 1건을 끝까지 읽는 제한 시간으로도 사용)
+IDLE_TIMEOUT = 60.0
+
+# 요청 헤더 최대 개수와 전체 크기 (넘으면 431)
+MAX_HEADER_COUNT = 100
+MAX_HEADER_SIZE = 16 * 1024
+
+
+class HeaderTooLarge(ValueError):
+    """요청 헤더 개수나 크기가 제한을 넘음"""
+
+
+class Request:
+    """HTTP 요청"""
+
+    def __init__(
+        self,
+        method: str,
+        path: str,
+        query: dict[str, list[str]],
+        headers: dict[str, str],
+        body: bytes,
+    ):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers  # 키는 소문자
+        self.body = body
+
+    def json(self):
+        """본문을 JSON으로 파싱 (실패 시 ValueError)"""
+        return json.loads(self.body.decode("utf-8"))
+
+
+class Response:
+    """HTTP 응답"""
+
+    def __init__(
+        self,
+        status: int = 200,
+        body: bytes | str = b"",
+        content_type: str = "text/plain; charset=utf-8",
+        headers: dict[str, str] | None = None,
+    ):
+        self.status = status
+        self.body = body.encode("utf-8") if isinstance(body, str) else body
+        self.content_type = content_type
+        self.headers = headers or {}
+
+    @classmethod
+    def json(cls, data, status: int = 200) -> "Response":
+        """JSON 응답 생성"""
+        return cls(
+            status,
+            json.dumps(data, ensure_ascii=False),
+            content_type="application/json",
+        )
+
+
+Handler = Callable[[Request], Awaitable[Response]]
+
+
+class HttpServer:
+    """asyncio 기반 최소 HTTP/1.1 서버"""
+
+    def __init__(self, host: str = "0.0.0.0", port: int = 8080):
+        """
+        Args:
+            host: 바인드 주소
+            port: 포트 (0이면 빈 포트 자동 선택, start() 후 self.port로 확인)
+        """
+        self.host = host
+        self.port = port
+        self._routes: dict[tuple[str, str], Handler] = {}
+        self._server: asyncio.Server | None = None
+        self._connections: set[asyncio.Task] = set()
+
+    def route(self, method: str, path: str, handler: Handler):
+        """경로 + 메서드에 핸들러 등록"""
+        self._routes[(method.upper(), path)] = handler
+
+    async def start(self):
+        """서버 시작 (바로 반환, 요청은 백그라운드에서 처리)"""
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """새 연결을 막고 열린 연결을 정리"""
+        if self._server is None:
+            return
+        self._server.close()
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _dispatch(self, request: Request) -> Response:
+        """라우팅: 경로가 없으면 404, 메서드가 다르면 405"""
+        handler = self._routes.get((request.method, request.path))
+        if handler is None:
+            if any(path == request.path for _, path in self._routes):
+                return Response(HTTPStatus.METHOD_NOT_ALLOWED, "Method Not Allowed")
+            return Response(HTTPStatus.NOT_FOUND, "Not Found")
+
+        try:
+            return await handler(request)
+        except Exception as e:  # noqa: BLE001 - 핸들러 오류는 500으로 응답하고 서버는 계속 동작
+            print(f"HTTP 핸들러 오류 ({request.method} {request.path}): {e}")
+            return Response(HTTPStatus.INTERNAL_SERVER_ERROR, "Internal Server Error")
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Request | None:
+        """요청 1건 읽기 (연결이 닫히면 None)
+
+        요청 라인부터 본문까지 전체를 IDLE_TIMEOUT 안에 받아야 합니다.
+        (헤더를 조금씩 보내며 연결을 붙잡는 클라이언트 차단)
+        """
+        async with asyncio.timeout(IDLE_TIMEOUT):
+            request_line = await reader.readline()
+            if not request_line:
+                return None
+
+            parts = request_line.decode("latin-1").strip().split()
+            if len(parts) != 3:
+                raise ValueError("잘못된 요청 라인")
+            method, target, version = parts
+
+            headers: dict[str, str] = {}
+            header_size = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                header_size += len(line)
+                if len(headers) >= MAX_HEADER_COUNT or header_size > MAX_HEADER_SIZE:
+                    raise HeaderTooLarge("요청 헤더가 너무 큼")
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length", "0"))
+            if length < 0 or length > MAX_BODY_SIZE:
+                raise ValueError("요청 본문 크기가 잘못됨")
+            body = await reader.readexactly(length) if length else b""
+
+        url = urlsplit(target)
+        headers[":version"] = version
+        return Request(method.upper(), url.path, parse_qs(url.query), headers, body)
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        """연결 1개 처리 (Keep-Alive면 여러 요청을 차례로 처리)"""
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HeaderTooLarge:
+                    await self._write_response(
+                        writer,
+                        Response(
+                            HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                            "Request Header Fields Too Large",
+                        ),
+                        False,
+                    )
+                    break
+                except (ValueError, asyncio.IncompleteReadError):
+                    await self._write_response(
+                        writer, Response(HTTPStatus.BAD_REQUEST, "Bad Request"), False
+                    )
+                    break
+                except (TimeoutError, ConnectionError):
+                    break
+
+                if request is None:
+                    break
+
+                response = await self._dispatch(request)
+                keep_alive = (
+                    request.headers.get("connection", "").lower() != "close"
+                    and request.headers.get(":version") == "HTTP/1.1"
+                )
+                await self._write_response(writer, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+
+    @staticmethod
+    async def _write_response(
+        writer: asyncio.StreamWriter, response: Response, keep_alive: bool
+    ):
+        """응답 쓰기"""
+        status = HTTPStatus(response.status)
+        head = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            f"Content-Type: {response.content_type}",
+            f"Content-Length: {len(response.body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        head.extend(f"{name}: {value}" for name, value in response.headers.items())
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+        writer.write(response.body)
+        await writer.drain()
@@ -15,6 +15,8 @@ Fear & Greed Index란?
 
 import requests
 
+from src import metrics
+
 # CNN Fear & Greed API 주소
 API_URL = "https://production.dataviz.cnn.io/index/fearandgreed/graphdata"
 
@@ -53,6 +55,7 @@ def get_fear_greed_index() -> dict:
         # 2. 응답 상태 확인
         # 200 = 성공, 그 외 = 실패
         if response.status_code != 200:
+            metrics.UPSTREAM_ERRORS.labels("cnn").inc()
             return {
                 "score": None,
                 "rating": "unknown",
@@ -74,6 +77,7 @@ def get_fear_greed_index() -> dict:
 
     except requests.exceptions.Timeout:
         # 시간 초과
+        metrics.UPSTREAM_ERRORS.labels("cnn").inc()
         return {
             "score": None,
             "rating": "unknown",
@@ -82,6 +86,7 @@ def get_fear_greed_index() -> dict:
 
     except requests.exceptions.RequestException as e:
         # 네트워크 에러
+        metrics.UPSTREAM_ERRORS.labels("cnn").inc()
         return {
             "score": None,
             "rating": "unknown",
@@ -90,6 +95,7 @@ def get_fear_greed_index() -> dict:
 
     except (KeyError, ValueError) as e:
         # 데이터 파싱 에러
+        metrics.UPSTREAM_ERRORS.labels("cnn").inc()
         return {
             "score": None,
             "rating": "unknown",
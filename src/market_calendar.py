@@ -0,0 +1,358 @@
+"""거래소 거래일 캘린더 모듈
+
+외부 데이터 없이 규칙으로 휴장일과 조기 폐장일을 계산합니다.
+거래소는 종목 코드로 고릅니다. (exchange_for: .KS/.KQ → KRX, 나머지 → NYSE)
+모든 함수는 exchange를 주지 않으면 NYSE 기준입니다.
+
+NYSE 휴장일:
+    - New Year's Day (1/1, 일요일이면 월요일 / 토요일이면 휴장 없음)
+    - Martin Luther King Jr. Day (1월 셋째 월요일)
+    - Washington's Birthday (2월 셋째 월요일)
+    - Good Friday (부활절 이틀 전)
+    - Memorial Day (5월 마지막 월요일)
+    - Juneteenth (6/19, 2022년부터)
+    - Independence Day (7/4)
+    - Labor Day (9월 첫째 월요일)
+    - Thanksgiving Day (11월 넷째 목요일)
+    - Christmas Day (12/25)
+    고정 날짜 휴일이 토요일이면 금요일, 일요일이면 월요일에 쉽니다.
+
+NYSE 조기 폐장 (13:00):
+    - 독립기념일 전날 (7/3, 평일일 때)
+    - 추수감사절 다음 날
+    - 크리스마스 이브 (12/24, 평일일 때)
+
+KRX (한국거래소, 09:00~15:30):
+    - 양력 공휴일 (1/1, 3/1, 5/5, 6/6, 8/15, 10/3, 10/9, 12/25)과 연말 휴장일 (12/31)
+    - 설날/추석/부처님오신날, 대체 공휴일, 선거일은 규칙으로 계산할 수 없어 KRX_CLOSURES 표 사용
+      (표에 없는 연도는 경고를 한 번 출력, 매년 다음 해 휴장일을 추가해야 함)
+    - 새해 첫 거래일과 수능일은 1시간 늦게 개장 (수능일은 마감도 1시간 늦음)
+
+장전 시간외 거래는 일봉을 만들지 않으므로 정규장 시작 전까지는 전날 마감이 마지막 데이터입니다.
+"""
+
+import datetime
+from collections.abc import Callable
+from functools import lru_cache
+from typing import NamedTuple
+from zoneinfo import ZoneInfo
+
+# 미국 정규장 (뉴욕 시간)
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_OPEN = datetime.time(9, 30)
+MARKET_CLOSE = datetime.time(16, 0)
+EARLY_CLOSE = datetime.time(13, 0)
+
+# 규칙으로 계산할 수 없는 임시 휴장일 (국가 애도일 등)
+SPECIAL_CLOSURES = {
+    datetime.date(2018, 12, 5): "National Day of Mourning (George H.W. Bush)",
+    datetime.date(2025, 1, 9): "National Day of Mourning (Jimmy Carter)",
+}
+
+
+def _easter(year: int) -> datetime.date:
+    """부활절 날짜 (그레고리력, Anonymous Gregorian algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    ll = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * ll) // 451
+    month, day = divmod(h + ll - 7 * m + 114, 31)
+    return datetime.date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> datetime.date:
+    """해당 월의 n번째 요일 (n=-1이면 마지막)"""
+    if n > 0:
+        first = datetime.date(year, month, 1)
+        offset = (weekday - first.weekday()) % 7
+        return first + datetime.timedelta(days=offset + 7 * (n - 1))
+
+    next_month = datetime.date(year + month // 12, month % 12 + 1, 1)
+    last = next_month - datetime.timedelta(days=1)
+    return last - datetime.timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(day: datetime.date) -> datetime.date:
+    """토요일 → 금요일, 일요일 → 월요일"""
+    if day.weekday() == 5:
+        return day - datetime.timedelta(days=1)
+    if day.weekday() == 6:
+        return day + datetime.timedelta(days=1)
+    return day
+
+
+@lru_cache(maxsize=32)
+def holidays(year: int) -> dict[datetime.date, str]:
+    """해당 연도의 휴장일 {날짜: 이름}"""
+    result = {}
+
+    # New Year's Day: 토요일이면 전년도 12/31에 쉬지 않음
+    new_year = datetime.date(year, 1, 1)
+    if new_year.weekday() != 5:
+        result[_observed(new_year)] = "New Year's Day"
+
+    result[_nth_weekday(year, 1, 0, 3)] = "Martin Luther King Jr. Day"
+    result[_nth_weekday(year, 2, 0, 3)] = "Washington's Birthday"
+    result[_easter(year) - datetime.timedelta(days=2)] = "Good Friday"
+    result[_nth_weekday(year, 5, 0, -1)] = "Memorial Day"
+    if year >= 2022:
+        result[_observed(datetime.date(year, 6, 19))] = "Juneteenth"
+    result[_observed(datetime.date(year, 7, 4))] = "Independence Day"
+    result[_nth_weekday(year, 9, 0, 1)] = "Labor Day"
+    result[_nth_weekday(year, 11, 3, 4)] = "Thanksgiving Day"
+    result[_observed(datetime.date(year, 12, 25))] = "Christmas Day"
+
+    for day, name in SPECIAL_CLOSURES.items():
+        if day.year == year:
+            result[day] = name
+    return result
+
+
+@lru_cache(maxsize=32)
+def early_closes(year: int) -> dict[datetime.date, str]:
+    """해당 연도의 조기 폐장일 {날짜: 이름}"""
+    closed = holidays(year)
+    candidates = {
+        datetime.date(year, 7, 3): "Independence Day Eve",
+        _nth_weekday(year, 11, 3, 4) + datetime.timedelta(days=1): "Black Friday",
+        datetime.date(year, 12, 24): "Christmas Eve",
+    }
+    return {
+        day: name
+        for day, name in candidates.items()
+        if day.weekday() < 5 and day not in closed
+    }
+
+
+def _nyse_special_hours(year: int) -> dict[datetime.date, tuple]:
+    """NYSE 정규장 시간이 다른 날 {날짜: (시작, 종료)} (조기 폐장)"""
+    return {day: (MARKET_OPEN, EARLY_CLOSE) for day in early_closes(year)}
+
+
+# 한국거래소 정규장 (서울 시간)
+KRX_TZ = ZoneInfo("Asia/Seoul")
+KRX_OPEN = datetime.time(9, 0)
+KRX_CLOSE = datetime.time(15, 30)
+
+# 매년 같은 날짜인 휴장일 (월, 일, 이름). 주말과 겹쳐도 다른 날에 쉬지 않음
+KRX_FIXED_HOLIDAYS = [
+    (1, 1, "신정"),
+    (3, 1, "삼일절"),
+    (5, 5, "어린이날"),
+    (6, 6, "현충일"),
+    (8, 15, "광복절"),
+    (10, 3, "개천절"),
+    (10, 9, "한글날"),
+    (12, 25, "성탄절"),
+    (12, 31, "연말 휴장일"),
+]
+
+# 음력 명절, 대체 공휴일, 선거일, 임시 공휴일 (평일인 날만)
+KRX_CLOSURES = {
+    datetime.date(2024, 2, 9): "설날",
+    datetime.date(2024, 2, 12): "설날 대체 공휴일",
+    datetime.date(2024, 4, 10): "국회의원 선거",
+    datetime.date(2024, 5, 6): "어린이날 대체 공휴일",
+    datetime.date(2024, 5, 15): "부처님오신날",
+    datetime.date(2024, 9, 16): "추석",
+    datetime.date(2024, 9, 17): "추석",
+    datetime.date(2024, 9, 18): "추석",
+    datetime.date(2024, 10, 1): "국군의 날 (임시 공휴일)",
+    datetime.date(2025, 1, 27): "임시 공휴일",
+    datetime.date(2025, 1, 28): "설날",
+    datetime.date(2025, 1, 29): "설날",
+    datetime.date(2025, 1, 30): "설날",
+    datetime.date(2025, 3, 3): "삼일절 대체 공휴일",
+    datetime.date(2025, 5, 6): "부처님오신날 대체 공휴일",
+    datetime.date(2025, 6, 3): "대통령 선거",
+    datetime.date(2025, 10, 6): "추석",
+    datetime.date(2025, 10, 7): "추석",
+    datetime.date(2025, 10, 8): "추석 대체 공휴일",
+    datetime.date(2026, 2, 16): "설날",
+    datetime.date(2026, 2, 17): "설날",
+    datetime.date(2026, 2, 18): "설날",
+    datetime.date(2026, 3, 2): "삼일절 대체 공휴일",
+    datetime.date(2026, 5, 25): "부처님오신날 대체 공휴일",
+    datetime.date(2026, 6, 3): "지방선거",
+    datetime.date(2026, 8, 17): "광복절 대체 공휴일",
+    datetime.date(2026, 9, 24): "추석",
+    datetime.date(2026, 9, 25): "추석",
+    datetime.date(2026, 10, 5): "개천절 대체 공휴일",
+    datetime.date(2027, 2, 8): "설날",
+    datetime.date(2027, 2, 9): "설날 대체 공휴일",
+    datetime.date(2027, 5, 13): "부처님오신날",
+    datetime.date(2027, 8, 16): "광복절 대체 공휴일",
+    datetime.date(2027, 9, 14): "추석",
+    datetime.date(2027, 9, 15): "추석",
+    datetime.date(2027, 9, 16): "추석",
+    datetime.date(2027, 10, 4): "개천절 대체 공휴일",
+    datetime.date(2027, 10, 11): "한글날 대체 공휴일",
+    datetime.date(2027, 12, 27): "성탄절 대체 공휴일",
+}
+
+# KRX_CLOSURES 표가 있는 연도 (없는 연도는 음력 명절/대체 공휴일을 거래일로 잘못 판단)
+KRX_CLOSURE_YEARS = frozenset(day.year for day in KRX_CLOSURES)
+
+# 표가 없다고 이미 경고한 연도 (연도마다 한 번만 출력)
+_warned_years: set[int] = set()
+
+# 수능일 (10:00 개장, 16:30 마감)
+KRX_EXAM_DAYS = {
+    datetime.date(2024, 11, 14),
+    datetime.date(2025, 11, 13),
+    datetime.date(2026, 11, 19),
+}
+
+
+@lru_cache(maxsize=32)
+def krx_holidays(year: int) -> dict[datetime.date, str]:
+    """해당 연도의 한국거래소 휴장일 {날짜: 이름}
+
+    KRX_CLOSURES 표에 없는 연도는 양력 공휴일만 반영하고 한 번 경고합니다.
+    """
+    if year not in KRX_CLOSURE_YEARS and year not in _warned_years:
+        _warned_years.add(year)
+        print(
+            f"⚠️ KRX 휴장일 표(KRX_CLOSURES)에 {year}년이 없음: "
+            "설날/추석/대체 공휴일이 거래일로 처리됩니다"
+        )
+    result = {
+        datetime.date(year, month, day): name for month, day, name in KRX_FIXED_HOLIDAYS
+    }
+    for day, name in KRX_CLOSURES.items():
+        if day.year == year:
+            result[day] = name
+    return result
+
+
+@lru_cache(maxsize=32)
+def _krx_special_hours(year: int) -> dict[datetime.date, tuple]:
+    """한국거래소 정규장 시간이 다른 날 {날짜: (시작, 종료)}"""
+    # 새해 첫 거래일은 개장식으로 10시 개장
+    first = datetime.date(year, 1, 1)
+    while first.weekday() >= 5 or first in krx_holidays(year):
+        first += datetime.timedelta(days=1)
+    result = {first: (datetime.time(10, 0), KRX_CLOSE)}
+    for day in KRX_EXAM_DAYS:
+        if day.year == year:
+            result[day] = (datetime.time(10, 0), datetime.time(16, 30))
+    return result
+
+
+class Exchange(NamedTuple):
+    """거래소 정규장 규칙"""
+
+    name: str
+    tz: ZoneInfo
+    open: datetime.time
+    close: datetime.time
+    # 연도 → {휴장일: 이름}
+    holidays: Callable[[int], dict[datetime.date, str]]
+    # 연도 → {날짜: (시작, 종료)} (조기 폐장/늦은 개장)
+    special_hours: Callable[[int], dict[datetime.date, tuple]]
+
+
+NYSE = Exchange(
+    "NYSE", MARKET_TZ, MARKET_OPEN, MARKET_CLOSE, holidays, _nyse_special_hours
+)
+KRX = Exchange("KRX", KRX_TZ, KRX_OPEN, KRX_CLOSE, krx_holidays, _krx_special_hours)
+
+EXCHANGES = {exchange.name: exchange for exchange in (NYSE, KRX)}
+
+# 종목 코드 접미사 → 거래소 (코스피 .KS, 코스닥 .KQ)
+SUFFIX_EXCHANGES = {".KS": KRX, ".KQ": KRX}
+
+# 접미사가 없는 지수 → 거래소
+SYMBOL_EXCHANGES = {"^KS11": KRX, "^KQ11": KRX, "^KS200": KRX}
+
+
+def exchange_for(symbol: str) -> Exchange:
+    """종목이 거래되는 거래소 (모르는 종목은 NYSE)"""
+    symbol = symbol.upper()
+    if symbol in SYMBOL_EXCHANGES:
+        return SYMBOL_EXCHANGES[symbol]
+    for suffix, exchange in SUFFIX_EXCHANGES.items():
+        if symbol.endswith(suffix):
+            return exchange
+    return NYSE
+
+
+def is_trading_day(day: datetime.date, exchange: Exchange = NYSE) -> bool:
+    """정규장이 열리는 날인지 (주말/휴장일 제외)"""
+    return day.weekday() < 5 and day not in exchange.holidays(day.year)
+
+
+def session(
+    day: datetime.date, exchange: Exchange = NYSE
+) -> tuple[datetime.datetime, datetime.datetime] | None:
+    """해당 날짜의 정규장 (시작, 종료) 시각. 휴장일이면 None"""
+    if not is_trading_day(day, exchange):
+        return None
+    start, close = exchange.special_hours(day.year).get(
+        day, (exchange.open, exchange.close)
+    )
+    return (
+        datetime.datetime.combine(day, start, tzinfo=exchange.tz),
+        datetime.datetime.combine(day, close, tzinfo=exchange.tz),
+    )
+
+
+def next_trading_day(day: datetime.date, exchange: Exchange = NYSE) -> datetime.date:
+    """다음 거래일 (day 다음 날부터)"""
+    day += datetime.timedelta(days=1)
+    while not is_trading_day(day, exchange):
+        day += datetime.timedelta(days=1)
+    return day
+
+
+def previous_trading_day(
+    day: datetime.date, exchange: Exchange = NYSE
+) -> datetime.date:
+    """이전 거래일 (day 전날부터)"""
+    day -= datetime.timedelta(days=1)
+    while not is_trading_day(day, exchange):
+        day -= datetime.timedelta(days=1)
+    return day
+
+
+def is_open(now: datetime.datetime, exchange: Exchange = NYSE) -> bool:
+    """정규장 중인지"""
+    now = now.astimezone(exchange.tz)
+    hours = session(now.date(), exchange)
+    return hours is not None and hours[0] <= now < hours[1]
+
+
+def last_close(now: datetime.datetime, exchange: Exchange = NYSE) -> datetime.date:
+    """now 시점에 이미 끝난 가장 최근 정규장 날짜"""
+    now = now.astimezone(exchange.tz)
+    hours = session(now.date(), exchange)
+    if hours is not None and now >= hours[1]:
+        return now.date()
+    return previous_trading_day(now.date(), exchange)
+
+
+def next_close(now: datetime.datetime, exchange: Exchange = NYSE) -> datetime.datetime:
+    """now 이후 처음 끝나는 정규장의 마감 시각 (마지막 일봉이 바뀌는 시각)"""
+    local = now.astimezone(exchange.tz)
+    hours = session(local.date(), exchange)
+    if hours is not None and local < hours[1]:
+        return hours[1]
+    return session(next_trading_day(local.date(), exchange), exchange)[1]
+
+
+def has_new_data(now: datetime.datetime, exchange: Exchange = NYSE) -> bool:
+    """하루 전 같은 시각과 비교해 새 주가 데이터가 있는지
+
+    정규장 중이거나, 지난 24시간 안에 정규장이 끝났으면 True.
+    (NYSE, 한국 시간 아침 리포트 기준: 화~토요일 True, 일/월요일과 미국 휴장일 다음 날 False)
+    """
+    if is_open(now, exchange):
+        return True
+    return last_close(now, exchange) != last_close(
+        now - datetime.timedelta(days=1), exchange
+    )
@@ -0,0 +1,309 @@
+"""Prometheus 메트릭 모듈
+
+외부 라이브러리 없이 Prometheus 텍스트 형식(0.0.4)으로 메트릭을 노출합니다.
+METRICS_PORT를 설정하면 봇/데몬 프로세스가 GET /metrics 엔드포인트를 엽니다.
+
+메트릭:
+    - stock_fetch_seconds: 종목 1개의 주가 데이터 조회 시간 (히스토그램)
+    - report_build_seconds{kind}: 리포트 수집~렌더링 시간 (command / scheduled / prewarm)
+    - telegram_send_seconds: 텔레그램 메시지 1건 전송 시간 (히스토그램)
+    - upstream_errors_total{source}: 외부 API 오류 (yfinance / cnn / telegram)
+    - empty_data_total: 데이터가 비어 있던 조회
+    - watchlist_symbols, watchlist_chats: 관심 종목 합집합 크기, 채팅방 수
+    - report_cache_hit_ratio: 리포트 캐시 적중률
+
+레이블 값은 종류가 정해진 것만 사용합니다. (사용자가 입력한 종목 코드를 레이블로 쓰면
+시계열이 끝없이 늘어나므로, 종목별 실패는 로그로 확인)
+
+사용 예:
+    with metrics.STOCK_FETCH_SECONDS.time():
+        data = fetch_stock_data("TSLA")
+"""
+
+import abc
+import math
+import threading
+import time
+from collections.abc import Callable
+
+from src.http_server import HttpServer, Request, Response
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 네트워크 호출 기준 기본 버킷 (초)
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra=()) -> str:
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    inner = ",".join(f'{name}="{_escape_label(value)}"' for name, value in pairs)
+    return "{" + inner + "}"
+
+
+class _Timer:
+    """with 문 동안의 시간을 히스토그램에 기록"""
+
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: "_HistogramChild"):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._start)
+        return False
+
+
+class _Metric(abc.ABC):
+    """레이블별 값을 가지는 메트릭 공통 부분"""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    @abc.abstractmethod
+    def _new_child(self):
+        """레이블 값 하나의 메트릭 (종류별로 구현)"""
+
+    def labels(self, *values: str):
+        """레이블 값에 해당하는 메트릭 (처음이면 생성)"""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name}: 레이블 {self.labelnames} 값이 필요합니다")
+        key = tuple(str(v) for v in values)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = self._new_child()
+            return child
+
+    def _default(self):
+        """레이블이 없는 메트릭의 값"""
+        return self.labels()
+
+    def clear(self):
+        with self._lock:
+            self._children.clear()
+
+    def collect(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        with self._lock:
+            children = sorted(self._children.items())
+        for values, child in children:
+            lines.extend(child.samples(self.name, self.labelnames, values))
+        return lines
+
+
+class _CounterChild:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        if amount < 0:
+            raise ValueError("Counter는 감소할 수 없습니다")
+        with self._lock:
+            self.value += amount
+
+    def samples(self, name, labelnames, values) -> list[str]:
+        labels = _format_labels(labelnames, values)
+        return [f"{name}{labels} {_format_value(self.value)}"]
+
+
+class Counter(_Metric):
+    """누적 카운터"""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+
+class _GaugeChild:
+    def __init__(self):
+        self.value = 0.0
+        self.function: Callable[[], float] | None = None
+
+    def set(self, value: float):
+        self.value = float(value)
+
+    def set_function(self, function: Callable[[], float] | None):
+        """수집할 때마다 호출해 값을 구할 함수 (None이면 해제)"""
+        self.function = function
+
+    def samples(self, name, labelnames, values) -> list[str]:
+        value = self.value
+        if self.function is not None:
+            try:
+                value = float(self.function())
+            except Exception:  # noqa: BLE001 - 값을 못 구하면 NaN으로 노출하고 수집은 계속
+                value = math.nan
+        labels = _format_labels(labelnames, values)
+        return [f"{name}{labels} {_format_value(value)}"]
+
+
+class Gauge(_Metric):
+    """현재 값 (직접 설정하거나 수집 시 함수 호출)"""
+
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self._default().set(value)
+
+    def set_function(self, function: Callable[[], float] | None):
+        self._default().set_function(function)
+
+
+class _HistogramChild:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+                    break
+
+    def time(self) -> _Timer:
+        return _Timer(self)
+
+    def samples(self, name, labelnames, values) -> list[str]:
+        with self._lock:
+            counts, count, total = list(self.counts), self.count, self.sum
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            labels = _format_labels(labelnames, values, [("le", _format_value(bound))])
+            lines.append(f"{name}_bucket{labels} {cumulative}")
+        labels = _format_labels(labelnames, values, [("le", "+Inf")])
+        lines.append(f"{name}_bucket{labels} {count}")
+        labels = _format_labels(labelnames, values)
+        lines.append(f"{name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{name}_count{labels} {count}")
+        return lines
+
+
+class Histogram(_Metric):
+    """관측값 분포 (버킷별 누적 개수, 합계, 개수)"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+    def time(self) -> _Timer:
+        return self._default().time()
+
+
+class Registry:
+    """노출할 메트릭 모음"""
+
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STOCK_FETCH_SECONDS = REGISTRY.register(
+    Histogram("stock_fetch_seconds", "Stock history fetch latency in seconds")
+)
+REPORT_BUILD_SECONDS = REGISTRY.register(
+    Histogram(
+        "report_build_seconds",
+        "Report collect and render duration in seconds",
+        ("kind",),
+        buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0),
+    )
+)
+TELEGRAM_SEND_SECONDS = REGISTRY.register(
+    Histogram("telegram_send_seconds", "Telegram sendMessage latency in seconds")
+)
+UPSTREAM_ERRORS = REGISTRY.register(
+    Counter("upstream_errors_total", "Upstream API errors", ("source",))
+)
+EMPTY_DATA = REGISTRY.register(
+    Counter("empty_data_total", "Fetches that returned no data")
+)
+WATCHLIST_SYMBOLS = REGISTRY.register(
+    Gauge("watchlist_symbols", "Distinct symbols across all chat watchlists")
+)
+WATCHLIST_CHATS = REGISTRY.register(Gauge("watchlist_chats", "Registered chats"))
+REPORT_CACHE_HIT_RATIO = REGISTRY.register(
+    Gauge("report_cache_hit_ratio", "Report cache hit ratio since start")
+)
+PROCESS_PEAK_MEMORY = REGISTRY.register(
+    Gauge("process_peak_rss_bytes", "Peak resident memory after the last collection")
+)
+
+
+def create_server(host: str, port: int, registry: Registry = REGISTRY) -> HttpServer:
+    """GET /metrics를 제공하는 HTTP 서버 (start()는 호출하는 쪽에서)"""
+
+    async def handle_metrics(request: Request) -> Response:
+        return Response(200, registry.render(), content_type=CONTENT_TYPE)
+
+    server = HttpServer(host, port)
+    server.route("GET", "/metrics", handle_metrics)
+    return server
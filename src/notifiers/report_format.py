@@ -0,0 +1,466 @@
+"""리포트 메시지 포맷팅 모듈
+
+일일 리포트를 텔레그램 HTML 메시지로 만듭니다.
+
+텔레그램 메시지는 최대 4096자까지만 보낼 수 있으므로,
+종목이 많으면 종목 단위로 여러 페이지로 나눕니다. (HTML 태그가 잘리지 않음)
+
+레이아웃:
+    - full: 종목별 현재가/고점/200일선을 여러 줄로 표시 (기본)
+    - compact: 종목당 한 줄짜리 표 (<pre> 고정폭)
+    - auto: 종목 수가 REPORT_COMPACT_THRESHOLD를 넘으면 compact, 아니면 full
+
+신호 변화 알림(render_change_alerts), 목표가 도달 알림(render_price_alerts),
+유니버스 스크리닝 결과(render_screen_results), 종목 기록(render_history)도 여기서 만듭니다.
+"""
+
+from html import escape
+
+from src.config import Config
+from src.stock.mdd import get_tier_signal
+
+# 텔레그램 메시지 최대 길이
+MESSAGE_LIMIT = 4096
+
+# 페이지 번호 표시 "(12/34)"용 여유 공간
+PAGE_MARKER_RESERVE = 16
+
+LAYOUTS = ("auto", "full", "compact")
+
+# 제한 시간 안에 수집하지 못해 이전 값을 보여주는 종목 표시
+STALE_MARK = "⏱️"
+
+# compact 레이아웃 표 머리글
+COMPACT_TABLE_HEADER = f"{'SYMBOL':<9}{'DD':>8}{'PRICE':>10}{'PEAK':>10}{'MA200':>8}"
+
+# 종목 기록(/history) 표 머리글
+HISTORY_TABLE_HEADER = f"{'DATE':<11}{'DD':>8}{'PRICE':>10}{'MA200':>8}{'FG':>5}"
+
+
+def _text_length(text: str) -> int:
+    """텔레그램 기준 글자 수 (UTF-16 단위, 이모지는 2자로 계산)"""
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _get_fear_greed_emoji(score: float) -> str:
+    """Fear & Greed 점수에 따른 이모지 반환"""
+    if score <= 24:
+        return "😱"  # Extreme Fear
+    elif score <= 44:
+        return "😰"  # Fear
+    elif score <= 55:
+        return "😐"  # Neutral
+    elif score <= 75:
+        return "😊"  # Greed
+    else:
+        return "🤑"  # Extreme Greed
+
+
+def resolve_layout(layout: str, symbol_count: int) -> str:
+    """auto 레이아웃을 종목 수에 따라 full/compact로 결정"""
+    if layout == "auto":
+        if symbol_count > Config.REPORT_COMPACT_THRESHOLD:
+            return "compact"
+        return "full"
+    return layout if layout in LAYOUTS else "full"
+
+
+def _format_header(fear_greed: dict, period: str) -> list[str]:
+    """리포트 머리말 (제목 + Fear & Greed + 하락률 섹션 제목)"""
+    period_display = Config.get_period_display(period)
+    lines = []
+
+    # 헤더
+    lines.append("<b>📊 Daily Stock Report</b>")
+    lines.append("")
+
+    # Fear & Greed Index
+    score = fear_greed.get("score")
+    if score is not None:
+        try:
+            score = float(score)
+            rating = fear_greed.get("rating", "unknown")
+            emoji = _get_fear_greed_emoji(score)
+            lines.append(f"{emoji} Fear & Greed: {score:.1f} ({rating})")
+        except (TypeError, ValueError):
+            lines.append("⚠️ Fear & Greed: 데이터 오류")
+
+        prev = fear_greed.get("previous_close")
+        if prev is not None:
+            try:
+                diff = float(score) - float(prev)
+                arrow = "📈" if diff >= 0 else "📉"
+                sign = "+" if diff >= 0 else ""
+                lines.append(f"   전일 대비: {sign}{diff:.1f} {arrow}")
+            except (TypeError, ValueError):
+                pass
+    else:
+        lines.append(f"⚠️ Fear & Greed: {fear_greed.get('error', 'Unknown')}")
+
+    lines.append("")
+    lines.append("")
+
+    # 고점 대비 하락률
+    lines.append(f"<b>📉 고점 대비 하락률 ({period_display})</b>")
+    lines.append("")
+    return lines
+
+
+def _format_full_block(item: dict) -> str | None:
+    """종목 1개의 상세 블록 (여러 줄). 데이터가 잘못되면 None"""
+    symbol = item.get("symbol")
+    drawdown_pct = item.get("drawdown_pct")
+    peak_price = item.get("peak_price", 0)
+    current_price = item.get("current_price", 0)
+    buy_signal = item.get("buy_signal", "")
+
+    if not symbol or drawdown_pct is None:
+        return None
+
+    try:
+        cur = float(current_price)
+        peak = float(peak_price)
+        pct = float(drawdown_pct)
+        signal = "🔔" if buy_signal else "⏸️"
+        stale = f"  {STALE_MARK}" if item.get("stale") else ""
+
+        lines = [
+            f"<b>{escape(symbol)}</b>  {pct:.1f}%  {signal}{stale}",
+            f"   ${cur:.2f} → ${peak:.2f}",
+        ]
+
+        # 200일 이동평균선 정보 추가
+        ma_200_data = item.get("ma_200")
+        if ma_200_data and ma_200_data.get("ma_200") is not None:
+            ma_price = ma_200_data["ma_200"]
+            ma_diff = ma_200_data["diff_pct"]
+            ma_trend = ma_200_data["trend"]
+            ma_position = ma_200_data["position"]
+
+            position_text = "위" if ma_position == "above" else "아래"
+            sign = "+" if ma_diff >= 0 else ""
+            lines.append(f"   📏 200일선: ${ma_price:.2f} ({sign}{ma_diff:.1f}%)")
+            lines.append(f"   → 현재가가 200일선 {position_text} = {ma_trend}")
+
+        lines.append("")
+        return "\n".join(lines)
+    except (TypeError, ValueError):
+        return None
+
+
+def _format_compact_row(item: dict) -> str | None:
+    """종목 1개의 표 한 줄. 데이터가 잘못되면 None"""
+    symbol = item.get("symbol")
+    drawdown_pct = item.get("drawdown_pct")
+    if not symbol or drawdown_pct is None:
+        return None
+
+    try:
+        cur = float(item.get("current_price", 0))
+        peak = float(item.get("peak_price", 0))
+        pct = float(drawdown_pct)
+    except (TypeError, ValueError):
+        return None
+
+    ma_text = "-"
+    ma_200_data = item.get("ma_200")
+    if ma_200_data and ma_200_data.get("diff_pct") is not None:
+        ma_diff = ma_200_data["diff_pct"]
+        sign = "+" if ma_diff >= 0 else ""
+        ma_text = f"{sign}{ma_diff:.1f}%"
+
+    signal = " 🔔" if item.get("buy_signal") else ""
+    stale = f" {STALE_MARK}" if item.get("stale") else ""
+    return (
+        f"{escape(symbol):<9}{pct:>7.1f}%{cur:>10.2f}{peak:>10.2f}{ma_text:>8}"
+        f"{signal}{stale}"
+    )
+
+
+def _format_timed_out(timed_out: list[str], stock_results: list[dict]) -> str:
+    """제한 시간 안에 수집하지 못한 종목 안내 (리포트 꼬리말)"""
+    lines = ["", f"{STALE_MARK} 시간 초과/오류: {escape(', '.join(timed_out))}"]
+    if any(item.get("stale") for item in stock_results):
+        lines.append(f"   ({STALE_MARK} 표시 종목은 이전에 수집한 값)")
+    return "\n".join(lines)
+
+
+def paginate(
+    header: str,
+    blocks: list[str],
+    continuation: str,
+    wrap: tuple[str, str] = ("", ""),
+    separator: str = "\n",
+    limit: int = MESSAGE_LIMIT,
+    footer: str = "",
+) -> list[str]:
+    """블록(종목) 단위로 메시지를 나눕니다.
+
+    블록 중간에서 자르지 않으므로 HTML 태그가 깨지지 않습니다.
+    페이지가 2개 이상이면 각 페이지 끝에 "(1/3)" 형식의 번호를 붙입니다.
+
+    Args:
+        header: 첫 페이지 머리말
+        blocks: 종목별 블록
+        continuation: 두 번째 페이지부터 붙는 머리말
+        wrap: 블록 묶음을 감싸는 (여는 태그, 닫는 태그). 예: ("<pre>", "</pre>")
+        separator: 블록 사이 구분자
+        limit: 페이지 최대 길이
+        footer: 마지막 페이지 끝에 붙는 꼬리말 (wrap 밖, 넘치면 별도 페이지)
+
+    Returns:
+        페이지 메시지 리스트
+    """
+    prefix, suffix = wrap
+    budget = limit - PAGE_MARKER_RESERVE
+
+    def render(page_header: str, page_blocks: list[str]) -> str:
+        return page_header + prefix + separator.join(page_blocks) + suffix
+
+    groups: list[list[str]] = []
+    current: list[str] = []
+    page_header = header
+
+    for block in blocks:
+        if current and _text_length(render(page_header, [*current, block])) > budget:
+            groups.append(current)
+            current = []
+            page_header = continuation
+        current.append(block)
+    groups.append(current)
+
+    # 꼬리말이 마지막 페이지에 들어가지 않으면 꼬리말만 있는 페이지 추가 (None)
+    if footer:
+        last_header = header if len(groups) == 1 else continuation
+        if _text_length(render(last_header, groups[-1]) + footer) > budget:
+            groups.append(None)
+
+    pages = []
+    for i, group in enumerate(groups):
+        page_header = header if i == 0 else continuation
+        pages.append(page_header if group is None else render(page_header, group))
+    pages[-1] += footer
+
+    if len(pages) > 1:
+        total = len(pages)
+        pages = [f"{page}\n({i}/{total})" for i, page in enumerate(pages, start=1)]
+    return pages
+
+
+def render_daily_report(
+    fear_greed: dict,
+    stock_results: list[dict],
+    period: str = "1y",
+    layout: str = "full",
+    limit: int = MESSAGE_LIMIT,
+    timed_out: list[str] | None = None,
+) -> list[str]:
+    """일일 리포트를 텔레그램 메시지 페이지 리스트로 만듭니다.
+
+    Args:
+        fear_greed: Fear & Greed 데이터
+        stock_results: 종목별 분석 결과 (stale이면 이전에 수집한 값)
+        period: 분석 기간
+        layout: "full", "compact" 또는 "auto"
+        limit: 페이지 최대 길이
+        timed_out: 제한 시간 안에 수집하지 못한 종목 (마지막 페이지 끝에 표시)
+
+    Returns:
+        순서대로 보낼 HTML 메시지 리스트 (최소 1개)
+    """
+    layout = resolve_layout(layout, len(stock_results))
+    header = "\n".join(_format_header(fear_greed, period))
+    period_display = Config.get_period_display(period)
+    continuation = f"<b>📉 고점 대비 하락률 ({period_display}, 계속)</b>\n\n"
+    footer = _format_timed_out(timed_out, stock_results) if timed_out else ""
+
+    if layout == "compact":
+        # 모든 페이지에 표 머리글 반복
+        rows = [row for row in map(_format_compact_row, stock_results) if row]
+        return paginate(
+            header + "\n",
+            rows,
+            continuation,
+            wrap=(f"<pre>{COMPACT_TABLE_HEADER}\n", "</pre>"),
+            limit=limit,
+            footer=footer,
+        )
+
+    blocks = [block for block in map(_format_full_block, stock_results) if block]
+    if not blocks:
+        return [header + footer]
+    return paginate(header + "\n", blocks, continuation, limit=limit, footer=footer)
+
+
+def _tier_text(tier: int) -> str:
+    """매수 단계 표시 (0단계는 관망)"""
+    return get_tier_signal(tier) or "관망"
+
+
+def _format_change_line(change: dict) -> str:
+    """상태 변화 1건을 한 줄로"""
+    symbol = escape(change["symbol"])
+    pct = float(change.get("drawdown_pct") or 0)
+
+    if change["kind"] == "tier":
+        arrow = "🔔" if change["new"] > change["old"] else "↩️"
+        return (
+            f"{arrow} <b>{symbol}</b>  {pct:.1f}%  "
+            f"{_tier_text(change['old'])} → {_tier_text(change['new'])}"
+        )
+
+    position_text = {"above": "위", "below": "아래"}
+    arrow = "📈" if change["new"] == "above" else "📉"
+    diff = change.get("ma_diff_pct")
+    diff_text = f" ({diff:+.1f}%)" if diff is not None else ""
+    return (
+        f"{arrow} <b>{symbol}</b>  200일선 "
+        f"{position_text.get(change['old'], change['old'])} → "
+        f"{position_text.get(change['new'], change['new'])}{diff_text}"
+    )
+
+
+def render_change_alerts(
+    changes: list[dict], period: str = "1y", limit: int = MESSAGE_LIMIT
+) -> list[str]:
+    """매수 단계/200일선 위치 변화 알림 메시지 (변화가 없으면 빈 리스트)
+
+    Args:
+        changes: signal_state.detect_changes() 결과
+        period: 분석 기간
+        limit: 페이지 최대 길이
+
+    Returns:
+        순서대로 보낼 HTML 메시지 리스트
+    """
+    if not changes:
+        return []
+    period_display = Config.get_period_display(period)
+    header = f"<b>🔔 신호 변화 ({period_display})</b>\n\n"
+    continuation = f"<b>🔔 신호 변화 ({period_display}, 계속)</b>\n\n"
+    lines = [_format_change_line(change) for change in changes]
+    return paginate(header, lines, continuation, limit=limit)
+
+
+def _format_price_alert_line(alert: dict) -> str:
+    """도달한 가격 알림 1건을 한 줄로"""
+    arrow = "⬇️" if alert["direction"] == "below" else "⬆️"
+    word = "이하" if alert["direction"] == "below" else "이상"
+    repeat = " 🔁" if alert.get("repeat") else ""
+    return (
+        f"{arrow} <b>{escape(alert['symbol'])}</b>  ${alert['current_price']:,.2f}  "
+        f"(목표 ${alert['price']:,.2f} {word}){repeat}"
+    )
+
+
+def render_price_alerts(alerts: list[dict], limit: int = MESSAGE_LIMIT) -> list[str]:
+    """목표가 도달 알림 메시지 (도달한 알림이 없으면 빈 리스트)
+
+    Args:
+        alerts: price_alerts.evaluate() 결과
+        limit: 페이지 최대 길이
+
+    Returns:
+        순서대로 보낼 HTML 메시지 리스트
+    """
+    if not alerts:
+        return []
+    header = "<b>🎯 목표가 도달</b>\n\n"
+    continuation = "<b>🎯 목표가 도달 (계속)</b>\n\n"
+    lines = [_format_price_alert_line(alert) for alert in alerts]
+    return paginate(header, lines, continuation, limit=limit)
+
+
+def render_screen_results(
+    screen: dict,
+    threshold: float,
+    top: int | None = None,
+    limit: int = MESSAGE_LIMIT,
+) -> list[str]:
+    """유니버스 스크리닝 결과 메시지 (하락률이 큰 순서의 compact 표)
+
+    Args:
+        screen: screener.screen() 결과
+        threshold: 기준 하락률 (%, 이 값 이하인 종목만 표시)
+        top: 표시할 최대 종목 수 (없으면 SCREEN_TOP)
+        limit: 페이지 최대 길이
+
+    Returns:
+        순서대로 보낼 HTML 메시지 리스트 (최소 1개)
+    """
+    top = top or Config.SCREEN_TOP
+    matches = [item for item in screen["results"] if item["drawdown_pct"] <= threshold]
+    period_display = Config.get_period_display(screen["period"])
+    header = (
+        f"<b>🔎 스크리닝: 고점 대비 {threshold:.0f}% 이하 ({period_display})</b>\n"
+        f"유니버스 {screen['universe']}개 중 {len(matches)}개"
+    )
+    if len(matches) > top:
+        header += f" (상위 {top}개 표시)"
+    header += "\n\n"
+    continuation = f"<b>🔎 스크리닝 ({period_display}, 계속)</b>\n\n"
+
+    footer = ""
+    if screen["missing"]:
+        footer = f"\n⚠️ 데이터 없음 {len(screen['missing'])}개"
+
+    rows = [row for row in map(_format_compact_row, matches[:top]) if row]
+    if not rows:
+        return [header + "조건에 맞는 종목이 없습니다." + footer]
+    return paginate(
+        header,
+        rows,
+        continuation,
+        wrap=(f"<pre>{COMPACT_TABLE_HEADER}\n", "</pre>"),
+        limit=limit,
+        footer=footer,
+    )
+
+
+def _format_history_row(row: dict) -> str:
+    """기록 1건(하루)의 표 한 줄"""
+    ma_text = "-"
+    if row.get("ma_diff_pct") is not None:
+        sign = "+" if row["ma_diff_pct"] >= 0 else ""
+        ma_text = f"{sign}{row['ma_diff_pct']:.1f}%"
+    fg_text = f"{row['fear_greed']:.0f}" if row.get("fear_greed") is not None else "-"
+    signal = " 🔔" if row.get("buy_signal") else ""
+    return (
+        f"{row['date']:<11}{row['drawdown_pct']:>7.1f}%{row['current_price']:>10.2f}"
+        f"{ma_text:>8}{fg_text:>5}{signal}"
+    )
+
+
+def render_history(
+    symbol: str,
+    rows: list[dict],
+    period: str,
+    days: int,
+    limit: int = MESSAGE_LIMIT,
+) -> list[str]:
+    """종목 기록 메시지 (날짜별 하락률/현재가/200일선 차이/Fear & Greed 표)
+
+    Args:
+        symbol: 종목 코드
+        rows: history.query() 결과 (날짜 오름차순)
+        period: 분석 기간
+        days: 조회한 기간 (일)
+        limit: 페이지 최대 길이
+
+    Returns:
+        순서대로 보낼 HTML 메시지 리스트 (최소 1개)
+    """
+    period_display = Config.get_period_display(period)
+    header = f"<b>🗂️ {escape(symbol)} 기록 (최근 {days}일, {period_display})</b>\n"
+    if not rows:
+        return [header + "\n저장된 기록이 없습니다."]
+
+    header += f"고점 ${rows[-1]['peak_price']:,.2f}\n\n"
+    continuation = f"<b>🗂️ {escape(symbol)} 기록 (계속)</b>\n\n"
+    return paginate(
+        header,
+        [_format_history_row(row) for row in rows],
+        continuation,
+        wrap=(f"<pre>{HISTORY_TABLE_HEADER}\n", "</pre>"),
+        limit=limit,
+    )
@@ -0,0 +1,352 @@
+"""텔레그램 전송 대기열 모듈 (Rate Limit)
+
+텔레그램 Bot API는 전송량을 제한합니다.
+- 전체: 초당 약 30건
+- 개인 채팅방: 초당 약 1건
+- 그룹 채팅방: 분당 약 20건
+
+한도를 넘으면 RetryAfter(429) 에러가 발생하므로, 모든 전송을 대기열에 넣고
+전체/채팅방별 토큰 버킷(src.ratelimit)으로 속도를 조절합니다.
+
+동작 방식:
+    - 우선순위: 사용자 명령 응답(INTERACTIVE)이 스케줄 방송(BROADCAST)보다 먼저 전송
+    - 같은 채팅방 메시지는 넣은 순서대로 하나씩 전송 (페이지 순서 보장)
+    - RetryAfter 발생 시 해당 채팅방과 봇 전체 전송을 지정 시간만큼 멈추고 자동 재시도
+      (방송 중 flood wait는 보통 봇 전체에 걸리므로 다른 채팅방 전송도 멈춤)
+    - 대기 요청은 채팅방별 힙에 보관 (넣을 때 O(log n), 고를 때는 채팅방 맨 앞 요청만 비교)
+    - 대기열 길이와 전송 지연(대기 + 전송 시간) 통계 제공
+"""
+
+import asyncio
+import datetime
+import heapq
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from telegram.error import RetryAfter
+
+from src.ratelimit import TokenBucket
+
+# 우선순위 (작을수록 먼저 전송)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BROADCAST = 10
+
+# 지연 통계에 유지할 최근 샘플 수
+LATENCY_SAMPLES = 500
+
+
+class _SendRequest:
+    """대기열에 들어간 전송 요청"""
+
+    def __init__(
+        self,
+        chat_id: str,
+        send: Callable[[], Awaitable[Any]],
+        priority: int,
+        seq: int,
+        future: asyncio.Future,
+        enqueued_at: float,
+    ):
+        self.chat_id = chat_id
+        self.send = send
+        self.priority = priority
+        self.seq = seq
+        self.future = future
+        self.enqueued_at = enqueued_at
+        self.attempts = 0
+
+    @property
+    def sort_key(self) -> tuple[int, int]:
+        return (self.priority, self.seq)
+
+
+def _retry_after_seconds(error: RetryAfter) -> float:
+    """RetryAfter의 대기 시간을 초 단위로 변환 (버전에 따라 int 또는 timedelta)"""
+    retry_after = error.retry_after
+    if isinstance(retry_after, datetime.timedelta):
+        return retry_after.total_seconds()
+    return float(retry_after)
+
+
+def _is_group_chat(chat_id: str) -> bool:
+    """그룹/채널 채팅방 여부 (텔레그램 그룹 ID는 음수)"""
+    return str(chat_id).startswith("-")
+
+
+class SendQueue:
+    """전체/채팅방별 속도 제한이 적용된 텔레그램 전송 대기열"""
+
+    def __init__(
+        self,
+        global_rate: float = 30.0,
+        chat_rate: float = 1.0,
+        group_rate_per_min: float = 20.0,
+        max_retries: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            global_rate: 봇 전체 초당 전송 한도
+            chat_rate: 개인 채팅방 초당 전송 한도
+            group_rate_per_min: 그룹 채팅방 분당 전송 한도
+            max_retries: RetryAfter 발생 시 최대 재시도 횟수
+            clock: 시간 함수 (테스트용)
+        """
+        self._clock = clock
+        self._chat_rate = chat_rate
+        self._group_rate = group_rate_per_min / 60
+        self._max_retries = max_retries
+
+        self._global = TokenBucket(global_rate, max(1.0, global_rate), clock())
+        self._chat_buckets: dict[str, TokenBucket] = {}
+        self._paused_until: dict[str, float] = {}
+        self._global_paused_until = 0.0
+
+        # 채팅방별 대기 요청 힙: (우선순위, 순번, 요청)
+        self._pending: dict[str, list[tuple[int, int, _SendRequest]]] = {}
+        self._inflight_chats: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._seq = 0
+        self._wakeup = asyncio.Event()
+        self._dispatcher: asyncio.Task | None = None
+
+        self._latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._sent = 0
+        self._failed = 0
+        self._retried = 0
+
+    # ----------------------------------------------------------
+    # 생명주기
+    # ----------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._dispatcher is not None and not self._dispatcher.done()
+
+    def start(self):
+        """전송 루프 시작 (이벤트 루프 안에서 호출)"""
+        if not self.running:
+            self._wakeup = asyncio.Event()
+            self._dispatcher = asyncio.create_task(self._run())
+
+    async def stop(self, drain: bool = True, timeout: float = 30.0):
+        """전송 루프 종료
+
+        Args:
+            drain: True면 남은 메시지를 모두 보낸 뒤 종료
+            timeout: drain 최대 대기 시간 (초)
+        """
+        if drain and self.running:
+            deadline = self._clock() + timeout
+            while (self._pending or self._inflight_chats) and self._clock() < deadline:
+                await asyncio.sleep(0.05)
+
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+
+        for queue in self._pending.values():
+            for _, _, request in queue:
+                if not request.future.done():
+                    request.future.cancel()
+        self._pending.clear()
+
+    # ----------------------------------------------------------
+    # 전송
+    # ----------------------------------------------------------
+
+    async def submit(
+        self,
+        chat_id: str,
+        send: Callable[[], Awaitable[Any]],
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> Any:
+        """전송 요청을 대기열에 넣고 결과를 기다립니다.
+
+        Args:
+            chat_id: 대상 채팅방 ID (속도 제한 단위)
+            send: 실제 API 호출을 수행하는 async 함수 (인자 없음)
+            priority: PRIORITY_INTERACTIVE 또는 PRIORITY_BROADCAST
+
+        Returns:
+            send()의 반환값. 실패 시 예외를 그대로 전달합니다.
+        """
+        future = self.enqueue(chat_id, send, priority)
+        return await future
+
+    def enqueue(
+        self,
+        chat_id: str,
+        send: Callable[[], Awaitable[Any]],
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> asyncio.Future:
+        """전송 요청을 대기열에 넣고 결과 Future를 바로 반환합니다.
+
+        여러 메시지를 한꺼번에 넣어 두고 나중에 기다릴 때 사용합니다.
+        """
+        if not self.running:
+            self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        self._seq += 1
+        request = _SendRequest(
+            chat_id=str(chat_id),
+            send=send,
+            priority=priority,
+            seq=self._seq,
+            future=future,
+            enqueued_at=self._clock(),
+        )
+        self._push(request)
+        self._wakeup.set()
+        return future
+
+    def _push(self, request: _SendRequest):
+        """요청을 채팅방 힙에 넣음 (재시도 요청은 원래 순번 자리로 돌아감)"""
+        queue = self._pending.setdefault(request.chat_id, [])
+        heapq.heappush(queue, (*request.sort_key, request))
+
+    def _pop(self, chat_id: str) -> _SendRequest:
+        """채팅방 힙의 맨 앞 요청을 꺼냄"""
+        queue = self._pending[chat_id]
+        _, _, request = heapq.heappop(queue)
+        if not queue:
+            del self._pending[chat_id]
+        return request
+
+    def _chat_bucket(self, chat_id: str) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            rate = self._group_rate if _is_group_chat(chat_id) else self._chat_rate
+            bucket = TokenBucket(rate, 1.0, self._clock())
+            self._chat_buckets[chat_id] = bucket
+        return bucket
+
+    def _pick_ready(self, now: float) -> tuple[_SendRequest | None, float | None]:
+        """지금 보낼 수 있는 요청 선택
+
+        Returns:
+            (보낼 요청, None) 또는 (None, 다음 확인까지 대기 시간). 대기 시간이 None이면 새 요청까지 대기.
+        """
+        global_delay = max(self._global.delay(now), self._global_paused_until - now)
+        wait: float | None = None
+        ready: _SendRequest | None = None
+
+        # 같은 채팅방은 가장 앞선 요청만 후보 (순서 보장)
+        for chat_id, queue in self._pending.items():
+            if chat_id in self._inflight_chats:
+                continue
+
+            request = queue[0][2]
+            delay = max(
+                global_delay,
+                self._chat_bucket(chat_id).delay(now),
+                self._paused_until.get(chat_id, 0.0) - now,
+            )
+            if delay > 0:
+                wait = delay if wait is None else min(wait, delay)
+            elif ready is None or request.sort_key < ready.sort_key:
+                ready = request
+
+        if ready is not None:
+            return ready, None
+        return None, wait
+
+    async def _run(self):
+        """전송 루프: 보낼 수 있는 요청을 골라 전송 태스크로 실행"""
+        while True:
+            now = self._clock()
+            request, wait = self._pick_ready(now)
+
+            if request is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except TimeoutError:
+                    pass
+                continue
+
+            self._pop(request.chat_id)
+            self._global.consume(now)
+            self._chat_bucket(request.chat_id).consume(now)
+            self._inflight_chats.add(request.chat_id)
+            task = asyncio.create_task(self._deliver(request))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _deliver(self, request: _SendRequest):
+        """요청 1건 전송 (RetryAfter면 채팅방과 전체 전송을 멈추고 다시 대기열에 넣음)"""
+        try:
+            result = await request.send()
+        except RetryAfter as e:
+            resume_at = self._clock() + _retry_after_seconds(e)
+            self._paused_until[request.chat_id] = resume_at
+            self._global_paused_until = max(self._global_paused_until, resume_at)
+            if request.attempts < self._max_retries and not request.future.done():
+                request.attempts += 1
+                self._retried += 1
+                self._push(request)
+            else:
+                self._failed += 1
+                if not request.future.done():
+                    request.future.set_exception(e)
+        except Exception as e:  # noqa: BLE001 - 호출한 쪽 future로 그대로 전달
+            self._failed += 1
+            if not request.future.done():
+                request.future.set_exception(e)
+        else:
+            self._sent += 1
+            self._latencies.append(self._clock() - request.enqueued_at)
+            if not request.future.done():
+                request.future.set_result(result)
+        finally:
+            self._inflight_chats.discard(request.chat_id)
+            self._wakeup.set()
+
+    # ----------------------------------------------------------
+    # 통계
+    # ----------------------------------------------------------
+
+    @property
+    def depth(self) -> int:
+        """대기 중인 메시지 수 (전송 중 포함)"""
+        pending = sum(len(queue) for queue in self._pending.values())
+        return pending + len(self._inflight_chats)
+
+    def stats(self) -> dict:
+        """대기열 통계
+
+        Returns:
+            {
+                "depth": 3,              # 대기 + 전송 중 메시지 수
+                "sent": 120,             # 전송 성공 누적
+                "failed": 1,             # 전송 실패 누적
+                "retried": 2,            # RetryAfter 재시도 누적
+                "latency_avg": 0.42,     # 최근 평균 지연 (초, 대기 + 전송)
+                "latency_p95": 1.10,     # 최근 95% 지연 (초)
+                "latency_max": 2.31,     # 최근 최대 지연 (초)
+            }
+        """
+        latencies = sorted(self._latencies)
+        if latencies:
+            avg = sum(latencies) / len(latencies)
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            max_latency = latencies[-1]
+        else:
+            avg = p95 = max_latency = 0.0
+
+        return {
+            "depth": self.depth,
+            "sent": self._sent,
+            "failed": self._failed,
+            "retried": self._retried,
+            "latency_avg": avg,
+            "latency_p95": p95,
+            "latency_max": max_latency,
+        }
@@ -10,151 +10,247 @@ python-telegram-bot 라이브러리를 사용한 비동기 메시지 전송 및
     /report         - 현재 설정된 기간으로 리포트 요청
     /report 6mo     - 특정 기간으로 리포트 요청
     /status         - 현재 설정 확인 (관심종목, 기간 등)
+    /period 6mo     - 채팅방 기본 분석 기간 변경
+    /alerttime 0830 - 채팅방 알림 시간 변경
+    /history TSLA   - 저장된 종목 기록 조회 (외부 조회 없음)
     /help           - 도움말
+
+관심 종목, 분석 기간, 알림 시간은 채팅방별로 관리됩니다.
+스케줄 리포트는 알림 시간이 같은 채팅방끼리 묶어, 종목 합집합을 한 번만 수집한 뒤
+채팅방별 리포트로 나눠 전송합니다.
+
+업데이트 수신 방식:
+    - polling (run_telegram_bot): 별도 설정 없이 동작
+    - 웹훅 (run_telegram_webhook): 내장 HTTP 서버로 받아 동시에 처리 (webhook.py)
 """
 
 import asyncio
+import collections
 import datetime
-
+import functools
+import signal
+import time
+from types import SimpleNamespace
 from zoneinfo import ZoneInfo
+
 from telegram import Bot, BotCommand, Update
 from telegram.error import TelegramError
 from telegram.ext import Application, CommandHandler, ContextTypes
 
+from src import (
+    analytics,
+    history,
+    market_calendar,
+    metrics,
+    pipeline,
+    price_alerts,
+    profiling,
+    screener,
+    signal_state,
+    snapshot,
+    watchlist,
+)
+from src.cache import PrewarmCache, ReportCache, data_as_of, same_session
 from src.config import Config
-from src import watchlist
-from src.stock.fetcher import fetch_stock_data
-from src.stock.mdd import calculate_drawdown_from_peak, get_buy_signal
-from src.stock.ma import calculate_ma, calculate_ma_analysis
-from src.indicators.fear_greed import get_fear_greed_index
+from src.notifiers.report_format import (
+    LAYOUTS,
+    render_change_alerts,
+    render_daily_report,
+    render_history,
+    render_price_alerts,
+    render_screen_results,
+)
+from src.notifiers.send_queue import (
+    PRIORITY_BROADCAST,
+    PRIORITY_INTERACTIVE,
+    SendQueue,
+)
+from src.notifiers.webhook import WebhookServer
+from src.scheduler import (
+    DailyTrigger,
+    IntervalTrigger,
+    Job,
+    Scheduler,
+    parse_session_spec,
+)
 
 
 class TelegramNotifier:
-    """텔레그램 봇을 통한 알림 전송 (Async)"""
+    """텔레그램 봇을 통한 알림 전송 (Async)
+
+    봇 모드에서는 Application의 bot(HTTP 연결 풀 포함)을 공유하는 인스턴스 하나를
+    post_init에서 만들어 모든 리포트 전송에 재사용합니다.
 
-    def __init__(self, token: str, chat_id: str):
+    생명주기:
+        notifier = TelegramNotifier(bot=application.bot, send_queue=SendQueue())
+        await notifier.start()   # 전송 대기열 시작 (직접 만든 Bot이면 초기화)
+        ...
+        await notifier.stop()    # 남은 메시지 전송 후 종료
+
+        # 또는
+        async with TelegramNotifier(token=..., chat_id=...) as notifier:
+            ...
+    """
+
+    def __init__(
+        self,
+        token: str | None = None,
+        chat_id: str | None = None,
+        send_queue: SendQueue | None = None,
+        bot: Bot | None = None,
+    ):
         """
         Args:
-            token: 텔레그램 봇 토큰 (BotFather에서 받은 것)
-            chat_id: 메시지를 보낼 채팅방 ID
+            token: 텔레그램 봇 토큰 (BotFather에서 받은 것). bot을 넘기면 생략 가능
+            chat_id: 기본으로 메시지를 보낼 채팅방 ID
+            send_queue: 전송 대기열 (없으면 바로 전송)
+            bot: 공유할 Bot 인스턴스 (예: application.bot). 없으면 token으로 새로 생성
         """
         self.chat_id = chat_id
-        self.bot = Bot(token=token)
+        self.send_queue = send_queue
+        # 직접 만든 Bot만 직접 초기화/종료 (공유 Bot은 Application이 관리)
+        self._owns_bot = bot is None
+        self.bot = bot if bot is not None else Bot(token=token)
+        self._started = False
+
+    async def start(self):
+        """전송 준비 (직접 만든 Bot 초기화, 전송 대기열 시작)"""
+        if self._started:
+            return
+        if self._owns_bot:
+            await self.bot.initialize()
+        if self.send_queue is not None:
+            self.send_queue.start()
+        self._started = True
+
+    async def stop(self):
+        """남은 메시지를 전송하고 종료 (직접 만든 Bot의 HTTP 연결 정리)"""
+        if not self._started:
+            return
+        if self.send_queue is not None:
+            await self.send_queue.stop(drain=True)
+        if self._owns_bot:
+            await self.bot.shutdown()
+        self._started = False
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
 
-    async def send_message(self, message: str) -> dict:
-        """텔레그램으로 메시지를 전송합니다."""
+    async def _api_send(self, chat_id: str, text: str):
+        """sendMessage 1회 호출 (전송 시간/오류 메트릭 기록)"""
         try:
-            result = await self.bot.send_message(
-                chat_id=self.chat_id,
-                text=message,
-                parse_mode="HTML",
-            )
+            with metrics.TELEGRAM_SEND_SECONDS.time():
+                return await self.bot.send_message(
+                    chat_id=chat_id, text=text, parse_mode="HTML"
+                )
+        except TelegramError:
+            metrics.UPSTREAM_ERRORS.labels("telegram").inc()
+            raise
+
+    async def send_message(
+        self,
+        message: str,
+        priority: int = PRIORITY_INTERACTIVE,
+        chat_id: str | None = None,
+    ) -> dict:
+        """텔레그램으로 메시지를 전송합니다.
+
+        Args:
+            message: HTML 형식 메시지
+            priority: 전송 대기열 우선순위 (PRIORITY_INTERACTIVE / PRIORITY_BROADCAST)
+            chat_id: 대상 채팅방 ID (없으면 기본 채팅방)
+        """
+        chat_id = str(chat_id or self.chat_id)
+
+        async def _send():
+            return await self._api_send(chat_id, message)
+
+        try:
+            if self.send_queue is not None:
+                result = await self.send_queue.submit(chat_id, _send, priority)
+            else:
+                result = await _send()
             return {"ok": True, "message_id": result.message_id}
 
         except TelegramError as e:
             return {"ok": False, "error": f"Telegram API 에러: {e}"}
 
-        except Exception as e:
+        except Exception as e:  # noqa: BLE001 - 전송 실패는 결과로 반환
             return {"ok": False, "error": f"에러 발생: {e}"}
 
-    async def send_daily_report(
+    async def send_messages(
         self,
-        fear_greed: dict,
-        stock_results: list[dict],
-        period: str = "1y",
+        messages: list[str],
+        priority: int = PRIORITY_INTERACTIVE,
+        chat_id: str | None = None,
     ) -> dict:
-        """일일 리포트를 포맷팅해서 전송합니다."""
-        period_display = Config.get_period_display(period)
-        lines = []
+        """여러 메시지(페이지)를 순서대로 전송합니다.
 
-        # 헤더
-        lines.append("<b>📊 Daily Stock Report</b>")
-        lines.append("")
+        전송 대기열이 있으면 모든 페이지를 한 번에 넣어 두고 기다리므로,
+        페이지 사이에 다른 작업을 기다리지 않고 채팅방 한도 내에서 연달아 전송됩니다.
+        (같은 채팅방 메시지는 대기열이 넣은 순서대로 보냄)
 
-        # Fear & Greed Index
-        score = fear_greed.get("score")
-        if score is not None:
-            try:
-                score = float(score)
-                rating = fear_greed.get("rating", "unknown")
-                emoji = _get_fear_greed_emoji(score)
-                lines.append(f"{emoji} Fear & Greed: {score:.1f} ({rating})")
-            except (TypeError, ValueError):
-                lines.append("⚠️ Fear & Greed: 데이터 오류")
-
-            prev = fear_greed.get("previous_close")
-            if prev is not None:
-                try:
-                    diff = float(score) - float(prev)
-                    arrow = "📈" if diff >= 0 else "📉"
-                    sign = "+" if diff >= 0 else ""
-                    lines.append(f"   전일 대비: {sign}{diff:.1f} {arrow}")
-                except (TypeError, ValueError):
-                    pass
+        Returns:
+            {"ok": True, "message_id": 첫 페이지 ID, "message_ids": [...], "pages": 3}
+        """
+        if self.send_queue is None:
+            message_ids = []
+            for message in messages:
+                result = await self.send_message(message, priority, chat_id)
+                if not result.get("ok"):
+                    return result
+                message_ids.append(result["message_id"])
         else:
-            lines.append(f"⚠️ Fear & Greed: {fear_greed.get('error', 'Unknown')}")
-
-        lines.append("")
-        lines.append("")
-
-        # 고점 대비 하락률
-        lines.append(f"<b>📉 고점 대비 하락률 ({period_display})</b>")
-        lines.append("")
-
-        for item in stock_results:
-            symbol = item.get("symbol")
-            drawdown_pct = item.get("drawdown_pct")
-            peak_price = item.get("peak_price", 0)
-            current_price = item.get("current_price", 0)
-            buy_signal = item.get("buy_signal", "")
+            chat_id = str(chat_id or self.chat_id)
+
+            def _make_send(text: str):
+                async def _send():
+                    return await self._api_send(chat_id, text)
+
+                return _send
+
+            futures = [
+                self.send_queue.enqueue(chat_id, _make_send(message), priority)
+                for message in messages
+            ]
+            results = await asyncio.gather(*futures, return_exceptions=True)
+            message_ids = []
+            for result in results:
+                if isinstance(result, TelegramError):
+                    return {"ok": False, "error": f"Telegram API 에러: {result}"}
+                if isinstance(result, BaseException):
+                    return {"ok": False, "error": f"에러 발생: {result}"}
+                message_ids.append(result.message_id)
+
+        return {
+            "ok": True,
+            "message_id": message_ids[0] if message_ids else None,
+            "message_ids": message_ids,
+            "pages": len(message_ids),
+        }
 
-            if not symbol or drawdown_pct is None:
-                continue
+    async def send_daily_report(
+        self,
+        fear_greed: dict,
+        stock_results: list[dict],
+        period: str = "1y",
+        priority: int = PRIORITY_INTERACTIVE,
+        chat_id: str | None = None,
+        layout: str | None = None,
+    ) -> dict:
+        """일일 리포트를 포맷팅해서 전송합니다. (길면 여러 페이지로 나눔)
 
-            try:
-                cur = float(current_price)
-                peak = float(peak_price)
-                pct = float(drawdown_pct)
-                signal = "🔔" if buy_signal else "⏸️"
-
-                lines.append(f"<b>{symbol}</b>  {pct:.1f}%  {signal}")
-                lines.append(f"   ${cur:.2f} → ${peak:.2f}")
-
-                # TSLA 200일 이동평균선 정보 추가
-                ma_200_data = item.get("ma_200")
-                if ma_200_data and ma_200_data.get("ma_200") is not None:
-                    ma_price = ma_200_data["ma_200"]
-                    ma_diff = ma_200_data["diff_pct"]
-                    ma_trend = ma_200_data["trend"]
-                    ma_position = ma_200_data["position"]
-
-                    position_text = "위" if ma_position == "above" else "아래"
-                    sign = "+" if ma_diff >= 0 else ""
-                    lines.append(
-                        f"   📏 200일선: ${ma_price:.2f} ({sign}{ma_diff:.1f}%)"
-                    )
-                    lines.append(f"   → 현재가가 200일선 {position_text} = {ma_trend}")
-
-                lines.append("")
-            except (TypeError, ValueError):
-                continue
-
-        message = "\n".join(lines)
-        return await self.send_message(message)
-
-
-def _get_fear_greed_emoji(score: float) -> str:
-    """Fear & Greed 점수에 따른 이모지 반환"""
-    if score <= 24:
-        return "😱"  # Extreme Fear
-    elif score <= 44:
-        return "😰"  # Fear
-    elif score <= 55:
-        return "😐"  # Neutral
-    elif score <= 75:
-        return "😊"  # Greed
-    else:
-        return "🤑"  # Extreme Greed
+        Args:
+            layout: "full", "compact", "auto" (없으면 REPORT_LAYOUT 설정)
+        """
+        pages = render_daily_report(
+            fear_greed, stock_results, period, layout or Config.REPORT_LAYOUT
+        )
+        return await self.send_messages(pages, priority, chat_id)
 
 
 # ============================================================
@@ -162,57 +258,63 @@ def _get_fear_greed_emoji(score: float) -> str:
 # ============================================================
 
 
-async def _fetch_single_stock(symbol: str, period: str) -> dict | None:
-    """단일 종목 데이터를 가져와 처리합니다."""
-    data = await asyncio.to_thread(fetch_stock_data, symbol, period)
-    if data.empty:
-        return None
-
-    close_prices = data.get("Close")
-    if close_prices is None or close_prices.empty:
-        return None
+class _ProgressMessage:
+    """리포트 생성 중 임시 메시지를 완료된 종목으로 갱신 (edit_text 호출 간격 제한)"""
 
-    drawdown_data = calculate_drawdown_from_peak(close_prices)
-    buy_signal = get_buy_signal(drawdown_data.get("drawdown_pct", 0))
-
-    result = {
-        "symbol": symbol,
-        "peak_price": drawdown_data.get("peak_price", 0),
-        "current_price": drawdown_data.get("current_price", 0),
-        "drawdown_pct": drawdown_data.get("drawdown_pct", 0),
-        "buy_signal": buy_signal,
-    }
-
-    # 200일 이동평균선 분석 (활성화된 종목만)
-    if watchlist.is_ma_enabled(symbol):
-        # 200일선 계산용 데이터 결정 (부족하면 1년 데이터 사용)
-        ma_prices = close_prices
-        if len(close_prices) < 200:
-            data_1y = await asyncio.to_thread(fetch_stock_data, symbol, "1y")
-            if not data_1y.empty:
-                ma_prices = data_1y.get("Close")
-
-        # MA 계산 및 분석
-        if ma_prices is not None and len(ma_prices) >= 200:
-            ma_200 = calculate_ma(ma_prices, window=200)
-            result["ma_200"] = calculate_ma_analysis(result["current_price"], ma_200)
-
-    return result
+    def __init__(self, message, header: str, total: int, interval: float):
+        """
+        Args:
+            message: 갱신할 임시 메시지 (telegram.Message)
+            header: 첫 줄 (예: "리포트 생성 중... (1년 (52주))")
+            total: 전체 종목 수
+            interval: 최소 갱신 간격 (초)
+        """
+        self.message = message
+        self.header = header
+        self.total = total
+        self.interval = interval
+        self.lines: list[str] = []
+        self._last_edit = 0.0
+
+    async def add(self, item: dict):
+        """완료된 종목 추가 (간격이 지났을 때만 메시지 수정)"""
+        pct = item.get("drawdown_pct", 0)
+        signal = "🔔" if item.get("buy_signal") else "⏸️"
+        self.lines.append(f"{item['symbol']}  {pct:.1f}%  {signal}")
+
+        now = time.monotonic()
+        if now - self._last_edit < self.interval:
+            return
+        self._last_edit = now
 
+        text = f"{self.header} {len(self.lines)}/{self.total}\n\n" + "\n".join(
+            self.lines
+        )
+        try:
+            await self.message.edit_text(text)
+        except TelegramError:
+            pass  # 수정 실패는 무시 (최종 리포트는 별도 전송)
 
-async def _collect_report_data(period: str) -> tuple[dict, list[dict]]:
-    """리포트에 필요한 데이터를 병렬로 수집합니다."""
-    # Fear & Greed와 주식 데이터를 병렬로 수집
-    fear_greed_task = asyncio.to_thread(get_fear_greed_index)
-    symbols = watchlist.get_all()
-    stock_tasks = [_fetch_single_stock(symbol, period) for symbol in symbols]
 
-    results = await asyncio.gather(fear_greed_task, *stock_tasks)
+def _select_chat_results(
+    stock_results: list[dict], symbols: list[str], ma_symbols: list[str]
+) -> list[dict]:
+    """공유 수집 결과에서 채팅방의 관심 종목만 골라 채팅방 순서대로 반환합니다.
 
-    fear_greed = results[0]
-    stock_results = [r for r in results[1:] if r is not None]
+    MA 분석을 켜지 않은 채팅방에는 200일선 정보를 제외합니다.
+    """
+    by_symbol = {item["symbol"]: item for item in stock_results}
+    ma_set = set(ma_symbols)
 
-    return fear_greed, stock_results
+    selected = []
+    for symbol in symbols:
+        item = by_symbol.get(symbol)
+        if item is None:
+            continue
+        if symbol not in ma_set and "ma_200" in item:
+            item = {k: v for k, v in item.items() if k != "ma_200"}
+        selected.append(item)
+    return selected
 
 
 # ============================================================
@@ -228,6 +330,11 @@ BOT_COMMANDS = [
     BotCommand("add", "➕ 종목 추가"),
     BotCommand("remove", "➖ 종목 삭제"),
     BotCommand("ma", "📏 200일선 분석 설정"),
+    BotCommand("period", "📅 분석 기간 설정"),
+    BotCommand("alerttime", "⏰ 알림 시간 설정"),
+    BotCommand("alert", "🎯 가격 알림 설정"),
+    BotCommand("screen", "🔎 유니버스 스크리닝"),
+    BotCommand("history", "🗂️ 종목 기록 보기"),
     BotCommand("status", "📈 현재 설정 확인"),
     BotCommand("help", "❓ 도움말"),
 ]
@@ -245,16 +352,32 @@ async def cmd_help(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 <b>직접 입력</b>
 /report [기간] - 특정 기간 리포트
-(1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, max)"""
+(1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, max)
+/report compact - 종목당 한 줄 표 형식 (full, compact, auto)
+/period [기간] - 이 채팅방의 기본 분석 기간 변경
+/alerttime [시간] - 이 채팅방의 알림 시간 변경 (예: 0830)
+/alert [종목] below|above [가격] - 목표가 알림 (끝에 repeat를 붙이면 반복)
+/alert remove [번호] - 목표가 알림 삭제
+/screen [하락률] [기간] - 유니버스에서 고점 대비 하락률 이하 종목 찾기 (예: /screen 20)
+/history [종목] [일수] - 저장된 리포트 기록 보기 (예: /history TSLA 30)
+
+관심 종목과 설정은 채팅방별로 저장됩니다."""
 
     await update.message.reply_text(help_text, parse_mode="HTML")
 
 
+def _exchanges(symbols: list[str]) -> list[market_calendar.Exchange]:
+    """종목이 거래되는 거래소 목록 (종목이 없으면 NYSE)"""
+    exchanges = {market_calendar.exchange_for(symbol) for symbol in symbols}
+    return sorted(exchanges or {market_calendar.NYSE}, key=lambda e: e.name)
+
+
 async def cmd_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """현재 설정 확인 명령어 핸들러"""
-    symbols = watchlist.get_all()
-    ma_symbols = watchlist.get_ma_symbols()
-    period_display = Config.get_period_display(Config.ANALYSIS_PERIOD)
+    chat_id = str(update.effective_chat.id)
+    symbols = watchlist.get_all(chat_id)
+    ma_symbols = watchlist.get_ma_symbols(chat_id)
+    period_display = Config.get_period_display(watchlist.get_period(chat_id))
 
     # MA 활성화 표시
     symbol_display = []
@@ -268,28 +391,81 @@ async def cmd_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 관심 종목: {", ".join(symbol_display)}
 분석 기간: {period_display}
-알림 시간: {Config.ALERT_TIME}
+알림 시간: {watchlist.get_alert_time(chat_id)}
 
 📏 = 200일선 분석 활성화"""
 
+    # 다음 정규장 마감 전까지는 새 일봉이 없어 캐시된 데이터를 그대로 사용
+    kst = ZoneInfo("Asia/Seoul")
+    now = datetime.datetime.now(tz=kst)
+    next_closes = [
+        f"{exchange.name} "
+        f"{market_calendar.next_close(now, exchange).astimezone(kst):%m/%d %H:%M}"
+        for exchange in _exchanges(symbols)
+    ]
+    status_text += f"\n\n다음 일봉 갱신 (한국 시간): {', '.join(next_closes)}"
+
+    send_queue = _get_notifier(context).send_queue
+    if send_queue is not None:
+        stats = send_queue.stats()
+        status_text += (
+            f"\n\n전송 대기열: {stats['depth']}건"
+            f" (평균 지연 {stats['latency_avg']:.1f}초,"
+            f" p95 {stats['latency_p95']:.1f}초)"
+        )
+
+    skews = context.application.bot_data.get("delivery_skew")
+    if skews:
+        last = skews[-1]
+        status_text += (
+            f"\n최근 스케줄 리포트 ({last['alert_time']}): "
+            f"지연 {last['first_skew']:.1f}~{last['max_skew']:.1f}초"
+        )
+
     await update.message.reply_text(status_text, parse_mode="HTML")
 
 
 async def cmd_report(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """리포트 요청 명령어 핸들러"""
-    # 기간 파싱 (/report 6mo 형태)
-    if context.args and len(context.args) > 0:
-        period = context.args[0].lower()
-        if not Config.is_valid_period(period):
+    chat_id = str(update.effective_chat.id)
+
+    # 기간/레이아웃 파싱 (/report 6mo, /report compact, /report 1y compact 형태)
+    period = watchlist.get_period(chat_id)
+    layout = Config.REPORT_LAYOUT
+    for arg in context.args or []:
+        arg = arg.lower()
+        if arg in LAYOUTS:
+            layout = arg
+        elif Config.is_valid_period(arg):
+            period = arg
+        else:
             await update.message.reply_text(
-                f"유효하지 않은 기간: {period}\n"
-                f"사용 가능: {', '.join(Config.VALID_PERIODS)}"
+                f"유효하지 않은 기간: {arg}\n"
+                f"사용 가능: {', '.join(Config.VALID_PERIODS)}\n"
+                f"레이아웃: {', '.join(LAYOUTS)}"
             )
             return
-    else:
-        period = Config.ANALYSIS_PERIOD
 
     period_display = Config.get_period_display(period)
+    notifier = _get_notifier(context)
+    report_cache = _get_report_cache(context)
+    symbols = watchlist.get_all(chat_id)
+    as_of = data_as_of(symbols=symbols)
+    cache_key = ReportCache.make_key(
+        period, watchlist.get_version(chat_id), as_of, layout
+    )
+
+    # 같은 기간/종목/데이터 기준 시점의 리포트가 있으면 바로 전송
+    cached_pages = report_cache.get(cache_key)
+    if cached_pages is not None:
+        result = await notifier.send_messages(
+            cached_pages, PRIORITY_INTERACTIVE, chat_id
+        )
+        if not result.get("ok"):
+            await update.message.reply_text(
+                f"리포트 전송 실패: {result.get('error', 'Unknown')}"
+            )
+        return
 
     processing_msg = None
     try:
@@ -297,13 +473,41 @@ async def cmd_report(update: Update, context: ContextTypes.DEFAULT_TYPE):
             f"리포트 생성 중... ({period_display})"
         )
 
-        fear_greed, stock_results = await _collect_report_data(period)
+        on_result = None
+        if Config.REPORT_STREAMING:
+            # 완료되는 종목부터 임시 메시지에 표시 (느린 종목을 기다리지 않음)
+            progress = _ProgressMessage(
+                processing_msg,
+                header=f"리포트 생성 중... ({period_display})",
+                total=len(symbols),
+                interval=Config.REPORT_PROGRESS_INTERVAL,
+            )
+            on_result = progress.add
+
+        with metrics.REPORT_BUILD_SECONDS.labels("command").time():
+            with profiling.span("collect"):
+                collected = await pipeline.collect_report_data(
+                    period,
+                    symbols,
+                    watchlist.get_ma_symbols(chat_id),
+                    on_result,
+                    as_of=as_of,
+                )
+            fear_greed, stock_results, timed_out = collected
+            await asyncio.to_thread(
+                history.record, period, stock_results, fear_greed, "command"
+            )
 
-        notifier = TelegramNotifier(
-            token=Config.TELEGRAM_BOT_TOKEN,
-            chat_id=str(update.effective_chat.id),
-        )
-        result = await notifier.send_daily_report(fear_greed, stock_results, period)
+            # 최종 리포트는 watchlist 순서로 정렬된 전체 결과
+            with profiling.span("render"):
+                pages = render_daily_report(
+                    fear_greed, stock_results, period, layout, timed_out=timed_out
+                )
+        # 시간 초과 종목이 있는 리포트는 캐시하지 않음 (다음 요청에서 다시 수집)
+        if not timed_out:
+            report_cache.put(cache_key, pages)
+        with profiling.span("send"):
+            result = await notifier.send_messages(pages, PRIORITY_INTERACTIVE, chat_id)
 
         # 임시 메시지 삭제 (실패해도 무시)
         try:
@@ -316,7 +520,7 @@ async def cmd_report(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 f"리포트 전송 실패: {result.get('error', 'Unknown')}"
             )
 
-    except Exception as e:
+    except Exception as e:  # noqa: BLE001 - 사용자에게는 일반 오류 메시지만 전송
         print(f"cmd_report 오류: {e}")  # 서버 로그에만 기록
         error_msg = "리포트 생성 중 오류가 발생했습니다."
         if processing_msg:
@@ -339,8 +543,9 @@ async def cmd_report_3mo(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def cmd_list(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """관심 종목 목록 보기"""
-    symbols = watchlist.get_all()
-    ma_symbols = watchlist.get_ma_symbols()
+    chat_id = str(update.effective_chat.id)
+    symbols = watchlist.get_all(chat_id)
+    ma_symbols = watchlist.get_ma_symbols(chat_id)
 
     if not symbols:
         await update.message.reply_text("등록된 관심 종목이 없습니다.")
@@ -369,11 +574,12 @@ async def cmd_add(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("사용법: /add 종목코드\n예: /add AAPL")
         return
 
+    chat_id = str(update.effective_chat.id)
     symbol = context.args[0].upper()
-    success, message = watchlist.add(symbol)
+    success, message = watchlist.add(symbol, chat_id)
 
     if success:
-        symbols = watchlist.get_all()
+        symbols = watchlist.get_all(chat_id)
         text = f"✅ {message}\n현재 종목: {', '.join(symbols)}"
     else:
         text = f"⚠️ {message}"
@@ -387,11 +593,12 @@ async def cmd_remove(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("사용법: /remove 종목코드\n예: /remove AAPL")
         return
 
+    chat_id = str(update.effective_chat.id)
     symbol = context.args[0].upper()
-    success, message = watchlist.remove(symbol)
+    success, message = watchlist.remove(symbol, chat_id)
 
     if success:
-        symbols = watchlist.get_all()
+        symbols = watchlist.get_all(chat_id)
         if symbols:
             text = f"✅ {message}\n현재 종목: {', '.join(symbols)}"
         else:
@@ -404,8 +611,9 @@ async def cmd_remove(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def cmd_ma(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """200일선 분석 설정"""
+    chat_id = str(update.effective_chat.id)
     if len(context.args) < 2:
-        ma_symbols = watchlist.get_ma_symbols()
+        ma_symbols = watchlist.get_ma_symbols(chat_id)
         if ma_symbols:
             text = f"사용법: /ma 종목코드 on|off\n예: /ma AAPL on\n\n현재 MA 활성화: {', '.join(ma_symbols)}"
         else:
@@ -423,10 +631,10 @@ async def cmd_ma(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     enabled = action == "on"
-    success, message = watchlist.set_ma(symbol, enabled)
+    success, message = watchlist.set_ma(symbol, enabled, chat_id)
 
     if success:
-        ma_symbols = watchlist.get_ma_symbols()
+        ma_symbols = watchlist.get_ma_symbols(chat_id)
         if ma_symbols:
             text = f"✅ {message}\nMA 활성화 종목: {', '.join(ma_symbols)}"
         else:
@@ -437,29 +645,531 @@ async def cmd_ma(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text(text)
 
 
-async def scheduled_daily_report(context: ContextTypes.DEFAULT_TYPE):
-    """매일 정해진 시간에 자동으로 리포트를 전송합니다."""
-    chat_id = context.job.chat_id
-    period = Config.ANALYSIS_PERIOD
+async def cmd_period(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """채팅방 기본 분석 기간 설정"""
+    chat_id = str(update.effective_chat.id)
+    if not context.args:
+        period_display = Config.get_period_display(watchlist.get_period(chat_id))
+        await update.message.reply_text(
+            f"사용법: /period 기간\n예: /period 6mo\n\n현재 분석 기간: {period_display}"
+        )
+        return
+
+    success, message = watchlist.set_period(context.args[0], chat_id)
+    text = f"✅ {message}" if success else f"⚠️ {message}"
+    await update.message.reply_text(text)
+
+
+async def cmd_alerttime(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """채팅방 알림 시간 설정"""
+    chat_id = str(update.effective_chat.id)
+    if not context.args:
+        await update.message.reply_text(
+            "사용법: /alerttime 시간\n예: /alerttime 0830\n\n"
+            f"현재 알림 시간: {watchlist.get_alert_time(chat_id)}"
+        )
+        return
+
+    success, message = watchlist.set_alert_time(context.args[0], chat_id)
+    if success:
+        # 알림 시간이 바뀌었으므로 스케줄 재등록 (스케줄을 맡은 프로세스만)
+        if Config.SCHEDULER_ENABLED:
+            _schedule_daily_reports(context.application)
+        text = f"✅ {message}"
+    else:
+        text = f"⚠️ {message}"
+    await update.message.reply_text(text)
+
+
+ALERT_USAGE = (
+    "사용법: /alert 종목코드 below|above 가격 [repeat]\n"
+    "예: /alert TSLA below 350\n"
+    "삭제: /alert remove 번호"
+)
+
 
-    print(f"[{datetime.datetime.now()}] 스케줄 리포트 전송 시작")
+async def cmd_alert(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """목표가 알림 설정/삭제/목록"""
+    chat_id = str(update.effective_chat.id)
+    args = context.args or []
+
+    if not args:
+        alerts = price_alerts.get_alerts(chat_id)
+        if alerts:
+            lines = [f"#{a['id']} {price_alerts.format_alert(a)}" for a in alerts]
+            text = f"{ALERT_USAGE}\n\n현재 알림:\n" + "\n".join(lines)
+        else:
+            text = f"{ALERT_USAGE}\n\n등록된 알림 없음"
+        await update.message.reply_text(text)
+        return
+
+    if args[0].lower() in ("remove", "del"):
+        if len(args) < 2 or not args[1].lstrip("#").isdigit():
+            await update.message.reply_text(ALERT_USAGE)
+            return
+        success, message = price_alerts.remove(int(args[1].lstrip("#")), chat_id)
+    else:
+        if len(args) < 3:
+            await update.message.reply_text(ALERT_USAGE)
+            return
+        try:
+            price = float(args[2].replace(",", "").lstrip("$"))
+        except ValueError:
+            await update.message.reply_text(
+                f"⚠️ 가격을 숫자로 입력해주세요.\n{ALERT_USAGE}"
+            )
+            return
+        repeat = len(args) > 3 and args[3].lower() == "repeat"
+        success, message = price_alerts.add(
+            args[0], args[1].lower(), price, repeat, chat_id
+        )
+
+    text = f"✅ {message}" if success else f"⚠️ {message}"
+    await update.message.reply_text(text)
+
+
+SCREEN_USAGE = (
+    "사용법: /screen [하락률] [기간]\n"
+    "예: /screen 20 1y (고점 대비 -20% 이하 종목)\n"
+    "유니버스 파일의 종목을 조회합니다."
+)
+
+# 스크리닝 진행 메시지에 표시할 종목 수
+SCREEN_PROGRESS_LINES = 10
+
+
+async def cmd_screen(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """유니버스 스크리닝 (고점 대비 하락률 기준 이하 종목 찾기)"""
+    chat_id = str(update.effective_chat.id)
+    period = watchlist.get_period(chat_id)
+    threshold = Config.SCREEN_THRESHOLD
+    for arg in context.args or []:
+        arg = arg.lower()
+        if Config.is_valid_period(arg):
+            period = arg
+            continue
+        try:
+            # "20", "-20", "20%" 모두 -20%로
+            threshold = -abs(float(arg.rstrip("%")))
+        except ValueError:
+            await update.message.reply_text(SCREEN_USAGE)
+            return
 
     try:
-        fear_greed, stock_results = await _collect_report_data(period)
+        symbols = screener.load_universe()
+    except FileNotFoundError:
+        await update.message.reply_text(
+            f"⚠️ 유니버스 파일이 없습니다: {screener.universe_file()}\n{SCREEN_USAGE}"
+        )
+        return
+    if not symbols:
+        await update.message.reply_text("⚠️ 유니버스 파일에 종목이 없습니다.")
+        return
 
-        notifier = TelegramNotifier(
-            token=Config.TELEGRAM_BOT_TOKEN,
-            chat_id=str(chat_id),
+    processing_msg = None
+    try:
+        processing_msg = await update.message.reply_text(
+            f"스크리닝 중... ({len(symbols)}개 종목)"
+        )
+        last_edit = 0.0
+
+        async def on_progress(done: int, total: int, results: list[dict]):
+            # 묶음이 끝날 때마다 지금까지의 상위 종목 표시 (수정 간격 제한)
+            nonlocal last_edit
+            now = time.monotonic()
+            if done == total or now - last_edit < Config.REPORT_PROGRESS_INTERVAL:
+                return
+            last_edit = now
+            matches = screener.rank(results, threshold)[:SCREEN_PROGRESS_LINES]
+            lines = [
+                f"{item['symbol']}  {item['drawdown_pct']:.1f}%" for item in matches
+            ]
+            try:
+                await processing_msg.edit_text(
+                    f"스크리닝 중... {done}/{total} 묶음\n\n" + "\n".join(lines)
+                )
+            except TelegramError:
+                pass
+
+        screen = await screener.screen(symbols, period, on_progress)
+        pages = render_screen_results(screen, threshold)
+        result = await _get_notifier(context).send_messages(
+            pages, PRIORITY_INTERACTIVE, chat_id
         )
-        result = await notifier.send_daily_report(fear_greed, stock_results, period)
 
-        if result.get("ok"):
-            print("  -> 전송 완료")
+        try:
+            await processing_msg.delete()
+        except TelegramError:
+            pass
+
+        if not result.get("ok"):
+            await update.message.reply_text(
+                f"스크리닝 결과 전송 실패: {result.get('error', 'Unknown')}"
+            )
+
+    except Exception as e:  # noqa: BLE001 - 사용자에게는 일반 오류 메시지만 전송
+        print(f"cmd_screen 오류: {e}")  # 서버 로그에만 기록
+        error_msg = "스크리닝 중 오류가 발생했습니다."
+        if processing_msg:
+            await processing_msg.edit_text(error_msg)
         else:
-            print(f"  -> 전송 실패: {result.get('error')}")
+            await update.message.reply_text(error_msg)
 
-    except Exception as e:
-        print(f"  -> 오류: {e}")
+
+HISTORY_USAGE = (
+    "사용법: /history 종목코드 [일수]\n"
+    "예: /history TSLA 30\n"
+    "리포트마다 저장한 값을 보여줍니다. (채팅방 분석 기간 기준)"
+)
+
+
+async def cmd_history(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """저장된 종목 기록 조회 (외부 데이터 조회 없이 저장소에서만)"""
+    chat_id = str(update.effective_chat.id)
+    args = context.args or []
+    if not args or len(args) > 2:
+        await update.message.reply_text(HISTORY_USAGE)
+        return
+
+    symbol = args[0].upper()
+    days = history.DEFAULT_DAYS
+    if len(args) == 2:
+        if not args[1].isdigit() or int(args[1]) < 1:
+            await update.message.reply_text(
+                f"⚠️ 일수를 1 이상의 숫자로 입력해주세요.\n{HISTORY_USAGE}"
+            )
+            return
+        days = int(args[1])
+
+    period = watchlist.get_period(chat_id)
+    rows = await asyncio.to_thread(history.query, symbol, days, period)
+    pages = render_history(symbol, rows, period, days)
+    result = await _get_notifier(context).send_messages(
+        pages, PRIORITY_INTERACTIVE, chat_id
+    )
+    if not result.get("ok"):
+        await update.message.reply_text(
+            f"기록 전송 실패: {result.get('error', 'Unknown')}"
+        )
+
+
+def _current_prices(stock_results: list[dict]) -> dict[str, float]:
+    """분석 결과의 종목별 현재가 (가격 알림 평가용)"""
+    return {
+        item["symbol"]: item["current_price"]
+        for item in stock_results
+        if item.get("current_price") is not None
+    }
+
+
+async def prewarm_daily_report(context: ContextTypes.DEFAULT_TYPE):
+    """알림 시간 직전에 리포트 데이터를 미리 수집/분석합니다.
+
+    결과는 알림 시각의 데이터 기준 시점으로 저장되어, 알림 시각의
+    scheduled_daily_report는 수집 없이 렌더링/전송만 합니다.
+    """
+    alert_time = context.job.data["alert_time"]
+    chat_ids = _job_chat_ids(context.job.data)
+    prewarm_cache = _get_prewarm_cache(context)
+    send_at = context.job.scheduled_at + datetime.timedelta(
+        seconds=Config.PREWARM_LEAD_SECONDS
+    )
+
+    started = time.monotonic()
+    prewarm_cache.begin(alert_time)
+    try:
+        for period, period_chat_ids in watchlist.get_chats_by_period(chat_ids).items():
+            try:
+                symbols = watchlist.get_union_symbols(period_chat_ids)
+                ma_symbols = watchlist.get_union_ma_symbols(period_chat_ids)
+                as_of = data_as_of(send_at, symbols=symbols)
+                collected_as_of = data_as_of(symbols=symbols)
+                if not same_session(collected_as_of, as_of):
+                    # 지금 받는 데이터가 알림 시각의 데이터가 아님 (장전 값을 장중 값으로 보내지 않도록)
+                    print(
+                        f"  -> {period}: 알림 시각 전에 장이 열리거나 닫혀 사전 수집 건너뜀"
+                    )
+                    continue
+                with (
+                    metrics.REPORT_BUILD_SECONDS.labels("prewarm").time(),
+                    profiling.span("prewarm"),
+                ):
+                    # 수집 시점 기준으로 저장해 이후 /report와 재시작 후 snapshot에서도 재사용
+                    collected = await pipeline.collect_report_data(
+                        period, symbols, ma_symbols, as_of=collected_as_of
+                    )
+                fear_greed, stock_results, timed_out = collected
+                if timed_out:
+                    # 알림 시각에 다시 수집 (시간 초과 종목을 이전 값으로 보내지 않도록)
+                    print(f"  -> {period} 사전 수집 시간 초과 종목: {timed_out}")
+                    continue
+                prewarm_cache.put(
+                    alert_time,
+                    period,
+                    as_of,
+                    symbols,
+                    ma_symbols,
+                    fear_greed,
+                    stock_results,
+                )
+            except Exception as e:  # noqa: BLE001 - 실패하면 알림 시각에 다시 수집
+                print(f"  -> {period} 사전 수집 오류: {e}")
+    finally:
+        prewarm_cache.finish(alert_time)
+
+    print(
+        f"[{datetime.datetime.now()}] {alert_time} 리포트 사전 수집 완료 "
+        f"({time.monotonic() - started:.1f}초)"
+    )
+
+
+async def scheduled_daily_report(context: ContextTypes.DEFAULT_TYPE):
+    """매일 정해진 시간에 자동으로 리포트를 전송합니다.
+
+    알림 시간이 같은 채팅방들을 분석 기간별로 묶어, 종목 합집합을 한 번만
+    수집/분석한 뒤 채팅방별 리포트로 나눠 전송합니다.
+    ALERT_MODE가 changes/both이면 매수 단계/200일선 위치가 바뀐 종목만 짧게 알립니다.
+    사전 수집된 데이터가 있으면 수집을 건너뛰고, 실행마다 전송 지연(skew)을 기록합니다.
+    """
+    alert_time = context.job.data["alert_time"]
+    chat_ids = _job_chat_ids(context.job.data)
+    notifier = _get_notifier(context)
+    report_cache = _get_report_cache(context)
+    prewarm_cache = _get_prewarm_cache(context)
+    scheduled_at = context.job.scheduled_at
+
+    print(
+        f"[{datetime.datetime.now()}] 스케줄 리포트 전송 시작 (채팅방 {len(chat_ids)}개)"
+    )
+
+    # 사전 수집이 알림 시각까지 끝나지 않았으면 마저 기다림 (중복 수집 방지)
+    await prewarm_cache.wait(alert_time)
+
+    skews = []
+    prewarmed = True
+    for period, period_chat_ids in watchlist.get_chats_by_period(chat_ids).items():
+        try:
+            symbols = watchlist.get_union_symbols(period_chat_ids)
+            ma_symbols = watchlist.get_union_ma_symbols(period_chat_ids)
+            as_of = data_as_of(symbols=symbols)
+            collected = prewarm_cache.take(
+                alert_time, period, as_of, symbols, ma_symbols
+            )
+            if collected is None:
+                prewarmed = False
+                with (
+                    metrics.REPORT_BUILD_SECONDS.labels("scheduled").time(),
+                    profiling.span("collect"),
+                ):
+                    collected = await pipeline.collect_report_data(
+                        period, symbols, ma_symbols, as_of=as_of
+                    )
+                print(f"  -> {period}: 종목 {len(symbols)}개 수집 완료")
+            else:
+                print(f"  -> {period}: 사전 수집 데이터 사용")
+                collected = (
+                    *collected,
+                    [],
+                )  # 사전 수집은 시간 초과 없이 끝난 것만 저장
+            fear_greed, stock_results, timed_out = collected
+        except Exception as e:  # noqa: BLE001 - 한 기간의 오류로 다른 기간 전송을 막지 않음
+            print(f"  -> {period} 수집 오류: {e}")
+            continue
+
+        await asyncio.to_thread(
+            history.record, period, stock_results, fear_greed, "scheduled"
+        )
+
+        # 매수 단계/200일선 위치 변화 (모드와 관계없이 상태는 항상 갱신, 새 값으로만)
+        fresh = pipeline.fresh_results(stock_results)
+        changes = signal_state.update(period, fresh, period_chat_ids)
+        if any(changes.values()):
+            print(
+                f"  -> {period}: 신호 변화 {sum(map(len, changes.values()))}건 (채팅방별 합계)"
+            )
+        # 목표가 도달 (알림 방식과 관계없이 항상 전송)
+        fired = price_alerts.evaluate(_current_prices(fresh), period_chat_ids)
+        if fired:
+            print(f"  -> {period}: 목표가 도달 {len(fired)}건")
+
+        for chat_id in period_chat_ids:
+            try:
+                messages = []
+                if Config.ALERT_MODE in ("report", "both"):
+                    chat_symbols = watchlist.get_all(chat_id)
+                    chat_results = _select_chat_results(
+                        stock_results,
+                        chat_symbols,
+                        watchlist.get_ma_symbols(chat_id),
+                    )
+                    chat_timed_out = [s for s in timed_out if s in chat_symbols]
+                    with profiling.span("render"):
+                        pages = render_daily_report(
+                            fear_greed,
+                            chat_results,
+                            period,
+                            Config.REPORT_LAYOUT,
+                            timed_out=chat_timed_out,
+                        )
+                    # 직후의 /report 요청은 캐시로 바로 응답 (시간 초과 종목이 없을 때만)
+                    if not chat_timed_out:
+                        report_cache.put(
+                            ReportCache.make_key(
+                                period,
+                                watchlist.get_version(chat_id),
+                                as_of,
+                                Config.REPORT_LAYOUT,
+                            ),
+                            pages,
+                        )
+                    messages.extend(pages)
+                if Config.ALERT_MODE in ("changes", "both"):
+                    messages.extend(render_change_alerts(changes[chat_id], period))
+                messages.extend(
+                    render_price_alerts(price_alerts.select_chat_alerts(fired, chat_id))
+                )
+
+                if not messages:
+                    print(f"  -> {chat_id}: 신호 변화 없음, 전송 생략")
+                    continue
+
+                with profiling.span("send"):
+                    result = await notifier.send_messages(
+                        messages, PRIORITY_BROADCAST, chat_id
+                    )
+
+                if result.get("ok"):
+                    skew = (
+                        datetime.datetime.now(tz=scheduled_at.tzinfo) - scheduled_at
+                    ).total_seconds()
+                    skews.append(skew)
+                    print(f"  -> {chat_id}: 전송 완료 (지연 {skew:.1f}초)")
+                else:
+                    print(f"  -> {chat_id}: 전송 실패: {result.get('error')}")
+
+            except Exception as e:  # noqa: BLE001 - 한 채팅방의 오류로 다른 채팅방 전송을 막지 않음
+                print(f"  -> {chat_id}: 오류: {e}")
+
+    if skews:
+        record = {
+            "alert_time": alert_time,
+            "scheduled_at": scheduled_at.isoformat(),
+            "prewarmed": prewarmed,
+            "chats": len(skews),
+            "first_skew": min(skews),
+            "max_skew": max(skews),
+        }
+        context.application.bot_data["delivery_skew"].append(record)
+        print(
+            f"  전송 지연: 첫 {record['first_skew']:.1f}초 / 최대 {record['max_skew']:.1f}초"
+            f" ({'사전 수집' if prewarmed else '즉시 수집'})"
+        )
+
+    # --profile: 봇 모드는 종료 전까지 요약을 볼 수 없으므로 리포트마다 누적 요약 출력
+    if profiling.is_enabled():
+        print(profiling.format_summary())
+
+
+def _job_callback(application, callback):
+    """스케줄러 작업을 봇 콜백 형태(context.application, context.job)로 호출"""
+
+    async def _run(job: Job):
+        await callback(SimpleNamespace(application=application, job=job))
+
+    return _run
+
+
+# 다른 프로세스(SCHEDULER_ENABLED=false)의 /alerttime 변경을 확인하는 간격 (초)
+SCHEDULE_SYNC_INTERVAL = 60
+
+
+def _job_chat_ids(data: dict) -> list[str]:
+    """스케줄 작업의 전송 대상 채팅방 (실행 시점의 watchlist 기준)
+
+    등록 후 다른 프로세스에서 채팅방이 추가되거나 알림 시간이 바뀌어도 반영됩니다.
+    """
+    if data.get("all_chats"):
+        return watchlist.get_chat_ids()
+    return watchlist.get_chats_by_alert_time().get(data["alert_time"], [])
+
+
+async def sync_schedule(context: ContextTypes.DEFAULT_TYPE):
+    """watchlist의 알림 시간 목록이 등록한 스케줄과 다르면 다시 등록합니다."""
+    application = context.application
+    if sorted(watchlist.get_chats_by_alert_time()) != application.bot_data.get(
+        "alert_times"
+    ):
+        print("알림 시간 변경 감지 → 스케줄 재등록")
+        _schedule_daily_reports(application)
+
+
+def _schedule_daily_reports(application):
+    """채팅방 알림 시간별 일일 리포트(사전 수집 + 전송)와 정규장 기준 리포트를 (재)등록합니다.
+
+    전송 대상 채팅방은 작업이 실행될 때 watchlist에서 다시 읽습니다.
+    SCHEDULE_SKIP_UNCHANGED이면 채팅방 종목이 거래되는 모든 거래소가 주말/휴장일이라
+    새 주가 데이터가 없는 날은 건너뜁니다.
+    """
+    scheduler: Scheduler = application.bot_data["scheduler"]
+    scheduler.remove("daily_report:", "prewarm:", "session_report:")
+
+    lead = datetime.timedelta(seconds=max(0, Config.PREWARM_LEAD_SECONDS))
+    skip_unchanged = Config.SCHEDULE_SKIP_UNCHANGED
+
+    def _when(offset: datetime.timedelta, data: dict):
+        if not skip_unchanged:
+            return None
+        # 실행 시점의 채팅방/종목 기준 (등록 후 /add로 KRX 종목이 추가될 수 있음)
+        return lambda at: any(
+            market_calendar.has_new_data(at + offset, exchange)
+            for exchange in _exchanges(watchlist.get_union_symbols(_job_chat_ids(data)))
+        )
+
+    chats_by_alert_time = watchlist.get_chats_by_alert_time()
+    application.bot_data["alert_times"] = sorted(chats_by_alert_time)
+    for alert_time, chat_ids in chats_by_alert_time.items():
+        send_time = _parse_alert_time(alert_time)
+        data = {"alert_time": alert_time}
+        scheduler.add(
+            Job(
+                f"daily_report:{alert_time}",
+                _job_callback(application, scheduled_daily_report),
+                DailyTrigger(send_time, when=_when(datetime.timedelta(), data)),
+                data=data,
+            )
+        )
+        if lead:
+            prewarm_time = (
+                datetime.datetime.combine(datetime.date.today(), send_time) - lead
+            ).timetz()
+            scheduler.add(
+                Job(
+                    f"prewarm:{alert_time}",
+                    _job_callback(application, prewarm_daily_report),
+                    DailyTrigger(prewarm_time, when=_when(lead, data)),
+                    data=data,
+                )
+            )
+        print(
+            f"스케줄 등록: 매일 {alert_time}에 리포트 전송 (채팅방 {len(chat_ids)}개)"
+        )
+
+    # 정규장 기준 리포트 (예: 개장 30분 전, 마감 15분 후) → 모든 채팅방
+    for spec in filter(None, (s.strip() for s in Config.SESSION_REPORTS.split(","))):
+        try:
+            trigger = parse_session_spec(spec)
+        except ValueError as e:
+            print(f"SESSION_REPORTS 무시: {e}")
+            continue
+        scheduler.add(
+            Job(
+                f"session_report:{spec}",
+                _job_callback(application, scheduled_daily_report),
+                trigger,
+                data={"alert_time": spec, "all_chats": True},
+            )
+        )
+        print(f"스케줄 등록: 거래일 정규장 {spec}분에 리포트 전송 (모든 채팅방)")
 
 
 def _parse_alert_time(alert_time: str) -> datetime.time:
@@ -486,42 +1196,300 @@ def _parse_alert_time(alert_time: str) -> datetime.time:
         return datetime.time(hour=9, minute=0, tzinfo=kst)
 
 
+def create_send_queue() -> SendQueue:
+    """설정값으로 전송 대기열 생성"""
+    return SendQueue(
+        global_rate=Config.SEND_GLOBAL_RATE,
+        chat_rate=Config.SEND_CHAT_RATE,
+        group_rate_per_min=Config.SEND_GROUP_RATE_PER_MIN,
+        max_retries=Config.SEND_MAX_RETRIES,
+    )
+
+
+def _get_notifier(context: ContextTypes.DEFAULT_TYPE) -> TelegramNotifier:
+    """post_init에서 만든 공유 TelegramNotifier 반환"""
+    return context.application.bot_data["notifier"]
+
+
+def _get_report_cache(context: ContextTypes.DEFAULT_TYPE) -> ReportCache:
+    """post_init에서 만든 리포트 캐시 반환"""
+    return context.application.bot_data["report_cache"]
+
+
+def _get_prewarm_cache(context: ContextTypes.DEFAULT_TYPE) -> PrewarmCache:
+    """post_init에서 만든 사전 수집 캐시 반환"""
+    return context.application.bot_data["prewarm_cache"]
+
+
 async def post_init(application):
-    """봇 시작 시 메뉴 명령어 등록"""
+    """봇 시작 시 메뉴 명령어 등록 및 공유 notifier 시작"""
     await application.bot.set_my_commands(BOT_COMMANDS)
     print("봇 메뉴 명령어 등록 완료")
 
+    # Application의 bot(이미 초기화된 HTTP 연결 풀)을 모든 리포트 전송에 재사용
+    notifier = TelegramNotifier(
+        bot=application.bot,
+        chat_id=Config.TELEGRAM_CHAT_ID,
+        send_queue=create_send_queue(),
+    )
+    await notifier.start()
+    _init_report_state(application, notifier)
+    _start_snapshots(application)
+    _start_scheduler(application)
+    await _start_metrics(application)
+
 
-def run_telegram_bot():
-    """텔레그램 봇 실행 (polling 모드 + 스케줄러)"""
-    application = (
+async def post_stop(application):
+    """봇 종료 시 스케줄러를 멈추고, 남은 메시지를 보낸 뒤 notifier 종료 (HTTP 연결이 닫히기 전)"""
+    await _stop_metrics(application)
+
+    scheduler = application.bot_data.pop("scheduler", None)
+    if scheduler is not None:
+        await scheduler.stop()
+
+    await _stop_snapshots(application)
+
+    notifier = application.bot_data.pop("notifier", None)
+    if notifier is not None:
+        await notifier.stop()
+
+    # 계산 작업자 프로세스 종료
+    analytics.shutdown()
+
+
+def _init_report_state(application, notifier: TelegramNotifier):
+    """리포트 전송에 쓰는 공유 객체를 bot_data에 준비"""
+    application.bot_data["notifier"] = notifier
+    application.bot_data["report_cache"] = ReportCache()
+    # 재시작 전에 저장한 캐시 중 지금도 유효한 것 복원
+    restored = snapshot.restore(application.bot_data["report_cache"])
+    if restored["results"] or restored["reports"]:
+        print(
+            f"snapshot 복원: 종목 결과 {restored['results']}개, "
+            f"리포트 {restored['reports']}개"
+        )
+    application.bot_data["prewarm_cache"] = PrewarmCache()
+    # 스케줄 리포트 실행별 전송 지연 기록 (최근 30회)
+    application.bot_data["delivery_skew"] = collections.deque(maxlen=30)
+    application.bot_data["scheduler"] = Scheduler(
+        misfire_grace=Config.SCHEDULE_MISFIRE_GRACE
+    )
+
+
+async def _snapshot_loop(report_cache: ReportCache):
+    """SNAPSHOT_INTERVAL초마다 캐시 snapshot 저장 (비정상 종료에 대비)"""
+    while True:
+        await asyncio.sleep(Config.SNAPSHOT_INTERVAL)
+        # 상태는 이벤트 루프에서 복사하고, 파일 쓰기만 스레드에서
+        await asyncio.to_thread(snapshot.write, snapshot.capture(report_cache))
+
+
+def _start_snapshots(application):
+    """주기적 snapshot 저장 시작 (SNAPSHOT_ENABLED이고 간격이 0보다 클 때)"""
+    if not Config.SNAPSHOT_ENABLED or Config.SNAPSHOT_INTERVAL <= 0:
+        return
+    application.bot_data["snapshot_task"] = asyncio.create_task(
+        _snapshot_loop(application.bot_data["report_cache"])
+    )
+
+
+async def _stop_snapshots(application):
+    """주기적 저장을 멈추고 마지막 snapshot 저장"""
+    task = application.bot_data.pop("snapshot_task", None)
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    report_cache = application.bot_data.get("report_cache")
+    if report_cache is not None and snapshot.save(report_cache):
+        print("snapshot 저장 완료")
+
+
+def _start_scheduler(application):
+    """스케줄 작업 등록 후 스케줄러 시작 (SCHEDULER_ENABLED일 때만)"""
+    if not Config.SCHEDULER_ENABLED:
+        print("스케줄 리포트 비활성화 (SCHEDULER_ENABLED=false)")
+        return
+    _schedule_daily_reports(application)
+    scheduler: Scheduler = application.bot_data["scheduler"]
+    scheduler.add(
+        Job(
+            "schedule_sync",
+            _job_callback(application, sync_schedule),
+            IntervalTrigger(datetime.timedelta(seconds=SCHEDULE_SYNC_INTERVAL)),
+        )
+    )
+    scheduler.start()
+
+
+async def _start_metrics(application):
+    """상태 게이지 연결 후 METRICS_PORT가 설정되면 /metrics 서버 시작"""
+    report_cache = application.bot_data["report_cache"]
+    metrics.REPORT_CACHE_HIT_RATIO.set_function(
+        lambda: report_cache.stats()["hit_ratio"]
+    )
+    metrics.WATCHLIST_SYMBOLS.set_function(lambda: len(watchlist.get_union_symbols()))
+    metrics.WATCHLIST_CHATS.set_function(lambda: len(watchlist.get_chat_ids()))
+
+    if not Config.METRICS_PORT:
+        return
+    server = metrics.create_server(Config.METRICS_LISTEN, Config.METRICS_PORT)
+    await server.start()
+    application.bot_data["metrics_server"] = server
+    print(f"메트릭 서버 시작: http://{Config.METRICS_LISTEN}:{server.port}/metrics")
+
+
+async def _stop_metrics(application):
+    """메트릭 서버 종료"""
+    server = application.bot_data.pop("metrics_server", None)
+    if server is not None:
+        await server.stop()
+
+
+def _allowed_only(handler):
+    """허용된 채팅방(ALLOWED_CHAT_IDS + TELEGRAM_CHAT_ID)의 명령어만 처리
+
+    그 외 채팅방은 응답 없이 무시합니다. (봇을 찾은 누구나 조회 부하/전송을 늘리지 않도록)
+    """
+
+    @functools.wraps(handler)
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        chat = update.effective_chat
+        if chat is None or not watchlist.is_allowed(chat.id):
+            print(f"허용되지 않은 채팅방의 명령어 무시: {chat.id if chat else '-'}")
+            return
+        await handler(update, context)
+
+    return wrapper
+
+
+def build_application(
+    concurrent_updates: bool | int = False, base_url: str | None = None
+) -> Application:
+    """명령어 핸들러가 등록된 Application 생성 (스케줄은 post_init에서 시작)
+
+    Args:
+        concurrent_updates: 동시에 처리할 업데이트 수 (False면 순서대로 1개씩)
+        base_url: Bot API 주소 (없으면 api.telegram.org, 부하 테스트의 가짜 서버용)
+    """
+    builder = (
         Application.builder()
         .token(Config.TELEGRAM_BOT_TOKEN)
+        .concurrent_updates(concurrent_updates)
         .post_init(post_init)
-        .build()
+        .post_stop(post_stop)
     )
+    if base_url:
+        builder = builder.base_url(base_url)
+    if concurrent_updates:
+        # 웹훅 모드는 업데이트를 직접 받으므로 polling용 Updater 불필요
+        builder = builder.updater(None)
+    application = builder.build()
+
+    handlers = {
+        "help": cmd_help,
+        "start": cmd_help,
+        "status": cmd_status,
+        "report": cmd_report,
+        "report6mo": cmd_report_6mo,
+        "report3mo": cmd_report_3mo,
+        "list": cmd_list,
+        "add": cmd_add,
+        "remove": cmd_remove,
+        "ma": cmd_ma,
+        "period": cmd_period,
+        "alerttime": cmd_alerttime,
+        "alert": cmd_alert,
+        "screen": cmd_screen,
+        "history": cmd_history,
+    }
+    for command, handler in handlers.items():
+        application.add_handler(CommandHandler(command, _allowed_only(handler)))
 
-    application.add_handler(CommandHandler("help", cmd_help))
-    application.add_handler(CommandHandler("start", cmd_help))
-    application.add_handler(CommandHandler("status", cmd_status))
-    application.add_handler(CommandHandler("report", cmd_report))
-    application.add_handler(CommandHandler("report6mo", cmd_report_6mo))
-    application.add_handler(CommandHandler("report3mo", cmd_report_3mo))
-    application.add_handler(CommandHandler("list", cmd_list))
-    application.add_handler(CommandHandler("add", cmd_add))
-    application.add_handler(CommandHandler("remove", cmd_remove))
-    application.add_handler(CommandHandler("ma", cmd_ma))
-
-    job_queue = application.job_queue
-    alert_time = _parse_alert_time(Config.ALERT_TIME)
-
-    job_queue.run_daily(
-        scheduled_daily_report,
-        time=alert_time,
-        chat_id=Config.TELEGRAM_CHAT_ID,
-        name="daily_report",
-    )
+    return application
 
-    print(f"스케줄 등록: 매일 {Config.ALERT_TIME}에 리포트 전송")
 
+def run_telegram_bot():
+    """텔레그램 봇 실행 (polling 모드 + 스케줄러)"""
+    application = build_application()
     application.run_polling(allowed_updates=Update.ALL_TYPES)
+
+
+async def _serve_webhook(application: Application):
+    """웹훅 서버를 띄우고 종료 신호(SIGINT/SIGTERM)까지 업데이트 처리"""
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    server = WebhookServer(
+        application,
+        secret_token=Config.WEBHOOK_SECRET,
+        path=Config.WEBHOOK_PATH,
+        host=Config.WEBHOOK_LISTEN,
+        port=Config.WEBHOOK_PORT,
+    )
+
+    # run_polling과 달리 수명 주기를 직접 관리하므로 post_init/post_stop도 직접 호출
+    await application.initialize()
+    try:
+        await application.post_init(application)
+        await application.start()
+        await server.start()
+        # 여러 프로세스가 같은 값으로 호출해도 결과가 같음 (로드밸런서 주소)
+        await application.bot.set_webhook(
+            url=Config.WEBHOOK_URL,
+            secret_token=Config.WEBHOOK_SECRET,
+            allowed_updates=Update.ALL_TYPES,
+        )
+        print(f"웹훅 등록 완료: {Config.WEBHOOK_URL}")
+
+        await stop_event.wait()
+    finally:
+        await server.stop()
+        if application.running:
+            await application.stop()
+        await application.post_stop(application)
+        await application.shutdown()
+
+
+def run_telegram_webhook():
+    """텔레그램 봇 실행 (웹훅 모드 + 스케줄러)"""
+    application = build_application(concurrent_updates=Config.WEBHOOK_CONCURRENCY)
+    asyncio.run(_serve_webhook(application))
+
+
+async def _serve_daemon():
+    """텔레그램 명령어 수신 없이 스케줄 리포트만 전송 (종료 신호까지)"""
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    async with TelegramNotifier(
+        token=Config.TELEGRAM_BOT_TOKEN,
+        chat_id=Config.TELEGRAM_CHAT_ID,
+        send_queue=create_send_queue(),
+    ) as notifier:
+        # 스케줄 작업은 application.bot_data만 사용하므로 Application 없이 실행
+        application = SimpleNamespace(bot_data={})
+        _init_report_state(application, notifier)
+        _start_snapshots(application)
+        _start_scheduler(application)
+        await _start_metrics(application)
+
+        for job in application.bot_data["scheduler"].jobs():
+            print(f"  다음 실행: {job.name} → {job.next_run}")
+
+        await stop_event.wait()
+        await _stop_metrics(application)
+        await application.bot_data["scheduler"].stop()
+        await _stop_snapshots(application)
+        analytics.shutdown()
+
+
+def run_report_daemon():
+    """데몬 모드 실행 (스케줄러 + 리포트 전송, 봇 명령어 없음)"""
+    asyncio.run(_serve_daemon())
@@ -0,0 +1,89 @@
+"""텔레그램 웹훅 수신 모듈
+
+polling 대신 텔레그램이 업데이트를 HTTP POST로 바로 보내도록 하는 웹훅 서버입니다.
+
+polling과 차이:
+    - 롱폴링 왕복이 없어 명령어 → 응답 지연이 줄어듦
+    - 상태를 서버에 두지 않으므로 여러 봇 프로세스를 로드밸런서 뒤에 둘 수 있음
+
+요청 처리 흐름:
+    1. X-Telegram-Bot-Api-Secret-Token 헤더 검증 (불일치 → 403)
+    2. JSON → Update 변환 후 application.update_queue에 넣음
+    3. 바로 200 응답 (명령어 처리는 Application이 동시에 진행)
+"""
+
+import hmac
+from http import HTTPStatus
+
+from telegram import Update
+
+from src.http_server import HttpServer, Request, Response
+
+# 텔레그램이 setWebhook의 secret_token을 담아 보내는 헤더
+SECRET_HEADER = "x-telegram-bot-api-secret-token"
+
+
+class WebhookServer:
+    """텔레그램 업데이트를 받아 Application에 넘기는 HTTP 서버"""
+
+    def __init__(
+        self,
+        application,
+        secret_token: str,
+        path: str = "/telegram",
+        host: str = "0.0.0.0",
+        port: int = 8443,
+    ):
+        """
+        Args:
+            application: python-telegram-bot Application (update_queue, bot 사용)
+            secret_token: setWebhook에 등록한 비밀 토큰
+            path: 업데이트를 받을 경로
+            host: 바인드 주소
+            port: 포트 (0이면 빈 포트 자동 선택)
+        """
+        self.application = application
+        self.secret_token = secret_token
+        self.path = path
+        self.received = 0
+        self.rejected = 0
+
+        self.server = HttpServer(host, port)
+        self.server.route("POST", path, self.handle_update)
+        self.server.route("GET", "/healthz", self.handle_health)
+
+    @property
+    def port(self) -> int:
+        return self.server.port
+
+    async def start(self):
+        await self.server.start()
+        print(f"웹훅 서버 시작: {self.server.host}:{self.port}{self.path}")
+
+    async def stop(self):
+        await self.server.stop()
+
+    def _is_authorized(self, request: Request) -> bool:
+        """비밀 토큰 검증 (타이밍 공격 방지용 상수 시간 비교)"""
+        token = request.headers.get(SECRET_HEADER, "")
+        return hmac.compare_digest(token.encode(), self.secret_token.encode())
+
+    async def handle_update(self, request: Request) -> Response:
+        """업데이트 1건 수신"""
+        if not self._is_authorized(request):
+            self.rejected += 1
+            return Response(HTTPStatus.FORBIDDEN, "Forbidden")
+
+        try:
+            update = Update.de_json(request.json(), self.application.bot)
+        except (ValueError, TypeError, KeyError) as e:
+            print(f"웹훅 업데이트 파싱 실패: {e}")
+            return Response(HTTPStatus.BAD_REQUEST, "Bad Request")
+
+        await self.application.update_queue.put(update)
+        self.received += 1
+        return Response(HTTPStatus.OK)
+
+    async def handle_health(self, request: Request) -> Response:
+        """로드밸런서 헬스체크"""
+        return Response.json({"ok": True, "received": self.received})
@@ -0,0 +1,432 @@
+"""리포트 데이터 수집 파이프라인
+
+CLI 단일 실행(main.py)과 봇(/report, 스케줄 리포트, 사전 수집)이 함께 쓰는
+동시 수집 모듈입니다. 두 경로가 같은 구현을 쓰므로 성능 특성도 같습니다.
+
+동작 방식:
+    - Fear & Greed와 종목 데이터를 동시에 수집
+    - 종목은 스레드에서 조회하고, 동시에 조회하는 종목 수는 FETCH_CONCURRENCY로 제한
+      (yfinance 요청이 한꺼번에 몰려 차단되거나 스레드 풀이 밀리지 않도록)
+    - 하락률/200일선 계산은 analytics 작업자 풀에서 실행 (이벤트 루프는 I/O만 담당)
+
+메모리 (max 기간처럼 긴 데이터):
+    - 조회 스레드에서 OHLCV DataFrame을 종가 float64 배열로 바꾸고 바로 버림
+    - 200일선은 마지막 200개만 작업자에게 보냄
+    - 긴 기간(LONG_PERIODS)은 동시 조회 수를 LONG_PERIOD_CONCURRENCY로 더 줄여
+      한꺼번에 메모리에 올라오는 DataFrame 수를 제한
+    - 수집이 끝나면 프로세스 최대 메모리(RSS)와 이번 수집에서 늘어난 양을 기록
+
+제한 시간:
+    - 종목 1개가 SYMBOL_TIMEOUT(초) 안에 끝나지 않으면 그 종목만 시간 초과
+    - 전체가 COLLECT_DEADLINE(초) 안에 끝나지 않으면 남은 종목을 모두 시간 초과로 처리
+    - 조회/계산 중 오류가 난 종목도 시간 초과와 같이 처리 (나머지 종목은 그대로 리포트)
+    - 시간 초과 종목은 STALE_FALLBACK이면 마지막으로 수집한 값(stale=True)으로 채우고,
+      리포트에는 시간 초과 종목 목록을 함께 표시
+    - 취소된 조회 중 아직 시작하지 않은 것은 실행되지 않고, 이미 실행 중인 스레드는
+      yfinance 요청 timeout(SYMBOL_TIMEOUT)이 지나면 스스로 끝남 (스레드가 계속 쌓이지 않음)
+
+사용 예:
+    fear_greed, stock_results, timed_out = await pipeline.collect_report_data(
+        "1y", ["TSLA", "SCHD"], ["TSLA"]
+    )
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+import numpy as np
+import pandas as pd
+
+from src import analytics, metrics, price_archive, profiling
+from src.cache import split_as_of, symbol_as_of
+from src.config import Config
+from src.indicators.fear_greed import get_fear_greed_index
+from src.stock.fetcher import fetch_stock_data
+from src.stock.ma import calculate_ma_analysis
+from src.stock.mdd import get_buy_signal
+
+# yfinance 요청 기본 timeout (SYMBOL_TIMEOUT이 0일 때)
+DEFAULT_REQUEST_TIMEOUT = 10.0
+
+# 200일선 계산 기간
+MA_WINDOW = analytics.MA_WINDOW
+
+# 데이터가 길어 동시 조회 수를 LONG_PERIOD_CONCURRENCY로 더 줄이는 기간
+LONG_PERIODS = ("5y", "max")
+
+# 마지막 수집 결과 {(기간, 종목): {"as_of", "ma", "result"}}
+# as_of는 종목 거래소의 기준 시점 (다음 정규장 마감 전까지 같은 값)
+# 같은 기준 시점이면 다시 조회하지 않고, 시간 초과 시에는 이전 값(stale)으로 사용
+_last_results: dict[tuple[str, str], dict] = {}
+
+# 마지막 Fear & Greed {"as_of", "value"} (미국 장 기준 시점이 같으면 다시 조회하지 않음)
+_last_fear_greed: dict = {}
+
+
+def _request_timeout() -> float:
+    """yfinance HTTP 요청 timeout (종목 제한 시간을 넘겨 스레드가 남지 않도록)"""
+    if Config.SYMBOL_TIMEOUT > 0:
+        return Config.SYMBOL_TIMEOUT
+    return DEFAULT_REQUEST_TIMEOUT
+
+
+def fresh_results(stock_results: list[dict]) -> list[dict]:
+    """이번에 새로 수집한 결과만 (시간 초과로 채운 이전 값 제외)
+
+    신호 변화/목표가 판단은 새 값으로만 해야 같은 알림이 반복되지 않습니다.
+    """
+    return [item for item in stock_results if not item.get("stale")]
+
+
+def clear_fallback():
+    """마지막 수집 결과 삭제"""
+    _last_results.clear()
+    _last_fear_greed.clear()
+
+
+def export_state() -> dict:
+    """마지막 수집 결과/Fear & Greed (snapshot 저장용, JSON으로 저장 가능한 형태)"""
+    return {
+        "results": [
+            {"period": period, "symbol": symbol, **entry}
+            for (period, symbol), entry in _last_results.items()
+        ],
+        "fear_greed": dict(_last_fear_greed),
+    }
+
+
+def import_state(state: dict) -> int:
+    """export_state() 결과를 되살림 (snapshot 복원용)
+
+    Returns:
+        복원한 종목 결과 수
+    """
+    count = 0
+    for entry in state.get("results", []):
+        result = entry.get("result")
+        if not isinstance(result, dict) or "drawdown_pct" not in result:
+            continue
+        _last_results[(entry["period"], entry["symbol"])] = {
+            "as_of": entry.get("as_of"),
+            "ma": bool(entry.get("ma")),
+            "result": result,
+        }
+        count += 1
+    fear_greed = state.get("fear_greed") or {}
+    if fear_greed.get("value", {}).get("score") is not None:
+        _last_fear_greed.update(fear_greed)
+    return count
+
+
+def _reusable(period: str, symbol: str, ma_enabled: bool, as_of: str | None):
+    """종목 거래소의 데이터 기준 시점이 같을 때 이미 수집한 결과 (없으면 None)
+
+    200일선 분석이 필요 없는 요청에는 다른 채팅방이 받아 둔 200일선 정보를 빼고 반환합니다.
+    """
+    if as_of is None:
+        return None
+    entry = _last_results.get((period, symbol))
+    if entry is None or entry["as_of"] != symbol_as_of(as_of, symbol):
+        return None
+    if ma_enabled and not entry["ma"]:
+        return None
+    result = entry["result"]
+    if not ma_enabled and "ma_200" in result:
+        result = {k: v for k, v in result.items() if k != "ma_200"}
+    return result
+
+
+def _fetch_close_series(symbol: str, period: str) -> pd.Series | None:
+    """종가 Series 조회 (데이터가 없으면 None)"""
+    return fetch_stock_data(symbol, period, _request_timeout()).get("Close")
+
+
+def _fetch_close_array(symbol: str, period: str) -> np.ndarray:
+    """종가만 float64 배열로 가져옵니다. (스레드에서 실행)
+
+    OHLCV DataFrame은 이 함수 안에서 버려지므로, 종목이 많거나 기간이 길어도
+    조회가 끝난 종목은 종가 배열만 메모리에 남습니다. 데이터가 없으면 빈 배열.
+    PRICE_ARCHIVE가 켜져 있으면 최근 일봉만 받아 아카이브에 추가하고,
+    아카이브(memmap)에서 기간만큼 잘라 복사 없이 반환합니다.
+    """
+    if Config.PRICE_ARCHIVE:
+        archive, rebuilt = price_archive.sync(symbol, _fetch_close_series)
+        if rebuilt:
+            print(f"  {symbol}: 수정 종가가 바뀌어 아카이브 다시 생성")
+        if archive is not None:
+            return price_archive.slice_period(archive, period)
+
+    close_prices = _fetch_close_series(symbol, period)
+    if close_prices is None or close_prices.empty:
+        return np.empty(0)
+    # DataFrame 블록의 view로 남으면 OHLCV 전체가 해제되지 않으므로 복사
+    return close_prices.to_numpy(dtype="float64", copy=True)
+
+
+async def analyze_symbol(
+    symbol: str,
+    period: str,
+    ma_enabled: bool = False,
+    on_fetched: Callable[[], None] | None = None,
+) -> dict | None:
+    """단일 종목 데이터를 가져와 하락률/매수 신호(/200일선)를 계산합니다.
+
+    Args:
+        symbol: 종목 심볼
+        period: 분석 기간
+        ma_enabled: 200일선 분석 여부
+        on_fetched: 조회가 끝나고 계산 전에 호출 (조회 슬롯을 계산 중에 붙잡지 않도록)
+
+    Returns:
+        {"symbol", "peak_price", "current_price", "drawdown_pct", "buy_signal", ["ma_200"]}
+        데이터가 없으면 None
+    """
+    with profiling.span("fetch", symbol):
+        closes = await asyncio.to_thread(_fetch_close_array, symbol, period)
+    if not len(closes):
+        return None
+
+    # 200일선 계산용 데이터 결정 (부족하면 1년 데이터 사용)
+    ma_closes = None
+    if ma_enabled:
+        ma_closes = closes
+        if len(closes) < MA_WINDOW:
+            with profiling.span("fetch", symbol):
+                ma_closes = await asyncio.to_thread(_fetch_close_array, symbol, "1y")
+        # 마지막 값만 필요하므로 끝부분만 작업자에게 보냄 (복사 없는 view)
+        ma_closes = ma_closes[-MA_WINDOW:] if len(ma_closes) >= MA_WINDOW else None
+
+    if on_fetched is not None:
+        on_fetched()
+
+    # 계산은 작업자 풀에서 (이벤트 루프는 기다리기만 함)
+    with profiling.span("compute", symbol):
+        record = await analytics.analyze(closes, ma_closes)
+
+    result = {
+        "symbol": symbol,
+        "peak_price": record["peak_price"],
+        "current_price": record["current_price"],
+        "drawdown_pct": record["drawdown_pct"],
+        "buy_signal": get_buy_signal(record["drawdown_pct"]),
+    }
+
+    # 200일 이동평균선 분석 (활성화되고 데이터가 충분한 종목만)
+    if ma_closes is not None:
+        result["ma_200"] = calculate_ma_analysis(
+            result["current_price"], record["ma_200"]
+        )
+
+    return result
+
+
+def _timed_fear_greed() -> dict:
+    """Fear & Greed 수집 (소요 시간 측정)"""
+    with profiling.span("fear_greed"):
+        return get_fear_greed_index()
+
+
+def _period_concurrency(period: str) -> int:
+    """기간별 동시 조회 수 (긴 기간은 조회 중인 OHLCV DataFrame 수를 더 작게 제한)"""
+    concurrency = Config.FETCH_CONCURRENCY
+    limit = Config.LONG_PERIOD_CONCURRENCY
+    if period in LONG_PERIODS and limit > 0:
+        return min(concurrency, limit) if concurrency > 0 else limit
+    return concurrency
+
+
+async def _collect_fear_greed(as_of: str | None) -> dict:
+    """Fear & Greed 수집 (미국 장 기준 시점이 같을 때 받은 값이 있으면 재사용)"""
+    if as_of is not None:
+        as_of = split_as_of(as_of)["NYSE"]
+    if as_of is not None and _last_fear_greed.get("as_of") == as_of:
+        return _last_fear_greed["value"]
+    fear_greed = await asyncio.to_thread(_timed_fear_greed)
+    if fear_greed.get("score") is not None:
+        _last_fear_greed.update(as_of=as_of, value=fear_greed)
+    return fear_greed
+
+
+async def collect_stocks(
+    period: str,
+    symbols: list[str],
+    ma_symbols: list[str],
+    on_result: Callable[[dict], Awaitable[None]] | None = None,
+    concurrency: int | None = None,
+    deadline: float | None = None,
+    symbol_timeout: float | None = None,
+    as_of: str | None = None,
+) -> tuple[list[dict], list[str]]:
+    """여러 종목을 동시에 수집합니다.
+
+    Args:
+        period: 분석 기간
+        symbols: 수집할 종목 리스트 (중복 없이)
+        ma_symbols: 200일선 분석을 함께 수행할 종목 리스트
+        on_result: 종목 하나가 끝날 때마다 완료 순서대로 호출되는 콜백 (진행 상황 표시용)
+        concurrency: 동시에 조회할 종목 수 (없으면 FETCH_CONCURRENCY, 긴 기간은
+            LONG_PERIOD_CONCURRENCY까지, 0 이하면 제한 없음)
+        deadline: 전체 수집 제한 시간 (초, 없으면 COLLECT_DEADLINE, 0 이하면 제한 없음)
+        symbol_timeout: 종목 1개 제한 시간 (초, 없으면 SYMBOL_TIMEOUT, 0 이하면 제한 없음)
+        as_of: 데이터 기준 시점 (cache.data_as_of). 주면 종목 거래소의 기준 시점이 같을 때
+            수집한 종목은 다시 조회하지 않고 그 결과를 사용 (재시작 후 snapshot으로 복원한 결과 포함)
+
+    Returns:
+        (종목 결과 리스트, 시간 초과/오류 종목 리스트). 둘 다 symbols 순서로 정렬.
+        데이터가 없는 종목은 빠지고, 시간 초과/오류 종목은 STALE_FALLBACK이면
+        마지막 수집 결과(stale=True)로 채웁니다.
+        같은 기준 시점이라 다시 조회하지 않은 종목은 reused=True입니다.
+    """
+    if concurrency is None:
+        concurrency = _period_concurrency(period)
+    if deadline is None:
+        deadline = Config.COLLECT_DEADLINE
+    if symbol_timeout is None:
+        symbol_timeout = Config.SYMBOL_TIMEOUT
+
+    semaphore = asyncio.Semaphore(concurrency) if concurrency > 0 else None
+    ma_set = set(ma_symbols)
+
+    async def run(symbol: str) -> dict | None:
+        if semaphore is None:
+            slot = None
+        else:
+            await semaphore.acquire()
+            slot = [semaphore]
+
+        def release():
+            # 조회가 끝나면 바로 반환 (계산은 작업자 풀이 맡으므로 조회 수 제한과 무관)
+            if slot:
+                slot.pop().release()
+
+        try:
+            # 대기열에서 기다린 시간은 빼고 실제 조회/계산 시간만 제한
+            async with asyncio.timeout(symbol_timeout if symbol_timeout > 0 else None):
+                return await analyze_symbol(symbol, period, symbol in ma_set, release)
+        finally:
+            release()
+
+    loop = asyncio.get_running_loop()
+    end = loop.time() + deadline if deadline > 0 else None
+    # 끝난 작업을 완료 순서대로 받는 큐
+    # (asyncio.wait는 깨어날 때마다 남은 작업 전체에 콜백을 다시 걸어 종목이 많으면 느림)
+    finished: asyncio.Queue[asyncio.Task] = asyncio.Queue()
+    tasks = {}
+    stock_results = []
+    timed_out = []
+    reused = []
+    for symbol in symbols:
+        result = _reusable(period, symbol, symbol in ma_set, as_of)
+        if result is not None:
+            reused.append({**result, "reused": True})
+            continue
+        task = asyncio.create_task(run(symbol))
+        task.add_done_callback(finished.put_nowait)
+        tasks[task] = symbol
+
+    async def handle(task: asyncio.Task):
+        try:
+            result = task.result()
+        except TimeoutError:
+            print(f"  ⚠️ {tasks[task]}: 조회 시간 초과 ({symbol_timeout:.0f}초)")
+            timed_out.append(tasks[task])
+            return
+        except Exception as e:  # noqa: BLE001
+            # 한 종목의 오류(아카이브 쓰기, 작업자 풀 등)로 리포트 전체를 버리지 않음
+            print(f"  ⚠️ {tasks[task]}: 수집 오류 ({type(e).__name__}: {e})")
+            timed_out.append(tasks[task])
+            return
+        if result is None:
+            return
+        _last_results[(period, result["symbol"])] = {
+            "as_of": symbol_as_of(as_of, result["symbol"]) if as_of else None,
+            "ma": result["symbol"] in ma_set,
+            "result": result,
+        }
+        stock_results.append(result)
+        if on_result is not None:
+            await on_result(result)
+
+    for result in reused:
+        stock_results.append(result)
+        if on_result is not None:
+            await on_result(result)
+
+    try:
+        for _ in range(len(tasks)):
+            try:
+                async with asyncio.timeout_at(end):
+                    task = await finished.get()
+            except TimeoutError:
+                # 이미 끝났지만 아직 꺼내지 않은 결과는 살리고, 나머지는 시간 초과
+                while not finished.empty():
+                    await handle(finished.get_nowait())
+                pending = [task for task in tasks if not task.done()]
+                print(
+                    f"  ⚠️ 수집 제한 시간({deadline:.0f}초) 초과: "
+                    f"{len(pending)}개 종목 시간 초과"
+                )
+                timed_out.extend(tasks[task] for task in pending)
+                break
+            await handle(task)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+    if Config.STALE_FALLBACK:
+        for symbol in timed_out:
+            previous = _last_results.get((period, symbol))
+            if previous is not None:
+                stock_results.append({**previous["result"], "stale": True})
+
+    order = {symbol: i for i, symbol in enumerate(symbols)}
+    stock_results.sort(key=lambda item: order.get(item["symbol"], len(order)))
+    timed_out.sort(key=lambda symbol: order[symbol])
+    return stock_results, timed_out
+
+
+async def collect_report_data(
+    period: str,
+    symbols: list[str],
+    ma_symbols: list[str],
+    on_result: Callable[[dict], Awaitable[None]] | None = None,
+    as_of: str | None = None,
+) -> tuple[dict, list[dict], list[str]]:
+    """리포트에 필요한 데이터(Fear & Greed + 종목 결과)를 병렬로 수집합니다.
+
+    Args:
+        period: 분석 기간
+        symbols: 수집할 종목 리스트 (중복 없이)
+        ma_symbols: 200일선 분석을 함께 수행할 종목 리스트
+        on_result: 종목 하나가 끝날 때마다 완료 순서대로 호출되는 콜백
+        as_of: 데이터 기준 시점 (주면 같은 기준 시점에 수집한 값은 다시 조회하지 않음)
+
+    Returns:
+        (Fear & Greed, 종목 결과 리스트, 시간 초과/오류 종목 리스트). symbols 순서로 정렬.
+    """
+    peak_before = profiling.peak_memory()
+    fear_greed_task = asyncio.create_task(_collect_fear_greed(as_of))
+    try:
+        stock_results, timed_out = await collect_stocks(
+            period, symbols, ma_symbols, on_result, as_of=as_of
+        )
+    except BaseException:
+        fear_greed_task.cancel()
+        raise
+    fear_greed = await fear_greed_task
+    _report_peak_memory(period, len(symbols), peak_before)
+    return fear_greed, stock_results, timed_out
+
+
+def _report_peak_memory(period: str, symbol_count: int, peak_before: int | None):
+    """수집 1회의 최대 메모리 기록 (프로세스 최대 RSS와 이번 수집에서 늘어난 양)"""
+    peak = profiling.peak_memory()
+    if peak is None:
+        return
+    metrics.PROCESS_PEAK_MEMORY.set(peak)
+    growth = peak - peak_before if peak_before is not None else 0
+    print(
+        f"  메모리: 최대 {peak / 2**20:.1f}MB "
+        f"(이번 수집 +{growth / 2**20:.1f}MB, {period} {symbol_count}종목)"
+    )
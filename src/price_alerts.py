@@ -0,0 +1,337 @@
+"""가격 알림 모듈 (/alert)
+
+채팅방별로 종목 목표가(예: TSLA 350 이하)를 저장하고, 가격이 목표가를 넘으면 알립니다.
+
+파일 위치: data/price_alerts.json
+구조:
+{
+    "next_id": 3,
+    "alerts": [
+        {"id": 1, "chat_id": "123456789", "symbol": "TSLA", "direction": "below",
+         "price": 350.0, "repeat": false, "armed": true}
+    ],
+    "last_prices": {"123456789": {"TSLA": 412.3}}
+}
+
+평가 방식:
+    종목별로 below/above 목표가를 정렬된 배열로 보관하고, 이전 가격 → 새 가격 사이
+    구간만 bisect로 찾아 확인합니다. 알림이 수백 개여도 가격이 움직인 범위에 있는
+    알림만 확인합니다.
+
+    - 한 번(once): 알린 뒤 삭제
+    - 반복(repeat): 목표가를 넘을 때마다 알림 (반대쪽으로 돌아갔다가 다시 넘어야 다시 알림)
+    - 새로 등록한 알림은 첫 평가 때 이미 목표가를 넘어 있으면 바로 알림
+
+    채팅방마다 리포트 시각이 다르므로, 평가는 이번에 전송받는 채팅방의 알림만 하고
+    마지막 가격도 채팅방별로 저장합니다.
+
+일일 리포트(종가)와 장중 감시(--watch, 현재가) 모두 같은 evaluate()를 사용합니다.
+"""
+
+import bisect
+import json
+import math
+
+from src import watchlist
+from src.config import Config
+
+DIRECTIONS = ("below", "above")
+
+# 채팅방당 최대 알림 수
+MAX_ALERTS_PER_CHAT = 200
+
+
+def _alerts_file():
+    """알림 파일 경로 (watchlist와 같은 data 디렉토리)"""
+    return watchlist.DATA_DIR / "price_alerts.json"
+
+
+def _resolve_chat_id(chat_id: str | int | None) -> str:
+    """chat_id가 없으면 기본 채팅방 ID 사용"""
+    return str(Config.TELEGRAM_CHAT_ID) if chat_id is None else str(chat_id)
+
+
+class AlertIndex:
+    """종목/방향별로 목표가를 정렬해 보관하는 인덱스"""
+
+    def __init__(self, alerts: list[dict] | None = None):
+        # {심볼: {방향: (정렬된 목표가, 같은 순서의 알림)}}
+        self._books: dict[str, dict[str, tuple[list[float], list[dict]]]] = {}
+        # 아직 한 번도 평가하지 않은 알림 {심볼: [알림]}
+        self._pending: dict[str, list[dict]] = {}
+        for alert in alerts or []:
+            self.add(alert)
+
+    def add(self, alert: dict):
+        """알림 추가"""
+        if not alert.get("armed"):
+            self._pending.setdefault(alert["symbol"], []).append(alert)
+            return
+        book = self._books.setdefault(alert["symbol"], {})
+        prices, items = book.setdefault(alert["direction"], ([], []))
+        i = bisect.bisect_right(prices, alert["price"])
+        prices.insert(i, alert["price"])
+        items.insert(i, alert)
+
+    def remove(self, alert: dict):
+        """알림 삭제 (없으면 무시)"""
+        pending = self._pending.get(alert["symbol"], [])
+        if alert in pending:
+            pending.remove(alert)
+            return
+        prices, items = self._books.get(alert["symbol"], {}).get(
+            alert["direction"], ([], [])
+        )
+        lo = bisect.bisect_left(prices, alert["price"])
+        hi = bisect.bisect_right(prices, alert["price"])
+        for i in range(lo, hi):
+            if items[i] is alert:
+                del prices[i]
+                del items[i]
+                return
+
+    def crossed(self, symbol: str, old: float | None, new: float) -> list[dict]:
+        """old → new 사이에서 넘은 목표가의 알림
+
+        below: new <= 목표가 < old (아래로 넘음)
+        above: old < 목표가 <= new (위로 넘음)
+        old가 없으면 (처음 보는 가격) 이미 넘어 있는 알림 모두
+        """
+        book = self._books.get(symbol, {})
+        fired = []
+
+        prices, items = book.get("below", ([], []))
+        if prices:
+            upper = math.inf if old is None else old
+            lo = bisect.bisect_left(prices, new)
+            hi = bisect.bisect_left(prices, upper)
+            fired.extend(items[lo:hi])
+
+        prices, items = book.get("above", ([], []))
+        if prices:
+            lower = -math.inf if old is None else old
+            lo = bisect.bisect_right(prices, lower)
+            hi = bisect.bisect_right(prices, new)
+            fired.extend(items[lo:hi])
+
+        return fired
+
+    def take_pending(self, symbol: str, chat_id: str) -> list[dict]:
+        """채팅방에서 처음 평가하는 알림을 꺼냄"""
+        pending = self._pending.get(symbol, [])
+        taken = [alert for alert in pending if alert["chat_id"] == chat_id]
+        if taken:
+            self._pending[symbol] = [a for a in pending if a["chat_id"] != chat_id]
+        return taken
+
+    def __len__(self) -> int:
+        books = sum(
+            len(prices) for book in self._books.values() for prices, _ in book.values()
+        )
+        return books + sum(len(items) for items in self._pending.values())
+
+
+def _is_triggered(alert: dict, price: float) -> bool:
+    """가격이 이미 목표가를 넘어 있는지"""
+    if alert["direction"] == "below":
+        return price <= alert["price"]
+    return price >= alert["price"]
+
+
+# 파일이 바뀌지 않았으면 인덱스를 다시 만들지 않음
+_cache: dict = {"mtime": None, "path": None, "data": None, "index": None}
+
+
+def _empty() -> dict:
+    return {"next_id": 1, "alerts": [], "last_prices": {}}
+
+
+def load() -> dict:
+    """JSON 파일에서 알림 로드 (없거나 읽기 실패 시 빈 목록)"""
+    path = _alerts_file()
+    if path.exists():
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+                if isinstance(data, dict):
+                    for key, value in _empty().items():
+                        data.setdefault(key, value)
+                    _migrate_last_prices(data)
+                    return data
+        except (json.JSONDecodeError, OSError):
+            pass
+    return _empty()
+
+
+def _migrate_last_prices(data: dict):
+    """이전 형식의 마지막 가격 {심볼: 가격}을 알림이 있는 채팅방마다 복사"""
+    last_prices = data["last_prices"]
+    legacy = {s: p for s, p in last_prices.items() if not isinstance(p, dict)}
+    if not legacy:
+        return
+    for symbol in legacy:
+        del last_prices[symbol]
+    for alert in data["alerts"]:
+        last_prices.setdefault(alert["chat_id"], dict(legacy))
+
+
+def save(data: dict) -> bool:
+    """알림을 JSON 파일에 저장"""
+    watchlist.DATA_DIR.mkdir(exist_ok=True)
+    try:
+        with open(_alerts_file(), "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    except OSError:
+        return False
+    _cache["mtime"] = None
+    return True
+
+
+def _load_indexed() -> tuple[dict, AlertIndex]:
+    """알림과 인덱스 (파일이 그대로면 이전 인덱스 재사용)"""
+    path = _alerts_file()
+    mtime = path.stat().st_mtime_ns if path.exists() else 0
+    if _cache["mtime"] != mtime or _cache["path"] != path:
+        data = load()
+        _cache.update(
+            mtime=mtime, path=path, data=data, index=AlertIndex(data["alerts"])
+        )
+    return _cache["data"], _cache["index"]
+
+
+def _save_indexed(data: dict, index: AlertIndex):
+    """저장 후 인덱스 캐시 유지"""
+    if save(data):
+        path = _alerts_file()
+        _cache.update(mtime=path.stat().st_mtime_ns, path=path, data=data, index=index)
+
+
+def add(
+    symbol: str,
+    direction: str,
+    price: float,
+    repeat: bool = False,
+    chat_id: str | int | None = None,
+) -> tuple[bool, str]:
+    """가격 알림 추가
+
+    Returns:
+        (성공여부, 메시지)
+    """
+    symbol = symbol.strip().upper()
+    chat_id = _resolve_chat_id(chat_id)
+    if not symbol:
+        return False, "종목 코드를 입력해주세요."
+    if direction not in DIRECTIONS:
+        return False, "방향은 below 또는 above로 입력해주세요."
+    if not price > 0 or math.isinf(price):
+        return False, "목표가는 0보다 커야 합니다."
+    if symbol not in watchlist.get_all(chat_id):
+        return False, f"{symbol}은(는) 관심 종목이 아닙니다. /add로 먼저 추가해주세요."
+
+    data, index = _load_indexed()
+    if len(get_alerts(chat_id)) >= MAX_ALERTS_PER_CHAT:
+        return False, f"알림은 채팅방당 최대 {MAX_ALERTS_PER_CHAT}개입니다."
+
+    alert = {
+        "id": data["next_id"],
+        "chat_id": chat_id,
+        "symbol": symbol,
+        "direction": direction,
+        "price": float(price),
+        "repeat": repeat,
+        "armed": False,
+    }
+    data["next_id"] += 1
+    data["alerts"].append(alert)
+    index.add(alert)
+    _save_indexed(data, index)
+    return True, f"#{alert['id']} {format_alert(alert)} 알림 추가됨"
+
+
+def remove(alert_id: int, chat_id: str | int | None = None) -> tuple[bool, str]:
+    """가격 알림 삭제 (다른 채팅방 알림은 삭제 불가)
+
+    Returns:
+        (성공여부, 메시지)
+    """
+    chat_id = _resolve_chat_id(chat_id)
+    data, index = _load_indexed()
+    for alert in data["alerts"]:
+        if alert["id"] == alert_id and alert["chat_id"] == chat_id:
+            data["alerts"].remove(alert)
+            index.remove(alert)
+            _save_indexed(data, index)
+            return True, f"#{alert_id} 알림 삭제됨"
+    return False, f"#{alert_id} 알림이 없습니다."
+
+
+def get_alerts(chat_id: str | int | None = None) -> list[dict]:
+    """채팅방의 가격 알림 (등록 순)"""
+    chat_id = _resolve_chat_id(chat_id)
+    data, _ = _load_indexed()
+    return [alert for alert in data["alerts"] if alert["chat_id"] == chat_id]
+
+
+def evaluate(prices: dict[str, float], chat_ids: list[str]) -> list[dict]:
+    """새 가격으로 목표가를 넘은 알림을 찾습니다.
+
+    전송받는 채팅방의 알림만 확인합니다. (다른 채팅방의 한 번 알림을 지우거나,
+    마지막 가격을 옮겨 그 채팅방이 알림을 놓치지 않도록)
+    한 번 알림은 삭제하고, 채팅방/종목별 마지막 가격을 저장합니다.
+
+    Args:
+        prices: {심볼: 가격}
+        chat_ids: 이번에 전송받는 채팅방 ID 리스트
+
+    Returns:
+        [{...알림, "current_price": 340.0}, ...]
+    """
+    data, index = _load_indexed()
+    if not len(index):
+        return []
+
+    alert_chats = {alert["chat_id"] for alert in data["alerts"]}
+    fired = []
+    for chat_id in dict.fromkeys(map(str, chat_ids)):
+        if chat_id not in alert_chats:
+            continue
+        last_prices = data["last_prices"].setdefault(chat_id, {})
+        for symbol, price in prices.items():
+            if price is None or not price > 0:
+                continue
+            hits = [
+                alert
+                for alert in index.crossed(symbol, last_prices.get(symbol), price)
+                if alert["chat_id"] == chat_id
+            ]
+            for alert in index.take_pending(symbol, chat_id):
+                alert["armed"] = True
+                if _is_triggered(alert, price):
+                    hits.append(alert)
+                if alert["repeat"] or alert not in hits:
+                    index.add(alert)
+            for alert in hits:
+                fired.append({**alert, "current_price": price})
+                if not alert["repeat"]:
+                    index.remove(alert)
+                    data["alerts"].remove(alert)
+            last_prices[symbol] = price
+
+    _save_indexed(data, index)
+    return fired
+
+
+def select_chat_alerts(fired: list[dict], chat_id: str | int) -> list[dict]:
+    """채팅방의 알림만 선택"""
+    chat_id = str(chat_id)
+    return [alert for alert in fired if alert["chat_id"] == chat_id]
+
+
+def format_alert(alert: dict) -> str:
+    """알림 설명 (예: TSLA $350.00 이하 (반복))"""
+    direction = "이하" if alert["direction"] == "below" else "이상"
+    text = f"{alert['symbol']} ${alert['price']:,.2f} {direction}"
+    if alert.get("repeat"):
+        text += " (반복)"
+    return text
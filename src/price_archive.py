@@ -0,0 +1,312 @@
+"""종가 아카이브 (numpy.memmap)
+
+긴 기간 데이터를 봇을 시작할 때마다 다시 받아 DataFrame으로 만들지 않도록,
+종목별 전체(max) 종가를 작은 바이너리 파일로 보관하고 numpy.memmap으로 엽니다.
+열린 배열은 파일을 그대로 가리키므로 하락률/200일선 계산이 복사 없이 읽습니다.
+
+파일 위치: data/archive/{종목}.bin
+구조 (little-endian):
+    헤더 32 bytes   magic "SABCLOSE", version(u4), 예약(u4), count(i8), capacity(i8)
+    날짜 int64[capacity]    1970-01-01 기준 일 수 (epoch-day)
+    종가 float64[capacity]  수정 종가
+
+capacity만큼 자리를 미리 잡아 두므로 새 일봉은 빈 자리에 쓰고 count만 바꿉니다.
+(파일을 다시 쓰지 않음. 자리가 모자랄 때만 두 배로 늘려 새 파일로 교체)
+
+동기화 (sync):
+    - 아카이브가 없으면 max 전체를 받아 생성
+    - 있으면 최근 SYNC_PERIOD만 받아 겹치는 날짜의 값을 비교한 뒤 뒤에 추가
+      (배당/분할로 과거 수정 종가가 바뀌었거나 겹치는 구간이 없으면 전체를 다시 받음)
+    - 종목 거래소의 데이터 기준 시점(cache.exchange_as_of)이 같으면 다시 조회하지 않음
+      (다음 정규장 마감 전에는 새 일봉이 없으므로)
+
+사용 예:
+    archive, rebuilt = price_archive.sync("TSLA", fetch)
+    closes = price_archive.slice_period(archive, "1y")   # memmap view
+"""
+
+import os
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from src import market_calendar, watchlist
+from src.cache import exchange_as_of
+
+MAGIC = b"SABCLOSE"
+VERSION = 1
+
+HEADER = np.dtype(
+    [
+        ("magic", "S8"),
+        ("version", "<u4"),
+        ("reserved", "<u4"),
+        ("count", "<i8"),
+        ("capacity", "<i8"),
+    ]
+)
+
+# 새로 만들 때 남겨 둘 빈 자리 (약 2년치 거래일)
+MIN_HEADROOM = 512
+
+# 아카이브가 있을 때 새 일봉을 받기 위해 조회하는 기간
+SYNC_PERIOD = "1mo"
+
+# 겹치는 날짜의 종가가 이 비율 넘게 다르면 수정 종가가 바뀐 것으로 보고 전체를 다시 받음
+ADJUST_TOLERANCE = 1e-6
+
+# 기간 → 마지막 날 기준으로 거슬러 올라갈 길이 (d는 거래일 수, 나머지는 달력 기준)
+PERIOD_OFFSETS = {
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+}
+
+# 종목별 마지막 동기화 시점 {종목: 거래소 기준 시점}
+_synced: dict[str, str] = {}
+
+# 같은 종목을 여러 스레드에서 동시에 쓰지 않도록
+_locks: dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+class Archive(NamedTuple):
+    """열린 아카이브 (두 배열 모두 파일을 가리키는 읽기 전용 memmap)"""
+
+    days: np.ndarray
+    closes: np.ndarray
+
+
+def archive_dir() -> Path:
+    """아카이브 디렉토리 (watchlist와 같은 data 디렉토리 아래)"""
+    return watchlist.DATA_DIR / "archive"
+
+
+def archive_path(symbol: str) -> Path:
+    """종목 아카이브 파일 경로"""
+    return archive_dir() / f"{symbol.upper().replace('/', '_')}.bin"
+
+
+def to_epoch_days(index: pd.Index) -> np.ndarray:
+    """날짜 인덱스를 epoch-day(int64)로 (거래소 현지 날짜 기준)"""
+    dates = np.asarray(pd.DatetimeIndex(index).date, dtype="datetime64[D]")
+    return dates.astype(np.int64)
+
+
+def _read_header(path: Path) -> np.void | None:
+    """헤더 읽기 (없거나 형식이 다르거나 잘린 파일이면 None)"""
+    try:
+        header = np.fromfile(path, dtype=HEADER, count=1)
+    except (OSError, ValueError):
+        return None
+    if len(header) != 1:
+        return None
+    header = header[0]
+    if header["magic"] != MAGIC or header["version"] != VERSION:
+        return None
+    count, capacity = int(header["count"]), int(header["capacity"])
+    if not 0 <= count <= capacity:
+        return None
+    if path.stat().st_size < HEADER.itemsize + 16 * capacity:
+        return None
+    return header
+
+
+def open_archive(symbol: str) -> Archive | None:
+    """아카이브를 memmap으로 엽니다. (없거나 읽을 수 없으면 None)"""
+    path = archive_path(symbol)
+    header = _read_header(path)
+    if header is None:
+        return None
+    count, capacity = int(header["count"]), int(header["capacity"])
+    if count == 0:
+        return Archive(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+    days = np.memmap(path, "<i8", "r", offset=HEADER.itemsize, shape=(count,))
+    closes = np.memmap(
+        path, "<f8", "r", offset=HEADER.itemsize + 8 * capacity, shape=(count,)
+    )
+    return Archive(days, closes)
+
+
+def write(symbol: str, days: np.ndarray, closes: np.ndarray, headroom: int = 0):
+    """아카이브 전체를 새로 씁니다. (임시 파일에 쓴 뒤 교체)"""
+    count = len(days)
+    capacity = count + max(headroom, MIN_HEADROOM)
+    header = np.zeros(1, dtype=HEADER)
+    header["magic"] = MAGIC
+    header["version"] = VERSION
+    header["count"] = count
+    header["capacity"] = capacity
+
+    padded_days = np.zeros(capacity, dtype="<i8")
+    padded_days[:count] = days
+    padded_closes = np.full(capacity, np.nan, dtype="<f8")
+    padded_closes[:count] = closes
+
+    path = archive_path(symbol)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        f.write(header.tobytes())
+        f.write(padded_days.tobytes())
+        f.write(padded_closes.tobytes())
+    os.replace(tmp, path)
+
+
+def append(symbol: str, days: np.ndarray, closes: np.ndarray) -> int:
+    """새 일봉을 아카이브 끝에 제자리에서 추가합니다.
+
+    마지막 날짜보다 이전 값은 무시하고, 마지막 날짜와 같은 날은 덮어씁니다.
+    (장중에 저장한 오늘 값을 마감 값으로 갱신)
+    빈 자리가 모자랄 때만 전체를 다시 씁니다.
+
+    Returns:
+        새로 늘어난 일봉 수
+    """
+    path = archive_path(symbol)
+    header = _read_header(path)
+    if header is None:
+        write(symbol, days, closes)
+        return len(days)
+
+    count, capacity = int(header["count"]), int(header["capacity"])
+    start = count
+    if count:
+        last_day = int(
+            np.memmap(path, "<i8", "r", HEADER.itemsize + 8 * (count - 1), (1,))[0]
+        )
+        keep = days >= last_day
+        days, closes = days[keep], closes[keep]
+        if len(days) and days[0] == last_day:
+            start = count - 1
+    if not len(days):
+        return 0
+
+    end = start + len(days)
+    if end > capacity:
+        current = open_archive(symbol)
+        write(
+            symbol,
+            np.concatenate([current.days[:start], days]),
+            np.concatenate([current.closes[:start], closes]),
+            headroom=capacity,
+        )
+        return end - count
+
+    # 값을 먼저 쓰고 count를 마지막에 바꿈 (중간에 멈춰도 이전 count까지는 온전)
+    day_view = np.memmap(path, "<i8", "r+", HEADER.itemsize + 8 * start, (len(days),))
+    day_view[:] = days
+    day_view.flush()
+    close_offset = HEADER.itemsize + 8 * capacity + 8 * start
+    close_view = np.memmap(path, "<f8", "r+", close_offset, (len(closes),))
+    close_view[:] = closes
+    close_view.flush()
+    count_view = np.memmap(path, "<i8", "r+", HEADER.fields["count"][1], (1,))
+    count_view[0] = end
+    count_view.flush()
+    del day_view, close_view, count_view
+    return end - count
+
+
+def _series_arrays(prices: pd.Series | None) -> tuple[np.ndarray, np.ndarray]:
+    """종가 Series를 (epoch-day, 종가) 배열로 (빈 값 제외)"""
+    if prices is None or prices.empty:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    prices = prices.dropna()
+    return to_epoch_days(prices.index), prices.to_numpy(dtype="float64", copy=True)
+
+
+def _overlap_matches(archive: Archive, days: np.ndarray, closes: np.ndarray) -> bool:
+    """새로 받은 값과 아카이브의 겹치는 날짜가 같은지 (마지막 날은 장중 값일 수 있어 제외)"""
+    stored_days = archive.days[:-1]
+    positions = np.searchsorted(stored_days, days)
+    found = positions < len(stored_days)
+    found[found] = stored_days[positions[found]] == days[found]
+    if not found.any():
+        return False
+    stored = archive.closes[positions[found]]
+    return bool(np.allclose(stored, closes[found], rtol=ADJUST_TOLERANCE, atol=0))
+
+
+def _symbol_lock(symbol: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(symbol.upper(), threading.Lock())
+
+
+def sync(
+    symbol: str,
+    fetch: Callable[[str, str], pd.Series | None],
+    as_of: str | None = None,
+) -> tuple[Archive | None, bool]:
+    """아카이브를 최신 일봉까지 맞추고 엽니다. (스레드에서 실행)
+
+    Args:
+        symbol: 종목 코드
+        fetch: (종목, 기간) → 종가 Series (DatetimeIndex) 또는 None
+        as_of: 데이터 기준 시점 (없으면 종목 거래소 기준, 같으면 다시 조회하지 않음)
+
+    Returns:
+        (열린 아카이브 (데이터를 받지 못하면 None),
+         수정 종가가 바뀌어 전체를 다시 받았는지)
+    """
+    symbol = symbol.upper()
+    as_of = as_of or exchange_as_of(market_calendar.exchange_for(symbol))
+    with _symbol_lock(symbol):
+        archive = open_archive(symbol)
+        if archive is not None and len(archive.days) and _synced.get(symbol) == as_of:
+            return archive, False
+
+        if archive is not None and len(archive.days) > 1:
+            days, closes = _series_arrays(fetch(symbol, SYNC_PERIOD))
+            if not len(days):
+                # 조회 실패 시 가지고 있는 값 사용 (다음 요청에서 다시 시도)
+                return archive, False
+            if _overlap_matches(archive, days, closes):
+                del archive
+                append(symbol, days, closes)
+                _synced[symbol] = as_of
+                return open_archive(symbol), False
+            # 수정 종가가 바뀜 (배당/분할) → 전체 다시
+            rebuilt = True
+        else:
+            rebuilt = False
+        del archive
+
+        days, closes = _series_arrays(fetch(symbol, "max"))
+        if not len(days):
+            return None, False
+        write(symbol, days, closes)
+        _synced[symbol] = as_of
+        return open_archive(symbol), rebuilt
+
+
+def slice_period(archive: Archive, period: str) -> np.ndarray:
+    """아카이브에서 분석 기간만큼의 종가 (복사 없는 memmap view)
+
+    기간은 마지막 일봉 날짜 기준으로 계산합니다. (1d/5d는 마지막 거래일 수)
+    """
+    closes = archive.closes
+    if period == "max" or not len(closes):
+        return closes
+    if period.endswith("d") and period[:-1].isdigit():
+        return closes[-int(period[:-1]) :]
+    offset = PERIOD_OFFSETS.get(period)
+    if offset is None:
+        return closes
+    last = pd.Timestamp(int(archive.days[-1]), unit="D")
+    cutoff = int(
+        (last - offset).to_datetime64().astype("datetime64[D]").astype(np.int64)
+    )
+    return closes[int(np.searchsorted(archive.days, cutoff, side="right")) :]
+
+
+def clear_synced():
+    """동기화 기록 삭제 (다음 sync에서 다시 조회)"""
+    _synced.clear()
@@ -0,0 +1,195 @@
+"""실행 시간 측정 모듈 (--profile)
+
+리포트 생성 단계(수집/계산/렌더링/전송)와 종목별 소요 시간을 구간(span)으로 기록합니다.
+
+사용법:
+    from src import profiling
+
+    with profiling.span("fetch", "TSLA"):
+        data = fetch_stock_data("TSLA")
+
+    print(profiling.format_summary())
+
+프로세스 최대 메모리(peak_memory)는 측정을 켜지 않아도 읽을 수 있습니다.
+
+측정을 켜지 않으면 span()은 미리 만들어 둔 빈 객체를 돌려주므로
+시각 측정이나 기록 없이 with 문 비용만 듭니다.
+"""
+
+import sys
+import threading
+import time
+from collections import defaultdict
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_enabled = False
+_lock = threading.Lock()
+
+
+class _StageStats:
+    """단계 1개의 누적 통계 (구간마다 값을 쌓지 않아 봇/데몬에서도 메모리가 늘지 않음)"""
+
+    __slots__ = ("count", "max", "total")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, elapsed: float):
+        self.count += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+
+
+# {단계: 누적 통계}
+_stages: dict[str, _StageStats] = defaultdict(_StageStats)
+# {(단계, 심볼): 누적 소요 시간(초)}
+_symbols: dict[tuple[str, str], float] = defaultdict(float)
+
+
+class _NoopSpan:
+    """측정을 끈 상태의 span (아무것도 하지 않음)"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    """소요 시간을 기록하는 span"""
+
+    __slots__ = ("stage", "start", "symbol")
+
+    def __init__(self, stage: str, symbol: str | None):
+        self.stage = stage
+        self.symbol = symbol
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _record(self.stage, self.symbol, time.perf_counter() - self.start)
+        return False
+
+
+def _record(stage: str, symbol: str | None, elapsed: float):
+    # 종목 수집은 스레드(asyncio.to_thread)에서도 끝나므로 잠금
+    with _lock:
+        _stages[stage].add(elapsed)
+        if symbol is not None:
+            _symbols[(stage, symbol)] += elapsed
+
+
+def span(stage: str, symbol: str | None = None):
+    """구간 소요 시간 측정 (with 문)
+
+    Args:
+        stage: 단계 이름 (예: fetch, compute, render, send)
+        symbol: 종목별로 따로 집계할 심볼
+    """
+    if not _enabled:
+        return _NOOP
+    return _Span(stage, symbol)
+
+
+def enable():
+    """측정 시작"""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """측정 중지 (기록은 유지)"""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def peak_memory() -> int | None:
+    """프로세스 최대 메모리 사용량 (RSS, bytes). 측정할 수 없는 플랫폼이면 None
+
+    측정을 켜지 않아도 동작합니다. (운영체제가 기록한 값을 읽기만 함)
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 bytes 단위
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def reset():
+    """기록 삭제"""
+    with _lock:
+        _stages.clear()
+        _symbols.clear()
+
+
+def summary(top: int = 5) -> dict:
+    """단계별/종목별 소요 시간 요약
+
+    Returns:
+        {
+            "stages": [{"stage": "fetch", "count": 3, "total": 1.2, "avg": 0.4, "max": 0.6}, ...],
+            "slowest": [{"stage": "fetch", "symbol": "TSLA", "total": 0.6}, ...],
+        }
+    """
+    with _lock:
+        stages = [
+            {
+                "stage": stage,
+                "count": stats.count,
+                "total": stats.total,
+                "avg": stats.total / stats.count,
+                "max": stats.max,
+            }
+            for stage, stats in _stages.items()
+            if stats.count
+        ]
+        slowest = sorted(_symbols.items(), key=lambda kv: kv[1], reverse=True)[:top]
+    return {
+        "stages": stages,
+        "slowest": [
+            {"stage": stage, "symbol": symbol, "total": total}
+            for (stage, symbol), total in slowest
+        ],
+    }
+
+
+def format_summary(top: int = 5) -> str:
+    """요약을 터미널 출력용 표로"""
+    data = summary(top)
+    if not data["stages"]:
+        return "⏱️ 측정된 구간 없음"
+
+    lines = [
+        "⏱️ 단계별 소요 시간",
+        f"  {'STAGE':<14}{'COUNT':>6}{'TOTAL':>10}{'AVG':>10}{'MAX':>10}",
+    ]
+    for item in data["stages"]:
+        lines.append(
+            f"  {item['stage']:<14}{item['count']:>6}"
+            f"{item['total']:>9.3f}s{item['avg']:>9.3f}s{item['max']:>9.3f}s"
+        )
+    if data["slowest"]:
+        lines.append("⏱️ 느린 종목")
+        for item in data["slowest"]:
+            lines.append(
+                f"  {item['symbol']:<10}{item['stage']:<10}{item['total']:>9.3f}s"
+            )
+    return "\n".join(lines)
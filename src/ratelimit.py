@@ -0,0 +1,47 @@
+"""속도 제한 모듈
+
+텔레그램 전송 대기열(send_queue)과 유니버스 스크리너(screener)가 함께 쓰는
+토큰 버킷입니다. 시각은 호출하는 쪽이 넘겨주므로 테스트에서 가짜 시계를 쓸 수 있습니다.
+
+사용 예:
+    bucket = TokenBucket(rate=1.0, capacity=1.0, now=time.monotonic())
+    await asyncio.sleep(bucket.delay(time.monotonic()))
+    bucket.consume(time.monotonic())
+"""
+
+
+class TokenBucket:
+    """토큰 버킷 알고리즘
+
+    초당 rate개씩 토큰이 채워지고, 최대 capacity개까지 쌓입니다.
+    요청 1건마다 토큰 1개를 소비하므로 평균 속도는 rate, 순간 최대치는 capacity로 제한됩니다.
+    """
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        """
+        Args:
+            rate: 초당 채워지는 토큰 수
+            capacity: 최대 토큰 수 (순간 허용량)
+            now: 현재 시각 (monotonic)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = now
+
+    def _refill(self, now: float):
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def delay(self, now: float) -> float:
+        """토큰 1개를 쓸 수 있을 때까지 남은 시간 (초, 0이면 즉시 가능)"""
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self, now: float):
+        """토큰 1개 소비"""
+        self._refill(now)
+        self.tokens -= 1
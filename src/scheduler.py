@@ -1,9 +1,276 @@
-"""스케줄러 모듈"""
+"""스케줄러 모듈
 
+asyncio 타이머 기반 작업 스케줄러입니다.
+매초 확인(polling)하지 않고, 가장 가까운 실행 시각까지 잠들었다가 깨어납니다.
+(작업이 추가/삭제되면 바로 깨어나 다음 실행 시각을 다시 계산)
 
-def run_scheduler():
-    """
-    매일 정해진 시간에 알림을 실행하는 스케줄러
-    """
-    # TODO: schedule 라이브러리를 사용하여 구현
-    pass
+트리거:
+    - DailyTrigger: 매일 정해진 시각 (조건 함수로 새 데이터가 없는 날 등은 건너뜀)
+    - SessionTrigger: 거래일 정규장 시작/종료 기준 (예: 개장 30분 전, 마감 15분 후)
+      조기 폐장일은 실제 폐장 시각(13:00) 기준, 휴장일은 실행하지 않음
+    - IntervalTrigger: 일정 간격마다 (예: 다른 프로세스의 watchlist 변경 확인)
+
+misfire 처리:
+    절전/이벤트 루프 지연 등으로 예정 시각보다 misfire_grace초 넘게 늦으면 그 회차는 건너뜁니다.
+    여러 회차가 밀려 있어도 한 번만 판단하고 다음 예정 시각으로 넘어갑니다.
+
+봇 모드(--bot, --webhook)와 데몬 모드(--daemon)가 같은 스케줄러를 사용합니다.
+"""
+
+import asyncio
+import copy
+import datetime
+import re
+from collections.abc import Awaitable, Callable
+
+from src import market_calendar
+
+# 시계 오차(절전 후 복귀 등)에 대비해 최소 이 간격마다 깨어나 다시 계산 (초)
+MAX_SLEEP = 3600.0
+
+# 최대 며칠 앞까지 실행 시각을 찾을지 (조건을 만족하는 날이 없으면 실행 안 함)
+SEARCH_DAYS = 366
+
+
+class DailyTrigger:
+    """매일 정해진 시각"""
+
+    def __init__(
+        self,
+        at: datetime.time,
+        when: Callable[[datetime.datetime], bool] | None = None,
+    ):
+        """
+        Args:
+            at: 실행 시각 (tzinfo 필수)
+            when: 실행 여부 조건 (실행 예정 시각을 받아 False면 그날 건너뜀)
+        """
+        if at.tzinfo is None:
+            raise ValueError("DailyTrigger 시각에는 timezone이 필요합니다")
+        self.at = at
+        self.when = when
+
+    def next_after(self, after: datetime.datetime) -> datetime.datetime | None:
+        """after 이후 첫 실행 시각"""
+        day = after.astimezone(self.at.tzinfo).date()
+        for _ in range(SEARCH_DAYS):
+            candidate = datetime.datetime.combine(day, self.at)
+            if candidate > after and (self.when is None or self.when(candidate)):
+                return candidate
+            day += datetime.timedelta(days=1)
+        return None
+
+    def __repr__(self) -> str:
+        return f"DailyTrigger({self.at.strftime('%H:%M')} {self.at.tzinfo})"
+
+
+class SessionTrigger:
+    """거래일 정규장 시작/종료 기준 시각"""
+
+    def __init__(self, anchor: str, offset: datetime.timedelta = datetime.timedelta()):
+        """
+        Args:
+            anchor: "open" (개장) 또는 "close" (폐장)
+            offset: 기준 시각에서 더할 시간 (음수면 이전)
+        """
+        if anchor not in ("open", "close"):
+            raise ValueError(f"알 수 없는 기준: {anchor}")
+        self.anchor = anchor
+        self.offset = offset
+
+    def next_after(self, after: datetime.datetime) -> datetime.datetime | None:
+        """after 이후 첫 실행 시각"""
+        day = after.astimezone(market_calendar.MARKET_TZ).date()
+        day -= datetime.timedelta(days=1)  # 큰 offset으로 날짜가 넘어가는 경우 대비
+        for _ in range(SEARCH_DAYS):
+            hours = market_calendar.session(day)
+            if hours is not None:
+                anchor_time = hours[0] if self.anchor == "open" else hours[1]
+                candidate = anchor_time + self.offset
+                if candidate > after:
+                    return candidate
+            day += datetime.timedelta(days=1)
+        return None
+
+    def __repr__(self) -> str:
+        minutes = int(self.offset.total_seconds() // 60)
+        return f"SessionTrigger({self.anchor}{minutes:+d}m)"
+
+
+class IntervalTrigger:
+    """일정 간격마다"""
+
+    def __init__(self, interval: datetime.timedelta):
+        """
+        Args:
+            interval: 실행 간격 (0보다 커야 함)
+        """
+        if interval <= datetime.timedelta():
+            raise ValueError("IntervalTrigger 간격은 0보다 커야 합니다")
+        self.interval = interval
+
+    def next_after(self, after: datetime.datetime) -> datetime.datetime:
+        """after 이후 첫 실행 시각"""
+        return after + self.interval
+
+    def __repr__(self) -> str:
+        return f"IntervalTrigger({self.interval.total_seconds():.0f}s)"
+
+
+def parse_session_spec(spec: str) -> SessionTrigger:
+    """세션 형식 문자열(분 단위, 예: open-30, close+15)을 SessionTrigger로 변환"""
+    match = re.fullmatch(r"\s*(open|close)\s*([+-]\s*\d+)?\s*", spec.lower())
+    if not match:
+        raise ValueError(f"잘못된 세션 형식: {spec} (예: open-30, close+15)")
+    minutes = int(match.group(2).replace(" ", "")) if match.group(2) else 0
+    return SessionTrigger(match.group(1), datetime.timedelta(minutes=minutes))
+
+
+class Job:
+    """스케줄 작업"""
+
+    def __init__(
+        self,
+        name: str,
+        callback: Callable[["Job"], Awaitable[None]],
+        trigger,
+        data=None,
+        misfire_grace: float | None = None,
+    ):
+        """
+        Args:
+            name: 작업 이름 (같은 이름으로 추가하면 교체)
+            callback: 실행할 함수. 실행 회차 정보(scheduled_at)가 담긴 Job 복사본을 받음
+            trigger: next_after(datetime)를 가진 트리거
+            data: 콜백에 전달할 데이터
+            misfire_grace: 허용 지연 (초, 없으면 스케줄러 기본값)
+        """
+        self.name = name
+        self.callback = callback
+        self.trigger = trigger
+        self.data = data
+        self.misfire_grace = misfire_grace
+        self.next_run: datetime.datetime | None = None
+        self.scheduled_at: datetime.datetime | None = None
+        self.runs = 0
+        self.missed = 0
+        self.errors = 0
+
+    def __repr__(self) -> str:
+        return f"Job({self.name}, {self.trigger}, next={self.next_run})"
+
+
+def _utc_now() -> datetime.datetime:
+    return datetime.datetime.now(tz=datetime.UTC)
+
+
+class Scheduler:
+    """asyncio 타이머 기반 스케줄러"""
+
+    def __init__(
+        self,
+        misfire_grace: float = 300.0,
+        clock: Callable[[], datetime.datetime] = _utc_now,
+    ):
+        """
+        Args:
+            misfire_grace: 기본 허용 지연 (초)
+            clock: 현재 시각 함수 (timezone 포함, 테스트용)
+        """
+        self.misfire_grace = misfire_grace
+        self._clock = clock
+        self._jobs: dict[str, Job] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._running: set[asyncio.Task] = set()
+
+    def add(self, job: Job) -> Job:
+        """작업 추가 (같은 이름이 있으면 교체)"""
+        job.next_run = job.trigger.next_after(self._clock())
+        self._jobs[job.name] = job
+        self._wakeup.set()
+        return job
+
+    def remove(self, *prefixes: str) -> int:
+        """이름이 prefix로 시작하는 작업 삭제. 삭제한 개수 반환"""
+        names = [name for name in self._jobs if name.startswith(prefixes)]
+        for name in names:
+            del self._jobs[name]
+        self._wakeup.set()
+        return len(names)
+
+    def jobs(self) -> list[Job]:
+        """등록된 작업 (다음 실행 시각 순)"""
+        return sorted(
+            self._jobs.values(),
+            key=lambda job: (
+                job.next_run or datetime.datetime.max.replace(tzinfo=datetime.UTC)
+            ),
+        )
+
+    def start(self):
+        """백그라운드에서 스케줄러 실행"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self, timeout: float = 30.0):
+        """스케줄러 중지 (실행 중인 작업은 timeout까지 기다림)"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._running:
+            await asyncio.wait(self._running, timeout=timeout)
+
+    async def run(self):
+        """다음 실행 시각까지 잠들고, 시각이 되면 작업 실행 (취소될 때까지 반복)"""
+        while True:
+            self._wakeup.clear()
+            now = self._clock()
+            for job in list(self._jobs.values()):
+                if job.next_run is not None and job.next_run <= now:
+                    self._fire(job, now)
+
+            upcoming = [job.next_run for job in self._jobs.values() if job.next_run]
+            timeout = MAX_SLEEP
+            if upcoming:
+                delay = (min(upcoming) - self._clock()).total_seconds()
+                timeout = min(MAX_SLEEP, max(0.0, delay))
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except TimeoutError:
+                pass
+
+    def _fire(self, job: Job, now: datetime.datetime):
+        """예정 시각이 된 작업 실행 (너무 늦었으면 건너뜀)"""
+        scheduled = job.next_run
+        # 밀린 회차는 모두 건너뛰고 다음 예정 시각으로
+        job.next_run = job.trigger.next_after(now)
+        if job.next_run is None:
+            del self._jobs[job.name]
+
+        grace = self.misfire_grace if job.misfire_grace is None else job.misfire_grace
+        lateness = (now - scheduled).total_seconds()
+        if lateness > grace:
+            job.missed += 1
+            print(
+                f"스케줄 건너뜀: {job.name} ({scheduled.isoformat()}, {lateness:.0f}초 지연)"
+            )
+            return
+
+        run = copy.copy(job)
+        run.scheduled_at = scheduled
+        task = asyncio.create_task(self._run_job(job, run))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    @staticmethod
+    async def _run_job(job: Job, run: Job):
+        """작업 실행 (예외는 기록만 하고 스케줄러는 계속 동작)"""
+        try:
+            await job.callback(run)
+            job.runs += 1
+        except Exception as e:  # noqa: BLE001 - 한 작업의 오류로 스케줄러를 멈추지 않음
+            job.errors += 1
+            print(f"스케줄 작업 오류 ({job.name}): {e}")
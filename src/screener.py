@@ -0,0 +1,228 @@
+"""유니버스 스크리너
+
+관심 종목(watchlist) 밖의 큰 종목 목록(예: S&P 500)에서
+고점 대비 하락률이 기준 이하인 종목을 찾습니다.
+
+유니버스 파일 (기본: data/universe.txt, SCREEN_UNIVERSE로 변경):
+    한 줄에 종목 하나 (쉼표/공백 구분도 가능), # 뒤는 주석
+
+동작 방식:
+    - SCREEN_CHUNK_SIZE개씩 묶어 한 번에 요청 (fetch_closes)
+    - 묶음 요청은 동시에 SCREEN_CONCURRENCY개, 초당 SCREEN_RATE개까지만 시작
+      (yfinance 요청이 몰려 차단되지 않도록)
+    - 하락률/200일선은 묶음 전체(열 = 종목)에 대해 DataFrame 연산으로 한 번에 계산
+    - 묶음이 끝날 때마다 지금까지의 결과를 하락률 순으로 콜백에 전달 (진행 상황 표시)
+    - 결과는 거래일 단위로 캐시: 같은 거래일에 다시 요청하면 조회 없이 바로 반환
+      (기준 하락률만 다른 요청도 재사용, 장 마감 후에는 마감 가격으로 한 번 더 조회)
+
+사용 예:
+    symbols = screener.load_universe()
+    screen = await screener.screen(symbols, "1y")
+    matches = screener.rank(screen["results"], threshold=-20.0)
+"""
+
+import asyncio
+import datetime
+import re
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+import pandas as pd
+
+from src import market_calendar, watchlist
+from src.config import Config
+from src.market_calendar import MARKET_TZ
+from src.ratelimit import TokenBucket
+from src.stock.fetcher import fetch_closes
+from src.stock.ma import calculate_ma_analysis
+from src.stock.mdd import get_buy_signal
+
+# 200일선 계산 기간
+MA_WINDOW = 200
+
+# 묶음 요청 HTTP timeout (초)
+REQUEST_TIMEOUT = 30.0
+
+# 거래일별 스크리닝 결과 {(종목 목록, 기간, 거래일): 결과}
+_cache: dict[tuple, dict] = {}
+
+
+def universe_file() -> Path:
+    """유니버스 파일 경로"""
+    if Config.SCREEN_UNIVERSE:
+        return Path(Config.SCREEN_UNIVERSE)
+    return watchlist.DATA_DIR / "universe.txt"
+
+
+def load_universe(path: Path | str | None = None) -> list[str]:
+    """유니버스 파일에서 종목 목록을 읽습니다. (대문자, 중복 제거, 순서 유지)
+
+    Raises:
+        FileNotFoundError: 파일이 없을 때
+    """
+    path = Path(path) if path else universe_file()
+    symbols = []
+    seen = set()
+    for line in path.read_text(encoding="utf-8").splitlines():
+        for token in re.split(r"[\s,]+", line.split("#", 1)[0]):
+            symbol = token.strip().upper()
+            if symbol and symbol not in seen:
+                seen.add(symbol)
+                symbols.append(symbol)
+    return symbols
+
+
+def trading_day_key(now: datetime.datetime | None = None) -> str:
+    """캐시 기준 거래일
+
+    정규장 중에는 그날 하루 동안 같은 값, 마감 후/휴장일에는 마지막 마감일.
+    (장중에 만든 결과는 마감 후 첫 요청에서 마감 가격으로 한 번 더 조회)
+    """
+    if now is None:
+        now = datetime.datetime.now(tz=MARKET_TZ)
+    if market_calendar.is_open(now):
+        return f"session:{now.astimezone(MARKET_TZ).date().isoformat()}"
+    return f"close:{market_calendar.last_close(now).isoformat()}"
+
+
+def analyze_closes(closes: pd.DataFrame) -> list[dict]:
+    """종가 DataFrame(열 = 종목)의 하락률/200일선을 한 번에 계산
+
+    Returns:
+        종목별 결과 리스트 (pipeline.analyze_symbol 결과와 같은 형태).
+        가격이 없는 종목은 빠집니다.
+    """
+    if closes.empty:
+        return []
+    closes = closes.astype("float64")
+
+    # 열 단위 연산 (종목 수만큼 반복하지 않음)
+    peak = closes.max()
+    current = closes.ffill().iloc[-1]
+    drawdown = (current - peak) / peak * 100
+    # 최근 200일에 빈 값이 없을 때만 200일선 계산 (calculate_ma와 같은 기준)
+    tail = closes.iloc[-MA_WINDOW:]
+    ma_200 = tail.mean().where(tail.count() >= MA_WINDOW)
+
+    items = []
+    for symbol in closes.columns:
+        if pd.isna(peak[symbol]) or peak[symbol] <= 0 or pd.isna(current[symbol]):
+            continue
+        item = {
+            "symbol": str(symbol),
+            "peak_price": float(peak[symbol]),
+            "current_price": float(current[symbol]),
+            "drawdown_pct": float(drawdown[symbol]),
+            "buy_signal": get_buy_signal(float(drawdown[symbol])),
+        }
+        if not pd.isna(ma_200[symbol]):
+            item["ma_200"] = calculate_ma_analysis(
+                item["current_price"], float(ma_200[symbol])
+            )
+        items.append(item)
+    return items
+
+
+def _screen_chunk(symbols: list[str], period: str) -> list[dict]:
+    """묶음 하나 조회 + 계산 (스레드에서 실행)"""
+    return analyze_closes(fetch_closes(symbols, period, REQUEST_TIMEOUT))
+
+
+def rank(results: list[dict], threshold: float) -> list[dict]:
+    """하락률이 threshold 이하인 종목을 하락률이 큰 순서로"""
+    matches = [item for item in results if item["drawdown_pct"] <= threshold]
+    return sorted(matches, key=lambda item: item["drawdown_pct"])
+
+
+async def screen(
+    symbols: list[str],
+    period: str = "1y",
+    on_progress: Callable[[int, int, list[dict]], Awaitable[None]] | None = None,
+    chunk_size: int | None = None,
+    concurrency: int | None = None,
+    rate: float | None = None,
+    now: datetime.datetime | None = None,
+) -> dict:
+    """유니버스 전체를 조회해 종목별 하락률/200일선을 계산합니다.
+
+    Args:
+        symbols: 유니버스 종목 리스트
+        period: 분석 기간
+        on_progress: 묶음이 끝날 때마다 (끝난 묶음 수, 전체 묶음 수, 지금까지 결과) 호출
+        chunk_size: 한 번에 요청할 종목 수 (없으면 SCREEN_CHUNK_SIZE)
+        concurrency: 동시에 보낼 묶음 요청 수 (없으면 SCREEN_CONCURRENCY)
+        rate: 초당 시작할 수 있는 묶음 요청 수 (없으면 SCREEN_RATE)
+        now: 캐시 기준 시각 (없으면 현재 시각)
+
+    Returns:
+        {
+            "period": "1y",
+            "as_of": "close:2025-01-10",   # 캐시 기준 거래일
+            "universe": 500,               # 유니버스 종목 수
+            "results": [...],              # 하락률이 큰 순서의 전체 결과
+            "missing": ["XXX"],            # 데이터를 받지 못한 종목
+            "cached": False,               # 캐시에서 꺼냈는지
+        }
+    """
+    as_of = trading_day_key(now)
+    key = (tuple(symbols), period, as_of)
+    cached = _cache.get(key)
+    if cached is not None:
+        return {**cached, "cached": True}
+
+    chunk_size = max(1, chunk_size or Config.SCREEN_CHUNK_SIZE)
+    concurrency = max(1, concurrency or Config.SCREEN_CONCURRENCY)
+    rate = rate or Config.SCREEN_RATE
+    chunks = [symbols[i : i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+
+    semaphore = asyncio.Semaphore(concurrency)
+    bucket = TokenBucket(rate, 1, time.monotonic()) if rate > 0 else None
+    start_lock = asyncio.Lock()
+
+    async def run(chunk: list[str]) -> list[dict]:
+        async with semaphore:
+            if bucket is not None:
+                # 묶음 요청 시작 간격 제한 (시작 순서대로 한 개씩 토큰 사용)
+                async with start_lock:
+                    while (delay := bucket.delay(time.monotonic())) > 0:
+                        await asyncio.sleep(delay)
+                    bucket.consume(time.monotonic())
+            return await asyncio.to_thread(_screen_chunk, chunk, period)
+
+    results: list[dict] = []
+    failed_chunks = 0
+    tasks = [asyncio.create_task(run(chunk)) for chunk in chunks]
+    try:
+        for done, finished in enumerate(asyncio.as_completed(tasks), start=1):
+            items = await finished
+            if not items:
+                failed_chunks += 1
+            results.extend(items)
+            results.sort(key=lambda item: item["drawdown_pct"])
+            if on_progress is not None:
+                await on_progress(done, len(chunks), results)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    found = {item["symbol"] for item in results}
+    entry = {
+        "period": period,
+        "as_of": as_of,
+        "universe": len(symbols),
+        "results": results,
+        "missing": [symbol for symbol in symbols if symbol not in found],
+    }
+
+    # 지난 거래일 결과 정리 후 저장 (통째로 실패한 묶음이 있으면 다음 요청에서 다시 조회)
+    for old_key in [k for k in _cache if k[-1] != as_of]:
+        del _cache[old_key]
+    if not failed_chunks:
+        _cache[key] = entry
+    return {**entry, "cached": False}
+
+
+def clear_cache():
+    """스크리닝 캐시 삭제"""
+    _cache.clear()
@@ -0,0 +1,242 @@
+"""매수 신호 상태 관리 모듈
+
+종목별 마지막 매수 단계와 200일선 위치를 저장하고,
+새 분석 결과와 비교해 바뀐 종목(상태 변화)만 찾아냅니다.
+
+같은 "1차 매수" 리포트를 몇 주씩 반복하는 대신,
+단계가 바뀌거나 200일선 위/아래가 바뀔 때만 짧은 알림을 보내기 위해 사용합니다.
+
+채팅방마다 알림 시간/종목이 달라 마지막으로 알린 상태도 다르므로 채팅방별로 저장합니다.
+(한 채팅방의 리포트가 상태를 갱신해, 나중에 보내는 다른 채팅방의 변화 알림을 삼키지 않도록)
+
+파일 위치: data/signal_state.json
+구조 (분석 기간마다 고점이 다르므로 채팅방 안에서 기간별로 저장):
+{
+    "chats": {
+        "123456789": {
+            "1y": {
+                "TSLA": {"tier": 1, "ma_position": "above", "updated_at": "2025-01-10T09:00:00"}
+            }
+        }
+    }
+}
+"""
+
+import datetime
+import json
+
+from src import watchlist
+from src.config import Config
+from src.stock.ma import get_ma_position
+from src.stock.mdd import get_signal_tier
+
+
+def _state_file():
+    """상태 파일 경로 (watchlist와 같은 data 디렉토리)"""
+    return watchlist.DATA_DIR / "signal_state.json"
+
+
+def load() -> dict:
+    """JSON 파일에서 상태 로드 (없거나 읽기 실패, 채팅방별 구조 이전 파일이면 빈 상태)"""
+    path = _state_file()
+    if path.exists():
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+                if isinstance(data, dict) and isinstance(data.get("chats"), dict):
+                    return data
+        except (json.JSONDecodeError, OSError):
+            pass
+    return {"chats": {}}
+
+
+def _chat_state(state: dict, chat_id: str | int) -> dict:
+    """채팅방의 기간별 상태 (없으면 생성)"""
+    return state["chats"].setdefault(str(chat_id), {})
+
+
+def save(state: dict) -> bool:
+    """상태를 JSON 파일에 저장"""
+    watchlist.DATA_DIR.mkdir(exist_ok=True)
+    try:
+        with open(_state_file(), "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2, ensure_ascii=False)
+        return True
+    except OSError:
+        return False
+
+
+def detect_changes(
+    period: str,
+    stock_results: list[dict],
+    state: dict,
+    tier_hysteresis: float | None = None,
+    ma_hysteresis: float | None = None,
+) -> list[dict]:
+    """새 분석 결과를 이전 상태와 비교해 변화 목록을 반환하고 state를 갱신합니다.
+
+    처음 보는 종목은 상태만 기록하고 변화로 보지 않습니다.
+
+    Args:
+        period: 분석 기간
+        stock_results: 종목별 분석 결과
+        state: 채팅방 하나의 기간별 상태 (제자리에서 갱신됨)
+        tier_hysteresis: 매수 단계 여유 폭 (%p, 없으면 SIGNAL_HYSTERESIS_PCT)
+        ma_hysteresis: 200일선 위치 여유 폭 (%, 없으면 MA_HYSTERESIS_PCT)
+
+    Returns:
+        [
+            {
+                "symbol": "TSLA",
+                "kind": "tier",          # tier(매수 단계) 또는 ma(200일선 위치)
+                "old": 1,
+                "new": 2,
+                "drawdown_pct": -21.3,
+                "current_price": 400.0,
+                "ma_diff_pct": None,     # kind가 ma일 때 200일선 차이 (%)
+            },
+            ...
+        ]
+    """
+    if tier_hysteresis is None:
+        tier_hysteresis = Config.SIGNAL_HYSTERESIS_PCT
+    if ma_hysteresis is None:
+        ma_hysteresis = Config.MA_HYSTERESIS_PCT
+
+    period_state = state.setdefault(period, {})
+    now = datetime.datetime.now().isoformat(timespec="seconds")
+    changes = []
+
+    for item in stock_results:
+        symbol = item.get("symbol")
+        drawdown_pct = item.get("drawdown_pct")
+        if not symbol or drawdown_pct is None:
+            continue
+
+        previous = period_state.get(symbol)
+        entry = {"tier": None, "ma_position": None, "updated_at": now}
+
+        prev_tier = previous.get("tier") if previous else None
+        entry["tier"] = get_signal_tier(drawdown_pct, prev_tier, tier_hysteresis)
+
+        ma_data = item.get("ma_200") or {}
+        ma_diff = ma_data.get("diff_pct")
+        prev_position = previous.get("ma_position") if previous else None
+        if ma_diff is not None:
+            entry["ma_position"] = get_ma_position(
+                ma_diff, prev_position, ma_hysteresis
+            )
+        else:
+            # 200일선 분석을 안 한 날은 이전 위치 유지
+            entry["ma_position"] = prev_position
+
+        base = {
+            "symbol": symbol,
+            "drawdown_pct": drawdown_pct,
+            "current_price": item.get("current_price"),
+            "ma_diff_pct": ma_diff,
+        }
+        if prev_tier is not None and entry["tier"] != prev_tier:
+            changes.append(
+                {**base, "kind": "tier", "old": prev_tier, "new": entry["tier"]}
+            )
+        if (
+            prev_position is not None
+            and entry["ma_position"] is not None
+            and entry["ma_position"] != prev_position
+        ):
+            changes.append(
+                {
+                    **base,
+                    "kind": "ma",
+                    "old": prev_position,
+                    "new": entry["ma_position"],
+                }
+            )
+
+        period_state[symbol] = entry
+
+    return changes
+
+
+def update(
+    period: str, stock_results: list[dict], chat_ids: list[str]
+) -> dict[str, list[dict]]:
+    """상태 파일을 읽어 채팅방별로 변화를 찾고, 갱신된 상태를 저장합니다.
+
+    Args:
+        period: 분석 기간
+        stock_results: 종목별 분석 결과 (여러 채팅방 종목의 합집합)
+        chat_ids: 이번에 알림을 받는 채팅방 ID 리스트 (이 채팅방들의 상태만 갱신)
+
+    Returns:
+        {채팅방 ID: 채팅방 관심 종목의 변화 목록 (select_chat_changes 적용)}
+    """
+    state = load()
+    changes = {}
+    for chat_id in chat_ids:
+        symbols = watchlist.get_all(chat_id)
+        chat_results = [item for item in stock_results if item.get("symbol") in symbols]
+        found = detect_changes(period, chat_results, _chat_state(state, chat_id))
+        changes[chat_id] = select_chat_changes(
+            found, symbols, watchlist.get_ma_symbols(chat_id)
+        )
+    save(state)
+    return changes
+
+
+def get_tiers(period: str) -> dict[str, int]:
+    """기간별 종목의 마지막 매수 단계 {심볼: 단계}
+
+    채팅방마다 값이 다르면 가장 최근에 갱신된 값을 사용합니다.
+    """
+    latest: dict[str, dict] = {}
+    for chat_state in load()["chats"].values():
+        for symbol, entry in chat_state.get(period, {}).items():
+            if entry.get("tier") is None:
+                continue
+            updated_at = entry.get("updated_at", "")
+            if symbol not in latest or updated_at > latest[symbol]["updated_at"]:
+                latest[symbol] = {**entry, "updated_at": updated_at}
+    return {symbol: entry["tier"] for symbol, entry in latest.items()}
+
+
+def record_tiers(
+    period: str, tiers: dict[str, int], chat_ids: list[str] | None = None
+) -> bool:
+    """매수 단계만 갱신 (장중 감시에서 알린 변화를 일일 알림이 다시 알리지 않도록)
+
+    Args:
+        period: 분석 기간
+        tiers: {심볼: 매수 단계}
+        chat_ids: 알림을 받은 채팅방 ID 리스트 (None이면 등록된 전체 채팅방).
+            이 중 종목을 가진 채팅방의 상태만 갱신합니다.
+    """
+    state = load()
+    now = datetime.datetime.now().isoformat(timespec="seconds")
+    if chat_ids is None:
+        chat_ids = watchlist.get_chat_ids()
+    for chat_id in chat_ids:
+        symbols = watchlist.get_all(chat_id)
+        period_state = _chat_state(state, chat_id).setdefault(period, {})
+        for symbol, tier in tiers.items():
+            if symbol not in symbols:
+                continue
+            entry = period_state.setdefault(symbol, {"ma_position": None})
+            entry["tier"] = tier
+            entry["updated_at"] = now
+    return save(state)
+
+
+def select_chat_changes(
+    changes: list[dict], symbols: list[str], ma_symbols: list[str]
+) -> list[dict]:
+    """채팅방 관심 종목의 변화만 선택 (200일선 변화는 MA 분석을 켠 종목만)"""
+    symbol_set = set(symbols)
+    ma_set = set(ma_symbols)
+    return [
+        change
+        for change in changes
+        if change["symbol"] in symbol_set
+        and (change["kind"] == "tier" or change["symbol"] in ma_set)
+    ]
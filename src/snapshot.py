@@ -0,0 +1,134 @@
+"""캐시 snapshot 저장/복원
+
+봇이 재시작되면(systemd Restart=always) 메모리의 캐시가 모두 비어,
+첫 /report가 모든 종목을 다시 조회합니다. 종료 시와 SNAPSHOT_INTERVAL마다
+메모리 상태를 파일로 저장하고, 시작할 때 유효한 것만 되살려 첫 요청도 캐시로 답합니다.
+
+저장하는 것:
+    - 종목별 마지막 수집 결과 (pipeline, 데이터 기준 시점 포함)
+    - 마지막 Fear & Greed 값 (pipeline)
+    - 완성된 리포트 메시지 (ReportCache)
+    (긴 기간 종가는 PRICE_ARCHIVE가 켜져 있으면 data/archive에 따로 보관됨)
+
+복원 시 확인:
+    - 파일 형식 버전이 같을 때만 사용
+    - 저장한 지 SNAPSHOT_MAX_AGE초가 지났으면 버림
+    - 리포트 메시지는 데이터 기준 시점(cache.data_as_of)이 지금과 같을 때만 복원
+      (종목 결과/Fear & Greed도 기준 시점이 같을 때만 재사용되고, 다르면 시간 초과 대체용으로만 쓰임)
+
+파일 위치: data/snapshot.json
+"""
+
+import datetime
+import json
+import os
+
+from src import pipeline, watchlist
+from src.cache import ReportCache, is_current
+from src.config import Config
+
+# 파일 형식 버전 (구조가 바뀌면 올려서 이전 파일을 무시)
+VERSION = 1
+
+
+def _snapshot_file():
+    """snapshot 파일 경로 (watchlist와 같은 data 디렉토리)"""
+    return watchlist.DATA_DIR / "snapshot.json"
+
+
+def capture(report_cache: ReportCache | None = None) -> dict:
+    """현재 메모리 상태를 JSON으로 저장할 수 있는 dict로"""
+    state = {
+        "version": VERSION,
+        "saved_at": datetime.datetime.now(datetime.UTC).isoformat(),
+        **pipeline.export_state(),
+        "reports": [],
+    }
+    if report_cache is not None:
+        state["reports"] = [
+            {"key": list(key), "pages": pages} for key, pages in report_cache.items()
+        ]
+    return state
+
+
+def write(state: dict) -> bool:
+    """capture() 결과를 파일로 (임시 파일에 쓴 뒤 교체하므로 저장 중 종료돼도 이전 파일은 온전)"""
+    watchlist.DATA_DIR.mkdir(exist_ok=True)
+    path = _snapshot_file()
+    tmp = path.with_suffix(".tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        return True
+    except (OSError, TypeError, ValueError) as e:
+        print(f"snapshot 저장 실패: {e}")
+        return False
+
+
+def save(report_cache: ReportCache | None = None) -> bool:
+    """현재 상태를 snapshot 파일로 저장 (SNAPSHOT_ENABLED가 꺼져 있으면 저장하지 않음)"""
+    if not Config.SNAPSHOT_ENABLED:
+        return False
+    return write(capture(report_cache))
+
+
+def _load() -> dict | None:
+    """snapshot 파일 읽기 (없거나 형식이 다르면 None)"""
+    path = _snapshot_file()
+    if not path.exists():
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(state, dict) or state.get("version") != VERSION:
+        return None
+    return state
+
+
+def restore(
+    report_cache: ReportCache | None = None,
+    now: datetime.datetime | None = None,
+    as_of: str | None = None,
+) -> dict:
+    """snapshot에서 유효한 상태만 되살립니다.
+
+    Args:
+        report_cache: 리포트 메시지를 복원할 캐시 (없으면 건너뜀)
+        now: 기준 시각 (없으면 현재 시각, 저장 후 경과 시간 판단용)
+        as_of: 데이터 기준 시점 (없으면 리포트 키의 거래소별 기준 시점을 지금 다시 계산해 비교)
+
+    Returns:
+        {"results": 복원한 종목 결과 수, "reports": 복원한 리포트 수}
+    """
+    restored = {"results": 0, "reports": 0}
+    if not Config.SNAPSHOT_ENABLED:
+        return restored
+    state = _load()
+    if state is None:
+        return restored
+
+    if now is None:
+        now = datetime.datetime.now(datetime.UTC)
+    try:
+        saved_at = datetime.datetime.fromisoformat(state["saved_at"])
+    except (KeyError, TypeError, ValueError):
+        return restored
+    if (now - saved_at).total_seconds() > Config.SNAPSHOT_MAX_AGE:
+        print("snapshot이 오래되어 사용하지 않음")
+        return restored
+
+    restored["results"] = pipeline.import_state(state)
+
+    if report_cache is not None:
+        for entry in state.get("reports", []):
+            key = tuple(entry.get("key") or ())
+            pages = entry.get("pages")
+            if not key or not isinstance(pages, list):
+                continue
+            if key[-1] == as_of if as_of else is_current(key[-1], now):
+                report_cache.put(key, pages)
+                restored["reports"] += 1
+    return restored
@@ -3,29 +3,127 @@
 import pandas as pd  # 데이터를 표(테이블) 형태로 다루는 라이브러리
 import yfinance as yf  # 야후 파이낸스에서 주가 데이터를 가져오는 라이브러리
 
+from src import metrics
+
 pd.set_option("display.max_columns", None)  # 컬럼 다 보기
 pd.set_option("display.max_rows", None)  # 행도 다 보기 (데이터 많으면 주의!)
 pd.set_option("display.width", None)  # 화면 폭 제한 없음
 
 
-def fetch_stock_data(symbol: str, period: str = "1y") -> pd.DataFrame:
+def fetch_stock_data(
+    symbol: str, period: str = "1y", timeout: float = 10
+) -> pd.DataFrame:
     """
     yfinance를 사용하여 특정 기간의 주식 데이터를 가져옵니다.
 
     Args:
         symbol: 주식 심볼 (예: 'TSLA', 'AAPL')
         period: 데이터 조회 기간 (예: '1d', '5d', '1mo', '1y', 'max')
+        timeout: HTTP 요청 제한 시간 (초, 응답 없는 요청이 스레드를 붙잡지 않도록)
 
     Returns:
         주가 정보가 담긴 pandas DataFrame. 데이터가 없거나 오류 발생 시 빈 DataFrame을 반환합니다.
     """
     try:
-        ticker = yf.Ticker(symbol)  # 1. 주식 정보 객체 생성
-        data = ticker.history(period=period)  # 2. 해당 기간의 주가 기록 가져오기
+        with metrics.STOCK_FETCH_SECONDS.time():
+            ticker = yf.Ticker(symbol)  # 1. 주식 정보 객체 생성
+            # 2. 해당 기간의 주가 기록 가져오기
+            data = ticker.history(period=period, timeout=timeout)
         if data.empty:
             print(f"'{symbol}'에 대한 데이터를 찾을 수 없습니다.")
+            metrics.EMPTY_DATA.inc()
             return pd.DataFrame()
         return data
-    except Exception as e:
+    except Exception as e:  # noqa: BLE001 - 조회 실패는 빈 DataFrame으로
         print(f"'{symbol}' 데이터 조회 중 오류 발생: {e}")
+        metrics.UPSTREAM_ERRORS.labels("yfinance").inc()
         return pd.DataFrame()
+
+
+def fetch_latest_quotes(symbols: list[str]) -> dict[str, float]:
+    """
+    여러 종목의 현재가를 한 번의 요청으로 가져옵니다. (장중 감시용)
+
+    오늘 일봉 1개만 받으므로 종목 수와 관계없이 요청 1번,
+    과거 데이터를 다시 받지 않아 호출 비용이 일정합니다.
+
+    Args:
+        symbols: 주식 심볼 리스트 (예: ['TSLA', 'AAPL'])
+
+    Returns:
+        {심볼: 현재가}. 가격을 받지 못한 종목은 빠집니다.
+    """
+    if not symbols:
+        return {}
+    try:
+        data = yf.download(
+            symbols,
+            period="1d",
+            interval="1d",
+            group_by="ticker",
+            auto_adjust=True,
+            progress=False,
+            threads=False,
+        )
+    except Exception as e:  # noqa: BLE001 - 조회 실패는 빈 결과로 (다음 틱에 다시 조회)
+        print(f"현재가 일괄 조회 중 오류 발생: {e}")
+        metrics.UPSTREAM_ERRORS.labels("yfinance").inc()
+        return {}
+
+    if data is None or data.empty:
+        return {}
+
+    quotes = {}
+    for symbol in symbols:
+        try:
+            if isinstance(data.columns, pd.MultiIndex):
+                close = data[symbol]["Close"]
+            else:
+                close = data["Close"]
+        except KeyError:
+            continue
+        close = close.dropna()
+        if not close.empty:
+            quotes[symbol] = float(close.iloc[-1])
+    return quotes
+
+
+def fetch_closes(
+    symbols: list[str], period: str = "1y", timeout: float = 10
+) -> pd.DataFrame:
+    """
+    여러 종목의 종가를 한 번의 요청으로 가져옵니다. (스크리너용)
+
+    Args:
+        symbols: 주식 심볼 리스트
+        period: 데이터 조회 기간
+        timeout: HTTP 요청 제한 시간 (초)
+
+    Returns:
+        종가 DataFrame (행: 날짜, 열: 심볼). 데이터를 받지 못한 종목은 빠지고,
+        오류 발생 시 빈 DataFrame을 반환합니다.
+    """
+    if not symbols:
+        return pd.DataFrame()
+    try:
+        data = yf.download(
+            symbols,
+            period=period,
+            interval="1d",
+            auto_adjust=True,
+            progress=False,
+            threads=False,
+            timeout=timeout,
+        )
+    except Exception as e:  # noqa: BLE001 - 조회 실패는 빈 DataFrame으로
+        print(f"종가 일괄 조회 중 오류 발생: {e}")
+        metrics.UPSTREAM_ERRORS.labels("yfinance").inc()
+        return pd.DataFrame()
+
+    if data is None or data.empty or "Close" not in data:
+        return pd.DataFrame()
+
+    closes = data["Close"]
+    if isinstance(closes, pd.Series):
+        closes = closes.to_frame(symbols[0])
+    return closes.dropna(axis=1, how="all")
@@ -28,12 +28,15 @@ def calculate_ma(prices: pd.Series, window: int = 200) -> float | None:
     if prices.empty or len(prices) < window:
         return None
 
-    ma = prices.rolling(window=window).mean().iloc[-1]
+    # 마지막 값만 필요하므로 전체 rolling 대신 마지막 window개만 평균
+    # (max 기간처럼 데이터가 길어도 계산량/메모리가 window에 비례)
+    tail = prices.iloc[-window:]
 
-    if pd.isna(ma):
+    # rolling과 같은 기준: 구간에 빈 값이 있으면 계산하지 않음
+    if tail.isna().any():
         return None
 
-    return float(ma)
+    return float(tail.mean())
 
 
 def calculate_ma_analysis(current_price: float, ma_200: float) -> dict:
@@ -77,3 +80,27 @@ def calculate_ma_analysis(current_price: float, ma_200: float) -> dict:
         "trend": trend,
         "position": position,
     }
+
+
+def get_ma_position(
+    diff_pct: float, previous_position: str | None = None, hysteresis: float = 0.0
+) -> str:
+    """
+    200일선 대비 위치를 hysteresis를 적용해 판단합니다.
+
+    200일선 근처에서 위/아래가 매일 바뀌는 것을 막기 위해,
+    이전 위치의 반대편으로 hysteresis(%) 이상 벗어나야 위치가 바뀝니다.
+
+    Args:
+        diff_pct: 현재가와 200일선 차이 (%)
+        previous_position: 이전 위치 (above/below, 없으면 부호로만 판단)
+        hysteresis: 위치가 바뀌는 데 필요한 여유 폭 (%)
+
+    Returns:
+        "above" 또는 "below"
+    """
+    if previous_position == "above" and diff_pct > -hysteresis:
+        return "above"
+    if previous_position == "below" and diff_pct < hysteresis:
+        return "below"
+    return "above" if diff_pct >= 0 else "below"
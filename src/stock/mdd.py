@@ -102,6 +102,51 @@ def calculate_drawdown_from_peak(prices: pd.Series) -> dict:
     }
 
 
+# 분할매수 단계: (단계, 고점 대비 하락률 기준, 신호)
+BUY_TIERS = [
+    (1, -10.0, "1차 매수 (정찰병)"),
+    (2, -20.0, "2차 매수 (비중 확대)"),
+    (3, -30.0, "3차 매수 (과매도 구간)"),
+]
+
+
+def get_signal_tier(
+    drawdown_pct: float, previous_tier: int | None = None, hysteresis: float = 0.0
+) -> int:
+    """
+    하락률에 따른 분할매수 단계를 반환합니다. (0: 관망, 1~3: 1~3차 매수)
+
+    hysteresis(이력 현상):
+    - 기준선 근처에서 단계가 매일 오락가락하는 것을 막기 위한 여유 폭
+    - 더 깊은 단계로는 기준선에서 바로 진입
+    - 이미 들어간 단계는 기준선보다 hysteresis만큼 더 회복해야 벗어남
+    - 예: hysteresis 1.0, 이전 1단계 → -9.5%에서는 1단계 유지, -8.9%에서 0단계
+
+    Args:
+        drawdown_pct: 고점 대비 하락률 (음수, 예: -15.5)
+        previous_tier: 이전 단계 (없으면 hysteresis 미적용)
+        hysteresis: 회복 시 필요한 여유 폭 (%p)
+
+    Returns:
+        단계 (0~3)
+    """
+    tier = 0
+    for level, threshold, _ in BUY_TIERS:
+        if previous_tier is not None and level <= previous_tier:
+            threshold += hysteresis
+        if drawdown_pct <= threshold:
+            tier = level
+    return tier
+
+
+def get_tier_signal(tier: int) -> str:
+    """단계에 해당하는 매수 신호 문자열 (0단계는 빈 문자열)"""
+    for level, _, signal in BUY_TIERS:
+        if level == tier:
+            return signal
+    return ""
+
+
 def get_buy_signal(drawdown_pct: float) -> str:
     """
     하락률에 따른 매수 신호를 반환합니다.
@@ -117,11 +162,5 @@ def get_buy_signal(drawdown_pct: float) -> str:
     Returns:
         매수 신호 문자열 또는 빈 문자열
     """
-    if drawdown_pct <= -30:
-        return "3차 매수 (과매도 구간)"
-    elif drawdown_pct <= -20:
-        return "2차 매수 (비중 확대)"
-    elif drawdown_pct <= -10:
-        return "1차 매수 (정찰병)"
-    else:
-        return ""  # 매수 신호 없음 (관망)
+    # 매수 신호가 없으면 빈 문자열 (관망)
+    return get_tier_signal(get_signal_tier(drawdown_pct))
@@ -0,0 +1,365 @@
+"""장중 가격 감시 모듈 (--watch)
+
+정규장 동안 관심 종목 전체의 현재가를 한 번의 요청으로 주기적으로 받아,
+고점 대비 하락률이 매수 단계 기준선(-10/-20/-30%)을 넘는 순간 알림을 보냅니다.
+
+동작 방식:
+    1. 장 시작 시 종목별 과거 데이터를 한 번만 받아 기간 고점을 캐시
+    2. 이후에는 현재가만 일괄 조회 → 고점/하락률을 증분 갱신 (과거 데이터 재다운로드 없음)
+    3. 매수 단계가 바뀌면 해당 종목을 가진 채팅방에 짧은 알림 전송
+       (고점은 채팅방별 분석 기간(/period)으로 계산하고, 같은 기간을 쓰는 채팅방에만 알림)
+       (정규장 여부는 종목별 거래소 기준: 서울 장중에는 KRX 종목만 감시)
+    4. 다음 조회 간격은 변동성과 기준선까지 남은 거리에 따라 자동 조절
+       (빠르게 움직이거나 기준선에 가까우면 짧게, 조용하면 길게)
+
+매수 단계 상태는 signal_state와 공유하므로, 장중에 알린 변화를 다음 날 다시 알리지 않습니다.
+/alert로 등록한 목표가도 매 조회마다 같은 현재가로 확인합니다. (price_alerts)
+"""
+
+import asyncio
+import datetime
+import signal
+import time
+from collections.abc import Callable
+
+from src import market_calendar, price_alerts, signal_state, watchlist
+from src.config import Config
+from src.notifiers.report_format import render_change_alerts, render_price_alerts
+from src.notifiers.send_queue import PRIORITY_INTERACTIVE
+from src.notifiers.telegram import TelegramNotifier, create_send_queue
+from src.stock.fetcher import fetch_latest_quotes, fetch_stock_data
+from src.stock.mdd import BUY_TIERS, get_signal_tier
+
+# 변동성(EWMA) 갱신 비율: 클수록 최근 움직임을 더 크게 반영
+VOLATILITY_ALPHA = 0.3
+
+# 기준선까지 예상 도달 시간의 몇 배 간격으로 조회할지 (여유를 두고 더 자주)
+INTERVAL_SAFETY = 0.5
+
+# 장이 닫혀 있을 때 최대 대기 시간 (초, 휴장일/시계 변경 대비 재확인)
+MAX_IDLE_SLEEP = 3600.0
+
+
+class SymbolWatch:
+    """종목 1개의 감시 상태"""
+
+    def __init__(self, symbol: str, peak: float, price: float, tier: int):
+        self.symbol = symbol
+        self.peak = peak
+        self.price = price
+        self.tier = tier
+        self.volatility = 0.0  # 초당 가격 변화율 (%/초, EWMA)
+        self.updated: float | None = None  # 마지막 현재가 시각 (monotonic)
+
+    @property
+    def drawdown_pct(self) -> float:
+        if self.peak <= 0:
+            return 0.0
+        return (self.price - self.peak) / self.peak * 100
+
+
+class PriceWatcher:
+    """관심 종목 현재가를 일괄 조회하며 매수 단계 변화를 감지"""
+
+    def __init__(
+        self,
+        period: str = "1y",
+        quote_fetcher: Callable[[list[str]], dict[str, float]] = fetch_latest_quotes,
+        history_fetcher=fetch_stock_data,
+        min_interval: float | None = None,
+        max_interval: float | None = None,
+        hysteresis: float | None = None,
+    ):
+        """
+        Args:
+            period: 고점 계산 기간
+            quote_fetcher: 현재가 일괄 조회 함수 ({심볼: 가격} 반환)
+            history_fetcher: 과거 데이터 조회 함수 (고점 계산용, 장 시작 시 1번)
+            min_interval: 최소 조회 간격 (초, 없으면 WATCH_MIN_INTERVAL)
+            max_interval: 최대 조회 간격 (초, 없으면 WATCH_MAX_INTERVAL)
+            hysteresis: 매수 단계 여유 폭 (%p, 없으면 SIGNAL_HYSTERESIS_PCT)
+        """
+        self.period = period
+        self.quote_fetcher = quote_fetcher
+        self.history_fetcher = history_fetcher
+        self.min_interval = min_interval or Config.WATCH_MIN_INTERVAL
+        self.max_interval = max_interval or Config.WATCH_MAX_INTERVAL
+        self.hysteresis = (
+            Config.SIGNAL_HYSTERESIS_PCT if hysteresis is None else hysteresis
+        )
+        self.states: dict[str, SymbolWatch] = {}
+        self.quotes: dict[str, float] = {}  # 마지막 조회 현재가
+
+    async def _prime_symbol(self, symbol: str, tier: int | None) -> SymbolWatch | None:
+        """과거 데이터로 기간 고점/마지막 종가 준비"""
+        data = await asyncio.to_thread(self.history_fetcher, symbol, self.period)
+        close = data.get("Close") if not data.empty else None
+        if close is None or close.dropna().empty:
+            return None
+        close = close.dropna()
+        watch = SymbolWatch(symbol, float(close.max()), float(close.iloc[-1]), 0)
+        watch.tier = get_signal_tier(watch.drawdown_pct, tier, self.hysteresis)
+        return watch
+
+    async def sync_symbols(
+        self, symbols: list[str], tiers: dict[str, int] | None = None
+    ):
+        """감시 종목을 맞춤 (새 종목만 과거 데이터 조회, 빠진 종목은 제거)
+
+        Args:
+            symbols: 감시할 종목
+            tiers: 이전 매수 단계 (signal_state, 없으면 현재 하락률로 시작)
+        """
+        tiers = tiers or {}
+        for symbol in [s for s in self.states if s not in symbols]:
+            del self.states[symbol]
+
+        new_symbols = [s for s in symbols if s not in self.states]
+        primed = await asyncio.gather(
+            *(self._prime_symbol(s, tiers.get(s)) for s in new_symbols)
+        )
+        for watch in primed:
+            if watch is not None:
+                self.states[watch.symbol] = watch
+
+    def apply_quotes(self, quotes: dict[str, float], now: float) -> list[dict]:
+        """현재가로 고점/하락률/변동성을 갱신하고 매수 단계 변화 목록 반환
+
+        Args:
+            quotes: {심볼: 현재가}
+            now: 조회 시각 (monotonic 초)
+
+        Returns:
+            signal_state.detect_changes()와 같은 형식의 변화 목록 (kind="tier")
+        """
+        changes = []
+        for symbol, price in quotes.items():
+            watch = self.states.get(symbol)
+            if watch is None or price <= 0:
+                continue
+
+            if watch.updated is not None and now > watch.updated and watch.price > 0:
+                move = abs(price - watch.price) / watch.price * 100
+                rate = move / (now - watch.updated)
+                watch.volatility += VOLATILITY_ALPHA * (rate - watch.volatility)
+
+            watch.price = price
+            watch.updated = now
+            watch.peak = max(watch.peak, price)
+
+            tier = get_signal_tier(watch.drawdown_pct, watch.tier, self.hysteresis)
+            if tier != watch.tier:
+                changes.append(
+                    {
+                        "symbol": symbol,
+                        "kind": "tier",
+                        "old": watch.tier,
+                        "new": tier,
+                        "drawdown_pct": watch.drawdown_pct,
+                        "current_price": price,
+                        "ma_diff_pct": None,
+                    }
+                )
+                watch.tier = tier
+        return changes
+
+    async def tick(self) -> list[dict]:
+        """현재가 일괄 조회 1회 (종목 수와 관계없이 요청 1번)"""
+        self.quotes = await asyncio.to_thread(self.quote_fetcher, list(self.states))
+        return self.apply_quotes(self.quotes, time.monotonic())
+
+    def _threshold_distance(self, watch: SymbolWatch) -> float:
+        """다음 단계 변화까지 남은 하락률 거리 (%p)"""
+        drawdown = watch.drawdown_pct
+        distances = []
+        if watch.tier < len(BUY_TIERS):
+            # 더 깊은 단계 기준선
+            distances.append(drawdown - BUY_TIERS[watch.tier][1])
+        if watch.tier > 0:
+            # 현재 단계에서 벗어나는 회복 기준선
+            distances.append(BUY_TIERS[watch.tier - 1][1] + self.hysteresis - drawdown)
+        return max(0.0, min(distances))
+
+    def next_interval(self) -> float:
+        """다음 조회까지 대기 시간 (초)
+
+        종목별로 "기준선까지 거리 / 현재 변동성" = 예상 도달 시간을 구해
+        가장 빠른 종목 기준으로 간격을 정합니다.
+        """
+        estimates = [
+            self._threshold_distance(watch) / watch.volatility
+            for watch in self.states.values()
+            if watch.volatility > 0
+        ]
+        if not estimates:
+            return self.max_interval
+        interval = min(estimates) * INTERVAL_SAFETY
+        return min(self.max_interval, max(self.min_interval, interval))
+
+
+def _next_open(
+    now: datetime.datetime, exchange: market_calendar.Exchange = market_calendar.NYSE
+) -> datetime.datetime:
+    """다음 정규장 시작 시각"""
+    now = now.astimezone(exchange.tz)
+    hours = market_calendar.session(now.date(), exchange)
+    if hours is not None and now < hours[0]:
+        return hours[0]
+    next_day = market_calendar.next_trading_day(now.date(), exchange)
+    return market_calendar.session(next_day, exchange)[0]
+
+
+def _open_symbols(symbols: list[str], now: datetime.datetime) -> list[str]:
+    """지금 자기 거래소 정규장이 열려 있는 종목"""
+    return [
+        symbol
+        for symbol in symbols
+        if market_calendar.is_open(now, market_calendar.exchange_for(symbol))
+    ]
+
+
+def _next_symbols_open(symbols: list[str], now: datetime.datetime) -> datetime.datetime:
+    """종목들의 거래소 중 가장 먼저 열리는 정규장 시작 시각 (종목이 없으면 NYSE)"""
+    exchanges = {market_calendar.exchange_for(symbol) for symbol in symbols}
+    return min(
+        _next_open(now, exchange) for exchange in exchanges or {market_calendar.NYSE}
+    )
+
+
+async def _sleep(stop_event: asyncio.Event, seconds: float):
+    """종료 신호가 오면 바로 깨어나는 sleep"""
+    try:
+        await asyncio.wait_for(stop_event.wait(), max(0.0, seconds))
+    except TimeoutError:
+        pass
+
+
+async def _deliver(
+    notifier,
+    changes: dict[str, list[dict]],
+    groups: dict[str, list[str]],
+    fired: list[dict],
+):
+    """매수 단계 변화/목표가 도달을 해당 채팅방에 전송
+
+    Args:
+        notifier: 알림을 보낼 TelegramNotifier
+        changes: {분석 기간: 그 기간으로 계산한 매수 단계 변화 목록}
+        groups: {분석 기간: 그 기간을 쓰는 채팅방 ID 리스트}
+        fired: 이번에 도달한 목표가 알림 (price_alerts.evaluate)
+    """
+    for period, chat_ids in groups.items():
+        for chat_id in chat_ids:
+            chat_changes = signal_state.select_chat_changes(
+                changes.get(period, []), watchlist.get_all(chat_id), []
+            )
+            pages = render_change_alerts(chat_changes, period)
+            pages += render_price_alerts(
+                price_alerts.select_chat_alerts(fired, chat_id)
+            )
+            if pages:
+                result = await notifier.send_messages(
+                    pages, PRIORITY_INTERACTIVE, chat_id
+                )
+                if not result.get("ok"):
+                    print(f"  -> {chat_id}: 전송 실패: {result.get('error')}")
+
+
+async def run_watch(
+    notifier,
+    stop_event: asyncio.Event,
+    quote_fetcher: Callable[[list[str]], dict[str, float]] = fetch_latest_quotes,
+):
+    """정규장 동안 감시를 반복 (종료 신호까지)
+
+    채팅방마다 /period로 정한 기간이 다르므로, 기간별로 고점/매수 단계를 따로 계산해
+    그 기간을 쓰는 채팅방에만 알립니다. (현재가 조회는 기간과 관계없이 1번)
+
+    Args:
+        notifier: 알림을 보낼 TelegramNotifier
+        stop_event: 종료 신호
+        quote_fetcher: 현재가 일괄 조회 함수 ({심볼: 가격} 반환)
+    """
+    while not stop_event.is_set():
+        now = datetime.datetime.now(tz=datetime.UTC)
+        symbols = watchlist.get_union_symbols()
+        if not _open_symbols(symbols, now):
+            next_open = _next_symbols_open(symbols, now)
+            print(f"장 마감 중, 다음 정규장: {next_open.isoformat()}")
+            await _sleep(
+                stop_event, min((next_open - now).total_seconds(), MAX_IDLE_SLEEP)
+            )
+            continue
+
+        # 장 시작: 기간별로 종목 고점 캐시 (세션마다 한 번)
+        watchers: dict[str, PriceWatcher] = {}
+        tiers: dict[str, dict[str, int]] = {}
+        print("장중 감시 시작")
+
+        while not stop_event.is_set():
+            # 거래소가 닫힌 종목은 빼고, watchlist/기간이 바뀌었거나 새로 열린 종목만 준비
+            now = datetime.datetime.now(tz=datetime.UTC)
+            groups = watchlist.get_chats_by_period()
+            open_symbols = _open_symbols(watchlist.get_union_symbols(), now)
+            if not open_symbols:
+                break
+            for period in [p for p in watchers if p not in groups]:
+                del watchers[period], tiers[period]
+            for period, chat_ids in groups.items():
+                if period not in watchers:
+                    watchers[period] = PriceWatcher(period, quote_fetcher)
+                    tiers[period] = signal_state.get_tiers(period)
+                await watchers[period].sync_symbols(
+                    _open_symbols(watchlist.get_union_symbols(chat_ids), now),
+                    tiers[period],
+                )
+
+            quotes = await asyncio.to_thread(quote_fetcher, open_symbols)
+            changes = {}
+            for period, watcher in watchers.items():
+                period_changes = watcher.apply_quotes(quotes, time.monotonic())
+                if not period_changes:
+                    continue
+                print(
+                    f"  {period} 매수 단계 변화 {len(period_changes)}건: "
+                    f"{[c['symbol'] for c in period_changes]}"
+                )
+                new_tiers = {c["symbol"]: c["new"] for c in period_changes}
+                signal_state.record_tiers(period, new_tiers, groups[period])
+                tiers[period].update(new_tiers)
+                changes[period] = period_changes
+
+            fired = price_alerts.evaluate(quotes, watchlist.get_chat_ids())
+            if fired:
+                print(f"  목표가 도달 {len(fired)}건: {[a['symbol'] for a in fired]}")
+
+            if changes or fired:
+                await _deliver(notifier, changes, groups, fired)
+
+            await _sleep(
+                stop_event,
+                min(
+                    (watcher.next_interval() for watcher in watchers.values()),
+                    default=Config.WATCH_MAX_INTERVAL,
+                ),
+            )
+
+
+async def _serve_watch():
+    """알림용 notifier를 열고 종료 신호까지 장중 감시"""
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    async with TelegramNotifier(
+        token=Config.TELEGRAM_BOT_TOKEN,
+        chat_id=Config.TELEGRAM_CHAT_ID,
+        send_queue=create_send_queue(),
+    ) as notifier:
+        await run_watch(notifier, stop_event)
+
+
+def run_price_watch():
+    """장중 감시 모드 실행 (고점 기간은 채팅방별 /period)"""
+    asyncio.run(_serve_watch())
@@ -1,15 +1,26 @@
 """Watchlist 관리 모듈
 
-JSON 파일 기반으로 관심 종목과 200일선 분석 설정을 관리합니다.
+JSON 파일 기반으로 채팅방별 관심 종목, 200일선 분석, 분석 기간, 알림 시간을 관리합니다.
 
 파일 위치: data/watchlist.json
 구조:
 {
-    "symbols": ["TSLA", "SCHD", "SCHG"],
-    "ma_enabled": ["TSLA"]
+    "chats": {
+        "123456789": {
+            "symbols": ["TSLA", "SCHD", "SCHG"],
+            "ma_enabled": ["TSLA"],
+            "period": "1y",
+            "alert_time": "09:00"
+        }
+    }
 }
+
+chat_id를 생략하면 기본 채팅방(TELEGRAM_CHAT_ID)을 사용합니다.
+허용된 채팅방(ALLOWED_CHAT_IDS + 기본 채팅방)만 등록/변경할 수 있고 스케줄 리포트를 받습니다.
+이전 형식(최상위 symbols/ma_enabled)은 기본 채팅방 설정으로 자동 이전됩니다.
 """
 
+import hashlib
 import json
 from pathlib import Path
 
@@ -39,53 +50,210 @@ def _get_default_ma_symbols() -> list[str]:
     return [s.strip().upper() for s in default_str.split(",") if s.strip()]
 
 
-def load() -> dict:
-    """JSON 파일에서 watchlist 로드 (없으면 기본값으로 초기화)"""
-    _ensure_data_dir()
+def _default_chat_id() -> str:
+    """기본 채팅방 ID (TELEGRAM_CHAT_ID)"""
+    return str(Config.TELEGRAM_CHAT_ID)
+
+
+def _resolve_chat_id(chat_id: str | int | None) -> str:
+    """chat_id가 없으면 기본 채팅방 ID 사용"""
+    if chat_id is None:
+        return _default_chat_id()
+    return str(chat_id)
+
+
+# 허용되지 않은 채팅방이 변경 명령어를 실행했을 때
+NOT_ALLOWED_MESSAGE = "허용되지 않은 채팅방입니다."
+
+# watchlist 파일을 저장하지 못했을 때 (읽지 못한 파일은 덮어쓰지 않음)
+SAVE_FAILED_MESSAGE = "watchlist를 저장하지 못했습니다. 잠시 후 다시 시도해주세요."
+
+
+def is_allowed(chat_id: str | int | None) -> bool:
+    """봇을 사용할 수 있는 채팅방인지 (ALLOWED_CHAT_IDS + 기본 채팅방)"""
+    chat_id = _resolve_chat_id(chat_id)
+    return chat_id == _default_chat_id() or chat_id in Config.get_allowed_chat_ids()
+
 
-    if WATCHLIST_FILE.exists():
-        try:
-            with open(WATCHLIST_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                # dict가 아니면 잘못된 형식
-                if not isinstance(data, dict):
-                    raise json.JSONDecodeError("JSON root is not an object", "", 0)
-                # 필수 키가 없으면 추가
-                if "symbols" not in data:
-                    data["symbols"] = _get_default_symbols()
-                if "ma_enabled" not in data:
-                    data["ma_enabled"] = _get_default_ma_symbols()
-                return data
-        except (json.JSONDecodeError, IOError, TypeError):
-            pass
-
-    # 파일이 없거나 읽기 실패 시 기본값
-    default_data = {
+def _new_chat_entry() -> dict:
+    """새 채팅방의 기본 설정"""
+    return {
         "symbols": _get_default_symbols(),
         "ma_enabled": _get_default_ma_symbols(),
+        "period": Config.ANALYSIS_PERIOD,
+        "alert_time": _normalize_alert_time(Config.ALERT_TIME) or "09:00",
     }
-    save(default_data)
-    return default_data
+
+
+def _fill_chat_entry(entry: dict) -> dict:
+    """채팅방 설정에 빠졌거나 형식이 잘못된 키를 기본값으로 채움"""
+    for key, value in _new_chat_entry().items():
+        if not isinstance(entry.get(key), type(value)):
+            entry[key] = value
+    return entry
+
+
+def _normalize_alert_time(alert_time: str) -> str | None:
+    """알림 시간을 HH:MM 형식으로 정규화 (09:00 또는 0900 형식 지원)
+
+    Returns:
+        "HH:MM" 문자열. 형식이 잘못되면 None.
+    """
+    alert_time = alert_time.strip()
+    try:
+        if ":" in alert_time:
+            hour_str, minute_str = alert_time.split(":", 1)
+            hour, minute = int(hour_str), int(minute_str)
+        elif len(alert_time) == 4 and alert_time.isdigit():
+            hour, minute = int(alert_time[:2]), int(alert_time[2:])
+        else:
+            return None
+    except ValueError:
+        return None
+
+    if not (0 <= hour <= 23 and 0 <= minute <= 59):
+        return None
+    return f"{hour:02d}:{minute:02d}"
+
+
+def load() -> dict:
+    """JSON 파일에서 watchlist 로드 (파일이 없을 때만 기본값으로 초기화)
+
+    형식이 잘못된 채팅방 설정은 그 채팅방만 건너뛰거나 기본값으로 채웁니다.
+    파일을 읽지 못하면 기본값을 반환하지만 파일은 덮어쓰지 않습니다
+    (다른 채팅방 설정이 사라지지 않도록 이때 반환한 데이터는 save()가 저장하지 않음).
+    """
+    _ensure_data_dir()
+
+    if not WATCHLIST_FILE.exists():
+        default_data = {"chats": {_default_chat_id(): _new_chat_entry()}}
+        save(default_data)
+        return default_data
+
+    try:
+        with open(WATCHLIST_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, OSError, UnicodeDecodeError) as e:
+        print(f"⚠️ watchlist 파일을 읽지 못함 (기본값 사용, 파일은 그대로 둠): {e}")
+        return {"chats": {_default_chat_id(): _new_chat_entry()}, "unreadable": True}
+
+    # dict가 아니면 잘못된 형식
+    if not isinstance(data, dict):
+        print("⚠️ watchlist 파일 형식 오류 (기본값 사용, 파일은 그대로 둠)")
+        return {"chats": {_default_chat_id(): _new_chat_entry()}, "unreadable": True}
+
+    chats = data.get("chats")
+    if not isinstance(chats, dict):
+        chats = {}
+
+    # 이전 형식(최상위 symbols/ma_enabled) → 기본 채팅방으로 이전
+    if "symbols" in data or "ma_enabled" in data:
+        legacy = chats.setdefault(_default_chat_id(), {})
+        if isinstance(legacy, dict):
+            legacy.setdefault("symbols", data.get("symbols", _get_default_symbols()))
+            legacy.setdefault(
+                "ma_enabled", data.get("ma_enabled", _get_default_ma_symbols())
+            )
+
+    valid = {}
+    for chat_id, entry in chats.items():
+        if not isinstance(entry, dict):
+            print(f"⚠️ watchlist 채팅방 {chat_id} 설정 형식 오류 (건너뜀)")
+            continue
+        valid[chat_id] = _fill_chat_entry(entry)
+    return {"chats": valid}
 
 
 def save(data: dict) -> bool:
-    """watchlist를 JSON 파일에 저장"""
+    """watchlist를 JSON 파일에 저장 (읽지 못한 파일에서 만든 기본값은 저장하지 않음)"""
+    if data.get("unreadable"):
+        print("⚠️ watchlist 파일을 읽지 못한 상태라 저장하지 않음")
+        return False
     _ensure_data_dir()
     try:
         with open(WATCHLIST_FILE, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
         return True
-    except IOError:
+    except OSError:
         return False
 
 
-def get_all() -> list[str]:
+def _get_chat(data: dict, chat_id: str | int | None) -> dict:
+    """채팅방 설정 반환 (등록되지 않은 채팅방은 기본값으로 생성)
+
+    생성만 하고 저장은 하지 않으므로, 변경 명령어를 실행한 채팅방만 파일에 등록됩니다.
+    """
+    chats = data.setdefault("chats", {})
+    chat_id = _resolve_chat_id(chat_id)
+    if chat_id not in chats:
+        chats[chat_id] = _new_chat_entry()
+    return chats[chat_id]
+
+
+def _allowed_chat_ids(data: dict) -> list[str]:
+    """파일에 등록된 채팅방 중 허용된 채팅방 ID 리스트"""
+    return [
+        chat_id for chat_id in data.get("chats", {}) if chat_id and is_allowed(chat_id)
+    ]
+
+
+def get_chat_ids() -> list[str]:
+    """등록된 채팅방 ID 리스트 (허용되지 않은 채팅방 제외)"""
+    return _allowed_chat_ids(load())
+
+
+def get_all(chat_id: str | int | None = None) -> list[str]:
     """전체 종목 리스트 반환"""
     data = load()
-    return data.get("symbols", [])
+    return _get_chat(data, chat_id).get("symbols", [])
+
+
+def get_version(chat_id: str | int | None = None) -> str:
+    """채팅방 watchlist 버전 (종목/MA 설정 내용의 해시)
+
+    종목이나 MA 설정이 바뀌면 값이 달라지므로 리포트 캐시 키로 사용합니다.
+    설정이 같은 채팅방끼리는 같은 버전을 가져 캐시를 공유합니다.
+    """
+    data = load()
+    chat = _get_chat(data, chat_id)
+    content = json.dumps(
+        [chat.get("symbols", []), sorted(chat.get("ma_enabled", []))],
+        ensure_ascii=False,
+    )
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()[:12]
+
+
+def get_union_symbols(chat_ids: list[str] | None = None) -> list[str]:
+    """여러 채팅방의 관심 종목 합집합 (등록 순서 유지, 중복 제거)
+
+    Args:
+        chat_ids: 대상 채팅방 ID 리스트. None이면 등록된 전체 채팅방 (허용되지 않은 채팅방 제외).
+    """
+    data = load()
+    if chat_ids is None:
+        chat_ids = _allowed_chat_ids(data)
+
+    symbols: dict[str, None] = {}
+    for chat_id in chat_ids:
+        for symbol in _get_chat(data, chat_id).get("symbols", []):
+            symbols[symbol] = None
+    return list(symbols)
+
+
+def get_union_ma_symbols(chat_ids: list[str] | None = None) -> list[str]:
+    """여러 채팅방의 MA 분석 활성화 종목 합집합 (None이면 허용된 전체 채팅방)"""
+    data = load()
+    if chat_ids is None:
+        chat_ids = _allowed_chat_ids(data)
 
+    symbols: dict[str, None] = {}
+    for chat_id in chat_ids:
+        for symbol in _get_chat(data, chat_id).get("ma_enabled", []):
+            symbols[symbol] = None
+    return list(symbols)
 
-def add(symbol: str) -> tuple[bool, str]:
+
+def add(symbol: str, chat_id: str | int | None = None) -> tuple[bool, str]:
     """종목 추가
 
     Returns:
@@ -95,16 +263,21 @@ def add(symbol: str) -> tuple[bool, str]:
     if not symbol:
         return False, "종목 코드를 입력해주세요."
 
+    if not is_allowed(chat_id):
+        return False, NOT_ALLOWED_MESSAGE
+
     data = load()
-    if symbol in data["symbols"]:
+    chat = _get_chat(data, chat_id)
+    if symbol in chat["symbols"]:
         return False, f"{symbol}은(는) 이미 등록되어 있습니다."
 
-    data["symbols"].append(symbol)
-    save(data)
+    chat["symbols"].append(symbol)
+    if not save(data):
+        return False, SAVE_FAILED_MESSAGE
     return True, f"{symbol} 추가됨"
 
 
-def remove(symbol: str) -> tuple[bool, str]:
+def remove(symbol: str, chat_id: str | int | None = None) -> tuple[bool, str]:
     """종목 삭제
 
     Returns:
@@ -114,26 +287,33 @@ def remove(symbol: str) -> tuple[bool, str]:
     if not symbol:
         return False, "종목 코드를 입력해주세요."
 
+    if not is_allowed(chat_id):
+        return False, NOT_ALLOWED_MESSAGE
+
     data = load()
-    if symbol not in data["symbols"]:
+    chat = _get_chat(data, chat_id)
+    if symbol not in chat["symbols"]:
         return False, f"{symbol}은(는) 목록에 없습니다."
 
-    data["symbols"].remove(symbol)
+    chat["symbols"].remove(symbol)
     # MA 목록에서도 제거
-    if symbol in data.get("ma_enabled", []):
-        data["ma_enabled"].remove(symbol)
-    save(data)
+    if symbol in chat.get("ma_enabled", []):
+        chat["ma_enabled"].remove(symbol)
+    if not save(data):
+        return False, SAVE_FAILED_MESSAGE
     return True, f"{symbol} 삭제됨"
 
 
-def is_ma_enabled(symbol: str) -> bool:
+def is_ma_enabled(symbol: str, chat_id: str | int | None = None) -> bool:
     """해당 종목의 MA 분석 활성화 여부"""
     symbol = symbol.strip().upper()
     data = load()
-    return symbol in data.get("ma_enabled", [])
+    return symbol in _get_chat(data, chat_id).get("ma_enabled", [])
 
 
-def set_ma(symbol: str, enabled: bool) -> tuple[bool, str]:
+def set_ma(
+    symbol: str, enabled: bool, chat_id: str | int | None = None
+) -> tuple[bool, str]:
     """종목의 MA 분석 설정 변경
 
     Returns:
@@ -143,29 +323,128 @@ def set_ma(symbol: str, enabled: bool) -> tuple[bool, str]:
     if not symbol:
         return False, "종목 코드를 입력해주세요."
 
+    if not is_allowed(chat_id):
+        return False, NOT_ALLOWED_MESSAGE
+
     data = load()
-    if symbol not in data["symbols"]:
+    chat = _get_chat(data, chat_id)
+    if symbol not in chat["symbols"]:
         return False, f"{symbol}은(는) 관심 종목에 없습니다."
 
-    ma_list = data.get("ma_enabled", [])
+    ma_list = chat.get("ma_enabled", [])
 
     if enabled:
         if symbol in ma_list:
             return False, f"{symbol}은(는) 이미 MA 분석이 활성화되어 있습니다."
         ma_list.append(symbol)
-        data["ma_enabled"] = ma_list
-        save(data)
+        chat["ma_enabled"] = ma_list
+        if not save(data):
+            return False, SAVE_FAILED_MESSAGE
         return True, f"{symbol} 200일선 분석 활성화"
     else:
         if symbol not in ma_list:
             return False, f"{symbol}은(는) MA 분석이 비활성화 상태입니다."
         ma_list.remove(symbol)
-        data["ma_enabled"] = ma_list
-        save(data)
+        chat["ma_enabled"] = ma_list
+        if not save(data):
+            return False, SAVE_FAILED_MESSAGE
         return True, f"{symbol} 200일선 분석 비활성화"
 
 
-def get_ma_symbols() -> list[str]:
+def get_ma_symbols(chat_id: str | int | None = None) -> list[str]:
     """MA 분석이 활성화된 종목 리스트"""
     data = load()
-    return data.get("ma_enabled", [])
+    return _get_chat(data, chat_id).get("ma_enabled", [])
+
+
+def get_period(chat_id: str | int | None = None) -> str:
+    """채팅방의 분석 기간"""
+    data = load()
+    return _get_chat(data, chat_id).get("period", Config.ANALYSIS_PERIOD)
+
+
+def set_period(period: str, chat_id: str | int | None = None) -> tuple[bool, str]:
+    """채팅방의 분석 기간 변경
+
+    Returns:
+        (성공여부, 메시지)
+    """
+    period = period.strip().lower()
+    if not Config.is_valid_period(period):
+        return False, (
+            f"유효하지 않은 기간: {period}\n"
+            f"사용 가능: {', '.join(Config.VALID_PERIODS)}"
+        )
+
+    if not is_allowed(chat_id):
+        return False, NOT_ALLOWED_MESSAGE
+
+    data = load()
+    _get_chat(data, chat_id)["period"] = period
+    if not save(data):
+        return False, SAVE_FAILED_MESSAGE
+    return True, f"분석 기간 변경: {Config.get_period_display(period)}"
+
+
+def get_alert_time(chat_id: str | int | None = None) -> str:
+    """채팅방의 알림 시간"""
+    data = load()
+    return _get_chat(data, chat_id).get("alert_time", Config.ALERT_TIME)
+
+
+def set_alert_time(
+    alert_time: str, chat_id: str | int | None = None
+) -> tuple[bool, str]:
+    """채팅방의 알림 시간 변경 (09:00 또는 0900 형식)
+
+    Returns:
+        (성공여부, 메시지)
+    """
+    normalized = _normalize_alert_time(alert_time)
+    if normalized is None:
+        return False, f"유효하지 않은 시간: {alert_time} (예: 09:00 또는 0900)"
+
+    if not is_allowed(chat_id):
+        return False, NOT_ALLOWED_MESSAGE
+
+    data = load()
+    _get_chat(data, chat_id)["alert_time"] = normalized
+    if not save(data):
+        return False, SAVE_FAILED_MESSAGE
+    return True, f"알림 시간 변경: {normalized}"
+
+
+def get_chats_by_alert_time() -> dict[str, list[str]]:
+    """알림 시간별 채팅방 ID 그룹
+
+    Returns:
+        {"09:00": ["123", "456"], "21:30": ["789"]}
+    """
+    data = load()
+    groups: dict[str, list[str]] = {}
+    for chat_id, entry in data.get("chats", {}).items():
+        if not chat_id or not is_allowed(chat_id):
+            continue
+        alert_time = _normalize_alert_time(entry.get("alert_time", "")) or "09:00"
+        groups.setdefault(alert_time, []).append(chat_id)
+    return groups
+
+
+def get_chats_by_period(chat_ids: list[str] | None = None) -> dict[str, list[str]]:
+    """분석 기간별 채팅방 그룹
+
+    Args:
+        chat_ids: 대상 채팅방 ID 리스트. None이면 등록된 전체 채팅방 (허용되지 않은 채팅방 제외).
+
+    Returns:
+        {"1y": ["123", "456"], "6mo": ["789"]}
+    """
+    data = load()
+    if chat_ids is None:
+        chat_ids = _allowed_chat_ids(data)
+
+    groups: dict[str, list[str]] = {}
+    for chat_id in chat_ids:
+        period = _get_chat(data, chat_id).get("period", Config.ANALYSIS_PERIOD)
+        groups.setdefault(period, []).append(chat_id)
+    return groups
@@ -0,0 +1,146 @@
+"""analytics.py 테스트 코드
+
+작업자 풀의 계산 결과가 기존 함수(calculate_drawdown_from_peak, calculate_ma)와 같고,
+요청이 배치로 묶이는지 검증
+"""
+
+import asyncio
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import analytics
+from src.analytics import AnalyticsPool
+from src.stock.ma import calculate_ma
+from src.stock.mdd import calculate_drawdown_from_peak
+
+
+def make_closes() -> list[np.ndarray]:
+    """테스트용 종가: 짧은 데이터, 200일선 구간에 NaN이 있는 데이터, 긴 데이터"""
+    rng = np.random.default_rng(7)
+    closes = [
+        100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, n))) for n in (30, 250, 3000)
+    ]
+    closes[1][-5] = np.nan
+    return closes
+
+
+def expected(closes: np.ndarray, with_ma: bool) -> dict:
+    """기존 함수로 계산한 값"""
+    prices = pd.Series(closes)
+    result = calculate_drawdown_from_peak(prices)
+    result["ma_200"] = calculate_ma(prices, 200) if with_ma else None
+    return result
+
+
+@pytest.fixture
+def pool():
+    """
+    fixture: 프로세스 없이 스레드에서 계산하는 풀
+    """
+    pool = AnalyticsPool(workers=0, batch_size=32, batch_delay=0.01)
+    yield pool
+    pool.shutdown()
+
+
+class TestAnalyticsPool:
+    """AnalyticsPool 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_matches_existing_functions(self, pool):
+        """
+        테스트 1: 동시에 들어온 요청은 배치 하나로 계산되고, 값은 기존 함수와 같음
+        """
+        closes = make_closes()
+
+        records = await asyncio.gather(
+            pool.analyze(closes[0]),
+            pool.analyze(closes[1], closes[1]),
+            pool.analyze(closes[2], closes[2]),
+        )
+
+        assert pool.batches == 1
+        for array, record, with_ma in zip(closes, records, (False, True, True)):
+            assert record == pytest.approx(expected(array, with_ma), nan_ok=True)
+        # 200일선 구간에 NaN이 있으면 None
+        assert records[1]["ma_200"] is None
+        assert records[2]["ma_200"] is not None
+
+    @pytest.mark.asyncio
+    async def test_full_batch_is_sent_immediately(self):
+        """
+        테스트 2: batch_size만큼 모이면 대기 시간 없이 바로 실행
+        """
+        pool = AnalyticsPool(workers=0, batch_size=2, batch_delay=60)
+        closes = make_closes()
+
+        records = await asyncio.wait_for(
+            asyncio.gather(*(pool.analyze(array) for array in closes[:2])), 5
+        )
+
+        assert pool.batches == 1
+        assert records[0]["drawdown_pct"] == pytest.approx(
+            expected(closes[0], False)["drawdown_pct"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_process_pool_reads_shared_memory(self):
+        """
+        테스트 3: 작업자 프로세스에서 공유 메모리의 배열로 계산해도 결과가 같음
+        (200일선용 배열이 따로 있는 경우 포함)
+        """
+        pool = AnalyticsPool(workers=1)
+        closes = make_closes()
+        try:
+            records = await asyncio.gather(
+                pool.analyze(closes[0], closes[2]),
+                pool.analyze(closes[2], closes[2]),
+            )
+        finally:
+            pool.shutdown()
+
+        assert records[0]["drawdown_pct"] == pytest.approx(
+            expected(closes[0], False)["drawdown_pct"]
+        )
+        assert records[0]["ma_200"] == pytest.approx(
+            expected(closes[2], True)["ma_200"]
+        )
+        assert records[1] == pytest.approx(expected(closes[2], True))
+
+    def test_resolve_workers(self, monkeypatch):
+        """
+        테스트 4: 자동(-1)은 코어 1개를 남기고 최대 4개, 코어가 1개면 스레드(0)
+        """
+        monkeypatch.setattr(analytics.os, "cpu_count", lambda: 1)
+        assert analytics.resolve_workers(-1) == 0
+
+        monkeypatch.setattr(analytics.os, "cpu_count", lambda: 16)
+        assert analytics.resolve_workers(-1) == 4
+        assert analytics.resolve_workers(2) == 2
+
+    @pytest.mark.asyncio
+    async def test_broken_process_pool_is_recreated(self):
+        """
+        테스트 5: 작업자 프로세스가 죽으면 그 배치는 스레드에서 계산하고,
+        다음 배치는 새 풀에서 계산
+        """
+        pool = AnalyticsPool(workers=1)
+        closes = make_closes()
+        try:
+            broken = pool._get_executor()
+            with pytest.raises(BrokenProcessPool):
+                await asyncio.wrap_future(broken.submit(os._exit, 1))
+
+            first = await pool.analyze(closes[1], closes[1])
+            assert pool._executor is None
+            second = await pool.analyze(closes[1], closes[1])
+            assert pool._executor is not None
+            assert pool._executor is not broken
+        finally:
+            pool.shutdown()
+
+        assert first == pytest.approx(expected(closes[1], True), nan_ok=True)
+        assert second == pytest.approx(expected(closes[1], True), nan_ok=True)
@@ -0,0 +1,71 @@
+"""benchmarks 테스트 코드
+
+기준값 비교가 느려진 항목만 골라내는지, 부하 테스트가 실제 핸들러로 명령어를 처리하는지 검증
+"""
+
+import pytest
+
+from benchmarks.loadtest import percentile, run_load_test
+from benchmarks.run import compare
+
+
+class TestCompare:
+    """compare 테스트"""
+
+    def test_flags_regression_over_tolerance(self):
+        """
+        테스트 1: 허용 비율과 최소 차이를 모두 넘으면 성능 저하로 판단
+        """
+        baseline = {"calculate_mdd[1000x1y]": 0.10, "calculate_ma[1000x1y]": 0.10}
+        results = {"calculate_mdd[1000x1y]": 0.20, "calculate_ma[1000x1y]": 0.12}
+
+        regressions = compare(results, baseline, tolerance=0.5)
+
+        assert len(regressions) == 1
+        assert regressions[0].startswith("calculate_mdd[1000x1y]")
+
+    def test_ignores_small_or_unknown_cases(self):
+        """
+        테스트 2: 절대 차이가 아주 작거나 기준값에 없는 항목은 무시
+        """
+        baseline = {"render_daily_report[10x1y]": 0.0001}
+        results = {
+            "render_daily_report[10x1y]": 0.0005,
+            "collect_report_data[10x1y]": 1.0,
+        }
+
+        assert compare(results, baseline, tolerance=0.5) == []
+
+
+class TestLoadTest:
+    """loadtest 테스트"""
+
+    def test_percentile(self):
+        """
+        테스트 3: nearest-rank 백분위수 (값이 없으면 0)
+        """
+        values = [float(i) for i in range(1, 101)]
+
+        assert percentile(values, 50) == 51.0
+        assert percentile(values, 99) == 100.0
+        assert percentile([], 95) == 0.0
+
+    @pytest.mark.asyncio
+    async def test_commands_run_through_real_handlers(self):
+        """
+        테스트 4: 가짜 서버로 모든 명령어가 처리되고 리포트가 전송됨
+        """
+        result = await run_load_test(
+            chats=3,
+            commands_per_chat=2,
+            mix={"report": 1},
+            symbols_per_chat=2,
+            universe_size=4,
+            telegram_latency=0,
+            yahoo_latency=0,
+        )
+
+        assert result["latency"]["count"] == 6
+        assert result["commands"]["report"]["count"] == 6
+        assert result["telegram"]["sent_messages"] >= 6
+        assert result["market"]["errors"] == 0
@@ -0,0 +1,195 @@
+"""cache.py 테스트 코드
+
+데이터 기준 시점(as-of) 계산(거래소별 포함)과 리포트 캐시 동작을 검증
+"""
+
+import datetime
+
+from src.cache import (
+    MARKET_TZ,
+    PrewarmCache,
+    ReportCache,
+    data_as_of,
+    is_current,
+    same_session,
+    symbol_as_of,
+)
+
+
+def ny(year, month, day, hour, minute=0):
+    """뉴욕 시간 datetime 생성"""
+    return datetime.datetime(year, month, day, hour, minute, tzinfo=MARKET_TZ)
+
+
+class TestDataAsOf:
+    """data_as_of 함수 테스트"""
+
+    def test_after_close(self):
+        """
+        테스트 1: 장 마감 후에는 당일 마감일이 기준
+
+        2025-01-10(금) 17:00 → close:2025-01-10
+        """
+        assert data_as_of(ny(2025, 1, 10, 17)) == "close:2025-01-10"
+
+    def test_before_open(self):
+        """
+        테스트 2: 장 시작 전에는 전 영업일 마감이 기준
+
+        2025-01-13(월) 08:00 → close:2025-01-10 (금)
+        """
+        assert data_as_of(ny(2025, 1, 13, 8)) == "close:2025-01-10"
+
+    def test_weekend(self):
+        """
+        테스트 3: 주말 내내 금요일 마감이 기준 (새 데이터 없음)
+        """
+        assert data_as_of(ny(2025, 1, 11, 12)) == "close:2025-01-10"
+        assert data_as_of(ny(2025, 1, 12, 23)) == "close:2025-01-10"
+
+    def test_holiday(self):
+        """
+        테스트 4: 휴장일(2025-01-20 MLK Day)에는 직전 거래일 마감이 기준
+        """
+        assert data_as_of(ny(2025, 1, 20, 12)) == "close:2025-01-17"
+        assert data_as_of(ny(2025, 1, 21, 8)) == "close:2025-01-17"
+
+    def test_intraday_bucket(self):
+        """
+        테스트 5: 장중에는 TTL 구간마다 기준 시점이 바뀜
+        """
+        first = data_as_of(ny(2025, 1, 10, 10, 0), intraday_ttl=300)
+        same = data_as_of(ny(2025, 1, 10, 10, 4), intraday_ttl=300)
+        next_bucket = data_as_of(ny(2025, 1, 10, 10, 5), intraday_ttl=300)
+
+        assert first.startswith("intraday:")
+        assert first == same
+        assert first != next_bucket
+
+    def test_krx_symbols_add_exchange_part(self):
+        """
+        테스트 6: KRX 종목이 있으면 KRX 기준 시점을 덧붙이고, 종목별로 자기 거래소 값을 사용
+
+        뉴욕 2025-01-12(일) 20:00 = 서울 1/13(월) 10:00 → 미국은 금요일 마감, 한국은 장중
+        """
+        now = ny(2025, 1, 12, 20)
+        as_of = data_as_of(now, intraday_ttl=300, symbols=["TSLA", "005930.KS"])
+
+        assert as_of.startswith("close:2025-01-10;KRX=intraday:")
+        assert data_as_of(now, symbols=["TSLA"]) == "close:2025-01-10"
+        assert symbol_as_of(as_of, "TSLA") == "close:2025-01-10"
+        assert symbol_as_of(as_of, "005930.KS").startswith("intraday:")
+        # KRX 값이 없는 기준 시점으로는 KRX 종목을 재사용하지 않음
+        assert symbol_as_of("close:2025-01-10", "005930.KS") is None
+
+    def test_is_current(self):
+        """
+        테스트 7: 저장한 기준 시점이 지금도 유효한지 거래소별로 다시 계산
+        """
+        as_of = "close:2025-01-10;KRX=close:2025-01-10"
+
+        assert is_current(as_of, ny(2025, 1, 11, 12))
+        # 월요일 서울 장이 열리면 KRX 값이 바뀜
+        assert not is_current(as_of, ny(2025, 1, 12, 20))
+
+    def test_same_session(self):
+        """
+        테스트 8: 장중 TTL 구간만 다르면 같은 장, 사이에 장이 열리거나 닫히면 다른 장
+        """
+        assert same_session(
+            "intraday:1;KRX=close:2025-01-10", "intraday:2;KRX=close:2025-01-10"
+        )
+        # 서울 장 시작 직전 → 직후
+        assert not same_session(
+            "close:2025-01-10;KRX=close:2025-01-10", "close:2025-01-10;KRX=intraday:3"
+        )
+        assert not same_session("intraday:1", "close:2025-01-10")
+        assert not same_session(
+            "close:2025-01-10", "close:2025-01-10;KRX=close:2025-01-10"
+        )
+
+
+class TestReportCache:
+    """ReportCache 클래스 테스트"""
+
+    def test_hit_and_miss(self):
+        """
+        테스트 1: 같은 키는 캐시 적중, 다른 버전은 미적중
+        """
+        cache = ReportCache()
+        key = ReportCache.make_key("1y", "v1", "close:2025-01-10")
+        cache.put(key, ["report"])
+
+        assert cache.get(key) == ["report"]
+        assert cache.get(ReportCache.make_key("1y", "v2", "close:2025-01-10")) is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_new_as_of_evicts_old_entries(self):
+        """
+        테스트 2: 새 기준 시점의 항목을 넣으면 이전 시점 항목은 삭제
+        """
+        cache = ReportCache()
+        old_key = ReportCache.make_key("1y", "v1", "close:2025-01-10")
+        cache.put(old_key, ["old"])
+        cache.put(ReportCache.make_key("1y", "v1", "close:2025-01-13"), ["new"])
+
+        assert cache.get(old_key) is None
+        assert cache.stats()["entries"] == 1
+
+    def test_other_exchange_mix_is_kept(self):
+        """
+        테스트 3: KRX 종목 유무로 기준 시점 형식이 달라도, 함께 있는 거래소 값이 같으면 유지
+        """
+        cache = ReportCache()
+        us_key = ReportCache.make_key("1y", "v1", "close:2025-01-10")
+        mixed = "close:2025-01-10;KRX=close:2025-01-10"
+        cache.put(us_key, ["us"])
+        cache.put(ReportCache.make_key("1y", "v2", mixed), ["mixed"])
+        assert cache.get(us_key) == ["us"]
+
+        cache.put(
+            ReportCache.make_key("1y", "v2", "close:2025-01-10;KRX=close:2025-01-13"),
+            ["new"],
+        )
+        assert cache.get(ReportCache.make_key("1y", "v2", mixed)) is None
+        assert cache.get(us_key) == ["us"]
+
+    def test_lru_limit(self):
+        """
+        테스트 4: 최대 개수를 넘으면 가장 오래 안 쓴 항목부터 삭제
+        """
+        cache = ReportCache(max_entries=2)
+        keys = [ReportCache.make_key(p, "v1", "close:2025-01-10") for p in "abc"]
+        cache.put(keys[0], ["a"])
+        cache.put(keys[1], ["b"])
+        cache.get(keys[0])
+        cache.put(keys[2], ["c"])
+
+        assert cache.get(keys[0]) == ["a"]
+        assert cache.get(keys[1]) is None
+
+
+class TestPrewarmCache:
+    """PrewarmCache 클래스 테스트"""
+
+    def test_take_matching_entry(self):
+        """
+        테스트 1: 기준 시점이 같고 종목이 포함되면 꺼낼 수 있고, 한 번만 꺼내짐
+        """
+        cache = PrewarmCache()
+        cache.put("09:00", "1y", "close:2025-01-10", ["A", "B"], ["A"], {}, [])
+
+        assert cache.take("09:00", "1y", "close:2025-01-10", ["A"], ["A"]) == ({}, [])
+        assert cache.take("09:00", "1y", "close:2025-01-10", ["A"], ["A"]) is None
+
+    def test_stale_or_incomplete_entry(self):
+        """
+        테스트 2: 기준 시점이 다르거나 나중에 종목이 추가됐으면 None
+        """
+        cache = PrewarmCache()
+        cache.put("09:00", "1y", "close:2025-01-10", ["A"], [], {}, [])
+        assert cache.take("09:00", "1y", "close:2025-01-13", ["A"], []) is None
+
+        cache.put("09:00", "1y", "close:2025-01-10", ["A"], [], {}, [])
+        assert cache.take("09:00", "1y", "close:2025-01-10", ["A", "B"], []) is None
@@ -0,0 +1,128 @@
+"""history.py 테스트 코드
+
+리포트 결과 저장(stale/reused 제외), 날짜별 조회(하루 마지막 값), 기간/일수 필터, 인덱스를 검증
+"""
+
+import datetime
+from contextlib import closing
+
+import pytest
+
+from src import history, watchlist
+from src.config import Config
+
+
+@pytest.fixture(autouse=True)
+def history_dir(tmp_path, monkeypatch):
+    """
+    fixture: 테스트마다 임시 디렉토리의 history.db 사용
+    """
+    monkeypatch.setattr(watchlist, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(Config, "HISTORY_DB", "")
+    monkeypatch.setattr(Config, "HISTORY_ENABLED", True)
+    return tmp_path
+
+
+def result(symbol: str, drawdown_pct: float, price: float, **extra) -> dict:
+    """테스트용 종목 분석 결과"""
+    return {
+        "symbol": symbol,
+        "peak_price": 500.0,
+        "current_price": price,
+        "drawdown_pct": drawdown_pct,
+        "buy_signal": "",
+        **extra,
+    }
+
+
+def at(day: int, hour: int = 9) -> datetime.datetime:
+    """2025년 1월 day일 hour시"""
+    return datetime.datetime(2025, 1, day, hour)
+
+
+class TestRecord:
+    """record 함수 테스트"""
+
+    def test_appends_runs_and_skips_stale(self, history_dir):
+        """
+        테스트 1: 실행마다 결과를 추가하고, 시간 초과로 이전 값을 쓴 종목과
+        같은 기준 시점이라 재사용한 종목은 저장하지 않음 (새 결과가 없으면 실행 기록도 없음)
+        """
+        fear_greed = {"score": 35.0, "rating": "fear"}
+        ma = {"ma_200": 250.0, "diff_pct": 57.9}
+        history.record(
+            "1y",
+            [
+                result("TSLA", -20.0, 400.0, ma_200=ma, buy_signal="1차 매수"),
+                result("SCHD", -3.0, 27.0, stale=True),
+                result("SCHG", -5.0, 28.0, reused=True),
+            ],
+            fear_greed,
+            "scheduled",
+            now=at(10),
+        )
+
+        rows = history.query("tsla", days=30, now=at(10))
+        assert len(rows) == 1
+        assert rows[0]["date"] == "2025-01-10"
+        assert rows[0]["ma_diff_pct"] == pytest.approx(57.9)
+        assert rows[0]["buy_signal"] == "1차 매수"
+        assert rows[0]["fear_greed"] == pytest.approx(35.0)
+        assert history.query("SCHD", now=at(10)) == []
+        assert history.query("SCHG", now=at(10)) == []
+        assert (history_dir / "history.db").exists()
+
+        # 모두 재사용/이전 값이면 빈 실행 기록도 남기지 않음
+        run_id = history.record(
+            "1y",
+            [result("TSLA", -20.0, 400.0, reused=True)],
+            fear_greed,
+            "command",
+            now=at(11),
+        )
+        assert run_id is None
+        with closing(history.connect()) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 1
+
+    def test_disabled_does_not_write(self, history_dir, monkeypatch):
+        """
+        테스트 2: HISTORY_ENABLED가 꺼져 있으면 파일을 만들지 않음
+        """
+        monkeypatch.setattr(Config, "HISTORY_ENABLED", False)
+
+        assert history.record("1y", [result("TSLA", -5.0, 475.0)], {}, "cli") is None
+        assert not (history_dir / "history.db").exists()
+
+
+class TestQuery:
+    """query 함수 테스트"""
+
+    def test_last_value_per_day_within_days_and_period(self):
+        """
+        테스트 3: 하루에 여러 번 실행했으면 마지막 값, 기간 밖/다른 분석 기간은 제외
+        """
+        history.record("1y", [result("TSLA", -30.0, 350.0)], {}, "cli", now=at(1))
+        history.record("1y", [result("TSLA", -10.0, 450.0)], {}, "cli", now=at(9))
+        history.record("1y", [result("TSLA", -12.0, 440.0)], {}, "cli", now=at(10, 9))
+        history.record("1y", [result("TSLA", -14.0, 430.0)], {}, "cli", now=at(10, 15))
+        history.record("6mo", [result("TSLA", -2.0, 490.0)], {}, "cli", now=at(10))
+
+        rows = history.query("TSLA", days=2, period="1y", now=at(10, 18))
+
+        assert [(row["date"], row["drawdown_pct"]) for row in rows] == [
+            ("2025-01-09", -10.0),
+            ("2025-01-10", -14.0),
+        ]
+
+    def test_indexes_on_symbol_and_date(self):
+        """
+        테스트 4: 종목+날짜 조회가 인덱스를 사용
+        """
+        with closing(history.connect()) as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM results"
+                " WHERE symbol = ? AND date >= ?",
+                ("TSLA", "2025-01-01"),
+            ).fetchall()
+
+        assert "idx_results_symbol_date" in " ".join(str(tuple(row)) for row in plan)
@@ -5,6 +5,7 @@
 
 import pandas as pd
 import pytest
+
 from src.stock.ma import calculate_ma, calculate_ma_analysis
 
 
@@ -66,6 +67,17 @@ class TestCalculateMa:
 
         assert ma == pytest.approx(100.5)
 
+    def test_nan_only_outside_window(self):
+        """
+        테스트 6: 빈 값은 마지막 window 구간에 있을 때만 None (rolling과 같은 기준)
+
+        [NaN, 20, 30, 40] 3일 평균 = 30, [10, NaN, 30, 40] 3일 평균 = None
+        """
+        assert calculate_ma(pd.Series([None, 20, 30, 40], dtype=float), 3) == (
+            pytest.approx(30.0)
+        )
+        assert calculate_ma(pd.Series([10, None, 30, 40], dtype=float), 3) is None
+
 
 class TestCalculateMaAnalysis:
     """calculate_ma_analysis 함수 테스트"""
@@ -0,0 +1,159 @@
+"""market_calendar.py 테스트 코드
+
+NYSE 휴장일/조기 폐장 규칙과 거래일 계산을 검증 (공식 휴장일 목록과 비교)
+KRX 휴장일/개장 시간 변경, 종목별 거래소 선택, 다음 마감 시각을 검증
+"""
+
+import datetime
+
+from src import market_calendar
+from src.market_calendar import KRX, KRX_TZ, MARKET_TZ, NYSE
+
+
+def ny(year, month, day, hour, minute=0):
+    """뉴욕 시간 datetime 생성"""
+    return datetime.datetime(year, month, day, hour, minute, tzinfo=MARKET_TZ)
+
+
+def kst(year, month, day, hour, minute=0):
+    """서울 시간 datetime 생성"""
+    return datetime.datetime(year, month, day, hour, minute, tzinfo=KRX_TZ)
+
+
+class TestHolidays:
+    """휴장일 규칙 테스트"""
+
+    def test_2025_holidays(self):
+        """
+        테스트 1: 2025년 NYSE 공식 휴장일과 일치 (임시 휴장일 포함)
+        """
+        expected = [
+            "2025-01-01",
+            "2025-01-09",
+            "2025-01-20",
+            "2025-02-17",
+            "2025-04-18",
+            "2025-05-26",
+            "2025-06-19",
+            "2025-07-04",
+            "2025-09-01",
+            "2025-11-27",
+            "2025-12-25",
+        ]
+        days = sorted(d.isoformat() for d in market_calendar.holidays(2025))
+        assert days == expected
+
+    def test_observed_rules(self):
+        """
+        테스트 2: 토요일 휴일은 금요일, 일요일 휴일은 월요일에 쉼
+
+        2026-07-04(토) → 7/3(금), 2027-12-25(토) → 12/24(금), 2023-01-01(일) → 1/2(월)
+        2022-01-01(토)은 전년도 12/31에 쉬지 않음
+        """
+        assert datetime.date(2026, 7, 3) in market_calendar.holidays(2026)
+        assert datetime.date(2027, 12, 24) in market_calendar.holidays(2027)
+        assert datetime.date(2023, 1, 2) in market_calendar.holidays(2023)
+        assert market_calendar.is_trading_day(datetime.date(2021, 12, 31))
+
+    def test_early_close(self):
+        """
+        테스트 3: 조기 폐장일은 13:00에 끝나고, 휴장일과 겹치면 조기 폐장 없음
+        """
+        _, close = market_calendar.session(datetime.date(2025, 11, 28))
+        assert close == ny(2025, 11, 28, 13)
+        # 2026-07-03은 독립기념일 대체 휴장
+        assert market_calendar.session(datetime.date(2026, 7, 3)) is None
+
+
+class TestSessions:
+    """거래일/장 상태 계산 테스트"""
+
+    def test_last_close_skips_holiday_weekend(self):
+        """
+        테스트 1: 3일 연휴(토/일/MLK Day) 동안 마지막 마감일은 금요일
+        """
+        assert market_calendar.last_close(ny(2025, 1, 20, 17)) == datetime.date(
+            2025, 1, 17
+        )
+        assert market_calendar.next_trading_day(
+            datetime.date(2025, 1, 17)
+        ) == datetime.date(2025, 1, 21)
+
+    def test_has_new_data(self):
+        """
+        테스트 2: 한국 시간 아침(뉴욕 전날 저녁)에 새 데이터가 있는지
+
+        화요일 아침(월요일 장 종료 후) True, 일요일 아침(토요일 저녁) False
+        휴장일(MLK Day) 다음 날 아침 False
+        """
+        assert market_calendar.has_new_data(ny(2025, 1, 13, 20))
+        assert not market_calendar.has_new_data(ny(2025, 1, 11, 20))
+        assert not market_calendar.has_new_data(ny(2025, 1, 20, 20))
+        assert market_calendar.has_new_data(ny(2025, 1, 21, 11))  # 장중
+
+
+class TestExchanges:
+    """거래소별 캘린더 테스트"""
+
+    def test_exchange_for_symbol(self):
+        """
+        테스트 1: .KS/.KQ 종목과 한국 지수는 KRX, 나머지는 NYSE
+        """
+        assert market_calendar.exchange_for("005930.KS") is KRX
+        assert market_calendar.exchange_for("035720.kq") is KRX
+        assert market_calendar.exchange_for("^KS11") is KRX
+        assert market_calendar.exchange_for("TSLA") is NYSE
+        assert market_calendar.exchange_for("^GSPC") is NYSE
+
+    def test_krx_holidays_and_hours(self):
+        """
+        테스트 2: KRX 설 연휴/연말 휴장, 새해 첫 거래일/수능일 늦은 개장
+
+        2025-01-27~30 휴장 → 1/31(금) 장 시작 전 마지막 마감은 1/24
+        """
+        assert market_calendar.last_close(kst(2025, 1, 31, 8), KRX) == (
+            datetime.date(2025, 1, 24)
+        )
+        assert market_calendar.session(datetime.date(2025, 12, 31), KRX) is None
+        # 뉴욕은 같은 날 정상 거래
+        assert market_calendar.is_trading_day(datetime.date(2025, 1, 28))
+
+        start, close = market_calendar.session(datetime.date(2025, 1, 2), KRX)
+        assert (start, close) == (kst(2025, 1, 2, 10), kst(2025, 1, 2, 15, 30))
+        _, close = market_calendar.session(datetime.date(2025, 11, 13), KRX)
+        assert close == kst(2025, 11, 13, 16, 30)
+
+    def test_next_close(self):
+        """
+        테스트 3: 다음 일봉이 생기는 시각 = 다음 정규장 마감 (장전/조기 폐장/연휴 반영)
+        """
+        # 장 시작 전 → 당일 마감
+        assert market_calendar.next_close(ny(2025, 1, 10, 8)) == ny(2025, 1, 10, 16)
+        # 블랙 프라이데이 조기 폐장
+        assert market_calendar.next_close(ny(2025, 11, 28, 12)) == ny(2025, 11, 28, 13)
+        # 금요일 마감 후 → 설 연휴 다음 거래일 마감
+        assert market_calendar.next_close(kst(2025, 1, 24, 16), KRX) == kst(
+            2025, 1, 31, 15, 30
+        )
+
+    def test_krx_closures_cover_next_year(self, capsys, monkeypatch):
+        """
+        테스트 4: KRX 휴장일 표에 내년까지 있어야 하고, 표에 없는 연도는 한 번만 경고
+
+        실패하면 KRX_CLOSURES에 다음 해 설날/추석/대체 공휴일을 추가할 것
+        """
+        next_year = datetime.date.today().year + 1
+        assert next_year in market_calendar.KRX_CLOSURE_YEARS
+
+        monkeypatch.setattr(market_calendar, "_warned_years", set())
+        market_calendar.krx_holidays.cache_clear()
+        market_calendar.krx_holidays(1999)
+        market_calendar.krx_holidays.cache_clear()
+        market_calendar.krx_holidays(1999)
+        market_calendar.krx_holidays(next_year)
+
+        out = capsys.readouterr().out
+        assert out.count("1999년이 없음") == 1
+        assert f"{next_year}년이 없음" not in out
+        # 2027년 설 연휴 (일요일 설날 → 화요일 대체 공휴일)
+        assert market_calendar.session(datetime.date(2027, 2, 9), KRX) is None
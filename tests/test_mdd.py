@@ -6,7 +6,12 @@ MDD 계산이 정확한지 다양한 케이스로 검증
 import pandas as pd
 import pytest
 
-from src.stock.mdd import calculate_drawdown_from_peak, calculate_mdd, get_buy_signal
+from src.stock.mdd import (
+    calculate_drawdown_from_peak,
+    calculate_mdd,
+    get_buy_signal,
+    get_signal_tier,
+)
 
 
 class TestCalculateMdd:
@@ -182,3 +187,32 @@ class TestGetBuySignal:
         assert get_buy_signal(-30.0) == "3차 매수 (과매도 구간)"
         assert get_buy_signal(-40.0) == "3차 매수 (과매도 구간)"
         assert get_buy_signal(-50.0) == "3차 매수 (과매도 구간)"
+
+
+class TestGetSignalTier:
+    """get_signal_tier 함수 테스트 (매수 단계 + hysteresis)"""
+
+    def test_tiers_without_hysteresis(self):
+        """
+        테스트 1: hysteresis 없이는 get_buy_signal과 같은 기준선
+        """
+        assert get_signal_tier(-9.9) == 0
+        assert get_signal_tier(-10.0) == 1
+        assert get_signal_tier(-20.0) == 2
+        assert get_signal_tier(-35.0) == 3
+
+    def test_hysteresis_on_recovery(self):
+        """
+        테스트 2: 이미 들어간 단계는 기준선보다 여유 폭만큼 회복해야 벗어남
+
+        이전 1단계, hysteresis 1.0 → -9.5%는 1단계 유지, -8.9%는 0단계
+        """
+        assert get_signal_tier(-9.5, previous_tier=1, hysteresis=1.0) == 1
+        assert get_signal_tier(-8.9, previous_tier=1, hysteresis=1.0) == 0
+
+    def test_deeper_tier_enters_immediately(self):
+        """
+        테스트 3: 더 깊은 단계는 기준선에서 바로 진입 (여유 폭 미적용)
+        """
+        assert get_signal_tier(-20.0, previous_tier=1, hysteresis=1.0) == 2
+        assert get_signal_tier(-19.5, previous_tier=1, hysteresis=1.0) == 1
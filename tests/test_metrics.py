@@ -0,0 +1,109 @@
+"""metrics.py 테스트 코드
+
+Prometheus 텍스트 형식 출력(카운터/게이지/히스토그램)과 /metrics 엔드포인트를 검증
+"""
+
+import httpx
+import pytest
+
+from src import metrics
+from src.metrics import Counter, Gauge, Histogram, Registry
+
+
+def make_registry():
+    """테스트용 레지스트리 (전역 메트릭과 분리)"""
+    registry = Registry()
+    counter = registry.register(Counter("errors_total", "Errors", ("source",)))
+    gauge = registry.register(Gauge("symbols", "Symbols"))
+    histogram = registry.register(
+        Histogram("fetch_seconds", "Fetch", ("symbol",), buckets=(0.1, 1.0))
+    )
+    return registry, counter, gauge, histogram
+
+
+class TestRender:
+    """Registry.render 테스트"""
+
+    def test_counter_and_gauge(self):
+        """
+        테스트 1: 레이블별 카운터 값과 함수 게이지 값이 출력됨
+        """
+        registry, counter, gauge, _ = make_registry()
+        counter.labels("yfinance").inc()
+        counter.labels("yfinance").inc(2)
+        gauge.set_function(lambda: 7)
+
+        text = registry.render()
+
+        assert "# TYPE errors_total counter" in text
+        assert 'errors_total{source="yfinance"} 3' in text
+        assert "symbols 7" in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        """
+        테스트 2: 히스토그램 버킷은 누적 개수, +Inf 버킷은 전체 개수
+        """
+        registry, _, _, histogram = make_registry()
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.labels("TSLA").observe(value)
+
+        text = registry.render()
+
+        assert 'fetch_seconds_bucket{symbol="TSLA",le="0.1"} 1' in text
+        assert 'fetch_seconds_bucket{symbol="TSLA",le="1"} 3' in text
+        assert 'fetch_seconds_bucket{symbol="TSLA",le="+Inf"} 4' in text
+        assert 'fetch_seconds_count{symbol="TSLA"} 4' in text
+        assert 'fetch_seconds_sum{symbol="TSLA"} 4.25' in text
+
+    def test_label_count_checked(self):
+        """
+        테스트 3: 레이블 개수가 맞지 않으면 ValueError
+        """
+        _, counter, _, _ = make_registry()
+        with pytest.raises(ValueError):
+            counter.inc()
+
+    def test_no_unbounded_labels(self):
+        """
+        테스트 4: 기본 메트릭은 종목 코드를 레이블로 쓰지 않고,
+        공통 클래스는 직접 만들 수 없음
+        """
+        assert all(
+            "symbol" not in metric.labelnames for metric in metrics.REGISTRY._metrics
+        )
+        metrics.STOCK_FETCH_SECONDS.observe(0.2)
+        # 레이블 없이 시계열 하나 (전역 레지스트리의 함수 게이지는 호출하지 않음)
+        counts = [
+            line
+            for line in metrics.STOCK_FETCH_SECONDS.collect()
+            if line.startswith("stock_fetch_seconds_count")
+        ]
+        assert len(counts) == 1 and counts[0].startswith("stock_fetch_seconds_count ")
+
+        with pytest.raises(TypeError):
+            metrics._Metric("plain", "Plain")
+
+
+class TestMetricsServer:
+    """create_server 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint(self):
+        """
+        테스트 5: GET /metrics가 Prometheus 텍스트 형식으로 응답
+        """
+        registry, counter, _, _ = make_registry()
+        counter.labels("cnn").inc()
+        server = metrics.create_server("127.0.0.1", 0, registry)
+        await server.start()
+        try:
+            async with httpx.AsyncClient(
+                base_url=f"http://127.0.0.1:{server.port}"
+            ) as client:
+                response = await client.get("/metrics")
+        finally:
+            await server.stop()
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'errors_total{source="cnn"} 1' in response.text
@@ -0,0 +1,191 @@
+"""pipeline.py 테스트 코드
+
+가짜 수집 함수로 완료 순서 스트리밍, 동시 조회 수 제한, 제한 시간과 이전 값 대체를 검증
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import pipeline
+from src.config import Config
+
+
+@pytest.fixture
+def fake_market(monkeypatch):
+    """
+    fixture: 종목별 지연을 정할 수 있는 가짜 수집 함수 (동시 실행 수 기록)
+    """
+    state = {"delays": {}, "errors": set(), "running": 0, "max_running": 0, "calls": []}
+
+    async def fake_analyze(symbol, period, ma_enabled=False, on_fetched=None):
+        state["calls"].append(symbol)
+        state["running"] += 1
+        state["max_running"] = max(state["max_running"], state["running"])
+        try:
+            await asyncio.sleep(state["delays"].get(symbol, 0.0))
+            if symbol in state["errors"]:
+                raise RuntimeError("boom")
+        finally:
+            state["running"] -= 1
+        return {"symbol": symbol, "drawdown_pct": -1.0, "buy_signal": ""}
+
+    monkeypatch.setattr(pipeline, "analyze_symbol", fake_analyze)
+    monkeypatch.setattr(pipeline, "get_fear_greed_index", lambda: {"score": 50})
+    pipeline.clear_fallback()
+    yield state
+    pipeline.clear_fallback()
+
+
+class TestCollectReportData:
+    """collect_report_data 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_streams_in_completion_order(self, fake_market):
+        """
+        테스트 1: 콜백은 완료 순서대로, 최종 결과는 watchlist 순서대로
+
+        SLOW가 가장 늦게 끝나도 FAST 결과를 먼저 받음
+        """
+        fake_market["delays"] = {"SLOW": 0.05, "FAST": 0.0, "MID": 0.02}
+        streamed = []
+
+        async def on_result(item):
+            streamed.append(item["symbol"])
+
+        fear_greed, results, timed_out = await pipeline.collect_report_data(
+            "1y", ["SLOW", "FAST", "MID"], [], on_result
+        )
+
+        assert streamed == ["FAST", "MID", "SLOW"]
+        assert [r["symbol"] for r in results] == ["SLOW", "FAST", "MID"]
+        assert fear_greed["score"] == 50
+        assert timed_out == []
+
+
+class TestCollectStocks:
+    """collect_stocks 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, fake_market):
+        """
+        테스트 2: 동시에 조회하는 종목 수가 concurrency를 넘지 않음
+        """
+        symbols = [f"S{i}" for i in range(10)]
+        fake_market["delays"] = {symbol: 0.01 for symbol in symbols}
+
+        results, _ = await pipeline.collect_stocks(
+            "1y", symbols, [], concurrency=3, deadline=0
+        )
+
+        assert len(results) == 10
+        assert fake_market["max_running"] == 3
+
+    @pytest.mark.asyncio
+    async def test_deadline_returns_finished_symbols(self, fake_market, monkeypatch):
+        """
+        테스트 3: 제한 시간이 지나면 끝난 종목만 반환하고 나머지는 시간 초과로 취소
+        """
+        monkeypatch.setattr(Config, "STALE_FALLBACK", False)
+        fake_market["delays"] = {"FAST": 0.0, "HANG": 10.0}
+
+        results, timed_out = await pipeline.collect_stocks(
+            "1y", ["HANG", "FAST"], [], concurrency=0, deadline=0.05
+        )
+
+        assert [r["symbol"] for r in results] == ["FAST"]
+        assert timed_out == ["HANG"]
+        await asyncio.sleep(0)
+        assert fake_market["running"] == 0
+
+    @pytest.mark.asyncio
+    async def test_symbol_timeout_falls_back_to_previous_value(self, fake_market):
+        """
+        테스트 4: 종목 제한 시간을 넘으면 마지막 수집 값(stale)으로 채우고 목록에 표시
+        """
+        await pipeline.collect_stocks("1y", ["SLOW", "FAST"], [], deadline=0)
+
+        fake_market["delays"] = {"SLOW": 10.0}
+        results, timed_out = await pipeline.collect_stocks(
+            "1y", ["SLOW", "FAST"], [], deadline=0, symbol_timeout=0.05
+        )
+
+        assert timed_out == ["SLOW"]
+        assert [r["symbol"] for r in results] == ["SLOW", "FAST"]
+        assert results[0]["stale"] is True
+        assert "stale" not in results[1]
+        assert pipeline.fresh_results(results) == [results[1]]
+
+    @pytest.mark.asyncio
+    async def test_long_period_uses_smaller_concurrency(self, fake_market, monkeypatch):
+        """
+        테스트 5: max 같은 긴 기간은 LONG_PERIOD_CONCURRENCY만큼만 동시에 조회
+        """
+        monkeypatch.setattr(Config, "FETCH_CONCURRENCY", 8)
+        monkeypatch.setattr(Config, "LONG_PERIOD_CONCURRENCY", 2)
+        symbols = [f"S{i}" for i in range(6)]
+        fake_market["delays"] = {symbol: 0.01 for symbol in symbols}
+
+        results, _ = await pipeline.collect_stocks("max", symbols, [], deadline=0)
+
+        assert len(results) == 6
+        assert fake_market["max_running"] == 2
+
+    @pytest.mark.asyncio
+    async def test_refetches_only_exchanges_with_new_data(self, fake_market):
+        """
+        테스트 6: 한국 장 값만 바뀌면 KRX 종목만 다시 조회하고 미국 종목은 재사용
+        """
+        symbols = ["TSLA", "005930.KS"]
+        before = "close:2025-01-10;KRX=close:2025-01-10"
+        await pipeline.collect_stocks("1y", symbols, [], as_of=before)
+        fake_market["calls"].clear()
+
+        await pipeline.collect_stocks("1y", symbols, [], as_of=before)
+        assert fake_market["calls"] == []
+
+        after = "close:2025-01-10;KRX=intraday:1736730000"
+        results, _ = await pipeline.collect_stocks("1y", symbols, [], as_of=after)
+        assert fake_market["calls"] == ["005930.KS"]
+        assert [r["symbol"] for r in results] == symbols
+
+    @pytest.mark.asyncio
+    async def test_symbol_error_keeps_other_symbols(self, fake_market):
+        """
+        테스트 7: 한 종목에서 오류가 나도 나머지 종목은 반환하고, 오류 종목은 이전 값으로 채움
+        """
+        await pipeline.collect_stocks("1y", ["BAD", "GOOD"], [], deadline=0)
+
+        fake_market["errors"] = {"BAD", "NEW"}
+        results, timed_out = await pipeline.collect_stocks(
+            "1y", ["BAD", "GOOD", "NEW"], [], deadline=0
+        )
+
+        assert timed_out == ["BAD", "NEW"]
+        assert [r["symbol"] for r in results] == ["BAD", "GOOD"]
+        assert results[0]["stale"] is True
+        assert "stale" not in results[1]
+
+
+class TestAnalyzeSymbol:
+    """analyze_symbol 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_keeps_close_array_only(self, monkeypatch):
+        """
+        테스트 8: 종가만 DataFrame과 메모리를 공유하지 않는 float64 배열로 남기고,
+        200일선은 마지막 200개로 계산
+        """
+        closes = np.linspace(100.0, 50.0, 3000)
+        data = pd.DataFrame({"Open": closes, "Close": closes, "Volume": closes})
+        monkeypatch.setattr(pipeline, "fetch_stock_data", lambda *args: data)
+
+        array = pipeline._fetch_close_array("TSLA", "max")
+        result = await pipeline.analyze_symbol("TSLA", "max", ma_enabled=True)
+
+        assert array.dtype == np.float64
+        assert not np.shares_memory(array, data["Close"].to_numpy())
+        assert result["peak_price"] == pytest.approx(100.0)
+        assert result["ma_200"]["ma_200"] == pytest.approx(closes[-200:].mean())
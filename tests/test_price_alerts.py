@@ -0,0 +1,153 @@
+"""price_alerts.py 테스트 코드
+
+목표가 인덱스(bisect)의 돌파 구간 계산과 한 번/반복 알림, 파일 저장을 검증
+"""
+
+import pytest
+
+from src import price_alerts, watchlist
+from src.config import Config
+from src.price_alerts import AlertIndex
+
+
+@pytest.fixture(autouse=True)
+def alerts_dir(tmp_path, monkeypatch):
+    """
+    fixture: 테스트마다 임시 디렉토리의 watchlist.json/price_alerts.json 사용
+    """
+    monkeypatch.setattr(watchlist, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(watchlist, "WATCHLIST_FILE", tmp_path / "watchlist.json")
+    monkeypatch.setattr(Config, "TELEGRAM_CHAT_ID", "100")
+    monkeypatch.setattr(Config, "DEFAULT_SYMBOLS", "TSLA,SCHD")
+    return tmp_path
+
+
+def armed(alert_id: int, direction: str, price: float) -> dict:
+    """테스트용 평가된 알림"""
+    return {
+        "id": alert_id,
+        "chat_id": "100",
+        "symbol": "TSLA",
+        "direction": direction,
+        "price": price,
+        "repeat": False,
+        "armed": True,
+    }
+
+
+class TestAlertIndex:
+    """AlertIndex 테스트"""
+
+    def test_crossed_range_only(self):
+        """
+        테스트 1: 이전 가격과 새 가격 사이의 목표가만 선택됨
+        """
+        index = AlertIndex(
+            [armed(i, "below", p) for i, p in enumerate([300, 350, 380, 400, 450])]
+            + [armed(10 + i, "above", p) for i, p in enumerate([420, 440, 500])]
+        )
+
+        fired = index.crossed("TSLA", 410.0, 360.0)
+        assert sorted(a["price"] for a in fired) == [380, 400]
+
+        fired = index.crossed("TSLA", 410.0, 440.0)
+        assert sorted(a["price"] for a in fired) == [420, 440]
+
+        assert index.crossed("TSLA", 410.0, 410.0) == []
+        assert index.crossed("SCHD", 100.0, 1.0) == []
+
+    def test_boundary_touch(self):
+        """
+        테스트 2: 목표가에 정확히 닿으면 알림, 그 가격에 머물면 다시 알리지 않음
+        """
+        index = AlertIndex([armed(1, "below", 350.0)])
+
+        assert len(index.crossed("TSLA", 351.0, 350.0)) == 1
+        assert index.crossed("TSLA", 350.0, 350.0) == []
+
+    def test_remove(self):
+        """
+        테스트 3: 삭제한 알림은 같은 가격의 다른 알림에 영향 없이 빠짐
+        """
+        first, second = armed(1, "below", 350.0), armed(2, "below", 350.0)
+        index = AlertIndex([first, second])
+
+        index.remove(first)
+
+        assert index.crossed("TSLA", 400.0, 300.0) == [second]
+        assert len(index) == 1
+
+
+class TestEvaluate:
+    """add / evaluate 테스트"""
+
+    def test_add_requires_watchlist_symbol(self):
+        """
+        테스트 4: 관심 종목이 아니거나 방향/가격이 잘못되면 추가 실패
+        """
+        assert price_alerts.add("AAPL", "below", 100.0)[0] is False
+        assert price_alerts.add("TSLA", "down", 100.0)[0] is False
+        assert price_alerts.add("TSLA", "below", -1.0)[0] is False
+        assert price_alerts.add("TSLA", "below", 350.0)[0] is True
+
+    def test_once_alert_removed_after_firing(self):
+        """
+        테스트 5: 한 번 알림은 도달 후 삭제되고 저장 파일에도 반영됨
+        """
+        price_alerts.add("TSLA", "below", 350.0)
+        assert price_alerts.evaluate({"TSLA": 400.0}, ["100"]) == []
+
+        fired = price_alerts.evaluate({"TSLA": 340.0}, ["100"])
+
+        assert [a["current_price"] for a in fired] == [340.0]
+        assert price_alerts.get_alerts() == []
+        assert price_alerts.load()["alerts"] == []
+
+    def test_repeat_alert_rearms(self):
+        """
+        테스트 6: 반복 알림은 반대쪽으로 돌아갔다가 다시 넘을 때마다 알림
+        """
+        price_alerts.add("TSLA", "above", 400.0, repeat=True)
+
+        assert len(price_alerts.evaluate({"TSLA": 390.0}, ["100"])) == 0
+        assert len(price_alerts.evaluate({"TSLA": 410.0}, ["100"])) == 1
+        assert len(price_alerts.evaluate({"TSLA": 420.0}, ["100"])) == 0
+        assert len(price_alerts.evaluate({"TSLA": 395.0}, ["100"])) == 0
+        assert len(price_alerts.evaluate({"TSLA": 401.0}, ["100"])) == 1
+        assert len(price_alerts.get_alerts()) == 1
+
+    def test_new_alert_fires_if_already_past(self):
+        """
+        테스트 7: 등록 시점에 이미 목표가를 넘어 있으면 첫 평가에서 알림
+        """
+        price_alerts.evaluate({"TSLA": 300.0}, ["100"])
+        price_alerts.add("TSLA", "below", 350.0)
+
+        fired = price_alerts.evaluate({"TSLA": 310.0}, ["100"])
+
+        assert len(fired) == 1
+
+    def test_remove_only_own_chat(self):
+        """
+        테스트 8: 다른 채팅방의 알림은 삭제할 수 없음
+        """
+        price_alerts.add("TSLA", "below", 350.0)
+
+        assert price_alerts.remove(1, "200")[0] is False
+        assert price_alerts.remove(1)[0] is True
+        assert price_alerts.evaluate({"TSLA": 100.0}, ["100"]) == []
+
+    def test_only_receiving_chats_are_evaluated(self):
+        """
+        테스트 9: 채팅방 100의 리포트가 채팅방 200의 알림을 울리거나 지우지 않고,
+        200이 리포트를 받을 때 자기 마지막 가격 기준으로 알림
+        """
+        price_alerts.add("TSLA", "below", 350.0, chat_id="200")
+        price_alerts.evaluate({"TSLA": 400.0}, ["200"])
+
+        assert price_alerts.evaluate({"TSLA": 340.0}, ["100"]) == []
+        assert len(price_alerts.get_alerts("200")) == 1
+
+        fired = price_alerts.evaluate({"TSLA": 345.0}, ["200"])
+        assert [(a["chat_id"], a["current_price"]) for a in fired] == [("200", 345.0)]
+        assert price_alerts.get_alerts("200") == []
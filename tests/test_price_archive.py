@@ -0,0 +1,137 @@
+"""price_archive.py 테스트 코드
+
+memmap 아카이브 쓰기/열기, 제자리 추가, 동기화(최근 일봉 추가, 수정 종가 변경 시 재생성),
+분석 기간 자르기를 검증
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import price_archive, watchlist
+from src.stock.mdd import calculate_drawdown_from_peak
+
+
+@pytest.fixture(autouse=True)
+def archive_dir(tmp_path, monkeypatch):
+    """
+    fixture: 테스트마다 임시 디렉토리의 아카이브 사용
+    """
+    monkeypatch.setattr(watchlist, "DATA_DIR", tmp_path)
+    price_archive.clear_synced()
+    yield tmp_path / "archive"
+    price_archive.clear_synced()
+
+
+def make_prices(end: str, length: int, start_price: float = 100.0) -> pd.Series:
+    """테스트용 일봉 종가 (뉴욕 시간 DatetimeIndex)"""
+    index = pd.bdate_range(end=end, periods=length, tz="America/New_York")
+    return pd.Series(start_price + np.arange(length, dtype=float), index=index)
+
+
+class TestArchiveFile:
+    """write / open_archive / append 테스트"""
+
+    def test_roundtrip_is_memmap(self):
+        """
+        테스트 1: 저장한 값을 memmap으로 열고, 계산 함수가 복사 없이 읽음
+        """
+        prices = make_prices("2025-01-10", 300)
+        days, closes = price_archive._series_arrays(prices)
+        price_archive.write("TSLA", days, closes)
+
+        archive = price_archive.open_archive("tsla")
+
+        assert isinstance(archive.closes, np.memmap)
+        np.testing.assert_array_equal(archive.closes, prices.to_numpy())
+        assert archive.days[-1] == np.datetime64("2025-01-10", "D").astype(np.int64)
+        series = pd.Series(archive.closes, copy=False)
+        assert np.shares_memory(series.to_numpy(), archive.closes)
+        assert calculate_drawdown_from_peak(series)["peak_price"] == closes.max()
+
+    def test_append_in_place(self, archive_dir):
+        """
+        테스트 2: 새 일봉은 파일을 다시 쓰지 않고 빈 자리에 추가,
+        마지막 날과 같은 날은 덮어쓰고 이전 날짜는 무시
+        """
+        prices = make_prices("2025-01-10", 10)
+        price_archive.write("TSLA", *price_archive._series_arrays(prices))
+        path = archive_dir / "TSLA.bin"
+        inode, size = path.stat().st_ino, path.stat().st_size
+
+        # 9일, 10일, 13일, 14일
+        update = make_prices("2025-01-14", 4, start_price=500.0)
+        added = price_archive.append("TSLA", *price_archive._series_arrays(update))
+
+        archive = price_archive.open_archive("TSLA")
+        assert added == 2
+        assert len(archive.closes) == 12
+        assert archive.closes[9] == 501.0  # 10일 값 덮어씀
+        assert archive.closes[8] == 108.0  # 9일 값 유지
+        assert (path.stat().st_ino, path.stat().st_size) == (inode, size)
+
+    def test_append_grows_when_full(self, monkeypatch):
+        """
+        테스트 3: 빈 자리가 모자라면 더 큰 파일로 다시 씀
+        """
+        monkeypatch.setattr(price_archive, "MIN_HEADROOM", 2)
+        price_archive.write(
+            "TSLA", *price_archive._series_arrays(make_prices("2025-01-10", 5))
+        )
+
+        update = make_prices("2025-01-17", 5, start_price=200.0)
+        price_archive.append("TSLA", *price_archive._series_arrays(update))
+
+        archive = price_archive.open_archive("TSLA")
+        assert len(archive.closes) == 10
+        assert archive.closes[-1] == 204.0
+
+
+class TestSync:
+    """sync / slice_period 테스트"""
+
+    def test_sync_fetches_recent_and_rebuilds_on_adjustment(self):
+        """
+        테스트 4: 처음엔 max 전체, 다음부턴 최근 일봉만 받아 추가,
+        같은 기준 시점엔 조회하지 않고, 과거 수정 종가가 바뀌면 전체를 다시 받음
+        """
+        calls = []
+        full = make_prices("2025-01-10", 300)
+
+        def fetch(symbol, period):
+            calls.append(period)
+            return full if period == "max" else recent
+
+        _, rebuilt = price_archive.sync("TSLA", fetch, as_of="close:2025-01-10")
+        assert rebuilt is False
+        recent = pd.concat([full.iloc[-15:], make_prices("2025-01-13", 1, 999.0)])
+        archive, rebuilt = price_archive.sync("TSLA", fetch, as_of="close:2025-01-13")
+        price_archive.sync("TSLA", fetch, as_of="close:2025-01-13")
+
+        assert calls == ["max", "1mo"]
+        assert rebuilt is False
+        assert len(archive.closes) == 301 and archive.closes[-1] == 999.0
+
+        # 배당 등으로 과거 값이 바뀜 → 전체 다시 (호출한 쪽에 다시 만들었음을 알림)
+        recent = make_prices("2025-01-14", 20, start_price=50.0)
+        _, rebuilt = price_archive.sync("TSLA", fetch, as_of="close:2025-01-14")
+        assert calls[-2:] == ["1mo", "max"]
+        assert rebuilt is True
+
+    def test_slice_period(self):
+        """
+        테스트 5: 분석 기간은 마지막 일봉 날짜 기준, 결과는 아카이브의 view
+        """
+        prices = make_prices("2025-01-10", 600)
+        price_archive.write("TSLA", *price_archive._series_arrays(prices))
+        archive = price_archive.open_archive("TSLA")
+
+        one_year = price_archive.slice_period(archive, "1y")
+
+        expected = prices[
+            prices.index > pd.Timestamp("2024-01-10", tz="America/New_York")
+        ]
+        assert len(one_year) == len(expected)
+        assert np.shares_memory(one_year, archive.closes)
+        assert len(price_archive.slice_period(archive, "5d")) == 5
+        assert len(price_archive.slice_period(archive, "max")) == 600
@@ -0,0 +1,76 @@
+"""profiling.py 테스트 코드
+
+구간 측정이 켜져 있을 때만 기록되고, 단계별/종목별로 집계되는지 검증
+"""
+
+import pytest
+
+from src import profiling
+
+
+@pytest.fixture(autouse=True)
+def clean_profiling():
+    """
+    fixture: 테스트마다 기록을 비우고 끝나면 측정을 끔
+    """
+    profiling.reset()
+    yield
+    profiling.disable()
+    profiling.reset()
+
+
+class TestSpan:
+    """span 테스트"""
+
+    def test_disabled_records_nothing(self):
+        """
+        테스트 1: 측정을 끄면 같은 빈 객체를 쓰고 아무것도 기록하지 않음
+        """
+        with profiling.span("fetch", "TSLA"):
+            pass
+
+        assert profiling.span("fetch") is profiling.span("render")
+        assert profiling.summary()["stages"] == []
+
+    def test_enabled_aggregates_by_stage_and_symbol(self):
+        """
+        테스트 2: 단계별 횟수/합계, 종목별 누적 시간 집계
+        """
+        profiling.enable()
+        for symbol in ("TSLA", "SCHD", "TSLA"):
+            with profiling.span("fetch", symbol):
+                pass
+        with profiling.span("render"):
+            pass
+
+        data = profiling.summary()
+        stages = {item["stage"]: item for item in data["stages"]}
+
+        assert stages["fetch"]["count"] == 3
+        assert stages["render"]["count"] == 1
+        assert {item["symbol"] for item in data["slowest"]} == {"TSLA", "SCHD"}
+        assert "fetch" in profiling.format_summary()
+
+    def test_exception_still_recorded(self):
+        """
+        테스트 3: 구간 안에서 예외가 나도 시간은 기록되고 예외는 그대로 전달
+        """
+        profiling.enable()
+        with pytest.raises(ValueError), profiling.span("send"):
+            raise ValueError("boom")
+
+        assert profiling.summary()["stages"][0]["stage"] == "send"
+
+    def test_stage_totals_do_not_grow(self):
+        """
+        테스트 4: 구간을 많이 기록해도 단계마다 누적 값 하나만 유지 (봇/데몬 장시간 실행)
+        """
+        profiling.enable()
+        for _ in range(1000):
+            with profiling.span("render"):
+                pass
+
+        stats = profiling._stages["render"]
+        assert not hasattr(stats, "__dict__")
+        assert stats.count == 1000
+        assert profiling.summary()["stages"][0]["max"] == stats.max
@@ -0,0 +1,27 @@
+"""ratelimit.py 테스트 코드
+
+토큰 버킷의 순간 허용량과 채워지는 속도를 검증
+"""
+
+import pytest
+
+from src.ratelimit import TokenBucket
+
+
+class TestTokenBucket:
+    """TokenBucket 테스트"""
+
+    def test_burst_then_wait(self):
+        """
+        테스트 1: 용량만큼 바로 쓰고, 그 다음은 채워질 때까지 대기
+
+        초당 1개, 최대 2개 → 2번은 즉시, 3번째는 1초 대기
+        """
+        bucket = TokenBucket(rate=1.0, capacity=2.0, now=0.0)
+
+        bucket.consume(0.0)
+        bucket.consume(0.0)
+
+        assert bucket.delay(0.0) == pytest.approx(1.0)
+        assert bucket.delay(0.5) == pytest.approx(0.5)
+        assert bucket.delay(1.0) == 0.0
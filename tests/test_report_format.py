@@ -0,0 +1,261 @@
+"""report_format.py 테스트 코드
+
+리포트 메시지가 텔레그램 길이 제한 안에서 종목 단위로 나뉘는지 검증
+"""
+
+from src.notifiers.report_format import (
+    MESSAGE_LIMIT,
+    paginate,
+    render_change_alerts,
+    render_daily_report,
+    render_history,
+    render_price_alerts,
+    render_screen_results,
+)
+
+FEAR_GREED = {"score": 25.5, "rating": "extreme fear", "previous_close": 24.0}
+
+
+def make_results(count: int) -> list[dict]:
+    """테스트용 종목 결과 (200일선 포함)"""
+    return [
+        {
+            "symbol": f"SYM{i}",
+            "peak_price": 300.0,
+            "current_price": 250.5,
+            "drawdown_pct": -16.5,
+            "buy_signal": "1차 매수 (정찰병)",
+            "ma_200": {
+                "ma_200": 220.3,
+                "diff_pct": 13.6,
+                "trend": "상승 추세 유지",
+                "position": "above",
+            },
+        }
+        for i in range(count)
+    ]
+
+
+class TestPaginate:
+    """paginate 함수 테스트"""
+
+    def test_single_page(self):
+        """
+        테스트 1: 짧으면 한 페이지, 페이지 번호 없음
+        """
+        pages = paginate("H\n", ["a", "b"], "C\n")
+
+        assert pages == ["H\na\nb"]
+
+    def test_splits_on_block_boundary(self):
+        """
+        테스트 2: 블록 중간에서 자르지 않고 다음 페이지로 넘김
+        """
+        blocks = ["x" * 50, "y" * 50, "z" * 50]
+        pages = paginate("H\n", blocks, "C\n", limit=100)
+
+        assert len(pages) == 3
+        assert pages[0].startswith("H\n" + "x" * 50)
+        assert pages[1].startswith("C\n" + "y" * 50)
+        assert pages[2].endswith("(3/3)")
+
+
+class TestRenderDailyReport:
+    """render_daily_report 함수 테스트"""
+
+    def test_small_report_is_one_page(self):
+        """
+        테스트 1: 종목이 적으면 한 페이지
+        """
+        pages = render_daily_report(FEAR_GREED, make_results(3), "1y", "full")
+
+        assert len(pages) == 1
+        assert "<b>SYM0</b>" in pages[0]
+        assert "📏 200일선" in pages[0]
+
+    def test_large_report_is_split_under_limit(self):
+        """
+        테스트 2: 종목 100개도 4096자 이하 페이지들로 나뉘고, 모든 종목이 포함됨
+        """
+        pages = render_daily_report(FEAR_GREED, make_results(100), "1y", "full")
+
+        assert len(pages) > 1
+        assert all(
+            len(page.encode("utf-16-le")) // 2 <= MESSAGE_LIMIT for page in pages
+        )
+        joined = "".join(pages)
+        assert all(f"<b>SYM{i}</b>" in joined for i in range(100))
+        # 태그가 페이지마다 짝이 맞음
+        assert all(page.count("<b>") == page.count("</b>") for page in pages)
+
+    def test_compact_layout(self):
+        """
+        테스트 3: compact는 종목당 한 줄, 페이지마다 <pre> 표가 닫힘
+        """
+        pages = render_daily_report(FEAR_GREED, make_results(300), "1y", "compact")
+
+        assert all(page.count("<pre>") == page.count("</pre>") == 1 for page in pages)
+        assert all("SYMBOL" in page for page in pages)
+        assert sum(page.count("SYM") - page.count("SYMBOL") for page in pages) == 300
+
+    def test_compact_is_denser(self):
+        """
+        테스트 4: compact 레이아웃이 full보다 페이지 수가 적음
+        """
+        results = make_results(200)
+        full = render_daily_report(FEAR_GREED, results, "1y", "full")
+        compact = render_daily_report(FEAR_GREED, results, "1y", "compact")
+
+        assert len(compact) < len(full)
+
+    def test_timed_out_footer(self):
+        """
+        테스트 5: 시간 초과 종목은 마지막 페이지 끝에 표시되고, 이전 값은 ⏱️로 구분
+        """
+        results = make_results(100)
+        results[0]["stale"] = True
+
+        pages = render_daily_report(
+            FEAR_GREED, results, "1y", "full", timed_out=["SYM0", "LATE"]
+        )
+
+        assert "시간 초과/오류: SYM0, LATE" in pages[-1]
+        assert "시간 초과" not in "".join(pages[:-1])
+        assert "<b>SYM0</b>  -16.5%  🔔  ⏱️" in pages[0]
+        assert "<b>SYM1</b>  -16.5%  🔔\n" in pages[0]
+
+
+class TestRenderChangeAlerts:
+    """render_change_alerts 함수 테스트"""
+
+    def test_change_lines(self):
+        """
+        테스트 1: 변화가 없으면 빈 리스트, 있으면 종목당 한 줄 알림
+        """
+        assert render_change_alerts([]) == []
+
+        pages = render_change_alerts(
+            [
+                {
+                    "symbol": "TSLA",
+                    "kind": "tier",
+                    "old": 1,
+                    "new": 2,
+                    "drawdown_pct": -21.3,
+                },
+                {
+                    "symbol": "SCHD",
+                    "kind": "ma",
+                    "old": "below",
+                    "new": "above",
+                    "drawdown_pct": -3.0,
+                    "ma_diff_pct": 0.8,
+                },
+            ]
+        )
+
+        assert len(pages) == 1
+        assert (
+            "TSLA" in pages[0]
+            and "1차 매수 (정찰병) → 2차 매수 (비중 확대)" in pages[0]
+        )
+        assert "200일선 아래 → 위 (+0.8%)" in pages[0]
+
+
+class TestRenderPriceAlerts:
+    """render_price_alerts 함수 테스트"""
+
+    def test_price_alert_lines(self):
+        """
+        테스트 1: 도달한 알림이 없으면 빈 리스트, 있으면 현재가/목표가 한 줄
+        """
+        assert render_price_alerts([]) == []
+
+        pages = render_price_alerts(
+            [
+                {
+                    "symbol": "TSLA",
+                    "direction": "below",
+                    "price": 350.0,
+                    "repeat": True,
+                    "current_price": 348.5,
+                }
+            ]
+        )
+
+        assert len(pages) == 1
+        assert "TSLA" in pages[0] and "$348.50" in pages[0]
+        assert "목표 $350.00 이하" in pages[0]
+
+
+class TestRenderScreenResults:
+    """render_screen_results 함수 테스트"""
+
+    def test_threshold_and_top(self):
+        """
+        테스트 1: 기준 이하 종목만 상위 top개까지 표로 표시, 데이터 없는 종목 수 안내
+        """
+        results = make_results(5)
+        for i, item in enumerate(results):
+            item["drawdown_pct"] = -40.0 + i * 5  # -40, -35, -30, -25, -20
+        screen = {
+            "period": "1y",
+            "universe": 8,
+            "results": results,
+            "missing": ["XXX"],
+        }
+
+        pages = render_screen_results(screen, threshold=-25.0, top=3)
+
+        assert len(pages) == 1
+        assert "유니버스 8개 중 4개 (상위 3개 표시)" in pages[0]
+        assert "SYM2" in pages[0] and "SYM3" not in pages[0]
+        assert "데이터 없음 1개" in pages[0]
+
+    def test_no_matches(self):
+        """
+        테스트 2: 조건에 맞는 종목이 없으면 안내 문구
+        """
+        screen = {"period": "1y", "universe": 3, "results": [], "missing": []}
+
+        pages = render_screen_results(screen, threshold=-20.0)
+
+        assert pages == [pages[0]]
+        assert "조건에 맞는 종목이 없습니다." in pages[0]
+
+
+class TestRenderHistory:
+    """render_history 함수 테스트"""
+
+    def test_rows_and_empty(self):
+        """
+        테스트 1: 날짜별 한 줄 표 (200일선/F&G 없으면 -), 기록이 없으면 안내 문구
+        """
+        rows = [
+            {
+                "date": "2025-01-09",
+                "peak_price": 500.0,
+                "current_price": 450.0,
+                "drawdown_pct": -10.0,
+                "ma_diff_pct": None,
+                "buy_signal": "",
+                "fear_greed": None,
+            },
+            {
+                "date": "2025-01-10",
+                "peak_price": 500.0,
+                "current_price": 400.0,
+                "drawdown_pct": -20.0,
+                "ma_diff_pct": 5.2,
+                "buy_signal": "1차 매수",
+                "fear_greed": 35.0,
+            },
+        ]
+
+        pages = render_history("TSLA", rows, "1y", 30)
+
+        assert len(pages) == 1
+        assert "TSLA 기록 (최근 30일" in pages[0]
+        assert "2025-01-09" in pages[0] and "+5.2%" in pages[0]
+        assert pages[0].count("🔔") == 1
+        assert "저장된 기록이 없습니다." in render_history("TSLA", [], "1y", 30)[0]
@@ -0,0 +1,155 @@
+"""scheduler.py 테스트 코드
+
+트리거의 다음 실행 시각 계산과 스케줄러의 실행/misfire 처리를 검증
+"""
+
+import asyncio
+import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from src.market_calendar import MARKET_TZ
+from src.scheduler import (
+    DailyTrigger,
+    IntervalTrigger,
+    Job,
+    Scheduler,
+    parse_session_spec,
+)
+
+KST = ZoneInfo("Asia/Seoul")
+
+
+class OnceTrigger:
+    """정해진 시각에 한 번만 실행되는 테스트용 트리거"""
+
+    def __init__(self, at: datetime.datetime):
+        self.at = at
+
+    def next_after(self, after):
+        return self.at if self.at > after else None
+
+
+def now_utc() -> datetime.datetime:
+    return datetime.datetime.now(tz=datetime.UTC)
+
+
+class TestTriggers:
+    """트리거 테스트"""
+
+    def test_daily_trigger_with_condition(self):
+        """
+        테스트 1: 조건을 만족하지 않는 날은 건너뜀 (주말 제외 조건)
+        """
+        trigger = DailyTrigger(
+            datetime.time(9, 0, tzinfo=KST), when=lambda at: at.weekday() < 5
+        )
+        # 2025-01-10(금) 10:00 이후 → 다음 평일 2025-01-13(월) 09:00
+        after = datetime.datetime(2025, 1, 10, 10, 0, tzinfo=KST)
+        assert trigger.next_after(after) == datetime.datetime(
+            2025, 1, 13, 9, 0, tzinfo=KST
+        )
+
+    def test_session_trigger(self):
+        """
+        테스트 2: 정규장 기준 트리거는 휴장일을 건너뛰고 조기 폐장 시각을 따름
+        """
+        close_plus_15 = parse_session_spec("close+15")
+        open_minus_30 = parse_session_spec("open-30")
+
+        # 추수감사절(2025-11-27) 휴장 → 다음 날 조기 폐장 13:00 + 15분
+        after = datetime.datetime(2025, 11, 26, 17, 0, tzinfo=MARKET_TZ)
+        assert close_plus_15.next_after(after) == datetime.datetime(
+            2025, 11, 28, 13, 15, tzinfo=MARKET_TZ
+        )
+        assert open_minus_30.next_after(after) == datetime.datetime(
+            2025, 11, 28, 9, 0, tzinfo=MARKET_TZ
+        )
+
+    def test_invalid_session_spec(self):
+        """
+        테스트 3: 잘못된 형식은 ValueError
+        """
+        with pytest.raises(ValueError):
+            parse_session_spec("lunch+10")
+
+    def test_interval_trigger(self):
+        """
+        테스트 4: 일정 간격 트리거는 기준 시각에 간격을 더하고, 0 이하 간격은 ValueError
+        """
+        trigger = IntervalTrigger(datetime.timedelta(seconds=60))
+        after = datetime.datetime(2025, 1, 10, 9, 0, tzinfo=KST)
+        assert trigger.next_after(after) == after + datetime.timedelta(seconds=60)
+
+        with pytest.raises(ValueError):
+            IntervalTrigger(datetime.timedelta())
+
+
+class TestScheduler:
+    """Scheduler 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_runs_job_on_time(self):
+        """
+        테스트 1: 예정 시각에 실행되고, 콜백은 예정 시각(scheduled_at)을 받음
+        """
+        scheduler = Scheduler()
+        due = now_utc() + datetime.timedelta(milliseconds=50)
+        runs = []
+
+        async def callback(job):
+            runs.append(job.scheduled_at)
+
+        scheduler.add(Job("once", callback, OnceTrigger(due)))
+        scheduler.start()
+        await asyncio.sleep(0.2)
+        await scheduler.stop()
+
+        assert runs == [due]
+        assert scheduler.jobs() == []  # 다음 실행 시각이 없으면 삭제
+
+    @pytest.mark.asyncio
+    async def test_misfire_is_skipped(self):
+        """
+        테스트 2: 허용 지연을 넘긴 회차는 실행하지 않고 건너뜀
+        """
+        scheduler = Scheduler(misfire_grace=60)
+        runs = []
+
+        async def callback(job):
+            runs.append(job)
+
+        job = scheduler.add(
+            Job("late", callback, OnceTrigger(now_utc() + datetime.timedelta(hours=1)))
+        )
+        job.next_run = now_utc() - datetime.timedelta(minutes=10)  # 절전 복귀 상황
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+
+        assert runs == []
+        assert job.missed == 1
+
+    @pytest.mark.asyncio
+    async def test_added_job_wakes_scheduler(self):
+        """
+        테스트 3: 잠든 스케줄러에 더 이른 작업을 추가하면 바로 깨어나 실행
+        """
+        scheduler = Scheduler()
+        runs = []
+
+        async def callback(job):
+            runs.append(job.name)
+
+        far = now_utc() + datetime.timedelta(hours=1)
+        scheduler.add(Job("far", callback, OnceTrigger(far)))
+        scheduler.start()
+        await asyncio.sleep(0.02)
+
+        soon = now_utc() + datetime.timedelta(milliseconds=30)
+        scheduler.add(Job("soon", callback, OnceTrigger(soon)))
+        await asyncio.sleep(0.2)
+        await scheduler.stop()
+
+        assert runs == ["soon"]
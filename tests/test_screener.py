@@ -0,0 +1,159 @@
+"""screener.py 테스트 코드
+
+유니버스 파일 읽기, 묶음 단위 조회/진행 콜백, 벡터 계산 결과, 거래일 캐시를 검증
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import screener
+from src.market_calendar import MARKET_TZ
+from src.stock.ma import calculate_ma
+from src.stock.mdd import calculate_drawdown_from_peak
+
+
+def ny(year, month, day, hour, minute=0):
+    """뉴욕 시간 datetime 생성"""
+    return datetime.datetime(year, month, day, hour, minute, tzinfo=MARKET_TZ)
+
+
+def make_closes(symbols: list[str], length: int = 260) -> pd.DataFrame:
+    """테스트용 종가 (열 = 종목)"""
+    rng = np.random.default_rng(3)
+    index = pd.bdate_range(end="2025-01-10", periods=length)
+    data = {
+        symbol: 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.03, length)))
+        for symbol in symbols
+    }
+    return pd.DataFrame(data, index=index)
+
+
+@pytest.fixture
+def fake_fetch(monkeypatch):
+    """
+    fixture: 요청받은 묶음을 기록하는 가짜 일괄 조회 (MISSING 종목은 데이터 없음)
+    """
+    calls = []
+
+    def fetch(symbols, period="1y", timeout=10):
+        calls.append(list(symbols))
+        return make_closes([s for s in symbols if s != "MISSING"])
+
+    monkeypatch.setattr(screener, "fetch_closes", fetch)
+    screener.clear_cache()
+    yield calls
+    screener.clear_cache()
+
+
+class TestLoadUniverse:
+    """load_universe 테스트"""
+
+    def test_parses_lines_commas_and_comments(self, tmp_path):
+        """
+        테스트 1: 줄/쉼표/공백 구분, # 주석 무시, 대문자 변환, 중복 제거(순서 유지)
+        """
+        path = tmp_path / "universe.txt"
+        path.write_text("# S&P 500\naapl\nMSFT, nvda  # 반도체\n\nAAPL\n", "utf-8")
+
+        assert screener.load_universe(path) == ["AAPL", "MSFT", "NVDA"]
+
+
+class TestAnalyzeCloses:
+    """analyze_closes 테스트"""
+
+    def test_matches_single_symbol_functions(self):
+        """
+        테스트 2: 열 단위 계산이 종목별 함수(calculate_drawdown_from_peak, calculate_ma)와 같음
+        상장한 지 200일이 안 된 종목은 200일선 없음
+        """
+        closes = make_closes(["AAA", "NEW"])
+        closes.loc[closes.index[:100], "NEW"] = np.nan
+
+        items = {item["symbol"]: item for item in screener.analyze_closes(closes)}
+
+        for symbol in ("AAA", "NEW"):
+            expected = calculate_drawdown_from_peak(closes[symbol].dropna())
+            assert items[symbol]["drawdown_pct"] == pytest.approx(
+                expected["drawdown_pct"]
+            )
+            assert items[symbol]["peak_price"] == pytest.approx(expected["peak_price"])
+        assert items["AAA"]["ma_200"]["ma_200"] == pytest.approx(
+            calculate_ma(closes["AAA"], 200)
+        )
+        assert "ma_200" not in items["NEW"]
+
+
+class TestScreen:
+    """screen 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_chunks_progress_and_cache(self, fake_fetch):
+        """
+        테스트 3: 묶음 단위로 조회하고 묶음마다 진행 콜백 호출,
+        같은 거래일에는 다시 조회하지 않음
+        """
+        symbols = ["A", "B", "C", "MISSING", "E"]
+        progress = []
+
+        async def on_progress(done, total, results):
+            progress.append((done, total, len(results)))
+
+        now = ny(2025, 1, 10, 17)
+        screen = await screener.screen(
+            symbols, "1y", on_progress, chunk_size=2, rate=0, now=now
+        )
+
+        assert sorted(fake_fetch) == [["A", "B"], ["C", "MISSING"], ["E"]]
+        assert [(done, total) for done, total, _ in progress] == [
+            (1, 3),
+            (2, 3),
+            (3, 3),
+        ]
+        assert progress[-1][2] == 4
+        assert screen["missing"] == ["MISSING"]
+        assert screen["universe"] == 5
+        pct = [item["drawdown_pct"] for item in screen["results"]]
+        assert pct == sorted(pct)
+
+        # 같은 거래일(주말 포함)에는 캐시, 다음 거래일 마감 후에는 다시 조회
+        again = await screener.screen(symbols, "1y", now=ny(2025, 1, 11, 12))
+        assert again["cached"] is True
+        assert len(fake_fetch) == 3
+        await screener.screen(
+            symbols, "1y", chunk_size=2, rate=0, now=ny(2025, 1, 13, 17)
+        )
+        assert len(fake_fetch) == 6
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_is_not_cached(self, fake_fetch, monkeypatch):
+        """
+        테스트 4: 묶음 하나가 통째로 실패하면 캐시하지 않음 (다음 요청에서 다시 조회)
+        """
+        monkeypatch.setattr(
+            screener, "fetch_closes", lambda symbols, period, timeout: pd.DataFrame()
+        )
+        now = ny(2025, 1, 10, 17)
+
+        first = await screener.screen(["A", "B"], "1y", rate=0, now=now)
+        second = await screener.screen(["A", "B"], "1y", rate=0, now=now)
+
+        assert first["missing"] == ["A", "B"]
+        assert second["cached"] is False
+
+    def test_rank_and_trading_day_key(self):
+        """
+        테스트 5: 기준 이하만 하락률 순으로, 캐시 기준은 장중엔 그날, 마감 후엔 마감일
+        """
+        results = [
+            {"symbol": "A", "drawdown_pct": -5.0},
+            {"symbol": "B", "drawdown_pct": -35.0},
+            {"symbol": "C", "drawdown_pct": -21.0},
+        ]
+        assert [r["symbol"] for r in screener.rank(results, -20.0)] == ["B", "C"]
+
+        assert screener.trading_day_key(ny(2025, 1, 10, 11)) == "session:2025-01-10"
+        assert screener.trading_day_key(ny(2025, 1, 10, 17)) == "close:2025-01-10"
+        assert screener.trading_day_key(ny(2025, 1, 12, 9)) == "close:2025-01-10"
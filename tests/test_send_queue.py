@@ -0,0 +1,148 @@
+"""send_queue.py 테스트 코드
+
+전송 대기열의 우선순위, 채팅방별 순서, RetryAfter 재시도를 검증
+(실제 텔레그램 API 대신 전송 순서를 기록하는 가짜 함수 사용)
+"""
+
+import asyncio
+import datetime
+import time
+
+import pytest
+from telegram.error import RetryAfter
+
+from src.notifiers.send_queue import (
+    PRIORITY_BROADCAST,
+    PRIORITY_INTERACTIVE,
+    SendQueue,
+)
+
+
+def make_sender(sent: list, name: str):
+    """호출되면 sent 리스트에 이름을 기록하는 가짜 전송 함수"""
+
+    async def _send():
+        sent.append(name)
+        return name
+
+    return _send
+
+
+class TestSendQueue:
+    """SendQueue 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_interactive_before_broadcast(self):
+        """
+        테스트 1: 나중에 들어온 명령 응답이 방송보다 먼저 전송됨
+        """
+        queue = SendQueue(global_rate=100, chat_rate=100)
+        sent = []
+
+        broadcast = [
+            queue.enqueue(f"chat{i}", make_sender(sent, f"b{i}"), PRIORITY_BROADCAST)
+            for i in range(3)
+        ]
+        reply = queue.enqueue("user", make_sender(sent, "reply"), PRIORITY_INTERACTIVE)
+
+        for future in [*broadcast, reply]:
+            await future
+        await queue.stop()
+
+        assert sent[0] == "reply"
+        assert sorted(sent[1:]) == ["b0", "b1", "b2"]
+
+    @pytest.mark.asyncio
+    async def test_same_chat_keeps_order(self):
+        """
+        테스트 2: 같은 채팅방 메시지는 넣은 순서대로 전송됨 (페이지 순서)
+        """
+        queue = SendQueue(global_rate=100, chat_rate=100)
+        sent = []
+
+        futures = [queue.enqueue("chat", make_sender(sent, f"p{i}")) for i in range(5)]
+        for future in futures:
+            await future
+        await queue.stop()
+
+        assert sent == ["p0", "p1", "p2", "p3", "p4"]
+
+    @pytest.mark.asyncio
+    async def test_retry_after_is_retried(self):
+        """
+        테스트 3: RetryAfter가 나면 기다렸다가 자동 재시도
+        """
+        queue = SendQueue(global_rate=100, chat_rate=100)
+        calls = []
+
+        async def _flaky_send():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RetryAfter(datetime.timedelta(milliseconds=50))
+            return "ok"
+
+        result = await queue.submit("chat", _flaky_send)
+        await queue.stop()
+
+        assert result == "ok"
+        assert len(calls) == 2
+        assert queue.stats()["retried"] == 1
+
+    @pytest.mark.asyncio
+    async def test_error_is_propagated(self):
+        """
+        테스트 4: 재시도 대상이 아닌 에러는 호출자에게 그대로 전달
+        """
+        queue = SendQueue(global_rate=100, chat_rate=100)
+
+        async def _failing_send():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await queue.submit("chat", _failing_send)
+        await queue.stop()
+
+        assert queue.stats()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stats(self):
+        """
+        테스트 5: 전송 후 대기열은 비고 지연 통계가 기록됨
+        """
+        queue = SendQueue(global_rate=100, chat_rate=100)
+        sent = []
+
+        await queue.submit("chat", make_sender(sent, "m"))
+        stats = queue.stats()
+        await queue.stop()
+
+        assert stats["depth"] == 0
+        assert stats["sent"] == 1
+        assert stats["latency_max"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_all_chats(self):
+        """
+        테스트 6: RetryAfter가 나면 다른 채팅방 전송도 대기 시간 동안 멈춤
+        """
+        queue = SendQueue(global_rate=100, chat_rate=100)
+        sent_at = {}
+        calls = []
+
+        async def _flooded_send():
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                raise RetryAfter(datetime.timedelta(milliseconds=200))
+            sent_at["a"] = time.monotonic()
+
+        async def _other_send():
+            sent_at["b"] = time.monotonic()
+
+        first = queue.enqueue("a", _flooded_send, PRIORITY_BROADCAST)
+        await asyncio.sleep(0.02)
+        await queue.submit("b", _other_send, PRIORITY_BROADCAST)
+        await first
+        await queue.stop()
+
+        assert sent_at["b"] - calls[0] >= 0.15
+        assert sent_at["a"] - calls[0] >= 0.15
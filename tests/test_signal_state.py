@@ -0,0 +1,141 @@
+"""signal_state.py 테스트 코드
+
+매수 단계/200일선 위치 상태 저장과 변화 감지(hysteresis 포함),
+채팅방별 상태 분리를 검증
+"""
+
+import pytest
+
+from src import signal_state, watchlist
+from src.config import Config
+
+
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path, monkeypatch):
+    """
+    fixture: 테스트마다 임시 디렉토리의 signal_state.json, watchlist.json 사용
+    (기본 채팅방 100, 허용 채팅방 200, 기본 종목 TSLA)
+    """
+    monkeypatch.setattr(watchlist, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(watchlist, "WATCHLIST_FILE", tmp_path / "watchlist.json")
+    monkeypatch.setattr(Config, "TELEGRAM_CHAT_ID", "100")
+    monkeypatch.setattr(Config, "ALLOWED_CHAT_IDS", "200")
+    monkeypatch.setattr(Config, "DEFAULT_SYMBOLS", "TSLA")
+    monkeypatch.setattr(Config, "DEFAULT_MA_SYMBOLS", "")
+    return tmp_path
+
+
+def result(symbol: str, drawdown_pct: float, ma_diff: float | None = None) -> dict:
+    """테스트용 종목 분석 결과"""
+    item = {"symbol": symbol, "drawdown_pct": drawdown_pct, "current_price": 100.0}
+    if ma_diff is not None:
+        item["ma_200"] = {"ma_200": 100.0, "diff_pct": ma_diff}
+    return item
+
+
+class TestDetectChanges:
+    """detect_changes 함수 테스트"""
+
+    def test_first_run_records_baseline(self):
+        """
+        테스트 1: 처음 보는 종목은 상태만 기록하고 알림 없음
+        """
+        state = {}
+        changes = signal_state.detect_changes("1y", [result("TSLA", -15.0)], state)
+
+        assert changes == []
+        assert state["1y"]["TSLA"]["tier"] == 1
+
+    def test_tier_transition(self):
+        """
+        테스트 2: 매수 단계가 바뀌면 변화 1건 (1단계 → 2단계)
+        """
+        state = {}
+        signal_state.detect_changes("1y", [result("TSLA", -15.0)], state)
+        changes = signal_state.detect_changes("1y", [result("TSLA", -21.0)], state)
+
+        assert len(changes) == 1
+        assert changes[0]["kind"] == "tier"
+        assert (changes[0]["old"], changes[0]["new"]) == (1, 2)
+
+    def test_no_flapping_with_hysteresis(self):
+        """
+        테스트 3: 기준선(-10%) 근처에서 오르내려도 여유 폭 안이면 알림 없음
+        """
+        state = {}
+        signal_state.detect_changes("1y", [result("TSLA", -10.2)], state)
+
+        flips = []
+        for pct in [-9.7, -10.1, -9.4, -10.3]:
+            flips += signal_state.detect_changes(
+                "1y", [result("TSLA", pct)], state, tier_hysteresis=1.0
+            )
+
+        assert flips == []
+
+    def test_ma_position_flip(self):
+        """
+        테스트 4: 200일선 아래 → 위 변화는 여유 폭을 넘었을 때만 감지
+        """
+        state = {}
+        signal_state.detect_changes("1y", [result("TSLA", -5.0, -2.0)], state)
+
+        small = signal_state.detect_changes(
+            "1y", [result("TSLA", -5.0, 0.3)], state, ma_hysteresis=0.5
+        )
+        big = signal_state.detect_changes(
+            "1y", [result("TSLA", -5.0, 1.0)], state, ma_hysteresis=0.5
+        )
+
+        assert small == []
+        assert [(c["kind"], c["old"], c["new"]) for c in big] == [
+            ("ma", "below", "above")
+        ]
+
+
+class TestPersistence:
+    """상태 파일 저장/로드 테스트"""
+
+    def test_update_persists_state(self, state_dir):
+        """
+        테스트 1: update()는 상태를 파일에 저장하고, 다음 실행에서 이어서 비교
+        """
+        assert signal_state.update("1y", [result("TSLA", -15.0)], ["100"]) == {
+            "100": []
+        }
+        assert (state_dir / "signal_state.json").exists()
+
+        changes = signal_state.update("1y", [result("TSLA", -31.0)], ["100"])["100"]
+        assert [(c["old"], c["new"]) for c in changes] == [(1, 3)]
+
+    def test_select_chat_changes(self):
+        """
+        테스트 2: 채팅방 종목만, 200일선 변화는 MA를 켠 종목만 선택
+        """
+        changes = [
+            {"symbol": "TSLA", "kind": "tier"},
+            {"symbol": "TSLA", "kind": "ma"},
+            {"symbol": "SCHD", "kind": "ma"},
+            {"symbol": "AAPL", "kind": "tier"},
+        ]
+        selected = signal_state.select_chat_changes(changes, ["TSLA", "SCHD"], ["TSLA"])
+
+        assert [(c["symbol"], c["kind"]) for c in selected] == [
+            ("TSLA", "tier"),
+            ("TSLA", "ma"),
+        ]
+
+    def test_state_is_kept_per_chat(self):
+        """
+        테스트 3: 한 채팅방의 리포트가 상태를 갱신해도, 나중에 받는 다른 채팅방의
+        변화 알림은 그대로 (알림 시간이 다른 채팅방)
+        """
+        signal_state.update("1y", [result("TSLA", -15.0)], ["100", "200"])
+
+        # 09:00 채팅방 100이 먼저 2단계 변화를 받음
+        first = signal_state.update("1y", [result("TSLA", -21.0)], ["100"])
+        assert [(c["old"], c["new"]) for c in first["100"]] == [(1, 2)]
+
+        # 21:30 채팅방 200도 같은 변화를 받음
+        later = signal_state.update("1y", [result("TSLA", -21.5)], ["200"])
+        assert [(c["old"], c["new"]) for c in later["200"]] == [(1, 2)]
@@ -0,0 +1,177 @@
+"""snapshot.py 테스트 코드
+
+캐시 저장/복원 왕복, 오래된/형식이 다른 파일 무시, 기준 시점이 지난 리포트 제외,
+복원한 종목 결과 재사용을 검증
+"""
+
+import datetime
+import json
+
+import pytest
+
+from src import pipeline, snapshot, watchlist
+from src.cache import ReportCache
+from src.config import Config
+
+AS_OF = "close:2025-01-10"
+
+
+@pytest.fixture(autouse=True)
+def snapshot_dir(tmp_path, monkeypatch):
+    """
+    fixture: 테스트마다 임시 디렉토리의 snapshot 사용, 수집 결과 초기화
+    """
+    monkeypatch.setattr(watchlist, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(Config, "SNAPSHOT_ENABLED", True)
+    monkeypatch.setattr(Config, "SNAPSHOT_MAX_AGE", 3600.0)
+    pipeline.clear_fallback()
+    yield tmp_path
+    pipeline.clear_fallback()
+
+
+@pytest.fixture
+def fake_market(monkeypatch):
+    """
+    fixture: 호출된 종목을 기록하는 가짜 수집 함수
+    """
+    calls = []
+
+    async def fake_analyze(symbol, period, ma_enabled=False, on_fetched=None):
+        calls.append(symbol)
+        result = {"symbol": symbol, "drawdown_pct": -1.0, "buy_signal": ""}
+        if ma_enabled:
+            result["ma_200"] = {"ma_200": 100.0, "diff_pct": 5.0}
+        return result
+
+    def fake_fear_greed():
+        calls.append("fear_greed")
+        return {"score": 50.0, "rating": "neutral"}
+
+    monkeypatch.setattr(pipeline, "analyze_symbol", fake_analyze)
+    monkeypatch.setattr(pipeline, "get_fear_greed_index", fake_fear_greed)
+    return calls
+
+
+def now_after(seconds: float) -> datetime.datetime:
+    """지금부터 seconds초 뒤 (저장 후 경과 시간 흉내)"""
+    return datetime.datetime.now(datetime.UTC) + datetime.timedelta(seconds=seconds)
+
+
+class TestSaveRestore:
+    """save / restore 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_roundtrip(self, fake_market, snapshot_dir):
+        """
+        테스트 1: 저장한 종목 결과, Fear & Greed, 리포트 메시지를 재시작 후 복원
+        """
+        await pipeline.collect_report_data("1y", ["TSLA", "SCHD"], [], as_of=AS_OF)
+        cache = ReportCache()
+        key = ReportCache.make_key("1y", "v1", AS_OF)
+        cache.put(key, ["page 1", "page 2"])
+
+        assert snapshot.save(cache)
+        assert (snapshot_dir / "snapshot.json").exists()
+
+        # 재시작 흉내
+        pipeline.clear_fallback()
+        restored_cache = ReportCache()
+        restored = snapshot.restore(restored_cache, as_of=AS_OF)
+
+        assert restored == {"results": 2, "reports": 1}
+        assert restored_cache.get(key) == ["page 1", "page 2"]
+
+    def test_skips_stale_or_other_version(self, snapshot_dir):
+        """
+        테스트 2: 저장한 지 SNAPSHOT_MAX_AGE가 지났거나 형식 버전이 다르면 복원하지 않음
+        """
+        cache = ReportCache()
+        cache.put(ReportCache.make_key("1y", "v1", AS_OF), ["page"])
+        snapshot.save(cache)
+
+        old = snapshot.restore(ReportCache(), now=now_after(7200), as_of=AS_OF)
+        assert old == {"results": 0, "reports": 0}
+
+        path = snapshot_dir / "snapshot.json"
+        state = json.loads(path.read_text(encoding="utf-8"))
+        path.write_text(json.dumps({**state, "version": 0}), encoding="utf-8")
+        other = snapshot.restore(ReportCache(), as_of=AS_OF)
+        assert other == {"results": 0, "reports": 0}
+
+    def test_report_with_other_as_of_is_dropped(self):
+        """
+        테스트 3: 리포트 메시지는 데이터 기준 시점이 지금과 같을 때만 복원
+        """
+        cache = ReportCache()
+        key = ReportCache.make_key("1y", "v1", AS_OF)
+        cache.put(key, ["page"])
+        snapshot.save(cache)
+
+        restored_cache = ReportCache()
+        restored = snapshot.restore(restored_cache, as_of="close:2025-01-13")
+
+        assert restored["reports"] == 0
+        assert restored_cache.get(key) is None
+
+
+class TestReuse:
+    """복원한 결과 재사용 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_same_as_of_is_not_fetched_again(self, fake_market):
+        """
+        테스트 4: 복원 후 같은 기준 시점이면 조회하지 않고 복원한 값 사용,
+        기준 시점이 바뀌면 다시 조회
+        """
+        await pipeline.collect_report_data("1y", ["TSLA"], [], as_of=AS_OF)
+        snapshot.save()
+        pipeline.clear_fallback()
+        snapshot.restore()
+        fake_market.clear()
+
+        streamed = []
+
+        async def on_result(item):
+            streamed.append(item["symbol"])
+
+        fear_greed, results, _ = await pipeline.collect_report_data(
+            "1y", ["TSLA", "SCHD"], [], on_result, as_of=AS_OF
+        )
+
+        assert fake_market == ["SCHD"]
+        assert fear_greed["score"] == 50.0
+        assert [item["symbol"] for item in results] == ["TSLA", "SCHD"]
+        # 복원한 값은 재사용 표시 (이력에 다시 저장하지 않도록)
+        assert [item.get("reused", False) for item in results] == [True, False]
+        assert sorted(streamed) == ["SCHD", "TSLA"]
+
+        # 200일선이 필요한데 복원한 값에 없으면 다시 조회
+        fake_market.clear()
+        await pipeline.collect_stocks("1y", ["TSLA"], ["TSLA"], as_of=AS_OF)
+        assert fake_market == ["TSLA"]
+
+        fake_market.clear()
+        await pipeline.collect_report_data("1y", ["TSLA"], [], as_of="close:2025-01-13")
+        assert sorted(fake_market) == ["TSLA", "fear_greed"]
+
+    @pytest.mark.asyncio
+    async def test_reused_result_without_ma(self, fake_market):
+        """
+        테스트 5: 200일선을 켠 채팅방이 수집한 결과를 재사용해도,
+        200일선을 켜지 않은 요청에는 200일선 정보가 없음
+        """
+        results, _ = await pipeline.collect_stocks(
+            "1y", ["TSLA"], ["TSLA"], as_of=AS_OF
+        )
+        assert "ma_200" in results[0]
+        fake_market.clear()
+
+        results, _ = await pipeline.collect_stocks("1y", ["TSLA"], [], as_of=AS_OF)
+
+        assert fake_market == []
+        assert "ma_200" not in results[0]
+        # 저장된 결과는 그대로 (200일선이 필요한 요청은 계속 재사용)
+        results, _ = await pipeline.collect_stocks(
+            "1y", ["TSLA"], ["TSLA"], as_of=AS_OF
+        )
+        assert fake_market == [] and "ma_200" in results[0]
@@ -8,10 +8,27 @@ Async 테스트란?
 - Java로 비유: @Async 메서드를 테스트할 때 CompletableFuture를 기다리는 것과 유사
 """
 
+import datetime
+from types import SimpleNamespace
+
 import pytest
 
+from src import pipeline
 from src.config import Config
+from src.notifiers import telegram
 from src.notifiers.telegram import TelegramNotifier
+from src.scheduler import Scheduler
+
+
+class FakeBot:
+    """send_message 호출만 기록하는 가짜 Bot (네트워크 사용 안 함)"""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send_message(self, chat_id, text, parse_mode=None):
+        self.sent.append((chat_id, text))
+        return SimpleNamespace(message_id=len(self.sent))
 
 
 @pytest.fixture
@@ -114,3 +131,198 @@ class TestTelegramNotifierInvalidToken:
         # 실패해야 함
         assert result["ok"] is False
         assert "error" in result
+
+
+class TestSharedBotNotifier:
+    """공유 Bot(application.bot)을 쓰는 notifier 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_uses_shared_bot(self):
+        """
+        테스트 1: 넘겨받은 Bot으로 전송하고, chat_id를 호출마다 지정할 수 있음
+        """
+        bot = FakeBot()
+        notifier = TelegramNotifier(bot=bot, chat_id="100")
+
+        async with notifier:
+            first = await notifier.send_message("기본 채팅방")
+            second = await notifier.send_message("다른 채팅방", chat_id="200")
+
+        assert first["ok"] is True
+        assert second["ok"] is True
+        assert [chat_id for chat_id, _ in bot.sent] == ["100", "200"]
+
+    @pytest.mark.asyncio
+    async def test_shared_bot_is_not_shut_down(self):
+        """
+        테스트 2: 공유 Bot은 notifier가 종료해도 그대로 (Application이 관리)
+
+        FakeBot에는 initialize/shutdown이 없으므로 호출되면 AttributeError 발생
+        """
+        notifier = TelegramNotifier(bot=FakeBot(), chat_id="100")
+
+        await notifier.start()
+        await notifier.stop()
+
+
+@pytest.fixture
+def scheduled_env(tmp_path, monkeypatch):
+    """
+    fixture: 가짜 수집 함수/Bot으로 스케줄 작업을 실행할 context
+
+    반환: (수집된 종목 목록, FakeBot, bot_data, context)
+    """
+    monkeypatch.setattr(telegram.watchlist, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(
+        telegram.watchlist, "WATCHLIST_FILE", tmp_path / "watchlist.json"
+    )
+    monkeypatch.setattr(Config, "TELEGRAM_CHAT_ID", "100")
+    monkeypatch.setattr(Config, "DEFAULT_SYMBOLS", "AAA,BBB")
+    monkeypatch.setattr(Config, "DEFAULT_MA_SYMBOLS", "")
+    monkeypatch.setattr(Config, "ALERT_TIME", "09:00")
+
+    fetched = []
+
+    async def fake_fetch(symbol, period, ma_enabled=False, on_fetched=None):
+        fetched.append(symbol)
+        return {"symbol": symbol, "drawdown_pct": -1.0, "buy_signal": ""}
+
+    monkeypatch.setattr(pipeline, "analyze_symbol", fake_fetch)
+    monkeypatch.setattr(pipeline, "get_fear_greed_index", lambda: {"score": 50})
+    pipeline.clear_fallback()
+
+    bot = FakeBot()
+    bot_data = {
+        "notifier": TelegramNotifier(bot=bot, chat_id="100"),
+        "report_cache": telegram.ReportCache(),
+        "prewarm_cache": telegram.PrewarmCache(),
+        "delivery_skew": [],
+    }
+    context = SimpleNamespace(
+        application=SimpleNamespace(bot_data=bot_data),
+        job=SimpleNamespace(
+            data={"alert_time": "09:00"},
+            scheduled_at=datetime.datetime.now(tz=datetime.UTC),
+        ),
+    )
+    yield fetched, bot, bot_data, context
+    pipeline.clear_fallback()
+
+
+class TestPrewarmedScheduledReport:
+    """사전 수집 + 스케줄 리포트 테스트 (가짜 수집 함수/Bot 사용)"""
+
+    @pytest.mark.asyncio
+    async def test_send_uses_prewarmed_data(self, scheduled_env, monkeypatch):
+        """
+        테스트 1: 사전 수집 후 전송 시점과 이후 같은 기준 시점의 조회에서는 다시 수집하지 않고,
+        전송 지연이 기록됨
+        """
+        fetched, bot, bot_data, context = scheduled_env
+        # 테스트 실행 시각과 관계없이 사전 수집/전송의 기준 시점을 같게 고정
+        monkeypatch.setattr(
+            telegram, "data_as_of", lambda now=None, symbols=None: "close:2025-01-10"
+        )
+
+        await telegram.prewarm_daily_report(context)
+        assert sorted(fetched) == ["AAA", "BBB"]
+
+        await telegram.scheduled_daily_report(context)
+
+        assert len(fetched) == 2  # 전송 시점에는 수집 없음
+        assert bot.sent[0][0] == "100"
+        assert "AAA" in bot.sent[0][1]
+        assert bot_data["delivery_skew"][0]["prewarmed"] is True
+
+        # 사전 수집 결과는 수집 시점 기준으로 남아 이후 /report에서도 다시 조회하지 않음
+        await pipeline.collect_report_data(
+            "1y", ["AAA", "BBB"], [], as_of="close:2025-01-10"
+        )
+        assert len(fetched) == 2
+
+    @pytest.mark.asyncio
+    async def test_session_opens_before_send(self, scheduled_env, monkeypatch):
+        """
+        테스트 2: 사전 수집과 알림 시각 사이에 장이 열리면 사전 수집하지 않고,
+        알림 시각에 장중 데이터를 새로 수집
+        """
+        fetched, bot, bot_data, context = scheduled_env
+
+        def fake_as_of(now=None, symbols=None):
+            # 지금(사전 수집 시각)은 장 시작 전, 알림 시각에는 서울 장중
+            if now is None:
+                return "close:2025-01-10;KRX=close:2025-01-10"
+            return "close:2025-01-10;KRX=intraday:1"
+
+        monkeypatch.setattr(telegram, "data_as_of", fake_as_of)
+
+        await telegram.prewarm_daily_report(context)
+        assert fetched == []
+
+        await telegram.scheduled_daily_report(context)
+
+        assert sorted(fetched) == ["AAA", "BBB"]
+        assert "AAA" in bot.sent[0][1]
+        assert bot_data["delivery_skew"][0]["prewarmed"] is False
+
+
+class TestScheduleSync:
+    """스케줄 작업의 채팅방/알림 시간을 실행 시점 watchlist에서 읽는지 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_changes_from_other_process(self, tmp_path, monkeypatch):
+        """
+        테스트 1: 다른 프로세스에서 바뀐 알림 시간은 동기화 작업이 다시 등록하고,
+        정규장 기준 리포트는 등록 후 추가된 채팅방에도 전송
+        """
+        monkeypatch.setattr(telegram.watchlist, "DATA_DIR", tmp_path)
+        monkeypatch.setattr(
+            telegram.watchlist, "WATCHLIST_FILE", tmp_path / "watchlist.json"
+        )
+        monkeypatch.setattr(Config, "TELEGRAM_CHAT_ID", "100")
+        monkeypatch.setattr(Config, "ALLOWED_CHAT_IDS", "200")
+        monkeypatch.setattr(Config, "ALERT_TIME", "09:00")
+        monkeypatch.setattr(Config, "SESSION_REPORTS", "close+15")
+        application = SimpleNamespace(bot_data={"scheduler": Scheduler()})
+        context = SimpleNamespace(application=application, job=None)
+
+        telegram._schedule_daily_reports(application)
+        session_job = next(
+            job
+            for job in application.bot_data["scheduler"].jobs()
+            if job.name == "session_report:close+15"
+        )
+
+        # 스케줄러가 없는 프로세스에서 변경 (SCHEDULER_ENABLED=false)
+        telegram.watchlist.set_alert_time("0830", "100")
+        assert telegram.watchlist.add("NEWCO", "200")[0]
+        await telegram.sync_schedule(context)
+
+        names = {job.name for job in application.bot_data["scheduler"].jobs()}
+        assert "daily_report:08:30" in names
+        # 09:00에는 새로 추가된 채팅방만 남음
+        assert telegram._job_chat_ids({"alert_time": "09:00"}) == ["200"]
+        assert telegram._job_chat_ids(session_job.data) == ["100", "200"]
+
+
+class TestAllowedChats:
+    """허용된 채팅방 확인 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_not_allowed_chat_is_ignored(self, monkeypatch):
+        """
+        테스트 1: 허용되지 않은 채팅방의 명령어는 핸들러를 실행하지 않음
+        """
+        monkeypatch.setattr(Config, "TELEGRAM_CHAT_ID", "100")
+        monkeypatch.setattr(Config, "ALLOWED_CHAT_IDS", "200")
+        handled = []
+
+        async def handler(update, context):
+            handled.append(update.effective_chat.id)
+
+        guarded = telegram._allowed_only(handler)
+        for chat_id in (100, 200, 999):
+            update = SimpleNamespace(effective_chat=SimpleNamespace(id=chat_id))
+            await guarded(update, None)
+
+        assert handled == [100, 200]
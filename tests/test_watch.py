@@ -0,0 +1,238 @@
+"""watch.py 테스트 코드
+
+장중 감시의 매수 단계 기준선 돌파 감지, 과거 데이터 재조회 여부, 조회 간격 조절,
+종목별 거래소 정규장 판단을 검증
+(네트워크 없이 가짜 조회 함수 사용)
+"""
+
+import datetime
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+import pytest
+
+from src import signal_state, watchlist
+from src.config import Config
+from src.watch import (
+    PriceWatcher,
+    SymbolWatch,
+    _deliver,
+    _next_symbols_open,
+    _open_symbols,
+)
+
+KST = ZoneInfo("Asia/Seoul")
+
+
+class FakeHistory:
+    """고점 100, 마지막 종가 last인 과거 데이터 (호출 횟수 기록)"""
+
+    def __init__(self, last: float = 95.0):
+        self.last = last
+        self.calls = []
+
+    def __call__(self, symbol: str, period: str = "1y") -> pd.DataFrame:
+        self.calls.append(symbol)
+        return pd.DataFrame({"Close": [90.0, 100.0, self.last]})
+
+
+class FakeQuotes:
+    """미리 정한 현재가를 순서대로 반환 (호출 횟수 기록)"""
+
+    def __init__(self, *ticks: dict[str, float]):
+        self.ticks = list(ticks)
+        self.calls = 0
+
+    def __call__(self, symbols: list[str]) -> dict[str, float]:
+        self.calls += 1
+        return self.ticks.pop(0)
+
+
+def make_watcher(history=None, quotes=None) -> PriceWatcher:
+    return PriceWatcher(
+        "1y",
+        quote_fetcher=quotes or FakeQuotes(),
+        history_fetcher=history or FakeHistory(),
+        min_interval=5,
+        max_interval=60,
+        hysteresis=1.0,
+    )
+
+
+class TestPriceWatcher:
+    """PriceWatcher 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_alerts_on_threshold_crossing(self):
+        """
+        테스트 1: 현재가가 -10% 기준선을 넘는 틱에서만 변화가 나옴
+        """
+        quotes = FakeQuotes({"TSLA": 93.0}, {"TSLA": 89.5}, {"TSLA": 89.0})
+        watcher = make_watcher(quotes=quotes)
+        await watcher.sync_symbols(["TSLA"])
+
+        assert await watcher.tick() == []
+        changes = await watcher.tick()
+        assert await watcher.tick() == []
+
+        assert len(changes) == 1
+        assert changes[0]["symbol"] == "TSLA"
+        assert changes[0]["kind"] == "tier"
+        assert (changes[0]["old"], changes[0]["new"]) == (0, 1)
+        assert changes[0]["drawdown_pct"] == pytest.approx(-10.5)
+
+    @pytest.mark.asyncio
+    async def test_history_fetched_once(self):
+        """
+        테스트 2: 과거 데이터는 종목당 한 번만, 틱마다 현재가 일괄 조회 1번
+        """
+        history = FakeHistory()
+        quotes = FakeQuotes(*[{"TSLA": 95.0, "SCHD": 95.0}] * 5)
+        watcher = make_watcher(history, quotes)
+
+        await watcher.sync_symbols(["TSLA", "SCHD"])
+        for _ in range(5):
+            await watcher.sync_symbols(["TSLA", "SCHD"])
+            await watcher.tick()
+
+        assert sorted(history.calls) == ["SCHD", "TSLA"]
+        assert quotes.calls == 5
+
+    @pytest.mark.asyncio
+    async def test_new_high_raises_peak(self):
+        """
+        테스트 3: 장중 신고가는 고점으로 반영되어 하락률 기준이 됨
+        """
+        quotes = FakeQuotes({"TSLA": 120.0}, {"TSLA": 107.0})
+        watcher = make_watcher(quotes=quotes)
+        await watcher.sync_symbols(["TSLA"])
+
+        await watcher.tick()
+        changes = await watcher.tick()
+
+        assert watcher.states["TSLA"].peak == 120.0
+        assert changes[0]["new"] == 1
+
+    @pytest.mark.asyncio
+    async def test_previous_tier_with_hysteresis(self):
+        """
+        테스트 4: 저장된 단계에서 시작하면 기준선 근처 반등은 알림 없음
+        """
+        quotes = FakeQuotes({"TSLA": 90.5}, {"TSLA": 88.0})
+        watcher = make_watcher(FakeHistory(last=89.0), quotes)
+        await watcher.sync_symbols(["TSLA"], {"TSLA": 1})
+
+        assert watcher.states["TSLA"].tier == 1
+        assert await watcher.tick() == []  # -9.5%: 여유 폭 안
+        assert await watcher.tick() == []
+
+    def test_interval_shrinks_with_volatility(self):
+        """
+        테스트 5: 조용하면 최대 간격, 기준선을 향해 빠르게 움직이면 최소 간격
+        """
+        watcher = make_watcher()
+        watcher.states["TSLA"] = SymbolWatch("TSLA", 100.0, 95.0, 0)
+
+        watcher.apply_quotes({"TSLA": 95.0}, now=0.0)
+        watcher.apply_quotes({"TSLA": 95.0}, now=30.0)
+        assert watcher.next_interval() == 60
+
+        watcher.apply_quotes({"TSLA": 92.0}, now=31.0)
+        assert watcher.next_interval() == 5
+
+
+class TestRecordTiers:
+    """signal_state.record_tiers / get_tiers 테스트"""
+
+    def test_intraday_change_not_repeated(self, tmp_path, monkeypatch):
+        """
+        테스트 6: 장중에 기록한 단계는 다음 일일 비교에서 변화로 보지 않음
+        """
+        monkeypatch.setattr(watchlist, "DATA_DIR", tmp_path)
+        monkeypatch.setattr(watchlist, "WATCHLIST_FILE", tmp_path / "watchlist.json")
+        monkeypatch.setattr(Config, "TELEGRAM_CHAT_ID", "100")
+        monkeypatch.setattr(Config, "DEFAULT_SYMBOLS", "TSLA")
+        signal_state.update("1y", [{"symbol": "TSLA", "drawdown_pct": -5.0}], ["100"])
+
+        signal_state.record_tiers("1y", {"TSLA": 1})
+
+        assert signal_state.get_tiers("1y") == {"TSLA": 1}
+        changes = signal_state.update(
+            "1y", [{"symbol": "TSLA", "drawdown_pct": -12.0}], ["100"]
+        )
+        assert changes == {"100": []}
+
+
+class FakeNotifier:
+    """보낸 메시지를 채팅방별로 기록"""
+
+    def __init__(self):
+        self.sent: dict[str, list[str]] = {}
+
+    async def send_messages(self, pages, priority, chat_id):
+        self.sent.setdefault(chat_id, []).extend(pages)
+        return {"ok": True}
+
+
+class TestPeriodGroups:
+    """채팅방별 분석 기간으로 나눈 장중 감시 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_changes_only_reach_chats_with_same_period(
+        self, tmp_path, monkeypatch
+    ):
+        """
+        테스트 8: 매수 단계 변화는 그 기간을 쓰는 채팅방에만 보내고, 상태도 그 채팅방만 갱신
+        """
+        monkeypatch.setattr(watchlist, "DATA_DIR", tmp_path)
+        monkeypatch.setattr(watchlist, "WATCHLIST_FILE", tmp_path / "watchlist.json")
+        monkeypatch.setattr(Config, "TELEGRAM_CHAT_ID", "100")
+        monkeypatch.setattr(Config, "ALLOWED_CHAT_IDS", "200")
+        monkeypatch.setattr(Config, "DEFAULT_SYMBOLS", "TSLA")
+        monkeypatch.setattr(Config, "ANALYSIS_PERIOD", "1y")
+        watchlist.set_period("6mo", chat_id="200")
+
+        groups = watchlist.get_chats_by_period()
+        assert groups == {"1y": ["100"], "6mo": ["200"]}
+
+        change = {
+            "symbol": "TSLA",
+            "kind": "tier",
+            "old": 0,
+            "new": 1,
+            "drawdown_pct": -12.0,
+            "current_price": 88.0,
+            "ma_diff_pct": None,
+        }
+        notifier = FakeNotifier()
+        await _deliver(notifier, {"1y": [change]}, groups, [])
+        signal_state.record_tiers("1y", {"TSLA": 1}, groups["1y"])
+
+        assert list(notifier.sent) == ["100"]
+        assert "TSLA" in notifier.sent["100"][0]
+        assert signal_state.get_tiers("1y") == {"TSLA": 1}
+        assert "200" not in signal_state.load()["chats"]
+
+
+class TestExchangeHours:
+    """종목별 거래소 정규장 판단 테스트"""
+
+    def test_open_symbols_by_exchange(self):
+        """
+        테스트 7: 서울 장중에는 KRX 종목만 감시하고, 모두 닫혔으면
+        종목 거래소 중 가장 먼저 열리는 정규장까지 대기
+        """
+        symbols = ["TSLA", "005930.KS"]
+        seoul_open = datetime.datetime(2025, 1, 10, 10, 0, tzinfo=KST)
+        assert _open_symbols(symbols, seoul_open) == ["005930.KS"]
+
+        # 서울 마감 후 → 같은 날 뉴욕 09:30 (한국 시간 23:30)
+        seoul_closed = datetime.datetime(2025, 1, 10, 16, 0, tzinfo=KST)
+        assert _open_symbols(symbols, seoul_closed) == []
+        assert _next_symbols_open(symbols, seoul_closed) == datetime.datetime(
+            2025, 1, 10, 23, 30, tzinfo=KST
+        )
+        # KRX 종목만 있으면 다음 서울 장 (월요일 09:00)
+        assert _next_symbols_open(["005930.KS"], seoul_closed) == datetime.datetime(
+            2025, 1, 13, 9, 0, tzinfo=KST
+        )
@@ -0,0 +1,179 @@
+"""watchlist.py 테스트 코드
+
+채팅방별 관심 종목 관리와 종목 합집합 계산이 정확한지 검증
+"""
+
+import json
+
+import pytest
+
+from src import watchlist
+from src.config import Config
+
+
+@pytest.fixture(autouse=True)
+def watchlist_file(tmp_path, monkeypatch):
+    """
+    fixture: 테스트마다 임시 디렉토리의 watchlist.json 사용
+
+    실제 data/watchlist.json을 건드리지 않도록 경로를 바꿔치기
+    """
+    monkeypatch.setattr(watchlist, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(watchlist, "WATCHLIST_FILE", tmp_path / "watchlist.json")
+    monkeypatch.setattr(Config, "TELEGRAM_CHAT_ID", "100")
+    monkeypatch.setattr(Config, "ALLOWED_CHAT_IDS", "200,300")
+    monkeypatch.setattr(Config, "DEFAULT_SYMBOLS", "TSLA,SCHD")
+    monkeypatch.setattr(Config, "DEFAULT_MA_SYMBOLS", "TSLA")
+    monkeypatch.setattr(Config, "ANALYSIS_PERIOD", "1y")
+    monkeypatch.setattr(Config, "ALERT_TIME", "09:00")
+    return tmp_path / "watchlist.json"
+
+
+class TestChatWatchlist:
+    """채팅방별 watchlist 테스트"""
+
+    def test_default_chat_initialized(self):
+        """
+        테스트 1: 파일이 없으면 기본 채팅방이 기본 종목으로 생성됨
+        """
+        assert watchlist.get_all() == ["TSLA", "SCHD"]
+        assert watchlist.get_chat_ids() == ["100"]
+
+    def test_chats_are_independent(self):
+        """
+        테스트 2: 한 채팅방의 변경이 다른 채팅방에 영향을 주지 않음
+        """
+        watchlist.add("AAPL", chat_id="200")
+        watchlist.remove("SCHD", chat_id="200")
+
+        assert watchlist.get_all("200") == ["TSLA", "AAPL"]
+        assert watchlist.get_all("100") == ["TSLA", "SCHD"]
+        assert watchlist.get_chat_ids() == ["100", "200"]
+
+    def test_read_does_not_register_chat(self):
+        """
+        테스트 3: 조회만 한 채팅방은 파일에 등록되지 않음
+        """
+        assert watchlist.get_all("300") == ["TSLA", "SCHD"]
+        assert "300" not in watchlist.get_chat_ids()
+
+    def test_not_allowed_chat_is_not_registered(self, watchlist_file):
+        """
+        테스트 4: 허용되지 않은 채팅방은 변경 명령어로 등록되지 않고, 파일에 있어도 방송 대상이 아님
+        """
+        assert watchlist.add("AAPL", chat_id="999") == (
+            False,
+            watchlist.NOT_ALLOWED_MESSAGE,
+        )
+        assert watchlist.set_alert_time("0830", chat_id="999")[0] is False
+        assert "999" not in watchlist.get_chat_ids()
+
+        data = json.loads(watchlist_file.read_text(encoding="utf-8"))
+        data["chats"]["999"] = {"symbols": ["AAPL"]}
+        watchlist_file.write_text(json.dumps(data), encoding="utf-8")
+
+        assert watchlist.get_chat_ids() == ["100"]
+        assert watchlist.get_chats_by_alert_time() == {"09:00": ["100"]}
+        assert watchlist.get_union_symbols() == ["TSLA", "SCHD"]
+        assert watchlist.get_union_ma_symbols() == ["TSLA"]
+
+    def test_legacy_format_migrated(self, watchlist_file):
+        """
+        테스트 5: 이전 형식(최상위 symbols)은 기본 채팅방으로 이전됨
+        """
+        watchlist_file.write_text(
+            json.dumps({"symbols": ["QQQM"], "ma_enabled": []}), encoding="utf-8"
+        )
+
+        assert watchlist.get_all() == ["QQQM"]
+        assert watchlist.get_ma_symbols() == []
+
+    def test_bad_entries_do_not_reset_file(self, watchlist_file):
+        """
+        테스트 6: 형식이 잘못된 채팅방만 건너뛰거나 기본값으로 채우고,
+        읽을 수 없는 파일은 기본값으로 덮어쓰지 않음
+        """
+        chats = {
+            "100": {"symbols": ["QQQM"], "ma_enabled": None},
+            "200": ["broken"],
+            "300": {"symbols": ["NVDA"]},
+        }
+        watchlist_file.write_text(json.dumps({"chats": chats}), encoding="utf-8")
+
+        assert watchlist.get_all("100") == ["QQQM"]
+        assert watchlist.get_ma_symbols("100") == ["TSLA"]
+        assert watchlist.get_chat_ids() == ["100", "300"]
+        assert watchlist.get_all("300") == ["NVDA"]
+
+        watchlist_file.write_text("{not json", encoding="utf-8")
+
+        assert watchlist.get_all("300") == ["TSLA", "SCHD"]
+        assert watchlist.add("AAPL", chat_id="300") == (
+            False,
+            watchlist.SAVE_FAILED_MESSAGE,
+        )
+        assert watchlist_file.read_text(encoding="utf-8") == "{not json"
+
+
+class TestUnionSymbols:
+    """종목 합집합 테스트"""
+
+    def test_union_keeps_order_without_duplicates(self):
+        """
+        테스트 1: 여러 채팅방의 종목은 중복 없이 한 번씩만 포함
+        """
+        watchlist.add("AAPL", chat_id="200")
+        watchlist.add("NVDA", chat_id="300")
+
+        assert watchlist.get_union_symbols() == ["TSLA", "SCHD", "AAPL", "NVDA"]
+        assert watchlist.get_union_symbols(["200", "300"]) == [
+            "TSLA",
+            "SCHD",
+            "AAPL",
+            "NVDA",
+        ]
+
+    def test_union_ma_symbols(self):
+        """
+        테스트 2: MA 활성화 종목도 채팅방 합집합으로 계산
+        """
+        watchlist.set_ma("SCHD", True, chat_id="200")
+        watchlist.set_ma("TSLA", False, chat_id="200")
+
+        assert watchlist.get_union_ma_symbols() == ["TSLA", "SCHD"]
+        assert watchlist.get_union_ma_symbols(["200"]) == ["SCHD"]
+
+
+class TestChatSettings:
+    """채팅방별 분석 기간/알림 시간 테스트"""
+
+    def test_set_period(self):
+        """
+        테스트 1: 유효한 기간만 저장됨
+        """
+        assert watchlist.set_period("6mo", chat_id="200")[0] is True
+        assert watchlist.set_period("7y", chat_id="200")[0] is False
+        assert watchlist.get_period("200") == "6mo"
+
+    def test_alert_time_normalized(self):
+        """
+        테스트 2: 0830, 8:30 모두 08:30으로 저장됨
+        """
+        watchlist.set_alert_time("0830", chat_id="200")
+        watchlist.set_alert_time("8:30", chat_id="300")
+
+        assert watchlist.get_alert_time("200") == "08:30"
+        assert watchlist.get_alert_time("300") == "08:30"
+        assert watchlist.set_alert_time("25:00", chat_id="200")[0] is False
+
+    def test_chats_grouped_by_alert_time(self):
+        """
+        테스트 3: 알림 시간이 같은 채팅방끼리 묶임
+        """
+        watchlist.set_alert_time("0900", chat_id="200")
+        watchlist.set_alert_time("2130", chat_id="300")
+
+        groups = watchlist.get_chats_by_alert_time()
+
+        assert sorted(groups["09:00"]) == ["100", "200"]
+        assert groups["21:30"] == ["300"]
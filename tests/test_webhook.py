@@ -0,0 +1,166 @@
+"""webhook.py 테스트 코드
+
+로컬 웹훅 서버에 가짜 텔레그램 클라이언트(httpx)로 업데이트를 보내
+비밀 토큰 검증, 업데이트 전달, 동시 처리, 느리거나 큰 요청 차단을 검증
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from src import http_server
+from src.notifiers.webhook import SECRET_HEADER, WebhookServer
+
+SECRET = "test-secret"
+
+
+class FakeApplication:
+    """update_queue만 가진 가짜 Application"""
+
+    def __init__(self):
+        self.bot = None
+        self.update_queue = asyncio.Queue()
+
+
+def make_update(update_id: int, text: str = "/report") -> dict:
+    """텔레그램이 보내는 형식의 메시지 업데이트"""
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": 12345, "type": "private"},
+            "from": {"id": 12345, "is_bot": False, "first_name": "Tester"},
+            "text": text,
+        },
+    }
+
+
+@pytest_asyncio.fixture
+async def webhook():
+    """빈 포트로 웹훅 서버를 띄우고 (서버, 가짜 클라이언트) 반환"""
+    application = FakeApplication()
+    server = WebhookServer(application, secret_token=SECRET, host="127.0.0.1", port=0)
+    await server.start()
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{server.port}") as client:
+        yield server, client
+    await server.stop()
+
+
+class TestWebhookServer:
+    """WebhookServer 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_update_is_queued(self, webhook):
+        """
+        테스트 1: 올바른 토큰의 업데이트는 200 응답 후 update_queue에 들어감
+        """
+        server, client = webhook
+        response = await client.post(
+            "/telegram", json=make_update(1), headers={SECRET_HEADER: SECRET}
+        )
+
+        assert response.status_code == 200
+        update = server.application.update_queue.get_nowait()
+        assert update.update_id == 1
+        assert update.message.text == "/report"
+
+    @pytest.mark.asyncio
+    async def test_wrong_secret_is_rejected(self, webhook):
+        """
+        테스트 2: 토큰이 없거나 다르면 403, 큐에 들어가지 않음
+        """
+        server, client = webhook
+        missing = await client.post("/telegram", json=make_update(1))
+        wrong = await client.post(
+            "/telegram", json=make_update(2), headers={SECRET_HEADER: "nope"}
+        )
+
+        assert missing.status_code == 403
+        assert wrong.status_code == 403
+        assert server.application.update_queue.empty()
+        assert server.rejected == 2
+
+    @pytest.mark.asyncio
+    async def test_bad_requests(self, webhook):
+        """
+        테스트 3: 잘못된 JSON은 400, 없는 경로는 404, GET은 405
+        """
+        _, client = webhook
+        headers = {SECRET_HEADER: SECRET}
+
+        bad_json = await client.post("/telegram", content=b"{", headers=headers)
+        not_found = await client.post("/other", json={}, headers=headers)
+        wrong_method = await client.get("/telegram")
+
+        assert bad_json.status_code == 400
+        assert not_found.status_code == 404
+        assert wrong_method.status_code == 405
+
+    @pytest.mark.asyncio
+    async def test_concurrent_updates(self, webhook):
+        """
+        테스트 4: 동시에 보낸 업데이트가 모두 빠짐없이 전달됨
+        """
+        server, client = webhook
+        headers = {SECRET_HEADER: SECRET}
+
+        responses = await asyncio.gather(
+            *(
+                client.post("/telegram", json=make_update(i), headers=headers)
+                for i in range(50)
+            )
+        )
+
+        assert all(r.status_code == 200 for r in responses)
+        queue = server.application.update_queue
+        ids = {queue.get_nowait().update_id for _ in range(queue.qsize())}
+        assert ids == set(range(50))
+
+    @pytest.mark.asyncio
+    async def test_health(self, webhook):
+        """
+        테스트 5: 헬스체크는 토큰 없이 200
+        """
+        _, client = webhook
+        response = await client.get("/healthz")
+
+        assert response.status_code == 200
+        assert response.json()["ok"] is True
+
+    @pytest.mark.asyncio
+    async def test_too_many_headers(self, webhook):
+        """
+        테스트 6: 헤더 개수가 제한을 넘으면 431로 응답하고 연결을 닫음
+        """
+        server, _ = webhook
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        headers = "".join(
+            f"X-Filler-{i}: x\r\n" for i in range(http_server.MAX_HEADER_COUNT + 1)
+        )
+        writer.write(f"GET /healthz HTTP/1.1\r\n{headers}\r\n".encode("latin-1"))
+        await writer.drain()
+
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+
+        assert response.startswith(b"HTTP/1.1 431 ")
+
+    @pytest.mark.asyncio
+    async def test_slow_headers_time_out(self, webhook, monkeypatch):
+        """
+        테스트 7: 헤더를 끝내지 않는 연결은 제한 시간이 지나면 닫힘
+        """
+        monkeypatch.setattr(http_server, "IDLE_TIMEOUT", 0.2)
+        server, _ = webhook
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(b"GET /healthz HTTP/1.1\r\nX-Slow: x\r\n")
+        await writer.drain()
+
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+
+        assert response == b""